@@ -113,7 +113,9 @@ class CCodeGenerator(object):
                     result = CodeExpression(precision.get_cst(optree.get_value(), language = language), precision)
                     Log.report(Log.Error, "Error during get_cst call for Constant: %s " % optree.get_str(display_precision = True)) # Exception print
 
-        elif isinstance(optree, TableLoad):
+        elif isinstance(optree, TableLoad) and not optree.get_precision().is_vector_format():
+            # (vector table loads, with vector indices, are implemented
+            #  by the target processor)
             # declaring table
             table = optree.inputs[0]
             tag = table.get_tag()
@@ -130,6 +132,12 @@ class CCodeGenerator(object):
                 code_object << self.generate_assignation(result_varname, result.get()) 
                 result = CodeVariable(result_varname, optree.get_precision())
 
+        elif isinstance(optree, ML_Table):
+            # table used as a value (e.g. pointer argument of a function call)
+            tag = optree.get_tag()
+            table_name = code_object.declare_table(optree, prefix = tag if tag != None else "table") 
+            result = CodeVariable(table_name, optree.get_storage_precision())
+
 
         elif isinstance(optree, SwitchBlock):
             switch_value = optree.inputs[0]
@@ -321,6 +329,9 @@ class CCodeGenerator(object):
 
         elif isinstance(symbol_object, ML_Table):
             initial_symbol = (symbol_object.get_definition(symbol, final = "", language = self.language) + " ") if initial else ""
+            if symbol_object.is_empty():
+                # content is not known at compile time (e.g. loaded at run time)
+                return "%s;\n" % initial_symbol.rstrip()
             table_content_init = symbol_object.get_content_init(language = self.language)
             return "%s = %s;\n" % (initial_symbol, table_content_init)
 
@@ -18,9 +18,12 @@ from .code_constant import *
 
 class CodeFunction(object):
   """ function code object """
-  def __init__(self, name, arg_list = None, output_format = None, code_object = None, language = C_Code):
+  def __init__(self, name, arg_list = None, output_format = None, code_object = None, language = C_Code, attributes = None):
     """ code function initialization """
     self.name = name
+    ## list of function attributes (e.g. target("avx2")) prefixed
+    #  to the function declaration as __attribute__((...))
+    self.attributes = attributes if attributes else []
     self.arg_list = arg_list if arg_list else []
     self.code_object = code_object
     self.output_format = output_format 
@@ -77,7 +80,8 @@ class CodeFunction(object):
     language = self.language if language is None else language
     arg_format_list = ", ".join("%s %s" % (inp.get_precision().get_name(language = language), inp.get_tag()) for inp in self.arg_list)
     final_symbol = ";" if final else ""
-    return "%s %s(%s)%s" % (self.output_format.get_name(language = language), self.name, arg_format_list, final_symbol)
+    attribute_prefix = "__attribute__((%s)) " % ", ".join(self.attributes) if self.attributes else ""
+    return "%s%s %s(%s)%s" % (attribute_prefix, self.output_format.get_name(language = language), self.name, arg_format_list, final_symbol)
 
   ## define function implementation
   #  @param scheme ML_Operation object to be defined as function implementation
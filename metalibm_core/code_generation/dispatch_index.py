@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+
+###############################################################################
+# This file is part of Kalray's Metalibm tool
+# Copyright (2016)
+# All rights reserved
+# created:          Oct 18th, 2016
+# last-modified:    Oct 18th, 2016
+#
+# author(s): Nicolas Brunie (nicolas.brunie@kalray.eu)
+###############################################################################
+
+# Precompiled index of processor operation tables
+#
+# A processor table is a nested dict
+#   {op_class: {codegen_key: {condition: {interface_condition: implementation}}}}
+# looking up an operation requires calling every condition and interface
+# predicate. A DispatchBucket compiles the {condition: {interface: ...}}
+# level of a table: type_strict_match predicates are indexed by their type
+# tuple, conditions known to be always true are not evaluated and, when no
+# remaining predicate depends on the node itself, lookup results (positive
+# and negative) are cached by interface type tuple.
+
+from ..core.ml_formats import ML_Custom_FixedPoint_Format
+from .generator_utility import (
+    type_strict_match, type_strict_match_list, type_fixed_match,
+    type_custom_match, type_relax_match, type_result_match,
+    type_all_match, type_std_integer_match
+)
+
+## value returned by DispatchBucket.lookup when no implementation matches
+NO_MATCH = object()
+
+## reference always-true condition
+_true_condition = lambda optree: True
+
+## interface predicate classes (and functions) whose result only
+#  depends on the interface format tuple (not on the node)
+pure_interface_class_list = (type_strict_match, type_strict_match_list, type_fixed_match, type_custom_match, type_relax_match, type_result_match)
+pure_interface_function_list = [type_all_match, type_std_integer_match]
+
+
+## test if <condition> is a lambda always returning True (e.g. lambda optree: True)
+def is_static_true_condition(condition):
+    try:
+        code = condition.func_code
+        ref_code = _true_condition.func_code
+    except AttributeError:
+        return False
+    return code.co_argcount == 1 and code.co_code == ref_code.co_code and code.co_names == ref_code.co_names and code.co_consts == ref_code.co_consts
+
+## test if <interface_condition> can be indexed by its type tuple
+def is_indexable_interface(interface_condition):
+    if not isinstance(interface_condition, type_strict_match):
+        return False
+    # custom fixed-point formats define __eq__ but not __hash__,
+    # they can not be used as index keys
+    for precision in interface_condition.type_tuple:
+        if isinstance(precision, ML_Custom_FixedPoint_Format):
+            return False
+    return True
+
+def is_pure_interface(interface_condition):
+    return isinstance(interface_condition, pure_interface_class_list) or interface_condition in pure_interface_function_list
+
+
+## Compiled {condition: {interface_condition: implementation}} table level
+class DispatchBucket(object):
+    def __init__(self, condition_map):
+        ## list of (condition or None if always true, strict_map, dynamic_list)
+        self.entry_list = []
+        ## lookup results can be cached by interface if no predicate depends on the node
+        self.cacheable = True
+        self.cache = {}
+        for condition in condition_map:
+            interface_map = condition_map[condition]
+            strict_map = {}
+            dynamic_list = []
+            for interface_condition in interface_map:
+                implementation = interface_map[interface_condition]
+                if is_indexable_interface(interface_condition):
+                    if not interface_condition.type_tuple in strict_map:
+                        strict_map[interface_condition.type_tuple] = implementation
+                else:
+                    if not is_pure_interface(interface_condition):
+                        self.cacheable = False
+                    dynamic_list.append((interface_condition, implementation))
+            if is_static_true_condition(condition):
+                # static conditions are tested first
+                self.entry_list.insert(0, (None, strict_map, dynamic_list))
+            else:
+                self.cacheable = False
+                self.entry_list.append((condition, strict_map, dynamic_list))
+
+    ## search for the implementation matching <interface> and <optree>
+    #  @return implementation or NO_MATCH
+    def lookup(self, interface, optree):
+        if self.cacheable:
+            try:
+                return self.cache[interface]
+            except KeyError:
+                pass
+            except TypeError:
+                # unhashable interface
+                return self.scan(interface, optree)
+            result = self.scan(interface, optree)
+            self.cache[interface] = result
+            return result
+        return self.scan(interface, optree)
+
+    def scan(self, interface, optree):
+        for condition, strict_map, dynamic_list in self.entry_list:
+            if condition is None or condition(optree):
+                try:
+                    return strict_map[interface]
+                except (KeyError, TypeError):
+                    pass
+                for interface_condition, implementation in dynamic_list:
+                    if interface_condition(*interface, optree = optree):
+                        return implementation
+        return NO_MATCH
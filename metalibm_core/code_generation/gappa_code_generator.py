@@ -20,7 +20,7 @@ from .generator_utility import C_Code, Gappa_Code, RoundOperator
 from ..core.attributes import ML_Debug
 from .code_object import Gappa_Unknown, GappaCodeObject
 
-from ..utility.gappa_utils import execute_gappa_script_extract
+from ..utility.gappa_utils import execute_gappa_script_extract, execute_gappa_script_list_extract, dump_gappa_script
 
 
 class GappaCodeGenerator(object):
@@ -270,9 +270,10 @@ class GappaCodeGenerator(object):
         return debug_msg
 
 
-    def get_eval_error(self, pre_optree, variable_copy_map = {}, goal_precision = ML_Binary32, gappa_filename = "gappa_tmp.g"):
+    def get_eval_error(self, pre_optree, variable_copy_map = None, goal_precision = ML_Binary32, gappa_filename = None):
         """ helper to compute the evaluation error of <pre_optree> bounded by tagged-node in variable_map, 
             assuming variable_map[v] is the liverange of node v """
+        variable_copy_map = {} if variable_copy_map is None else variable_copy_map
         # registering initial bounds
         bound_list = [op for op in variable_copy_map]
         # copying pre-operation tree
@@ -290,9 +291,16 @@ class GappaCodeGenerator(object):
         return execute_gappa_script_extract(gappa_code.get(self), gappa_filename = gappa_filename)["goal"]
 
 
-    def get_eval_error_v2(self, opt_engine, pre_optree, variable_copy_map = {}, goal_precision = ML_Exact, gappa_filename = "gappa_tmp.g", relative_error = False):
+    def get_eval_error_v2(self, opt_engine, pre_optree, variable_copy_map = None, goal_precision = ML_Exact, gappa_filename = None, relative_error = False):
         """ helper to compute the evaluation error of <pre_optree> bounded by tagged-node in variable_map, 
             assuming variable_map[v] is the liverange of node v """
+        gappa_code = self.get_eval_error_code_v2(opt_engine, pre_optree, variable_copy_map, goal_precision, relative_error = relative_error)
+        return execute_gappa_script_extract(gappa_code, gappa_filename = gappa_filename)["goal"]
+
+    def get_eval_error_code_v2(self, opt_engine, pre_optree, variable_copy_map = None, goal_precision = ML_Exact, relative_error = False):
+        """ generate the gappa script (string) evaluating the error of <pre_optree>
+            (see get_eval_error_v2) """
+        variable_copy_map = {} if variable_copy_map is None else variable_copy_map
         # registering initial bounds
         bound_list = [op for op in variable_copy_map]
         # copying pre-operation tree
@@ -341,15 +349,18 @@ class GappaCodeGenerator(object):
         self.add_goal(gappa_code, goal)
 
         self.clear_memoization_map()
-        return execute_gappa_script_extract(gappa_code.get(self), gappa_filename = gappa_filename)["goal"]
+        return gappa_code.get(self)
 
-    def get_eval_error_v3(self, opt_engine, pre_optree, variable_copy_map = {}, goal_precision = ML_Exact, gappa_filename = "gappa_tmp.g", dichotomy = [], relative_error = False):
+    ## evaluation error computation for each case of <dichotomy>, 
+    #  the gappa scripts of every case are evaluated concurrently
+    def get_eval_error_v3(self, opt_engine, pre_optree, variable_copy_map = None, goal_precision = ML_Exact, gappa_filename = None, dichotomy = [], relative_error = False):
+        variable_copy_map = {} if variable_copy_map is None else variable_copy_map
         # storing initial interval values
         init_interval = {}
         for op in variable_copy_map:
             init_interval[op] = variable_copy_map[op].get_interval()
 
-        eval_error_list = []
+        gappa_code_list = []
         case_id = 0
 
         # performing dichotomised search
@@ -364,15 +375,18 @@ class GappaCodeGenerator(object):
                     # else making sure initial interval is set
                     clean_copy_map[op].set_interval(init_interval[op])
                     
-            # computing evaluation error in local conditions
-            eval_error = self.get_eval_error_v2(opt_engine, pre_optree, clean_copy_map, goal_precision, ("c%d_" % case_id) + gappa_filename, relative_error = relative_error)
-            eval_error_list.append(eval_error)
+            # generating evaluation error script in local conditions
+            gappa_code = self.get_eval_error_code_v2(opt_engine, pre_optree, clean_copy_map, goal_precision, relative_error = relative_error)
+            if gappa_filename != None:
+                dump_gappa_script(gappa_code, ("c%d_" % case_id) + gappa_filename)
+            gappa_code_list.append(gappa_code)
             case_id += 1
 
-        return eval_error_list
+        return [result["goal"] for result in execute_gappa_script_list_extract(gappa_code_list)]
 
 
-    def get_interval_code(self, pre_goal, variable_copy_map = {}, goal_precision = ML_Exact, update_handle = True):
+    def get_interval_code(self, pre_goal, variable_copy_map = None, goal_precision = ML_Exact, update_handle = True):
+        variable_copy_map = {} if variable_copy_map is None else variable_copy_map
         # registering initial bounds
         bound_list = [op for op in variable_copy_map]
 
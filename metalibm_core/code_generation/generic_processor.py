@@ -19,6 +19,7 @@ from .complex_generator import *
 from ..core.ml_formats import *
 from ..core.ml_table import ML_ApproxTable
 from ..core.ml_operations import *
+from .dispatch_index import DispatchBucket, NO_MATCH
 
 
 def LibFunctionConstructor(require_header):
@@ -678,8 +679,9 @@ def get_parent_proc_class_list(proc_class):
     return [parent for parent in proc_class.__bases__ if test_is_processor(parent)]
     
 
-def create_proc_hierarchy(process_list, proc_class_list = []):
+def create_proc_hierarchy(process_list, proc_class_list = None):
     """ create an ordered list of processor hierarchy """
+    proc_class_list = [] if proc_class_list is None else proc_class_list
     if process_list == []:
         return proc_class_list
     new_process_list = []
@@ -694,6 +696,12 @@ def create_proc_hierarchy(process_list, proc_class_list = []):
     
 class ML_FullySupported: pass
 
+## (latency, reciprocal throughput) of operations missing from the
+#  operation_cost_table of every level of the processor hierarchy
+DEFAULT_OPERATION_COST = (4, 1)
+## operations which do not generate any instruction by themselves
+ZERO_COST_OPERATIONS = (ML_LeafNode, Statement, ConditionBlock, Return, Loop, ReferenceAssign)
+
 class GenericProcessor(AbstractProcessor):
     """ Generic class for instruction selection,
         corresponds to a portable C-implementation """
@@ -711,10 +719,48 @@ class GenericProcessor(AbstractProcessor):
     # approximation table map
     approx_table_map = generic_approx_table_map
 
+    ## estimated (latency, reciprocal throughput), in cycles, of operations
+    #  indexed by operation class or by (operation class, precision) pair;
+    #  a processor class only lists the entries it overrides
+    #  (see get_operation_cost)
+    operation_cost_table = {
+        Addition: (4, 0.5),
+        Subtraction: (4, 0.5),
+        Multiplication: (4, 0.5),
+        FusedMultiplyAdd: (4, 0.5),
+        Negation: (1, 0.5),
+        Abs: (1, 0.5),
+        Division: (26, 6),
+        (Division, ML_Binary32): (11, 5),
+        (Division, ML_Binary64): (14, 8),
+        Modulo: (26, 6),
+        BitLogicAnd: (1, 0.33),
+        BitLogicOr: (1, 0.33),
+        BitLogicXor: (1, 0.33),
+        BitLogicNegate: (1, 0.33),
+        BitLogicLeftShift: (1, 0.5),
+        BitLogicRightShift: (1, 0.5),
+        TypeCast: (1, 1),
+        Conversion: (4, 1),
+        NearestInteger: (8, 1),
+        Comparison: (3, 1),
+        Test: (3, 1),
+        LogicalAnd: (1, 0.5),
+        LogicalOr: (1, 0.5),
+        LogicalNot: (1, 0.5),
+        Select: (1, 0.5),
+        ExponentExtraction: (2, 1),
+        ExponentInsertion: (2, 1),
+        TableLoad: (5, 0.5),
+        FunctionCall: (20, 20),
+    }
+
     def get_target_name(sef):
         return self.target_name
 
     def __init__(self, *args):
+        # precompiled operation tables (see get_dispatch_bucket)
+        self.dispatch_index = {}
         # create ordered list of parent architecture instances
         parent_class_list = get_parent_proc_class_list(self.__class__)
         self.parent_architecture = [parent(*args) for parent in create_proc_hierarchy(parent_class_list, [])]
@@ -728,9 +774,42 @@ class GenericProcessor(AbstractProcessor):
     def get_compiler(self):
       return GenericProcessor.default_compiler
 
+    ## return the list of extra compiler options required to build
+    #  programs using the processor's code generation tables
+    def get_compilation_options(self):
+      return []
+
+    ## return the list of CPU features (__builtin_cpu_supports names)
+    #  required to execute code generated for the processor
+    def get_cpu_features(self):
+      return []
+
     def get_execution_command(self, test_file):
       return "./%s" % test_file
 
+    ## @return estimated (latency, reciprocal throughput), in cycles, of the
+    #          operation performed by <optree>: operation_cost_table entry
+    #          of the most derived level of the processor hierarchy defining
+    #          it, the speed_measure of the operation implementation (when
+    #          defined) overriding the latency
+    def get_operation_cost(self, optree, language = C_Code):
+        if isinstance(optree, ZERO_COST_OPERATIONS):
+            return 0, 0
+        op_class = optree.__class__
+        cost = None
+        for proc_class in create_proc_hierarchy([self.__class__], []):
+            cost_table = proc_class.__dict__.get("operation_cost_table", {})
+            cost = cost_table.get((op_class, optree.get_precision()), cost_table.get(op_class, None))
+            if cost != None:
+                break
+        latency, throughput = DEFAULT_OPERATION_COST if cost is None else cost
+        if self.is_supported_operation(optree, language = language):
+            implementation = self.get_recursive_implementation(optree, language = language)
+            speed_measure = getattr(implementation, "get_speed_measure", lambda: None)()
+            if speed_measure != None:
+                latency = speed_measure
+        return latency, throughput
+
 
     def generate_expr(self, code_generator, code_object, optree, arg_tuple, **kwords): #folded = True, language = C_Code, result_var = None):
         """ processor generate expression """
@@ -748,8 +827,9 @@ class GenericProcessor(AbstractProcessor):
         return op_map
 
 
-    def generate_local_op_map(self, language = C_Code, op_map = {}, table_getter = lambda self: self.code_generation_table):
+    def generate_local_op_map(self, language = C_Code, op_map = None, table_getter = lambda self: self.code_generation_table):
         """ generate simplified map of locally supported operations """
+        op_map = {} if op_map is None else op_map
         table = table_getter(self)
         if not language in table:
           return op_map
@@ -769,16 +849,25 @@ class GenericProcessor(AbstractProcessor):
           return op_map
                     
 
+    ## return the compiled version of op_map[language][op_class][codegen_key]
+    #  (built on first request)
+    def get_dispatch_bucket(self, op_map, language, op_class, codegen_key):
+        index_key = (id(op_map), language, op_class, codegen_key)
+        if not index_key in self.dispatch_index:
+            self.dispatch_index[index_key] = DispatchBucket(op_map[language][op_class][codegen_key])
+        return self.dispatch_index[index_key]
+
+    ## discard compiled tables, must be called if an operation
+    #  table is modified after the first lookup
+    def clear_dispatch_index(self):
+        self.dispatch_index = {}
+
     def get_implementation(self, optree, language = C_Code, table_getter = lambda self: self.code_generation_table):
         """ return <self> implementation of operation performed by <optree> """
         table = table_getter(self)
         op_class, interface, codegen_key = GenericProcessor.get_operation_keys(optree)
-        for condition in table[language][op_class][codegen_key]:
-            if condition(optree):
-                for interface_condition in table[language][op_class][codegen_key][condition]:
-                    if interface_condition(*interface, optree = optree):
-                        return table[language][op_class][codegen_key][condition][interface_condition]
-        return None
+        implementation = self.get_dispatch_bucket(table, language, op_class, codegen_key).lookup(interface, optree)
+        return None if implementation is NO_MATCH else implementation
 
     def get_recursive_implementation(self, optree, language = None, table_getter = lambda self: self.code_generation_table):
         """ recursively search for an implementation of optree in the processor class hierarchy """
@@ -815,10 +904,8 @@ class GenericProcessor(AbstractProcessor):
                     # unsupported codegen key
                     return False
                 else:
-                    for condition in op_map[language][op_class][codegen_key]:
-                        if condition(optree):
-                            for interface_condition in op_map[language][op_class][codegen_key][condition]:
-                                if interface_condition(*interface, optree = optree): return True
+                    if self.get_dispatch_bucket(op_map, language, op_class, codegen_key).lookup(interface, optree) is not NO_MATCH:
+                        return True
                     # unsupported condition or interface type
                     if debug: 
                       Log.report(Log.Info, "unsupported condition key for %s" % optree.get_str(display_precision = True))
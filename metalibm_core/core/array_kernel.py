@@ -0,0 +1,192 @@
+# -*- coding: utf-8 -*-
+
+###############################################################################
+# This file is part of Kalray's Metalibm tool
+# Copyright (2016)
+# All rights reserved
+# created:          Oct 18th, 2016
+# last-modified:    Oct 18th, 2016
+#
+# author(s): Nicolas Brunie (nicolas.brunie@kalray.eu)
+###############################################################################
+
+# Array-mapping kernel generation
+#
+#   void <name>(const T* restrict in, T* restrict out, size_t n)
+#   {
+#     // alignment peeling (scalar) until <in> is aligned on a vector boundary
+#     // main body: vector implementation, optionally unrolled
+#     // tail: scalar implementation or masked vector implementation
+#   }
+#
+# Memory accesses are expressed through FunctionObject built on
+# TemplateOperator (the IR does not provide pointer indexing).
+
+from .ml_operations import (
+    Variable, Constant, Statement, Loop, ReferenceAssign, ConditionBlock,
+    Addition, Comparison, LogicalAnd, VectorElementSelection, FunctionObject
+)
+from .ml_formats import ML_UInt64, ML_Void
+from .ml_complex_formats import ML_Pointer_Format, ML_Size_t
+from ..code_generation.code_function import CodeFunction
+from ..code_generation.generator_utility import TemplateOperator, FunctionOperator
+from ..utility.log_report import Log
+
+
+## tail elements are processed by the scalar implementation
+ARRAY_TAIL_SCALAR = "scalar"
+## tail elements are processed by a single call to the vector implementation
+#  on a partially filled vector, only valid lanes are stored
+ARRAY_TAIL_MASKED = "masked"
+
+ARRAY_TAIL_POLICY_LIST = [ARRAY_TAIL_SCALAR, ARRAY_TAIL_MASKED]
+
+
+## index/size format used inside the kernel
+ML_Index = ML_UInt64
+
+def build_index_cast():
+    return FunctionObject("index_cast", [ML_Size_t], ML_Index, FunctionOperator("(uint64_t)", arity = 1))
+
+def build_scalar_load(precision):
+    return FunctionObject("array_load", [ML_Pointer_Format(precision), ML_Index], precision, TemplateOperator("%s[%s]", arity = 2))
+
+def build_scalar_store(precision):
+    return FunctionObject("array_store", [ML_Pointer_Format(precision), ML_Index, precision], ML_Void, TemplateOperator("%s[%s] = %s", arity = 3, void_function = True))
+
+## vector load/store are performed through a cast of the element pointer
+#  to the vector format (vector formats are aligned as their elements)
+def build_vector_load(precision, vector_format):
+    template = "(*(const %s*)(%%s + %%s))" % vector_format.get_name()
+    return FunctionObject("array_vector_load", [ML_Pointer_Format(precision), ML_Index], vector_format, TemplateOperator(template, arity = 2))
+
+def build_vector_store(precision, vector_format):
+    template = "*(%s*)(%%s + %%s) = %%s" % vector_format.get_name()
+    return FunctionObject("array_vector_store", [ML_Pointer_Format(precision), ML_Index, vector_format], ML_Void, TemplateOperator(template, arity = 3, void_function = True))
+
+## number of elements to be processed before <in> is aligned on a
+#  <alignment> byte boundary (assuming <in> is aligned on an element boundary)
+def build_alignment_peel(precision, alignment):
+    template = "((uint64_t) ((0 - (uintptr_t) %%s) & %d) / sizeof(%s))" % (alignment - 1, precision.get_name())
+    return FunctionObject("array_alignment_peel", [ML_Pointer_Format(precision)], ML_Index, TemplateOperator(template, arity = 1))
+
+
+## build the array-mapping kernel of a function implementation
+#  @param name string name of the kernel
+#  @param precision ML_Format of array elements
+#  @param scalar_function FunctionObject of the scalar implementation
+#  @param vector_function FunctionObject of the vector implementation
+#         (None if the implementation is scalar)
+#  @param vector_size integer size of vector_function vectors
+#  @param unroll_factor integer number of (vector) calls per main loop iteration
+#  @param tail_policy ARRAY_TAIL_SCALAR or ARRAY_TAIL_MASKED
+#  @return CodeFunction object
+def generate_array_kernel(name, precision, scalar_function, vector_function = None, vector_size = 1, unroll_factor = 1, tail_policy = ARRAY_TAIL_SCALAR):
+    if not tail_policy in ARRAY_TAIL_POLICY_LIST:
+        Log.report(Log.Error, "unknown array kernel tail policy: %s" % tail_policy)
+    if unroll_factor < 1:
+        Log.report(Log.Error, "array kernel unroll factor must be positive, not %d" % unroll_factor)
+    vector_size = vector_size if vector_function != None else 1
+
+    kernel = CodeFunction(name, output_format = ML_Void)
+    vx = kernel.add_input_variable("in", ML_Pointer_Format(precision, const_data = True, restrict = True))
+    vy = kernel.add_input_variable("out", ML_Pointer_Format(precision, restrict = True))
+    vn = kernel.add_input_variable("n", ML_Size_t)
+
+    vi = Variable("i", precision = ML_Index, var_type = Variable.Local)
+    size = Variable("size", precision = ML_Index, var_type = Variable.Local)
+
+    scalar_load = build_scalar_load(precision)
+    scalar_store = build_scalar_store(precision)
+
+    def index_cst(value):
+        return Constant(value, precision = ML_Index)
+
+    ## i + <offset>
+    def index_add(offset):
+        return Addition(vi, index_cst(offset), precision = ML_Index)
+
+    ## every loop is built from new nodes: code generation memoization
+    #  must not share folded values between loop bodies
+    def scalar_step(offset = 0):
+        index = index_add(offset) if offset else vi
+        return scalar_store(vy, index, scalar_function(scalar_load(vx, index)))
+
+    def increment(step):
+        return ReferenceAssign(vi, index_add(step))
+
+    ## loop processing <step> elements per iteration while
+    #  the remaining element count allows it
+    def build_loop(body, step, bound = None):
+        if bound is None:
+            exit_condition = Comparison(index_add(step), size, specifier = Comparison.LessOrEqual)
+        else:
+            exit_condition = bound
+        return Loop(Statement(), exit_condition, Statement(body, increment(step)))
+
+    kernel_scheme = Statement(
+        ReferenceAssign(size, build_index_cast()(vn)),
+        ReferenceAssign(vi, index_cst(0)),
+    )
+
+    if vector_size == 1:
+        # scalar implementation
+        if unroll_factor > 1:
+            kernel_scheme.add(build_loop(Statement(*tuple(scalar_step(u) for u in xrange(unroll_factor))), unroll_factor))
+        kernel_scheme.add(build_loop(scalar_step(), 1, bound = Comparison(vi, size, specifier = Comparison.Less)))
+        kernel.set_scheme(kernel_scheme)
+        return kernel
+
+    vector_format = vector_function.get_precision()
+    vector_load = build_vector_load(precision, vector_format)
+    vector_store = build_vector_store(precision, vector_format)
+
+    def vector_step(offset = 0):
+        index = index_add(offset) if offset else vi
+        return vector_store(vy, index, vector_function(vector_load(vx, index)))
+
+    # alignment peeling
+    alignment = vector_size * precision.get_bit_size() / 8
+    peel = Variable("peel", precision = ML_Index, var_type = Variable.Local)
+    kernel_scheme.add(ReferenceAssign(peel, build_alignment_peel(precision, alignment)(vx)))
+    peel_bound = LogicalAnd(
+        Comparison(vi, peel, specifier = Comparison.Less),
+        Comparison(vi, size, specifier = Comparison.Less)
+    )
+    kernel_scheme.add(build_loop(scalar_step(), 1, bound = peel_bound))
+
+    # main vector body
+    if unroll_factor > 1:
+        kernel_scheme.add(build_loop(Statement(*tuple(vector_step(u * vector_size) for u in xrange(unroll_factor))), unroll_factor * vector_size))
+    kernel_scheme.add(build_loop(vector_step(), vector_size))
+
+    # tail
+    if tail_policy == ARRAY_TAIL_SCALAR:
+        kernel_scheme.add(build_loop(scalar_step(), 1, bound = Comparison(vi, size, specifier = Comparison.Less)))
+    else:
+        vec_x = Variable("vec_x", precision = vector_format, var_type = Variable.Local)
+        vec_r = Variable("vec_r", precision = vector_format, var_type = Variable.Local)
+        lane_load = Statement()
+        lane_store = Statement()
+        for k in xrange(vector_size):
+            # inactive lanes are filled with the first tail element
+            lane_load.add(ConditionBlock(
+                Comparison(index_add(k), size, specifier = Comparison.Less, likely = None),
+                ReferenceAssign(VectorElementSelection(vec_x, k, precision = precision), scalar_load(vx, index_add(k))),
+                ReferenceAssign(VectorElementSelection(vec_x, k, precision = precision), scalar_load(vx, vi))
+            ))
+            lane_store.add(ConditionBlock(
+                Comparison(index_add(k), size, specifier = Comparison.Less, likely = None),
+                scalar_store(vy, index_add(k), VectorElementSelection(vec_r, k, precision = precision))
+            ))
+        kernel_scheme.add(ConditionBlock(
+            Comparison(vi, size, specifier = Comparison.Less, likely = False),
+            Statement(
+                lane_load,
+                ReferenceAssign(vec_r, vector_function(vec_x)),
+                lane_store
+            )
+        ))
+
+    kernel.set_scheme(kernel_scheme)
+    return kernel
@@ -80,12 +80,32 @@ class Handle(object):
 
 
 ## Base class to store Node's attributes
+#
+#  Attributes records may be shared between nodes: records with default
+#  values (see get_default) and records of copied nodes (see get_copy)
+#  are marked shared and must not be modified in place, nodes duplicate
+#  them before any modification (copy-on-write, see
+#  AbstractOperation.get_mutable_attributes)
 class Attributes(object):
     """ Attribute management class for Metalibm's Operation """
+    __slots__ = (
+        "precision", "interval", "debug", "exact", "tag", "max_abs_error",
+        "silent", "handle", "clearprevious", "rounding_mode",
+        "rounding_mode_dependant", "prevent_optimization", "unbreakable",
+        "shared",
+    )
     default_precision     = [None]
     default_rounding_mode = [None]
     default_silent        = [None]
     str_del               = "| "
+    ## shared default records, indexed by the identity of their precision
+    #  (each record keeps its precision alive, so an index can not be
+    #  reused by another format while its record is stored)
+    default_record_map = {}
+    ## number of stored default records above which the map is flushed
+    #  (formats built on the fly, e.g. custom fixed-point formats, would
+    #  otherwise make it grow without bound)
+    default_record_limit = 1024
 
     def __init__(self, **init_map):
         self.precision  = attr_init(init_map, "precision", Attributes.default_precision[0])
@@ -95,13 +115,39 @@ class Attributes(object):
         self.tag        = attr_init(init_map, "tag")
         self.max_abs_error = attr_init(init_map, "max_abs_error")
         self.silent     = attr_init(init_map, "silent", Attributes.default_silent[0])
-        self.handle     = attr_init(init_map, "handle", Handle())
+        # node handle, created on demand (see AbstractOperation.get_handle)
+        self.handle     = attr_init(init_map, "handle")
         self.clearprevious = attr_init(init_map, "clearprevious")
         # rounding mode (if applicable) of the operation
         self.rounding_mode = attr_init(init_map, "rounding_mode", Attributes.default_rounding_mode[0])
         self.rounding_mode_dependant = None
         self.prevent_optimization = attr_init(init_map, "prevent_optimization")
         self.unbreakable  = attr_init(init_map, "unbreakable", False)
+        self.shared = False
+
+    ## @return Attributes record initialized from <init_map>, the shared
+    #          default record when <init_map> does not set any attribute
+    #          but the precision
+    @staticmethod
+    def get_record(**init_map):
+        for attr_name in init_map:
+            if attr_name != "precision" and attr_name in Attributes.__slots__:
+                return Attributes(**init_map)
+        return Attributes.get_default(init_map.get("precision", Attributes.default_precision[0]))
+
+    ## @return shared (read-only) record with default values and <precision>
+    @staticmethod
+    def get_default(precision):
+        rounding_mode = Attributes.default_rounding_mode[0]
+        silent = Attributes.default_silent[0]
+        default_record = Attributes.default_record_map.get(id(precision))
+        if default_record is None or default_record.precision is not precision or default_record.rounding_mode is not rounding_mode or default_record.silent is not silent:
+            if len(Attributes.default_record_map) >= Attributes.default_record_limit:
+                Attributes.default_record_map.clear()
+            default_record = Attributes(precision = precision, rounding_mode = rounding_mode, silent = silent)
+            default_record.shared = True
+            Attributes.default_record_map[id(precision)] = default_record
+        return default_record
 
 
     def get_str(self, tab_level = 0):
@@ -114,10 +160,38 @@ class Attributes(object):
         return tab_str + "%s D[%s] E[%s] RND=%s[%s]" % (self.interval, debug_str, self.exact, self.rounding_mode, self.rounding_mode_dependant)
 
 
+    ## @return exact (private) duplicate of the record
+    def get_private_copy(self):
+        new_record = Attributes.__new__(Attributes)
+        new_record.precision = self.precision
+        new_record.interval = self.interval
+        new_record.debug = self.debug
+        new_record.exact = self.exact
+        new_record.tag = self.tag
+        new_record.max_abs_error = self.max_abs_error
+        new_record.silent = self.silent
+        new_record.handle = self.handle
+        new_record.clearprevious = self.clearprevious
+        new_record.rounding_mode = self.rounding_mode
+        new_record.rounding_mode_dependant = self.rounding_mode_dependant
+        new_record.prevent_optimization = self.prevent_optimization
+        new_record.unbreakable = self.unbreakable
+        new_record.shared = False
+        return new_record
+
+    ## the record itself (marked shared) is returned when the copy would be
+    #  identical (unbreakable and rounding_mode_dependant are not copied)
     def get_copy(self):
+        if not self.unbreakable and self.rounding_mode_dependant is None:
+            self.shared = True
+            return self
         return Attributes(precision = self.precision, interval = self.interval, debug = self.debug, exact = self.exact, tag = self.tag, max_abs_error = self.max_abs_error, silent = self.silent, handle = self.handle, clearprevious = self.clearprevious, rounding_mode = self.rounding_mode, prevent_optimization = self.prevent_optimization)
 
+    ## copy without range and error information (see get_copy)
     def get_light_copy(self):
+        if not self.unbreakable and self.rounding_mode_dependant is None and self.interval is None and self.exact is None and self.max_abs_error is None:
+            self.shared = True
+            return self
         return Attributes(precision = self.precision, debug = self.debug, tag = self.tag, silent = self.silent, handle = self.handle, clearprevious = self.clearprevious, rounding_mode = self.rounding_mode, prevent_optimization = self.prevent_optimization)
 
     def set_attr(self, **init_map):
@@ -0,0 +1,159 @@
+# -*- coding: utf-8 -*-
+
+###############################################################################
+# This file is part of Kalray's Metalibm tool
+# Copyright (2016)
+# All rights reserved
+# created:          Oct 18th, 2016
+# last-modified:    Oct 18th, 2016
+#
+# author(s): Nicolas Brunie (nicolas.brunie@kalray.eu)
+###############################################################################
+
+# Reference value computation for auto-test generation
+#
+# Each test input is evaluated once (numeric_emulate), the (RD, RU) bounds
+# expected from a faithful implementation are both rounded directly from
+# this single evaluation (an intermediary rounding could collapse the
+# bounds of results very close to a floating-point number). Large batches are dispatched over a pool of
+# worker processes and batch results are stored in an on-disk cache.
+# Test vectors can also be dumped to a binary file loaded at run time by
+# the generated test program (see support_lib/ml_test_vectors.h).
+
+import os
+import hashlib
+import struct
+import multiprocessing
+
+import sollya
+
+from ..utility.log_report import Log
+from ..utility.cache_utils import DiskCache
+from ..utility.profiling import Profile
+from .polynomials import sollya_number_to_cache_str
+from .ml_formats import ML_Std_FP_Format
+
+## maximal size (in bytes) of the reference bound cache: a single entry
+#  (bounds of a full test set) can be several tens of MB, far beyond the
+#  default cache size limit
+REFERENCE_CACHE_MAX_SIZE = 1024 * 2**20
+
+## on-disk cache of reference bounds
+reference_cache = DiskCache("auto_test_reference", max_size = int(os.environ.get("ML_REFERENCE_CACHE_MAX_SIZE", REFERENCE_CACHE_MAX_SIZE)))
+
+## struct (little-endian) element format of binary test vectors, by format bit size
+TEST_VECTOR_PACK_FORMAT = {32: "f", 64: "d"}
+
+## minimal number of inputs for a batch to be evaluated by a process pool
+POOL_THRESHOLD = 4096
+
+## number of inputs transmitted at once to a worker process
+POOL_CHUNK_SIZE = 256
+
+## (emulate function, rounding format) of the batch
+#  being evaluated, inherited by worker processes when the pool is forked
+#  (bound methods and sollya objects can not be pickled)
+_reference_task = None
+
+
+def reference_number_to_str(value):
+    """ exact string encoding of a reference value (special values included) """
+    value_str = str(value)
+    if "infty" in value_str or "NaN" in value_str:
+        return value_str
+    return sollya_number_to_cache_str(value)
+
+## evaluate the (RD, RU) bounds of <emulate>(<input_value>)
+#  @param emulate function sollya number -> sollya object
+#  @param sollya_precision sollya format bounds are rounded to
+#  @return pair of sollya numbers (low bound, high bound)
+def evaluate_reference(emulate, input_value, sollya_precision):
+    reference = emulate(input_value)
+    return sollya.round(reference, sollya_precision, sollya.RD), sollya.round(reference, sollya_precision, sollya.RU)
+
+## worker process function: evaluate the bounds of a chunk of inputs
+#  @param input_str_list list of input values (encoded as strings)
+#  @return list of encoded (low, high) bound pairs
+def reference_worker(input_str_list):
+    emulate, sollya_precision = _reference_task
+    result = []
+    for input_str in input_str_list:
+        low, high = evaluate_reference(emulate, sollya.parse(input_str), sollya_precision)
+        result.append((reference_number_to_str(low), reference_number_to_str(high)))
+    return result
+
+def evaluate_reference_pool(input_str_list, process_num):
+    chunk_list = [input_str_list[i:i + POOL_CHUNK_SIZE] for i in xrange(0, len(input_str_list), POOL_CHUNK_SIZE)]
+    pool = multiprocessing.Pool(process_num)
+    try:
+        result_list = pool.map(reference_worker, chunk_list, chunksize = 1)
+    finally:
+        pool.close()
+        pool.join()
+    return [bounds for chunk_result in result_list for bounds in chunk_result]
+
+
+## compute the reference (low, high) bounds of <emulate> on every input of <input_list>
+#  @param emulate function sollya number -> sollya object (numeric_emulate)
+#  @param input_list list of sollya numbers
+#  @param precision ML_Format of the tested function results
+#  @param function_key string identifying the emulated function (cache key),
+#         None disables caching
+#  @param process_num number of worker processes (None: cpu count, 1: sequential)
+#  @return list of (low, high) sollya number pairs
+def get_reference_bounds(emulate, input_list, precision, function_key = None, process_num = None):
+    global _reference_task
+    if len(input_list) == 0:
+        return []
+    sollya_precision = precision.get_sollya_object()
+    input_str_list = [reference_number_to_str(input_value) for input_value in input_list]
+
+    cache_key = None
+    if function_key != None:
+        input_digest = hashlib.sha1("\n".join(input_str_list)).hexdigest()
+        cache_key = "|".join([function_key, str(precision), input_digest])
+        cache_value = reference_cache.get(cache_key)
+        if cache_value != None:
+            Profile.add_counter("reference_cache_hits")
+            return [tuple(sollya.parse(bound_str) for bound_str in entry.split(",")) for entry in cache_value.split(";")]
+
+    profile_token = Profile.start_phase("reference_evaluation")
+    Profile.add_counter("reference_evaluations", len(input_list))
+    bound_str_list = None
+    # daemonic processes (e.g. batch generation workers) can not have children
+    if process_num != 1 and len(input_list) >= POOL_THRESHOLD and not multiprocessing.current_process().daemon:
+        _reference_task = (emulate, sollya_precision)
+        try:
+            bound_str_list = evaluate_reference_pool(input_str_list, process_num)
+        except Exception as e:
+            Log.report(Log.Warning, "parallel reference evaluation failed (%s), falling back to sequential evaluation" % e)
+        finally:
+            _reference_task = None
+
+    if bound_str_list is None:
+        bound_list = [evaluate_reference(emulate, input_value, sollya_precision) for input_value in input_list]
+        bound_str_list = [(reference_number_to_str(low), reference_number_to_str(high)) for low, high in bound_list]
+    else:
+        bound_list = [(sollya.parse(low_str), sollya.parse(high_str)) for low_str, high_str in bound_str_list]
+    Profile.end_phase("reference_evaluation", profile_token)
+
+    if cache_key != None:
+        reference_cache.put(cache_key, ";".join("%s,%s" % bounds for bounds in bound_str_list))
+    return bound_list
+
+
+## dump test vectors to the binary file <filename>: the inputs followed by
+#  the (low, high) bound pairs, stored as raw little-endian <precision> values
+#  @param input_list list of sollya numbers
+#  @param bound_list list of (low, high) sollya number pairs
+def write_test_vector_file(filename, precision, input_list, bound_list):
+    if not isinstance(precision, ML_Std_FP_Format) or not precision.get_bit_size() in TEST_VECTOR_PACK_FORMAT:
+        Log.report(Log.Error, "binary test vectors are not supported for format %s" % precision)
+    pack_format = TEST_VECTOR_PACK_FORMAT[precision.get_bit_size()]
+    value_list = [float(value) for value in input_list]
+    for low, high in bound_list:
+        value_list.append(float(low))
+        value_list.append(float(high))
+    vector_stream = open(filename, "wb")
+    vector_stream.write(struct.pack("<%d%s" % (len(value_list), pack_format), *value_list))
+    vector_stream.close()
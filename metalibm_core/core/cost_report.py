@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+
+###############################################################################
+# This file is part of Kalray's Metalibm tool
+# Copyright (2016)
+# All rights reserved
+# created:          Oct 18th, 2016
+# last-modified:    Oct 18th, 2016
+#
+# author(s): Nicolas Brunie (nicolas.brunie@kalray.eu)
+###############################################################################
+
+# Static cost report of optimized schemes
+#
+# For each generated function, the report lists the operation counts by
+# class and format, the table loads (and the tables they access), the
+# estimated critical path latency and the estimated reciprocal throughput
+# (sum of the reciprocal throughputs of its operations, assuming a single
+# issue port) of the function fast path (see
+# OptimizationEngine.extract_fast_path). When no fast path can be extracted
+# (no condition of the scheme is marked likely or unlikely) the estimates
+# are computed on the whole scheme.
+# Operation costs are the per-target estimates of
+# GenericProcessor.get_operation_cost.
+
+import json
+
+from ..utility.log_report import Log
+from ..code_generation.code_constant import C_Code
+from ..code_generation.generic_processor import ZERO_COST_OPERATIONS
+from .ml_operations import ML_LeafNode, TableLoad
+
+
+## @return list of the distinct nodes of the DAG rooted at <optree>
+#          (extra inputs included)
+def get_node_list(optree):
+    node_list = []
+    visited = set()
+    node_stack = [optree]
+    while node_stack:
+        node = node_stack.pop()
+        if node is None or node in visited: continue
+        visited.add(node)
+        node_list.append(node)
+        if not isinstance(node, ML_LeafNode):
+            node_stack.extend(node.get_inputs())
+        node_stack.extend(node.get_extra_inputs())
+    return node_list
+
+
+class SchemeCostReport(object):
+    """ static operation mix / critical path estimation of optimized schemes """
+    def __init__(self, processor, opt_engine, language = C_Code):
+        self.processor = processor
+        self.opt_engine = opt_engine
+        self.language = language
+
+    ## @return (latency, reciprocal throughput) of the operation performed by <optree>
+    def get_operation_cost(self, optree):
+        return self.processor.get_operation_cost(optree, language = self.language)
+
+    ## @return estimated latency of the longest dependency chain of <optree>
+    def get_critical_path_latency(self, optree):
+        latency_map = {}
+        node_stack = [(optree, False)]
+        while node_stack:
+            node, expanded = node_stack.pop()
+            if node in latency_map: continue
+            input_list = [] if isinstance(node, ML_LeafNode) else [op for op in node.get_inputs() if not op is None]
+            if expanded:
+                latency_map[node] = self.get_operation_cost(node)[0] + max([latency_map.get(op, 0) for op in input_list] + [0])
+            else:
+                node_stack.append((node, True))
+                node_stack.extend((op, False) for op in input_list if not op in latency_map)
+        return latency_map[optree]
+
+    ## @return estimated reciprocal throughput of <optree>
+    def get_reciprocal_throughput(self, optree):
+        return sum(self.get_operation_cost(node)[1] for node in get_node_list(optree))
+
+    ## build the cost report of function <function_name> whose optimized
+    #  scheme is <scheme>
+    #  @return dict (json serializable)
+    def evaluate(self, function_name, scheme):
+        operation_count = {}
+        table_map = {}
+        table_load_count = 0
+        for node in get_node_list(scheme):
+            if isinstance(node, ZERO_COST_OPERATIONS): continue
+            class_count = operation_count.setdefault(node.__class__.__name__, {})
+            format_name = str(node.get_precision())
+            class_count[format_name] = class_count.get(format_name, 0) + 1
+            if isinstance(node, TableLoad):
+                table_load_count += 1
+                table = node.get_input(0)
+                if not table in table_map:
+                    storage_precision = table.get_storage_precision()
+                    table_map[table] = {
+                        "table": table.get_tag() or "table_%d" % len(table_map),
+                        "dimensions": table.dimensions,
+                        "storage_precision": str(storage_precision),
+                        "byte_size": reduce(lambda acc, dim: acc * dim, table.dimensions, storage_precision.get_bit_size() / 8),
+                        "loads": 0,
+                    }
+                table_map[table]["loads"] += 1
+
+        fast_path = self.opt_engine.extract_fast_path(scheme)
+        if fast_path is None:
+            Log.report(Log.Verbose, "no fast path in %s, cost estimated on the whole scheme" % function_name)
+        cost_root = scheme if fast_path is None else fast_path
+        return {
+            "function": function_name,
+            "operation_count": operation_count,
+            "operation_total": sum(sum(class_count.values()) for class_count in operation_count.values()),
+            "table_load_count": table_load_count,
+            "tables": sorted(table_map.values(), key = lambda desc: desc["table"]),
+            "fast_path": not fast_path is None,
+            "critical_path_latency": self.get_critical_path_latency(cost_root),
+            "reciprocal_throughput": self.get_reciprocal_throughput(cost_root),
+        }
+
+    ## @return one-line summary of <report> (built by evaluate)
+    @staticmethod
+    def get_summary(report):
+        return "%s: %d operation(s), %d table load(s), %s latency=%s, reciprocal throughput=%s" % (
+            report["function"], report["operation_total"], report["table_load_count"],
+            "fast path" if report["fast_path"] else "whole scheme",
+            report["critical_path_latency"], report["reciprocal_throughput"]
+        )
+
+
+## dump the reports of <report_list> in JSON format to <report_filename>
+def dump_cost_report(report_filename, report_list, **header):
+    report = dict(header)
+    report["functions"] = report_list
+    report_stream = open(report_filename, "w")
+    json.dump(report, report_stream, indent = 2, sort_keys = True)
+    report_stream.close()
@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+
+###############################################################################
+# This file is part of Kalray's Metalibm tool
+# Copyright (2016)
+# All rights reserved
+# created:          Oct 18th, 2016
+# last-modified:    Oct 18th, 2016
+#
+# author(s): Nicolas Brunie (nicolas.brunie@kalray.eu)
+###############################################################################
+
+# Iterative (worklist based) traversal of operation DAGs: large schemes
+# (unrolled loops, replicated vector schemes, high degree polynomials)
+# can be processed without hitting python's recursion limit
+
+from .ml_operations import ML_LeafNode
+
+
+## default children of a DAG node: inputs (non-leaf nodes) followed by extra inputs
+def get_node_children(optree):
+    if isinstance(optree, ML_LeafNode):
+        return list(optree.get_extra_inputs())
+    return list(optree.get_inputs()) + list(optree.get_extra_inputs())
+
+
+## apply <process> to every node of the DAG rooted at <optree>, each node
+#  being processed once, after all its children (post-order, children are
+#  processed from left to right)
+#  @param optree root of the DAG
+#  @param get_children function node -> list of children to be processed before node
+#  @param process function node -> result, result is stored in memoization_map
+#  @param memoization_map dict node -> result, nodes already in the map are
+#         not processed (and their children not visited)
+#  @return result associated with <optree>
+def postorder_apply(optree, get_children, process, memoization_map = None):
+    memoization_map = {} if memoization_map is None else memoization_map
+    node_stack = [(optree, False)]
+    while node_stack:
+        node, children_done = node_stack.pop()
+        if node in memoization_map:
+            continue
+        if children_done:
+            memoization_map[node] = process(node)
+        else:
+            node_stack.append((node, True))
+            for child in reversed(get_children(node)):
+                if not child in memoization_map:
+                    node_stack.append((child, False))
+    return memoization_map[optree]
+
+
+## list the nodes of the DAG rooted at <optree> in topological order
+#  (every node appears after all of its children)
+def topological_order(optree, get_children = get_node_children):
+    node_list = []
+    def register_node(node):
+        node_list.append(node)
+        return node
+    postorder_apply(optree, get_children, register_node)
+    return node_list
+
+
+## apply <process> to every node reachable from <optree> in pre-order
+#  (a node is processed before its children), with a context value
+#  propagated from parent to children
+#  @param process function (node, context) -> list of (child, child_context)
+#         to be visited after node (in order)
+#  @param context context value associated with the root
+def preorder_walk(optree, process, context = None):
+    node_stack = [(optree, context)]
+    while node_stack:
+        node, node_context = node_stack.pop()
+        child_list = process(node, node_context)
+        node_stack.extend(child_list[::-1])
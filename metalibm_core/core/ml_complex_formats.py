@@ -40,11 +40,16 @@ class ML_Complex_Format(ML_FP_Format):
 
 class ML_Pointer_Format(ML_Format):
   """ wrapper for address/pointer format """
-  def __init__(self, data_precision):
+  ## @param data_precision format of the pointed data
+  #  @param const_data boolean flag, pointed data are read-only
+  #  @param restrict boolean flag, C99 restrict qualified pointer
+  def __init__(self, data_precision, const_data = False, restrict = False):
     self.data_precision = data_precision
+    self.const_data = const_data
+    self.restrict = restrict
 
   def get_name(self, language = C_Code):
-    return "%s*" % self.get_data_precision().get_name(language)
+    return "%s%s*%s" % ("const " if self.const_data else "", self.get_data_precision().get_name(language), " restrict" if self.restrict else "")
 
   def get_data_precision(self):
     return self.data_precision
@@ -66,3 +71,6 @@ ML_Binary64_p = ML_Pointer_Format(ML_Binary64)
 
 ML_Int32_p    = ML_Pointer_Format(ML_Int32)
 ML_Int64_p    = ML_Pointer_Format(ML_Int64)
+
+# object size format (C size_t)
+ML_Size_t = ML_FormatConstructor(64, "size_t", "%zu", lambda v: None)
@@ -18,7 +18,7 @@ from metalibm_core.core.ml_operations import *
 from metalibm_core.core.ml_table import ML_Table
 from metalibm_core.core.ml_complex_formats import ML_Mpfr_t
 from metalibm_core.core.ml_call_externalizer import CallExternalizer
-from metalibm_core.core.ml_vectorizer import StaticVectorizer
+from metalibm_core.core.ml_vectorizer import StaticVectorizer, VECTOR_FALLBACK_LIST, VECTOR_FALLBACK_SCALAR_LOOP, VECTOR_FALLBACK_BLEND
 
 from metalibm_core.code_generation.code_object import NestedCode
 from metalibm_core.code_generation.code_function import CodeFunction
@@ -32,8 +32,19 @@ from metalibm_core.code_generation.gappa_code_generator import GappaCodeGenerato
 
 from metalibm_core.utility.log_report import Log
 from metalibm_core.utility.debug_utils import *
-from metalibm_core.utility.ml_template import ArgDefault
-
+from metalibm_core.utility.ml_template import ArgDefault, target_map
+from metalibm_core.utility.profiling import Profile
+from metalibm_core.utility.gappa_utils import is_gappa_installed, execute_gappa_script_list_extract
+from metalibm_core.core.passes import get_node_count
+from metalibm_core.core.auto_test_reference import get_reference_bounds, write_test_vector_file
+from metalibm_core.core.array_kernel import generate_array_kernel, build_vector_load, ARRAY_TAIL_SCALAR
+from metalibm_core.core.multi_target import get_variant_function_name, get_variant_output_file, generate_dispatcher, DISPATCH_IFUNC, DISPATCH_LIST
+from metalibm_core.core.polynomial_scheme_selector import PolynomialSchemeSelector, POLYNOMIAL_SCHEME_MAP, REFERENCE_POLYNOMIAL_SCHEME, POLYNOMIAL_METRIC_LATENCY, POLYNOMIAL_METRIC_THROUGHPUT
+from metalibm_core.core.cost_report import SchemeCostReport, dump_cost_report
+from metalibm_core.core.vector_abi import get_vector_abi_implementation_name, generate_vector_abi_wrapper, generate_vector_abi_header
+
+import os
+import copy
 import random
 import subprocess
 
@@ -83,14 +94,34 @@ class DefaultArgTemplate:
   target = GenericProcessor()
   fuse_fma = True
   fast_path_extract = True
+  if_conversion = True
   # Debug verbosity
   debug = False
   vector_size = 1
+  vector_fallback = VECTOR_FALLBACK_SCALAR_LOOP
+  vector_abi = False
+  multi_target = None
+  dispatch = DISPATCH_IFUNC
+  polynomial_scheme = "auto"
   language = C_Code
   auto_test = False
   auto_test_execute = False
   auto_test_range = None
   auto_test_std   = False
+  auto_test_seed  = None
+  auto_test_jobs  = None
+  auto_test_vector_file = None
+  array_kernel = False
+  array_unroll = 1
+  array_tail = ARRAY_TAIL_SCALAR
+  auto_bench = False
+  auto_bench_execute = False
+  bench_repeat = 100
+  bench_libm = None
+  pass_list = None
+  pass_trace = None
+  profile = None
+  cost_report = None
 
 ## Base class for all metalibm function (metafunction)
 class ML_FunctionBasis(object):
@@ -123,6 +154,7 @@ class ML_FunctionBasis(object):
              # Debug verbosity
              debug_flag = ArgDefault(False, 2),
              vector_size = ArgDefault(1, 2),
+             vector_fallback = ArgDefault(VECTOR_FALLBACK_SCALAR_LOOP, 2),
              language = ArgDefault(C_Code, 2),
              auto_test = ArgDefault(False, 2),
              auto_test_range = ArgDefault(Interval(-1, 1), 2),
@@ -164,6 +196,25 @@ class ML_FunctionBasis(object):
     self.auto_test_execute = ArgDefault.select_value([arg_template.auto_test_execute])
     self.auto_test_range = ArgDefault.select_value([arg_template.auto_test_range, auto_test_range])
     self.auto_test_std   = auto_test_std 
+    ## seed of the random test input generator (None for unseeded generation)
+    self.auto_test_seed  = ArgDefault.select_value([arg_template.auto_test_seed])
+    ## number of processes used to evaluate test references (None: cpu count)
+    self.auto_test_jobs  = ArgDefault.select_value([arg_template.auto_test_jobs])
+    ## binary file test vectors are stored in (None to embed them in the test source)
+    self.auto_test_vector_file = ArgDefault.select_value([arg_template.auto_test_vector_file])
+    ## enable the generation of the array-mapping kernel <function_name>_array
+    self.array_kernel = ArgDefault.select_value([arg_template.array_kernel])
+    self.array_unroll = ArgDefault.select_value([arg_template.array_unroll])
+    self.array_tail   = ArgDefault.select_value([arg_template.array_tail])
+    ## enable the generation of a performance benchmark (number of inputs)
+    self.auto_bench = ArgDefault.select_value([arg_template.auto_bench, arg_template.auto_bench_execute])
+    self.auto_bench_execute = ArgDefault.select_value([arg_template.auto_bench_execute])
+    self.bench_repeat = ArgDefault.select_value([arg_template.bench_repeat])
+    ## name of the libm function the implementation is compared to
+    #  (default derived from base_name, "none" to disable comparison)
+    self.bench_libm = ArgDefault.select_value([arg_template.bench_libm])
+    if self.bench_libm is None:
+      self.bench_libm = base_name + {ML_Binary32: "f", ML_Binary64: ""}.get(self.get_output_precision(), "")
 
     self.language = language
 
@@ -173,10 +224,31 @@ class ML_FunctionBasis(object):
     self.function_name = function_name if function_name else libc_naming(base_name, self.io_precisions)
 
     self.output_file = output_file if output_file else self.function_name + ".c"
+    if self.auto_test_vector_file is True:
+      self.auto_test_vector_file = os.path.splitext(self.output_file)[0] + ".test_vectors.bin"
 
     self.debug_flag = debug_flag
 
     self.vector_size = vector_size
+    ## evaluation strategy of the lanes failing the vector fast path
+    #  (VECTOR_FALLBACK_SCALAR_LOOP or VECTOR_FALLBACK_BLEND)
+    self.vector_fallback = ArgDefault.select_value([arg_template.vector_fallback, vector_fallback])
+    if not self.vector_fallback in VECTOR_FALLBACK_LIST:
+      Log.report(Log.Error, "unknown vector fallback strategy: %s" % self.vector_fallback)
+    ## export the vector implementation under its x86_64 vector ABI name,
+    #  <function_name> is then the scalar entry point
+    self.vector_abi = ArgDefault.select_value([arg_template.vector_abi])
+    if self.vector_abi and self.vector_size == 1:
+      Log.report(Log.Warning, "vector ABI requires a vector implementation (--vector-size), ignored")
+      self.vector_abi = False
+    ## list of target names the function is generated for, with a runtime
+    #  dispatcher (None for single target generation)
+    self.multi_target = ArgDefault.select_value([arg_template.multi_target])
+    self.dispatch = ArgDefault.select_value([arg_template.dispatch])
+    if not self.dispatch in DISPATCH_LIST:
+      Log.report(Log.Error, "unknown dispatch method: %s" % self.dispatch)
+    ## kept to instantiate the variants of multi-target generation
+    self.arg_template = arg_template
 
     # TODO: FIX which i/o precision to select
     # TODO: incompatible with fixed-point formats
@@ -190,9 +262,31 @@ class ML_FunctionBasis(object):
 
     self.fuse_fma = fuse_fma
     self.fast_path_extract = fast_path_extract
-
-    self.implementation = CodeFunction(self.function_name, output_format = self.get_output_precision())
+    ## enable the conversion of side-effect free branches into selections
+    self.if_conversion = ArgDefault.select_value([arg_template.if_conversion])
+    ## polynomial evaluation scheme used by generate_polynomial_scheme
+    #  ("auto" for cost-model-driven selection, or a POLYNOMIAL_SCHEME_MAP key)
+    self.polynomial_scheme = ArgDefault.select_value([arg_template.polynomial_scheme])
+    if self.polynomial_scheme != "auto" and not self.polynomial_scheme in POLYNOMIAL_SCHEME_MAP:
+      Log.report(Log.Error, "unknown polynomial scheme: %s" % self.polynomial_scheme)
+
+    implementation_name = get_vector_abi_implementation_name(self.function_name, self.vector_size) if self.vector_abi else self.function_name
+    self.implementation = CodeFunction(implementation_name, output_format = self.get_output_precision())
     self.opt_engine = OptimizationEngine(self.processor)
+    self.opt_engine.set_pass_list(ArgDefault.select_value([arg_template.pass_list]))
+    ## name of the file where optimization pass statistics are dumped (None to disable)
+    self.pass_trace = ArgDefault.select_value([arg_template.pass_trace])
+    ## name of the file where the generation profiling report is dumped (None to disable)
+    self.profile = ArgDefault.select_value([arg_template.profile])
+    if self.profile is True:
+      self.profile = "%s.profile.json" % self.function_name
+    # node counts are only measured when pass statistics are reported
+    self.opt_engine.set_pass_node_count(bool(self.pass_trace or self.profile))
+    ## name of the file where the static cost report of the optimized
+    #  schemes is dumped (None to disable)
+    self.cost_report = ArgDefault.select_value([arg_template.cost_report])
+    if self.cost_report is True:
+      self.cost_report = "%s.cost.json" % self.function_name
     self.gappa_engine = GappaCodeGenerator(self.processor, declare_cst = True, disable_debug = True)
 
     self.C_code_generator = CCodeGenerator(self.processor, declare_cst = False, disable_debug = not self.debug_flag, libm_compliant = self.libm_compliant, language = self.language)
@@ -204,14 +298,9 @@ class ML_FunctionBasis(object):
   def get_vector_size(self):
     return self.vector_size
 
-  ## compute the evaluation error of an ML_Operation node
-  #  @param optree ML_Operation object whose evaluation error is computed
-  #  @param variable_copy_map dict(optree -> optree) used to delimit the bound of optree
-  #  @param goal_precision ML_Format object, precision used for evaluation goal
-  #  @param gappa_filename string, name of the file where the gappa proof of the evaluation error will be dumped
-  #  @return numerical value of the evaluation error
-  def get_eval_error(self, optree, variable_copy_map = {}, goal_precision = ML_Exact, gappa_filename = "gappa_eval_error.g", relative_error = False):
-    """ wrapper for GappaCodeGenerator get_eval_error_v2 function """
+  ## optimize a copy of <optree> for evaluation error computation
+  #  @return pair (optimized scheme, variable copy map of the optimized scheme)
+  def optimise_eval_error_scheme(self, optree, variable_copy_map):
     copy_map = {}
     for leaf in variable_copy_map: 
       copy_map[leaf] = variable_copy_map[leaf]
@@ -219,7 +308,57 @@ class ML_FunctionBasis(object):
     new_variable_copy_map = {}
     for leaf in variable_copy_map:
       new_variable_copy_map[leaf.get_handle().get_node()] = variable_copy_map[leaf]
-    return self.gappa_engine.get_eval_error_v2(self.opt_engine, opt_optree, new_variable_copy_map if variable_copy_map != None else {}, goal_precision, gappa_filename, relative_error = relative_error)
+    return opt_optree, new_variable_copy_map
+
+  ## compute the evaluation error of an ML_Operation node
+  #  @param optree ML_Operation object whose evaluation error is computed
+  #  @param variable_copy_map dict(optree -> optree) used to delimit the bound of optree
+  #  @param goal_precision ML_Format object, precision used for evaluation goal
+  #  @param gappa_filename string, name of the file where the gappa proof of the evaluation error will be dumped (None for no dump)
+  #  @return numerical value of the evaluation error
+  def get_eval_error(self, optree, variable_copy_map = None, goal_precision = ML_Exact, gappa_filename = "gappa_eval_error.g", relative_error = False):
+    """ wrapper for GappaCodeGenerator get_eval_error_v2 function """
+    variable_copy_map = {} if variable_copy_map is None else variable_copy_map
+    opt_optree, new_variable_copy_map = self.optimise_eval_error_scheme(optree, variable_copy_map)
+    return self.gappa_engine.get_eval_error_v2(self.opt_engine, opt_optree, new_variable_copy_map, goal_precision, gappa_filename, relative_error = relative_error)
+
+  ## batched version of get_eval_error, the gappa scripts of every
+  #  request are evaluated concurrently (see execute_gappa_script_list_extract)
+  #  @param request_list list of (optree, variable_copy_map) pairs
+  #  @return list of evaluation error intervals (one per request)
+  def get_eval_error_list(self, request_list, goal_precision = ML_Exact, relative_error = False):
+    gappa_code_list = []
+    for optree, variable_copy_map in request_list:
+      opt_optree, new_variable_copy_map = self.optimise_eval_error_scheme(optree, variable_copy_map)
+      gappa_code_list.append(self.gappa_engine.get_eval_error_code_v2(self.opt_engine, opt_optree, new_variable_copy_map, goal_precision, relative_error = relative_error))
+    return [result["goal"] for result in execute_gappa_script_list_extract(gappa_code_list)]
+
+  ## generate the evaluation scheme of a polynomial, selected by
+  #  PolynomialSchemeSelector (lowest latency, or reciprocal throughput for
+  #  vector implementations) unless forced by <polynomial_scheme>
+  #  @param polynomial_object Polynomial object to be evaluated
+  #  @param variable ML_Operation polynomial variable
+  #  @param unified_precision ML_Format of the polynomial operations
+  #  @param variable_interval Interval of <variable>, enables the Gappa check
+  #         of candidate evaluation errors
+  #  @return ML_Operation evaluation scheme
+  #  When the evaluation error of the candidates can not be checked
+  #  (no <variable_interval> or gappa not installed), the reference
+  #  (Horner) scheme is used
+  def generate_polynomial_scheme(self, polynomial_object, variable, unified_precision, variable_interval = None, power_map = None):
+    if self.polynomial_scheme != "auto":
+      return POLYNOMIAL_SCHEME_MAP[self.polynomial_scheme](polynomial_object, variable, unified_precision, power_map)
+    if variable_interval is None:
+      Log.report(Log.Warning, "no interval for polynomial variable %s, falling back to %s scheme" % (variable.get_tag(), REFERENCE_POLYNOMIAL_SCHEME))
+      return POLYNOMIAL_SCHEME_MAP[REFERENCE_POLYNOMIAL_SCHEME](polynomial_object, variable, unified_precision, power_map)
+    if not is_gappa_installed():
+      Log.report(Log.Warning, "gappa is not installed in this environnement, falling back to %s polynomial scheme" % REFERENCE_POLYNOMIAL_SCHEME)
+      return POLYNOMIAL_SCHEME_MAP[REFERENCE_POLYNOMIAL_SCHEME](polynomial_object, variable, unified_precision, power_map)
+    bound_variable = Variable("poly_var", precision = unified_precision, interval = variable_interval)
+    error_function = lambda scheme: sup(abs(self.get_eval_error(scheme, {variable: bound_variable})))
+    metric = POLYNOMIAL_METRIC_LATENCY if self.get_vector_size() == 1 else POLYNOMIAL_METRIC_THROUGHPUT
+    selector = PolynomialSchemeSelector(self.processor, fuse_fma = self.fuse_fma, metric = metric)
+    return selector.select(polynomial_object, variable, unified_precision, error_function = error_function, power_map = power_map)
 
   ## name generation
   #  @param base_name string, name to be extended for unifiquation
@@ -268,7 +407,9 @@ class ML_FunctionBasis(object):
   ## 
   # @return main_scheme, [list of sub-CodeFunction object]
   def generate_function_list(self):
+    profile_token = Profile.start_phase("generate_scheme")
     self.implementation.set_scheme(self.generate_scheme())
+    Profile.end_phase("generate_scheme", profile_token)
     return [self.implementation]
 
   ## submit operation node to a standard optimization procedure
@@ -276,33 +417,19 @@ class ML_FunctionBasis(object):
   #  @param copy  dict(optree -> optree) copy map to be used while duplicating pre_scheme (if None disable copy)
   #  @param enable_subexpr_sharing boolean flag, enables sub-expression sharing optimization
   #  @param verbose boolean flag, enable verbose mode
+  #  @param pass_list custom list of pass names (None for default pipeline)
   #  @return optimizated scheme 
-  def optimise_scheme(self, pre_scheme, copy = None, enable_subexpr_sharing = True, verbose = True):
+  def optimise_scheme(self, pre_scheme, copy = None, enable_subexpr_sharing = True, verbose = True, pass_list = None):
     """ default scheme optimization """
     # copying when required
     scheme = pre_scheme if copy is None else pre_scheme.copy(copy)
-    # fusing FMA
-    if self.fuse_fma:
-      if verbose: print "MDL fusing FMA"
-      scheme = self.opt_engine.fuse_multiply_add(scheme, silence = True)
-
-    if verbose: print "MDL abstract scheme"
-    self.opt_engine.instantiate_abstract_precision(scheme, None)
-
-    if verbose: print "MDL instantiated scheme"
-    self.opt_engine.instantiate_precision(scheme, default_precision = None)
-
-    if enable_subexpr_sharing:
-      if verbose: print "subexpression sharing"
-      self.opt_engine.subexpression_sharing(scheme)
+    if pass_list is None:
+      pass_list = ["constant_folding"] + (["fuse_fma"] if self.fuse_fma else []) + ["instantiate_abstract_precision", "instantiate_precision"]
+      pass_list += ["if_conversion"] if self.if_conversion else []
+      pass_list += ["structural_sharing", "subexpression_sharing"] if enable_subexpr_sharing else []
+      pass_list += ["silence_fp_operations", "check_processor_support"]
 
-    if verbose: print "silencing operation"
-    self.opt_engine.silence_fp_operations(scheme)
-
-    if verbose: print "checking processor support"
-    self.opt_engine.check_processor_support(scheme)
-
-    return scheme
+    return self.opt_engine.execute_pass_list(scheme, pass_list, verbose = verbose, default_precision = None, silence = True, vector_size = self.get_vector_size())
 
 
   ## 
@@ -336,11 +463,33 @@ class ML_FunctionBasis(object):
     self.result.add_header("inttypes.h")
 
     Log.report(Log.Info, "Generating C code in " + self.output_file)
+    profile_token = Profile.start_phase("code_emission")
+    output_code = self.result.get(self.C_code_generator)
+    Profile.end_phase("code_emission", profile_token)
+    Profile.add_counter("emitted_lines", output_code.count("\n"))
     output_stream = open(self.output_file, "w")
-    output_stream.write(self.result.get(self.C_code_generator))
+    output_stream.write(output_code)
     output_stream.close()
 
   def gen_implementation(self, display_after_gen = False, display_after_opt = False, enable_subexpr_sharing = True):
+    if self.multi_target:
+      return self.gen_multi_target_implementation(display_after_gen = display_after_gen, display_after_opt = display_after_opt, enable_subexpr_sharing = enable_subexpr_sharing)
+    # the profiler state is global: it must not leak to the next
+    # generation (e.g. batch mode) whatever the outcome of this one
+    if self.profile:
+      # counters of previous generations (e.g. other multi-target
+      # variants) are discarded
+      Profile.reset()
+      Profile.enable()
+    try:
+      self.gen_target_implementation(display_after_gen = display_after_gen, display_after_opt = display_after_opt, enable_subexpr_sharing = enable_subexpr_sharing)
+    finally:
+      Profile.disable()
+
+  ## generate the function implementation for the selected target
+  def gen_target_implementation(self, display_after_gen = False, display_after_opt = False, enable_subexpr_sharing = True):
+    Profile.reset()
+    generation_token = Profile.start_phase("gen_implementation")
     # generate scheme
     if self.get_vector_size() == 1:
       # scalar implementation
@@ -352,12 +501,28 @@ class ML_FunctionBasis(object):
       scalar_arg_list = self.implementation.get_arg_list()
       self.implementation.clear_arg_list()
 
+      profile_token = Profile.start_phase("vector_implementation")
       code_function_list = self.generate_vector_implementation(scalar_scheme, scalar_arg_list, self.get_vector_size())
+      Profile.end_phase("vector_implementation", profile_token)
+
+    if self.array_kernel:
+      code_function_list.append(self.generate_array_kernel(code_function_list))
+    # auto-test and auto-bench functions are excluded from the cost report
+    reported_function_list = list(code_function_list)
 
     if self.auto_test_enable:
+      profile_token = Profile.start_phase("auto_test")
       code_function_list += self.generate_auto_test(test_num = self.auto_test_number if self.auto_test_number else 0, test_range = self.auto_test_range)
+      Profile.end_phase("auto_test", profile_token)
+
+    if self.auto_bench:
+      if self.auto_test_enable:
+        Log.report(Log.Error, "auto-test and auto-bench can not be generated together (both define main)")
+      code_function_list += self.generate_auto_bench(code_function_list, bench_num = self.auto_bench, bench_repeat = self.bench_repeat, bench_range = self.auto_test_range)
       
 
+    cost_report_list = []
+    cost_estimator = SchemeCostReport(self.processor, self.opt_engine, language = self.language)
     for code_function in code_function_list:
       scheme = code_function.get_scheme()
       if display_after_gen:
@@ -365,7 +530,15 @@ class ML_FunctionBasis(object):
         print scheme.get_str(depth = None, display_precision = True, memoization_map = {})
 
       # optimize scheme
-      opt_scheme = self.optimise_scheme(scheme, enable_subexpr_sharing = enable_subexpr_sharing)
+      profile_token = Profile.start_phase("optimization")
+      # custom pipeline (--pass-list) only overrides the top-level optimization
+      opt_scheme = self.optimise_scheme(scheme, enable_subexpr_sharing = enable_subexpr_sharing, pass_list = self.opt_engine.get_pass_list())
+      Profile.end_phase("optimization", profile_token)
+      if Profile.enabled:
+        Profile.add_counter("ir_nodes", get_node_count(opt_scheme))
+      if self.cost_report and code_function in reported_function_list:
+        cost_report_list.append(cost_estimator.evaluate(code_function.get_name(), opt_scheme))
+        Log.report(Log.Info, "cost estimate of %s" % SchemeCostReport.get_summary(cost_report_list[-1]))
 
       if display_after_opt:
         print "function %s, after opt " % code_function.get_name()
@@ -373,9 +546,25 @@ class ML_FunctionBasis(object):
 
     # generate C code to implement scheme
     self.generate_code(code_function_list, language = self.language)
+    if self.vector_abi:
+      self.generate_vector_abi_header()
+
+    if self.cost_report:
+      Log.report(Log.Info, "dumping static cost report in %s" % self.cost_report)
+      dump_cost_report(self.cost_report, cost_report_list, function_name = self.function_name, target = self.processor.__class__.__name__, vector_size = self.vector_size)
+
+    if self.pass_trace:
+      Log.report(Log.Info, "dumping optimization pass trace in %s" % self.pass_trace)
+      self.opt_engine.dump_pass_trace(self.pass_trace)
+
+    Profile.end_phase("gen_implementation", generation_token)
+    if self.profile:
+      Log.report(Log.Info, "dumping generation profile in %s" % self.profile)
+      Profile.set_section("passes", self.opt_engine.get_pass_statistics())
+      Profile.dump(self.profile, function_name = self.function_name, target = self.processor.__class__.__name__, vector_size = self.vector_size)
 
     if self.auto_test_enable:
-      compiler = self.processor.get_compiler()
+      compiler = " ".join([self.processor.get_compiler()] + self.processor.get_compilation_options())
       test_file = "./test_%s.bin" % self.function_name
       test_command =  "%s -O2 -DML_DEBUG -I $ML_SRC_DIR/metalibm_core $ML_SRC_DIR/metalibm_core/support_lib/ml_libm_compatibility.c %s -o %s -lm " % (compiler, self.output_file, test_file) 
       test_command += " && %s " % self.processor.get_execution_command(test_file)
@@ -392,7 +581,94 @@ class ML_FunctionBasis(object):
         print "VALIDATION %s command line:" % self.get_name()
         print test_command
 
+    if self.auto_bench:
+      compiler = " ".join([self.processor.get_compiler()] + self.processor.get_compilation_options())
+      bench_file = "./bench_%s.bin" % self.function_name
+      bench_report = "%s.bench.json" % self.function_name
+      bench_command = "%s -O2 -I $ML_SRC_DIR/metalibm_core $ML_SRC_DIR/metalibm_core/support_lib/ml_libm_compatibility.c %s -o %s -lm " % (compiler, self.output_file, bench_file) 
+      bench_command += " && %s > %s" % (self.processor.get_execution_command(bench_file), bench_report)
+      if self.auto_bench_execute:
+        print "BENCHMARK %s " % self.get_name()
+        print bench_command
+        bench_result = subprocess.call(bench_command, shell = True)
+        if not bench_result:
+          print "BENCHMARK SUCCESS, results in %s" % bench_report
+        else:
+          print "BENCHMARK FAILURE"
+          sys.exit(1)
+      else:
+        print "BENCHMARK %s command line:" % self.get_name()
+        print bench_command
+
+
+
+  ## generate the function for each target of <multi_target> (variants
+  #  <function_name>_<target> in <output_file>_<target>) and the runtime
+  #  dispatcher <function_name> in <output_file>
+  #  variants are generated without auto-test, auto-bench (which define
+  #  main) nor vector ABI wrappers
+  def gen_multi_target_implementation(self, **kwords):
+    variant_list = []
+    for target_name in self.multi_target:
+      if not target_name in target_map:
+        Log.report(Log.Error, "unknown target in multi-target list: %s" % target_name)
+      variant_args = copy.copy(self.arg_template)
+      variant_args.multi_target = None
+      variant_args.target = target_map[target_name]()
+      variant_args.function_name = get_variant_function_name(self.function_name, target_name)
+      variant_args.output_file = get_variant_output_file(self.output_file, target_name)
+      variant_args.auto_test = variant_args.auto_test_execute = variant_args.auto_test_std = False
+      variant_args.auto_bench = variant_args.auto_bench_execute = False
+      variant_args.vector_abi = False
+      # each variant dumps its own cost report (<variant function name>.cost.json),
+      # pass trace and profile (<file>_<target>.<ext>)
+      variant_args.cost_report = True if self.cost_report else None
+      variant_args.pass_trace = get_variant_output_file(self.pass_trace, target_name) if self.pass_trace else None
+      variant_args.profile = get_variant_output_file(self.profile, target_name) if self.profile else None
+      Log.report(Log.Info, "generating %s variant for target %s" % (variant_args.function_name, target_name))
+      variant = self.__class__(variant_args)
+      variant.gen_implementation(**kwords)
+      variant_list.append((variant, target_name))
+
+    header_list = ["stdint.h"] + (["support_lib/ml_vector_format.h"] if self.get_vector_size() > 1 else [])
+    dispatcher_code = generate_dispatcher(self.function_name, [(variant.processor, variant.implementation) for variant, _ in variant_list], dispatch = self.dispatch, header_list = header_list)
+    Log.report(Log.Info, "Generating %s dispatcher in %s" % (self.dispatch, self.output_file))
+    output_stream = open(self.output_file, "w")
+    output_stream.write(dispatcher_code)
+    output_stream.close()
 
+    library_file = "lib%s.so" % self.function_name
+    build_command = " && ".join(
+      "%s -O2 -fPIC -I $ML_SRC_DIR/metalibm_core -c %s -o %s.o" % (
+        " ".join([variant.processor.get_compiler()] + variant.processor.get_compilation_options()),
+        variant.output_file, os.path.splitext(variant.output_file)[0]
+      ) for variant, _ in variant_list
+    )
+    object_list = [os.path.splitext(variant.output_file)[0] + ".o" for variant, _ in variant_list]
+    build_command += " && %s -O2 -fPIC -shared -I $ML_SRC_DIR/metalibm_core %s %s -o %s -lm" % (self.processor.get_compiler(), self.output_file, " ".join(object_list), library_file)
+    print "MULTI-TARGET %s build command line:" % self.function_name
+    print build_command
+
+  ## @param code_function_list list of CodeFunction of the implementation
+  #         (scalar callback first for vector implementations)
+  #  @return pair of FunctionObject (scalar implementation, vector implementation or None)
+  def get_implementation_function_objects(self, code_function_list):
+    if self.get_vector_size() == 1:
+      return self.implementation.get_function_object(), None
+    else:
+      return code_function_list[0].get_function_object(), self.implementation.get_function_object()
+
+  ## generate the array-mapping kernel
+  #  void <function_name>_array(const T* restrict in, T* restrict out, size_t n)
+  #  @param code_function_list list of CodeFunction of the implementation
+  #         (scalar callback first for vector implementations)
+  #  @return CodeFunction object
+  def generate_array_kernel(self, code_function_list):
+    scalar_function, vector_function = self.get_implementation_function_objects(code_function_list)
+    return generate_array_kernel(
+      "%s_array" % self.function_name, self.precision, scalar_function, vector_function,
+      vector_size = self.get_vector_size(), unroll_factor = self.array_unroll, tail_policy = self.array_tail
+    )
 
   ## externalized an optree: generate a CodeFunction which compute the 
   #  given optree inside a sub-function and returns it as a result
@@ -423,77 +699,118 @@ class ML_FunctionBasis(object):
 
     vector_output_format = self.vectorizer.vectorize_format(self.precision, vector_size)
 
+    print "[SV] building vectorized main statement"
+    if vector_mask is None:
+      # branch-free scheme (e.g. after if-conversion): no slow path
+      function_scheme = Statement(Return(vector_scheme))
+    else:
+      function_scheme = self.generate_vector_slow_path(scalar_scheme, vec_arg_list, vector_scheme, vector_mask, scalar_callback, vector_size)
+
+    # print "vectorized_scheme: ", function_scheme.get_str(depth = None, display_precision = True, memoization_map = {})
+
+    for vec_arg in vec_arg_list:
+      self.implementation.register_new_input_variable(vec_arg)
+    self.implementation.set_output_format(vector_output_format)
+
+    # dummy scheme to make functionnal code generation
+    self.implementation.set_scheme(function_scheme)
+
+    print "[SV] end of generate_function_list"
+    if self.vector_abi:
+      return [scalar_callback_function, self.implementation] + self.generate_vector_abi_entry_points(scalar_callback_function, vector_size)
+    return [scalar_callback_function, self.implementation]
+
+  ## generate the scalar entry point <function_name> and the x86_64 vector
+  #  ABI wrapper of the vector implementation
+  #  @param scalar_callback_function CodeFunction of the scalar callback
+  #  @return list of CodeFunction
+  def generate_vector_abi_entry_points(self, scalar_callback_function, vector_size):
+    scalar_function = CodeFunction(self.function_name, output_format = self.precision)
+    arg_list = [scalar_function.add_input_variable(arg.get_tag(), arg.get_precision()) for arg in scalar_callback_function.get_arg_list()]
+    scalar_function.set_scheme(Statement(Return(scalar_callback_function.get_function_object()(*arg_list))))
+    abi_wrapper = generate_vector_abi_wrapper(
+      self.function_name, self.implementation.get_function_object(), self.precision,
+      self.implementation.get_output_format(), vector_size, arity = len(arg_list)
+    )
+    return [scalar_function, abi_wrapper]
+
+  ## dump the header declaring <function_name> and its vector ABI variant
+  #  (<output_file> with .h extension)
+  def generate_vector_abi_header(self):
+    header_file = os.path.splitext(self.output_file)[0] + ".h"
+    Log.report(Log.Info, "Generating vector ABI header in " + header_file)
+    header_stream = open(header_file, "w")
+    header_stream.write(generate_vector_abi_header(header_file, self.function_name, self.precision, self.vector_size, arity = len(self.implementation.get_arg_list())))
+    header_stream.close()
+
+
+  ## build the vector implementation scheme: fast path evaluation,
+  #  followed by the slow path (vector_fallback strategy) when some lanes
+  #  fail <vector_mask>
+  #  @param scalar_scheme optimized scalar scheme <vector_scheme> was vectorized from
+  #  @return Statement of the vector implementation
+  def generate_vector_slow_path(self, scalar_scheme, vec_arg_list, vector_scheme, vector_mask, scalar_callback, vector_size):
+    vector_output_format = self.vectorizer.vectorize_format(self.precision, vector_size)
+
+    # slow path value and mask of the lanes it evaluates correctly
+    slow_scheme, slow_mask = vector_scheme, vector_mask
+    if self.vector_fallback == VECTOR_FALLBACK_BLEND:
+      blended_scheme, blend_mask = self.vectorizer.vectorize_blended_scheme(scalar_scheme, vector_size)
+      if not blended_scheme is None:
+        slow_scheme, slow_mask = blended_scheme, blend_mask
 
     vi = Variable("i", precision = ML_Int32, var_type = Variable.Local)
     vec_res = Variable("vec_res", precision = vector_output_format, var_type = Variable.Local)
 
-    vec_elt_arg_tuple = tuple(VectorElementSelection(vec_arg, vi, precision = self.precision) for vec_arg in vec_arg_list)
-
     vector_mask.set_attributes(tag = "vector_mask", debug = debug_multi)
 
-    print "[SV] building vectorized main statement"
-    if self.language is OpenCL_Code:
-      unrolled_cond_allocation = Statement()
+    if slow_mask is None:
+      # every lane is evaluated by the blended scheme
+      scalar_lanes = Statement()
+    elif self.language is OpenCL_Code:
+      scalar_lanes = Statement()
       for i in xrange(vector_size):
         elt_index = Constant(i)
         vec_elt_arg_tuple = tuple(VectorElementSelection(vec_arg, elt_index, precision = self.precision) for vec_arg in vec_arg_list)
-        unrolled_cond_allocation.add(
+        scalar_lanes.add(
           ConditionBlock(
-            Likely(VectorElementSelection(vector_mask, elt_index, precision = ML_Bool), None),
+            LogicalNot(VectorElementSelection(slow_mask, elt_index, precision = ML_Bool), precision = ML_Bool, likely = False),
             ReferenceAssign(VectorElementSelection(vec_res, elt_index, precision = self.precision), scalar_callback(*vec_elt_arg_tuple)),
-            # ReferenceAssign(VectorElementSelection(vec_res, elt_index, precision = self.precision), VectorElementSelection(vector_scheme, elt_index, precision = self.precision))
           )
         ) 
 
-
-      function_scheme = Statement(
-        vector_scheme,
-        ConditionBlock(
-          Test(vector_mask, specifier = Test.IsMaskNotAnyZero, precision = ML_Bool, likely = True, debug = debug_multi),
-          Return(vector_scheme),
+    else:
+      # the scalar callback is only called on the lanes failing
+      # <slow_mask>, iterating over the set bits of a lane bit-field
+      lane_bits = Variable("lane_bits", precision = ML_UInt32, var_type = Variable.Local)
+      zero_lanes = FunctionObject("ml_vmask%d_zero_lanes" % vector_size, [slow_mask.get_precision()], ML_UInt32, FunctionOperator("ml_vmask%d_zero_lanes" % vector_size, arity = 1, require_header = ["support_lib/ml_vector_lib.h"]))
+      lowest_lane = FunctionObject("ml_lowest_lane", [ML_UInt32], ML_Int32, FunctionOperator("ml_lowest_lane", arity = 1, require_header = ["support_lib/ml_vector_lib.h"]))
+      vec_elt_arg_tuple = tuple(VectorElementSelection(vec_arg, vi, precision = self.precision) for vec_arg in vec_arg_list)
+      scalar_lanes = Statement(
+        ReferenceAssign(lane_bits, zero_lanes(slow_mask)),
+        Loop(
+          Statement(),
+          Comparison(lane_bits, Constant(0, precision = ML_UInt32), specifier = Comparison.NotEqual, precision = ML_Bool, likely = False),
           Statement(
-            ReferenceAssign(vec_res, vector_scheme),
-            unrolled_cond_allocation,
-            Return(vec_res)
+            ReferenceAssign(vi, lowest_lane(lane_bits)),
+            ReferenceAssign(VectorElementSelection(vec_res, vi, precision = self.precision), scalar_callback(*vec_elt_arg_tuple)),
+            ReferenceAssign(lane_bits, BitLogicAnd(lane_bits, Subtraction(lane_bits, Constant(1, precision = ML_UInt32), precision = ML_UInt32), precision = ML_UInt32))
           )
         )
       )
 
-    else:
-      function_scheme = Statement(
-        vector_scheme,
-        ConditionBlock(
-          Test(vector_mask, specifier = Test.IsMaskNotAnyZero, precision = ML_Bool, likely = True, debug = debug_multi),
-          Return(vector_scheme),
-          Statement(
-            ReferenceAssign(vec_res, vector_scheme),
-            Loop(
-              ReferenceAssign(vi, Constant(0, precision = ML_Int32)),
-              vi < Constant(vector_size, precision = ML_Int32),
-              Statement(
-                ConditionBlock(
-                  Likely(VectorElementSelection(vector_mask, vi, precision = ML_Bool), None),
-                  ReferenceAssign(VectorElementSelection(vec_res, vi, precision = self.precision), scalar_callback(*vec_elt_arg_tuple))
-                ),
-                ReferenceAssign(vi, vi + 1)
-              ),
-            ),
-            Return(vec_res)
-          )
+    return Statement(
+      vector_scheme,
+      ConditionBlock(
+        Test(vector_mask, specifier = Test.IsMaskNotAnyZero, precision = ML_Bool, likely = True, debug = debug_multi),
+        Return(vector_scheme),
+        Statement(
+          ReferenceAssign(vec_res, slow_scheme),
+          scalar_lanes,
+          Return(vec_res)
         )
       )
-
-    # print "vectorized_scheme: ", function_scheme.get_str(depth = None, display_precision = True, memoization_map = {})
-
-    for vec_arg in vec_arg_list:
-      self.implementation.register_new_input_variable(vec_arg)
-    self.implementation.set_output_format(vector_output_format)
-
-    # dummy scheme to make functionnal code generation
-    self.implementation.set_scheme(function_scheme)
-
-    print "[SV] end of generate_function_list"
-    return [scalar_callback_function, self.implementation]
+    )
 
 
   # Currently mostly empty, to be populated someday
@@ -547,35 +864,47 @@ class ML_FunctionBasis(object):
     sollya_precision = self.precision.get_sollya_object()
     interval_size = high_input - low_input 
 
-    input_table = ML_Table(dimensions = [test_total], storage_precision = self.precision, tag = self.uniquify_name("input_table"))
+    # test vectors stored in a binary file are loaded at run time:
+    # tables are declared without initializer
+    external_vectors = self.auto_test_vector_file != None
+    input_table = ML_Table(dimensions = [test_total], storage_precision = self.precision, tag = self.uniquify_name("input_table"), empty = external_vectors)
     ## (low, high) are store in output table
-    output_table = ML_Table(dimensions = [test_total, 2], storage_precision = self.precision, tag = self.uniquify_name("output_table"))
+    output_table = ML_Table(dimensions = [test_total, 2], storage_precision = self.precision, tag = self.uniquify_name("output_table"), empty = external_vectors)
 
     # general index for input/output tables
     table_index = 0
 
 
+    input_list = []
     if self.auto_test_std:
       # standard test cases
       for i in range(num_std_case):
-        input_value = round(self.standard_test_cases[i], sollya_precision, RN)
-
-        input_table[table_index] = input_value
-        # FIXME only valid for faithful evaluation
-        output_table[table_index][0] = round(self.numeric_emulate(input_value), sollya_precision, RD)
-        output_table[table_index][1] = round(self.numeric_emulate(input_value), sollya_precision, RU)
-
-        table_index += 1
+        input_list.append(round(self.standard_test_cases[i], sollya_precision, RN))
 
     # random test cases
+    random_generator = random.Random(self.auto_test_seed)
     for i in range(test_num):
-      input_value = round(low_input + (random.randrange(2**32 + 1) / float(2**32)) * interval_size, sollya_precision, RN) 
+      input_list.append(round(low_input + (random_generator.randrange(2**32 + 1) / float(2**32)) * interval_size, sollya_precision, RN))
+
+    # expected result bounds, each input is evaluated once
+    # FIXME only valid for faithful evaluation
+    function_key = "%s.%s:%s" % (self.__class__.__module__, self.__class__.__name__, self.function_name)
+    bound_list = get_reference_bounds(self.numeric_emulate, input_list, self.precision, function_key = function_key, process_num = self.auto_test_jobs)
+
+    for input_value, (low_bound, high_bound) in zip(input_list, bound_list):
       input_table[table_index] = input_value
-      # FIXME only valid for faithful evaluation
-      output_table[table_index][0] = round(self.numeric_emulate(input_value), sollya_precision, RD)
-      output_table[table_index][1] = round(self.numeric_emulate(input_value), sollya_precision, RU)
+      output_table[table_index][0] = low_bound
+      output_table[table_index][1] = high_bound
       table_index += 1
 
+    load_statement = Statement()
+    if external_vectors:
+      Log.report(Log.Info, "dumping auto-test vectors in %s" % self.auto_test_vector_file)
+      write_test_vector_file(self.auto_test_vector_file, self.precision, input_list, bound_list)
+      vector_path = os.path.abspath(self.auto_test_vector_file).replace("\\", "\\\\").replace("\"", "\\\"")
+      load_op = FunctionOperator("ml_load_test_vectors", arg_map = {0: "\"%s\"" % vector_path, 1: "sizeof(%s)" % self.precision.get_name(language = C_Code), 2: FO_Arg(0), 3: str(test_total), 4: FO_Arg(1), 5: str(2 * test_total)}, void_function = True, require_header = ["support_lib/ml_test_vectors.h"])
+      load_function = FunctionObject("ml_load_test_vectors", [self.precision] * 2, ML_Void, load_op)
+      load_statement.add(load_function(input_table, output_table))
 
     vi = Variable("i", precision = ML_Int32, var_type = Variable.Local)
 
@@ -659,6 +988,7 @@ class ML_FunctionBasis(object):
       )
     # common test scheme between scalar and vector functions
     test_scheme = Statement(
+      load_statement,
       test_loop,
       printf_success_function(),
       Return(Constant(0, precision = ML_Int32))
@@ -666,6 +996,126 @@ class ML_FunctionBasis(object):
     auto_test.set_scheme(test_scheme)
     return [auto_test]
 
+  ## generate a benchmark main measuring throughput (independent inputs)
+  #  and latency (dependent chain) of the scalar, vector and libm variants
+  #  of the function, results are printed in JSON format
+  #  @param code_function_list list of CodeFunction of the implementation
+  #  @param bench_num number of distinct inputs
+  #  @param bench_repeat number of passes over the inputs per measure
+  #  @param bench_range Interval inputs are selected in
+  #  @return list of CodeFunction
+  def generate_auto_bench(self, code_function_list, bench_num = 1024, bench_repeat = 100, bench_range = Interval(-1.0, 1.0)):
+    auto_bench = CodeFunction("main", output_format = ML_Int32)
+    vector_size = self.get_vector_size()
+    bench_num += (vector_size - bench_num % vector_size) % vector_size
+    bench_header = ["support_lib/ml_bench.h"]
+
+    # random inputs
+    sollya_precision = self.precision.get_sollya_object()
+    low_input = inf(bench_range)
+    interval_size = sup(bench_range) - low_input
+    random_generator = random.Random(self.auto_test_seed)
+    input_list = [round(low_input + (random_generator.randrange(2**32 + 1) / float(2**32)) * interval_size, sollya_precision, RN) for i in xrange(bench_num)]
+    input_table = ML_Table(dimensions = [bench_num], storage_precision = self.precision, tag = self.uniquify_name("bench_input_table"), init_data = input_list)
+    output_table = ML_Table(dimensions = [bench_num], storage_precision = self.precision, tag = self.uniquify_name("bench_output_table"), empty = True)
+
+    # benchmark support functions (support_lib/ml_bench.h)
+    timestamp_function = FunctionObject("ml_bench_timestamp", [], ML_UInt64, FunctionOperator("ml_bench_timestamp", arg_map = {}, require_header = bench_header))
+    begin_function = FunctionObject("ml_bench_begin", [], ML_Void, FunctionOperator("ml_bench_begin", arg_map = {0: "\"%s\"" % self.function_name}, void_function = True, require_header = bench_header))
+    end_function = FunctionObject("ml_bench_end", [], ML_Void, FunctionOperator("ml_bench_end", arg_map = {}, void_function = True, require_header = bench_header))
+    consume_array_function = FunctionObject("ml_bench_consume_array", [self.precision], ML_Void, FunctionOperator("ml_bench_consume_array", arity = 1, void_function = True, require_header = bench_header))
+    consume_value_function = FunctionObject("ml_bench_consume_value", [self.precision], ML_Void, FunctionOperator("ml_bench_consume_value", arity = 1, void_function = True, require_header = bench_header))
+    if not self.precision in [ML_Binary32, ML_Binary64]:
+      Log.report(Log.Error, "auto-bench is not supported for format %s" % self.precision)
+    chain_name = {ML_Binary32: "ml_bench_chainf", ML_Binary64: "ml_bench_chain"}[self.precision]
+    chain_function = FunctionObject(chain_name, [self.precision] * 2, self.precision, FunctionOperator(chain_name, arity = 2, require_header = bench_header))
+
+    def report_function(variant, mode, call_count):
+      report_op = FunctionOperator("ml_bench_report", arg_map = {0: "\"%s\"" % variant, 1: "\"%s\"" % mode, 2: FO_Arg(0), 3: str(call_count * bench_repeat), 4: str(bench_num * bench_repeat)}, void_function = True, require_header = bench_header)
+      return FunctionObject("ml_bench_report", [ML_UInt64], ML_Void, report_op)
+
+    vi = Variable("i", precision = ML_Int32, var_type = Variable.Local)
+    vr = Variable("r", precision = ML_Int32, var_type = Variable.Local)
+    t_start = Variable("t_start", precision = ML_UInt64, var_type = Variable.Local)
+    t_stop = Variable("t_stop", precision = ML_UInt64, var_type = Variable.Local)
+
+    ## timed <bench_repeat> passes over the inputs, <body> processing
+    #  inputs i to i + step - 1 (new nodes must be built for each measure)
+    def build_measure(variant, mode, body, step, sink):
+      return Statement(
+        ReferenceAssign(t_start, timestamp_function()),
+        Loop(
+          ReferenceAssign(vr, Constant(0, precision = ML_Int32)),
+          vr < Constant(bench_repeat, precision = ML_Int32),
+          Statement(
+            Loop(
+              ReferenceAssign(vi, Constant(0, precision = ML_Int32)),
+              vi < Constant(bench_num, precision = ML_Int32),
+              Statement(
+                body,
+                ReferenceAssign(vi, vi + step)
+              )
+            ),
+            ReferenceAssign(vr, vr + 1)
+          )
+        ),
+        ReferenceAssign(t_stop, timestamp_function()),
+        report_function(variant, mode, bench_num / step)(Subtraction(t_stop, t_start, precision = ML_UInt64)),
+        sink
+      )
+
+    def scalar_measure_list(variant, function):
+      acc = Variable("acc", precision = self.precision, var_type = Variable.Local)
+      throughput_body = ReferenceAssign(TableLoad(output_table, vi), function(TableLoad(input_table, vi)))
+      latency_body = ReferenceAssign(acc, function(chain_function(TableLoad(input_table, vi), acc)))
+      return [
+        build_measure(variant, "throughput", throughput_body, 1, consume_array_function(output_table)),
+        ReferenceAssign(acc, TableLoad(input_table, Constant(0, precision = ML_Int32))),
+        build_measure(variant, "latency", latency_body, 1, consume_value_function(acc)),
+      ]
+
+    def vector_measure_list(variant, function):
+      vector_format = function.get_precision()
+      vector_load = build_vector_load(self.precision, vector_format)
+      vec_x = Variable("vec_x", precision = vector_format, var_type = Variable.Local)
+      vec_r = Variable("vec_r", precision = vector_format, var_type = Variable.Local)
+      vec_acc = Variable("vec_acc", precision = vector_format, var_type = Variable.Local)
+      throughput_body = Statement(ReferenceAssign(vec_r, function(vector_load(input_table, vi))))
+      for k in xrange(vector_size):
+        throughput_body.add(ReferenceAssign(TableLoad(output_table, vi + k), VectorElementSelection(vec_r, k, precision = self.precision)))
+      # the dependency chain goes through the first lane
+      latency_body = Statement(
+        ReferenceAssign(vec_x, vector_load(input_table, vi)),
+        ReferenceAssign(VectorElementSelection(vec_x, 0, precision = self.precision), chain_function(VectorElementSelection(vec_x, 0, precision = self.precision), VectorElementSelection(vec_acc, 0, precision = self.precision))),
+        ReferenceAssign(vec_acc, function(vec_x))
+      )
+      return [
+        build_measure(variant, "throughput", throughput_body, vector_size, consume_array_function(output_table)),
+        ReferenceAssign(vec_acc, vector_load(input_table, Constant(0, precision = ML_Int32))),
+        build_measure(variant, "latency", latency_body, vector_size, consume_value_function(VectorElementSelection(vec_acc, 0, precision = self.precision))),
+      ]
+
+    scalar_function, vector_function = self.get_implementation_function_objects(code_function_list)
+    bench_scheme = Statement(begin_function())
+    for measure in scalar_measure_list("scalar", scalar_function):
+      bench_scheme.add(measure)
+    if vector_function != None:
+      for measure in vector_measure_list("vector", vector_function):
+        bench_scheme.add(measure)
+    if self.bench_libm in [None, "none"]:
+      pass
+    elif self.bench_libm == self.function_name:
+      Log.report(Log.Warning, "libm comparison disabled: implementation is named after the libm function %s" % self.bench_libm)
+    else:
+      libm_function = FunctionObject(self.bench_libm, [self.precision], self.precision, FunctionOperator(self.bench_libm, arity = 1))
+      for measure in scalar_measure_list("libm", libm_function):
+        bench_scheme.add(measure)
+    bench_scheme.add(end_function())
+    bench_scheme.add(Return(Constant(0, precision = ML_Int32)))
+
+    auto_bench.set_scheme(bench_scheme)
+    return [auto_bench]
+
   @staticmethod
   def get_name():
     return ML_FunctionBasis.function_name
@@ -19,7 +19,7 @@ import sys, inspect
 from sollya import Interval, SollyaObject, nearestint, floor, ceil
 
 from ..utility.log_report import Log
-from .attributes import Attributes, attr_init
+from .attributes import Attributes, Handle, attr_init
 from .ml_formats import * # FP_SpecialValue, ML_FloatingPointException, ML_FloatingPoint_RoundingMode, ML_FPRM_Type, ML_FPE_Type
 
 ## \defgroup ml_operations ml_operations
@@ -70,6 +70,9 @@ def implicit_op(op):
 
 ## Parent for abstract operations 
 #  @brief parent to Metalibm's abstract operation
+#  node classes keep a per-instance __dict__ (no __slots__): change_to
+#  reassigns __class__ between classes with different instance fields
+#  and several fields (arity, extra_inputs) override class-level defaults
 class AbstractOperation(ML_Operation):
     name = "AbstractOperation"
     extra_inputs = []
@@ -78,9 +81,25 @@ class AbstractOperation(ML_Operation):
 
     ## init operation handle
     def __init__(self, **init_map):
-        self.attributes = Attributes(**init_map)
+        self.attributes = Attributes.get_record(**init_map)
         self.index = AbstractOperation.global_index; AbstractOperation.global_index += 1
-        self.get_handle().set_node(self)
+        if self.attributes.get_handle() != None:
+            self.attributes.get_handle().set_node(self)
+
+    ## node's attributes record may be shared with other nodes (see
+    #  Attributes), it is duplicated before being modified
+    #  @return node's attributes, which can be modified in place
+    def get_mutable_attributes(self):
+        if self.attributes.shared:
+            self.attributes = self.attributes.get_private_copy()
+        return self.attributes
+
+    ## set node's attributes to a copy of <optree>'s attributes (the copy
+    #  shares <optree>'s handle)
+    #  @param light boolean flag, range and error information are not copied
+    def copy_attributes(self, optree, light = False):
+        optree.get_handle()
+        self.attributes = optree.attributes.get_light_copy() if light else optree.attributes.get_copy()
 
     ## extract the High part of the Node
     @property
@@ -197,7 +216,7 @@ class AbstractOperation(ML_Operation):
 
     ## set the node output precision
     def set_precision(self, new_precision):
-        self.attributes.set_precision(new_precision)
+        self.get_mutable_attributes().set_precision(new_precision)
 
 
     def get_inputs(self):
@@ -212,7 +231,7 @@ class AbstractOperation(ML_Operation):
         return self.attributes.get_interval()
     ## set the node live-range interval
     def set_interval(self, new_interval):
-        return self.attributes.set_interval(new_interval)
+        return self.get_mutable_attributes().set_interval(new_interval)
 
     ## wrapper for getting the exact field of node's attributes
     #  @return the node exact flag value
@@ -221,7 +240,7 @@ class AbstractOperation(ML_Operation):
 
     ## wrapper for setting the exact field of node's attributes
     def set_exact(self, new_exact_value):
-        self.attributes.set_exact(new_exact_value)
+        self.get_mutable_attributes().set_exact(new_exact_value)
 
     ## wrapper for getting the tag value within node's attributes
     #  @return the node's tag 
@@ -233,54 +252,57 @@ class AbstractOperation(ML_Operation):
     ## wrapper for setting the tag value within node's attributes
     def set_tag(self, new_tag):
         """ tag setter (transmit to self.attributes field) """
-        return self.attributes.set_tag(new_tag)
+        return self.get_mutable_attributes().set_tag(new_tag)
 
     ## wrapper for getting the value of debug field from node's attributes
     def get_debug(self):
         return self.attributes.get_debug()
     ## wrapper for setting the debug field value within node's attributes
     def set_debug(self, new_debug):
-        return self.attributes.set_debug(new_debug)
+        return self.get_mutable_attributes().set_debug(new_debug)
 
     ## wrapper for getting the value of silent field from node's attributes
     def get_silent(self):
     ## wrapper for setting the value of silent field within node's attributes
         return self.attributes.get_silent()
     def set_silent(self, silent_value):
-        return self.attributes.set_silent(silent_value)
+        return self.get_mutable_attributes().set_silent(silent_value)
 
     ## wrapper for retrieving the handle field from node's attributes
+    #  (the handle is created on the first request)
     def get_handle(self):
+        if self.attributes.get_handle() is None:
+            self.get_mutable_attributes().set_handle(Handle(self))
         return self.attributes.get_handle()
     ## wrapper for changing the handle within node's attributes
     def set_handle(self, new_handle):
-        self.attributes.set_handle(new_handle)
+        self.get_mutable_attributes().set_handle(new_handle)
 
     ##  wrapper for getting the value of clearprevious field from node's attributes
     def get_clearprevious(self):
         return self.attributes.get_clearprevious()
     ## wrapper for setting the value of clearprevious field within node's attributes
     def set_clearprevious(self, new_clearprevious):
-        return self.attributes.set_clearprevious(new_clearprevious)
+        return self.get_mutable_attributes().set_clearprevious(new_clearprevious)
 
     ##  wrapper for getting the value of unbreakable field from node's attributes
     def get_unbreakable(self):
         return self.attributes.get_unbreakable()
     ## wrapper for setting the value of unbreakable field within node's attributes
     def set_unbreakable(self, new_unbreakable):
-        return self.attributes.set_unbreakable(new_unbreakable)
+        return self.get_mutable_attributes().set_unbreakable(new_unbreakable)
 
     ## wrapper to change some attributes values using dictionnary arguments
     def set_attributes(self, **kwords):
         if "likely" in kwords:
             self.set_likely(kwords["likely"])
             kwords.pop("likely")
-        self.attributes.set_attr(**kwords)
+        self.get_mutable_attributes().set_attr(**kwords)
 
     ## modify the values of some node's attributes and return the current node
     #  @return current node
     def modify_attributes(self, **kwords):
-        self.attributes.set_attr(**kwords)
+        self.get_mutable_attributes().set_attr(**kwords)
         return self
 
     ## 
@@ -302,7 +324,7 @@ class AbstractOperation(ML_Operation):
     ## wrapper for setting the rounding field within node's attributes
     def set_rounding_mode(self, new_rounding_mode):
         """ rounding mode setter function (attributes) """
-        self.attributes.set_rounding_mode(new_rounding_mode)
+        self.get_mutable_attributes().set_rounding_mode(new_rounding_mode)
 
     ## wrapper for getting the max_abs_error field of node's attributes
     #  @return the node's max_abs_error attribute value
@@ -310,12 +332,12 @@ class AbstractOperation(ML_Operation):
         return self.attributes.get_max_abs_error()
     ## wrapper for setting the max_abs_error field value within node's attributes
     def set_max_abs_error(self, new_max_abs_error):
-        self.attributes.set_max_abs_error(new_max_abs_error)
+        self.get_mutable_attributes().set_max_abs_error(new_max_abs_error)
 
     def get_prevent_optimization(self):
         return self.attributes.get_prevent_optimization()
     def set_prevent_optimization(self, prevent_optimization):
-        self.attributes.set_prevent_optimization(prevent_optimization)
+        self.get_mutable_attributes().set_prevent_optimization(prevent_optimization)
 
     ## wrapper to access the class name field
     #  @return the node's name (generally node's class name)
@@ -349,7 +371,8 @@ class AbstractOperation(ML_Operation):
     #  @param  display_attribute [boolean] enable/disable display of node's attributes
     #  @param  display_id [boolean]  enable/disbale display of unique node identified
     #  @return a string describing the node
-    def get_str(self, depth = 2, display_precision = False, tab_level = 0, memoization_map = {}, display_attribute = False, display_id = False):
+    def get_str(self, depth = 2, display_precision = False, tab_level = 0, memoization_map = None, display_attribute = False, display_id = False):
+        memoization_map = {} if memoization_map is None else memoization_map
         new_depth = None 
         if depth != None:
             if  depth < 0: 
@@ -376,14 +399,14 @@ class AbstractOperation(ML_Operation):
 
     ## virtual function, called after a node's copy
     #  overleaded by inheriter of AbstractOperation
-    def finish_copy(self, new_copy, copy_map = {}):
+    def finish_copy(self, new_copy, copy_map = None):
         pass
 
 
     ## pure virtual copy  node function
     #  @param copy_map dictionnary of previously built copy, if a node is found within this table, table's value is returned as copy result
     #  @return node's copy (newly generated or memoized)
-    def copy(self, copy_map = {}):
+    def copy(self, copy_map = None):
         print "Error: copy not implemented"
         print self, self.__class__
         raise NotImplementedError
@@ -412,8 +435,11 @@ class ML_ArithmeticOperation(AbstractOperation):
     """ init function for abstract operation """
     AbstractOperation.__init__(self, **init_map)
     self.inputs = tuple(implicit_op(op) for op in ops)
-    if self.get_interval() == None:
-        self.set_interval(self.range_function(self.inputs))
+    # the range of a copy is copied from the original node
+    if self.get_interval() == None and not "__copy" in init_map:
+        interval = self.range_function(self.inputs)
+        if interval != None:
+            self.set_interval(interval)
 
 ## Parent for AbstractOperation with no expected input
 class ML_LeafNode(AbstractOperation): 
@@ -430,7 +456,7 @@ class Constant(ML_LeafNode):
         self.value = value
         # attribute fields initialization
         if isinstance(value, int) or isinstance(value, float) or isinstance(value, SollyaObject):
-            self.attributes.set_interval(Interval(value))
+            self.set_interval(Interval(value))
 
 
     ## accessor to the constat value
@@ -440,20 +466,21 @@ class Constant(ML_LeafNode):
     def set_value(self, new_value):
         self.value = new_value
 
-    def get_str(self, depth = None, display_precision = False, tab_level = 0, memoization_map = {}, display_attribute = False, display_id = False):
+    def get_str(self, depth = None, display_precision = False, tab_level = 0, memoization_map = None, display_attribute = False, display_id = False):
         precision_str = "" if not display_precision else "[%s]" % str(self.get_precision())
         attribute_str = "" if not display_attribute else self.attributes.get_str(tab_level = tab_level)
         id_str        = ("[id=%x]" % id(self)) if display_id else ""
         return AbstractOperation.str_del * tab_level + "Cst(%s)%s%s%s\n" % (self.value, attribute_str, precision_str, id_str)
 
 
-    def copy(self, copy_map = {}):
+    def copy(self, copy_map = None):
         """ return a new, free copy of <self> """
+        copy_map = {} if copy_map is None else copy_map
         # test for previous definition in memoization map
         if self in copy_map: return copy_map[self]
         # else define a new and free copy
         new_copy = Constant(self.value)
-        new_copy.attributes = self.attributes.get_copy()
+        new_copy.copy_attributes(self)
         copy_map[self] = new_copy
         return new_copy
 
@@ -477,7 +504,7 @@ class Variable(ML_LeafNode):
     #  @param init_map standard ML_Operation attribute dictionnary initialization 
     def __init__(self, tag, **init_map):
         AbstractOperation.__init__(self, **init_map)
-        self.attributes.set_tag(tag)
+        self.set_tag(tag)
         # used to distinguish between input variables (without self.inputs) 
         # and intermediary variables 
         self.var_type = attr_init(init_map, "var_type", default_value = Variable.Input)  
@@ -487,14 +514,15 @@ class Variable(ML_LeafNode):
         return self.var_type
 
     ## generate string description of the Variable node
-    def get_str(self, depth = None, display_precision = False, tab_level = 0, memoization_map = {}, display_attribute = False, display_id = False):
+    def get_str(self, depth = None, display_precision = False, tab_level = 0, memoization_map = None, display_attribute = False, display_id = False):
         precision_str = "" if not display_precision else "[%s]" % str(self.get_precision())
         attribute_str = "" if not display_attribute else self.attributes.get_str(tab_level = tab_level)
         id_str        = ("[id=%x]" % id(self)) if display_id else ""
         return AbstractOperation.str_del * tab_level + "Var(%s)%s%s%s\n" % (self.get_tag(), precision_str, attribute_str, id_str)
 
 
-    def copy(self, copy_map = {}):
+    def copy(self, copy_map = None):
+        copy_map = {} if copy_map is None else copy_map
         # test for previous definition in memoization map
         if self in copy_map: return copy_map[self]
         # by default input variable are not copied
@@ -505,7 +533,7 @@ class Variable(ML_LeafNode):
             return self
         # else define a new and free copy
         new_copy = Variable(tag = self.get_tag(), var_type = self.var_type)
-        new_copy.attributes = self.attributes.get_copy()
+        new_copy.copy_attributes(self)
         copy_map[self] = new_copy
         return new_copy
 
@@ -519,18 +547,22 @@ def AbstractOperation_init(self, *ops, **init_map):
   """ init function for abstract operation """
   AbstractOperation.__init__(self, **init_map)
   self.inputs = tuple(implicit_op(op) for op in ops)
-  if self.get_interval() == None:
-      self.set_interval(self.range_function(self.inputs))
+  # the range of a copy is copied from the original node
+  if self.get_interval() == None and not "__copy" in init_map:
+      interval = self.range_function(self.inputs)
+      if interval != None:
+          self.set_interval(interval)
 
-def AbstractOperation_copy(self, copy_map = {}):
+def AbstractOperation_copy(self, copy_map = None):
   """ base function to copy an abstract operation object,
       copy_map is a memoization hashtable which can be use to factorize
       copies """
+  copy_map = {} if copy_map is None else copy_map
   # test for previous definition in memoization map
   if self in copy_map: return copy_map[self]
   # else define a new and free copy
   new_copy = self.__class__(*tuple(op.copy(copy_map) for op in self.inputs), __copy = True)
-  new_copy.attributes = self.attributes.get_copy()
+  new_copy.copy_attributes(self)
   self.finish_copy(new_copy, copy_map)
   copy_map[self] = new_copy
   return new_copy
@@ -711,7 +743,7 @@ class FusedMultiplyAdd(ArithmeticOperationConstructor("FusedMultiplyAdd", inheri
         """ return code generation specific key """
         return self.specifier
 
-    def finish_copy(self, new_copy, copy_map = {}):
+    def finish_copy(self, new_copy, copy_map = None):
         new_copy.specifier = self.specifier
         new_copy.arity = new_copy.specifier.arity
         new_copy.commutated = self.commutated
@@ -834,7 +866,7 @@ class ConditionBlock(AbstractOperationConstructor("ConditionBlock", arity = 3)):
     def push_to_pre_statement(self, optree):
         self.pre_statement.push(optree)
 
-    def finish_copy(self, new_copy, copy_map = {}):
+    def finish_copy(self, new_copy, copy_map = None):
         new_copy.pre_statement = self.pre_statement.copy(copy_map)
         new_copy.extra_inputs = [op.copy(copy_map) for op in self.extra_inputs]
         new_copy.parent_list = [op.copy(copy_map) for op in self.parent_list] 
@@ -913,7 +945,7 @@ class BooleanOperation(object):
         """ set likely value """
         self.likely = likely
 
-    def finish_copy(self, new_copy, copy_map = {}):
+    def finish_copy(self, new_copy, copy_map = None):
         new_copy.likely = self.likely
 
 
@@ -978,7 +1010,7 @@ class Test(ArithmeticOperationConstructor("Test", inheritance = [BooleanOperatio
         """ return code generation specific key """
         return self.specifier
 
-    def finish_copy(self, new_copy, copy_map = {}):
+    def finish_copy(self, new_copy, copy_map = None):
         new_copy.specifier = self.specifier
         BooleanOperation.finish_copy(self, new_copy, copy_map)
         new_copy.arity = self.arity
@@ -1023,7 +1055,7 @@ class Comparison(ArithmeticOperationConstructor("Comparison", arity = 2, inherit
         return self.specifier
 
 
-    def finish_copy(self, new_copy, copy_map = {}):
+    def finish_copy(self, new_copy, copy_map = None):
         new_copy.specifier = self.specifier
         BooleanOperation.finish_copy(self, new_copy, copy_map)
 
@@ -1057,7 +1089,7 @@ class Statement(AbstractOperationConstructor("Statement")):
         self.arity += 1
 
 
-    def finish_copy(self, new_copy, copy_map = {}):
+    def finish_copy(self, new_copy, copy_map = None):
         new_copy.arity = self.arity
 
 
@@ -1066,7 +1098,7 @@ class FieldExtraction(ArithmeticOperationConstructor("FieldExtraction")):
         self.__class__.__base__.__init__(self, *args, **kwords)
         self.arity = len(args)
 
-    def finish_copy(self, new_copy, copy_map = {}):
+    def finish_copy(self, new_copy, copy_map = None):
         new_copy.arity = self.arity
 
 class SO_Specifier_Type(object): 
@@ -1128,7 +1160,7 @@ class SpecificOperation(AbstractOperationConstructor("SpecificOperation", inheri
         return self.specifier
 
 
-    def finish_copy(self, new_copy, copy_map = {}):
+    def finish_copy(self, new_copy, copy_map = None):
         new_copy.specifier = self.specifier 
         new_copy.function_name = self.function_name
         new_copy.arity = self.arity
@@ -1251,12 +1283,13 @@ class FunctionCall(AbstractOperationConstructor("FunctionCall")):
             if isinstance(inp, Constant) and isinstance(inp.get_precision(), ML_AbstractFormat):
                 inp.set_precision(new_optree_format)
 
-    def copy(self, copy_map = {}):
+    def copy(self, copy_map = None):
+        copy_map = {} if copy_map is None else copy_map
         # test for previous definition in memoization map
         if self in copy_map: return copy_map[self]
         # else define a new and free copy
         new_copy = self.__class__(self.function_object, *tuple(op.copy(copy_map) for op in self.inputs), __copy = True)
-        new_copy.attributes = self.attributes.get_copy()
+        new_copy.copy_attributes(self)
         self.finish_copy(new_copy, copy_map)
         copy_map[self] = new_copy
         return new_copy
@@ -1271,7 +1304,7 @@ class SwitchBlock(AbstractOperationConstructor("Switch", arity = 1)):
         self.pre_statement = Statement()
         self.case_map = case_map
 
-    def finish_copy(self, new_copy, copy_map = {}):
+    def finish_copy(self, new_copy, copy_map = None):
         new_copy.pre_statement = self.statement.copy(copy_map)
         new_copy.extra_inputs = [op.copy(copy_map) for op in self.extra_inputs]
         new_copy.parent_list = [op.copy(copy_map) for op in self.parent_list] 
@@ -1297,11 +1330,12 @@ class SwitchBlock(AbstractOperationConstructor("Switch", arity = 1)):
     def push_to_pre_statement(self, optree):
         self.pre_statement.push(optree)
 
-    def get_str(self, depth = 2, display_precision = False, tab_level = 0, memoization_map = {}, display_attribute = False, display_id = False):
+    def get_str(self, depth = 2, display_precision = False, tab_level = 0, memoization_map = None, display_attribute = False, display_id = False):
         """ string conversion for operation graph 
             depth:                  number of level to be crossed (None: infty)
             display_precision:      enable/display format display
         """
+        memoization_map = {} if memoization_map is None else memoization_map
         new_depth = None 
         if depth != None:
             if  depth < 0: 
@@ -1334,6 +1368,7 @@ class VectorElementSelection(ArithmeticOperationConstructor("VectorElementSelect
         ML_Float2: ML_Binary32,
         ML_Float4: ML_Binary32,
         ML_Float8: ML_Binary32,
+        ML_Float16: ML_Binary32,
 
         ML_Double2: ML_Binary64,
         ML_Double4: ML_Binary64,
@@ -1342,10 +1377,12 @@ class VectorElementSelection(ArithmeticOperationConstructor("VectorElementSelect
         ML_Int2: ML_Int32,
         ML_Int4: ML_Int32,
         ML_Int8: ML_Int32,
+        ML_VInt16: ML_Int32,
 
         ML_UInt2: ML_UInt32,
         ML_UInt4: ML_UInt32,
         ML_UInt8: ML_UInt32,
+        ML_VUInt16: ML_UInt32,
     }
 
     def get_codegen_key(self):
@@ -10,12 +10,18 @@
 ###############################################################################
 
 import sys
+import math
 
-from sollya import inf, sup
+import sollya
+from sollya import inf, sup, SollyaObject, RN, RD, RU, RZ
 
 from ..utility.log_report import Log
 from .ml_operations import *
 from .ml_formats import *
+from .ml_table import ML_Table
+from ..code_generation.code_constant import C_Code
+from .passes import PassManager, dump_pass_trace
+from .dag_traversal import get_node_children, postorder_apply, preorder_walk, topological_order
 
 
 def merge_abstract_format(*args):
@@ -355,6 +361,151 @@ support_simplification = {
 }
 
 
+## if-conversion cost model: relative evaluation cost of operation classes
+#  (unlisted operations cost 1, leaves are free)
+if_conversion_cost_table = {
+    Division: 8,
+    Modulo: 8,
+    FusedMultiplyAdd: 1,
+    NearestInteger: 2,
+}
+## integer operations whose overflow is undefined behavior in C when
+#  their format is signed
+signed_overflow_operation_list = [Addition, Subtraction, Multiplication, Negation, FusedMultiplyAdd, BitLogicLeftShift]
+
+## scalar format of <precision> (element format of vector formats)
+def get_element_format(precision):
+    return precision.get_scalar_format() if precision.is_vector_format() else precision
+
+## test if <precision> is a signed integer format (abstract integers are
+#  conservatively considered signed)
+def is_signed_integer_format(precision):
+    if precision is None:
+        return False
+    precision = get_element_format(precision)
+    return precision is ML_Integer or (isinstance(precision, ML_Fixed_Format) and precision.get_signed())
+
+## test if <precision> is a floating-point format (or a vector of
+#  floating-point elements)
+def is_fp_format(precision):
+    return precision != None and isinstance(get_element_format(precision), ML_FP_Format)
+
+## cost of a mispredicted branch
+IF_CONVERSION_MISPREDICTION_COST = 16
+## misprediction rate of a branch whose condition has a likely attribute
+IF_CONVERSION_LIKELY_MISPREDICTION_RATE = 0.05
+## misprediction rate of a branch whose condition has no likely attribute
+#  (mixed inputs)
+IF_CONVERSION_UNKNOWN_MISPREDICTION_RATE = 0.5
+
+
+## constant folding: floating-point operations, exact result evaluated on
+#  sollya numbers (the result is rounded once to the operation format)
+fp_folding_map = {
+    Addition: lambda a, b: a + b,
+    Subtraction: lambda a, b: a - b,
+    Multiplication: lambda a, b: a * b,
+    Division: lambda a, b: a / b,
+    Negation: lambda a: -a,
+    Abs: lambda a: abs(a),
+}
+## constant folding: fused multiply-add, by specifier
+fma_folding_map = {
+    FusedMultiplyAdd.Standard: lambda a, b, c: a * b + c,
+    FusedMultiplyAdd.Subtract: lambda a, b, c: a * b - c,
+    FusedMultiplyAdd.SubtractNegate: lambda a, b, c: c - a * b,
+    FusedMultiplyAdd.Negate: lambda a, b, c: - a * b - c,
+}
+## C integer division of <a> by <b> (quotient truncated toward zero)
+def c_integer_division(a, b):
+    quotient = abs(a) // abs(b)
+    return -quotient if (a < 0) != (b < 0) else quotient
+
+## C integer remainder of <a> by <b> (sign of the dividend)
+def c_integer_modulo(a, b):
+    return a - b * c_integer_division(a, b)
+
+## constant folding: integer operations, evaluated on python integers
+#  (operands are first wrapped to their format, see wrap_integer_value)
+integer_folding_map = {
+    Addition: lambda a, b: a + b,
+    Subtraction: lambda a, b: a - b,
+    Multiplication: lambda a, b: a * b,
+    Division: c_integer_division,
+    Modulo: c_integer_modulo,
+    Negation: lambda a: -a,
+    BitLogicAnd: lambda a, b: a & b,
+    BitLogicOr: lambda a, b: a | b,
+    BitLogicXor: lambda a, b: a ^ b,
+    BitLogicNegate: lambda a: ~a,
+    BitLogicLeftShift: lambda a, b: a << b,
+    BitLogicRightShift: lambda a, b: a >> b,
+}
+## sollya rounding mode used to fold operations with a given rounding mode
+#  attribute (operations with a dynamic rounding mode are not folded)
+folding_rounding_mode_map = {
+    None: RN,
+    ML_RoundToNearest: RN,
+    ML_RoundTowardZero: RZ,
+    ML_RoundTowardPlusInfty: RU,
+    ML_RoundTowardMinusInfty: RD,
+}
+
+## @return value of <optree> if it is a scalar numerical constant, else None
+def get_constant_value(optree):
+    if isinstance(optree, Constant):
+        value = optree.get_value()
+        if isinstance(value, (int, long, float, SollyaObject)):
+            return value
+    return None
+
+## @return True if <optree> is a constant equal to <reference_value>
+def is_constant_equal(optree, reference_value):
+    value = get_constant_value(optree)
+    return value != None and value == reference_value
+
+## @return True if <optree> is a constant -0.0
+def is_negative_zero(optree):
+    value = get_constant_value(optree)
+    return isinstance(value, float) and value == 0 and math.copysign(1.0, value) < 0
+
+## @return integer value of <optree> if it is an integral constant, else None
+def get_integer_constant_value(optree):
+    value = get_constant_value(optree)
+    if isinstance(value, (int, long)):
+        return value
+    elif isinstance(value, float) and value.is_integer():
+        return int(value)
+    return None
+
+## @return value of integer <value> once stored in integer format
+#          <precision>, None if the C conversion is not defined (signed
+#          overflow)
+def wrap_integer_value(value, precision):
+    bit_size = precision.get_bit_size()
+    if not precision.get_signed():
+        return value % 2**bit_size
+    elif -2**(bit_size - 1) <= value < 2**(bit_size - 1):
+        return value
+    return None
+
+## round the exact value <value> to floating-point format <precision>
+#  @return rounded value, None if the rounded value is not finite or if
+#          its rounding would raise underflow (those operations are left
+#          to be evaluated at run time)
+def round_fp_constant_value(value, precision, rounding_mode):
+    if not rounding_mode in folding_rounding_mode_map:
+        return None
+    sollya_precision = precision.get_sollya_object()
+    lower_value = sollya.round(value, sollya_precision, RD)
+    upper_value = sollya.round(value, sollya_precision, RU)
+    rounded_value = sollya.round(value, sollya_precision, folding_rounding_mode_map[rounding_mode])
+    if not abs(rounded_value) <= precision.get_omega():
+        return None
+    elif lower_value != upper_value and abs(rounded_value) < S2**precision.get_emin_normal():
+        return None
+    return rounded_value
+
 
 class OptimizationEngine(object):
     """ backend (precision instanciation and optimization passes) class """
@@ -365,6 +516,41 @@ class OptimizationEngine(object):
         self.change_handle = change_handle
         self.dot_product_enabled = dot_product_enabled
         self.default_boolean_precision = default_boolean_precision
+        ## custom optimization pipeline (list of pass names), None for default
+        self.pass_list = None
+        ## statistics of every pass executed by this engine
+        self.pass_statistics = []
+        ## enable node count measurement in pass statistics
+        self.pass_node_count = False
+
+    def set_pass_list(self, pass_list):
+        self.pass_list = pass_list
+
+    def get_pass_list(self):
+        return self.pass_list
+
+    def get_pass_statistics(self):
+        return self.pass_statistics
+
+    def set_pass_node_count(self, pass_node_count):
+        self.pass_node_count = pass_node_count
+
+    ## dump execution time and node count of every pass executed
+    #  by this engine to <trace_filename> (JSON format)
+    def dump_pass_trace(self, trace_filename):
+        dump_pass_trace(self.pass_statistics, trace_filename)
+
+    ## execute a pipeline of registered optimization passes on <optree>
+    #  @param pass_list list of pass names
+    #  @param pass_options options transmitted to every pass
+    #  @return root of the optimized DAG
+    def execute_pass_list(self, optree, pass_list, verbose = True, **pass_options):
+        # a new pass context (owning passes memoization tables) is 
+        # created for each pipeline execution
+        pass_manager = PassManager(self, pass_list, node_count = self.pass_node_count)
+        optree = pass_manager.execute(optree, verbose = verbose, **pass_options)
+        self.pass_statistics += pass_manager.get_statistics()
+        return optree
 
     def set_dot_product_enabled(self, dot_product_enabled):
         self.dot_product_enabled = dot_product_enabled
@@ -372,8 +558,8 @@ class OptimizationEngine(object):
     def get_dot_product_enabled(self):
         return self.dot_product_enabled
 
-    def copy_optree(self, optree, copy_map = {}):
-        return optree.copy(copy_map)
+    def copy_optree(self, optree, copy_map = None):
+        return optree.copy({} if copy_map is None else copy_map)
 
 
     def get_default_fp_precision(self, optree):
@@ -480,106 +666,82 @@ class OptimizationEngine(object):
         return result_format
 
 
-    def instantiate_abstract_precision(self, optree, default_precision = None, memoization_map = {}):    
-        """ recursively determine an abstract precision for each node """
-        if optree in memoization_map:
-            return memoization_map[optree]
-        elif optree.get_precision() != None: 
-            if not isinstance(optree, ML_LeafNode):
-                for inp in optree.inputs:
-                    self.instantiate_abstract_precision(inp, default_precision, memoization_map = memoization_map)
-                for inp in optree.get_extra_inputs():
-                    self.instantiate_abstract_precision(inp, default_precision, memoization_map = memoization_map)
-            memoization_map[optree] = optree.get_precision()
-            return optree.get_precision()
-        else:
-            if isinstance(optree, Constant):
-                if isinstance(optree.get_value(), FP_SpecialValue):
-                    optree.set_precision(optree.get_value().get_precision())
-                    memoization_map[optree] = optree.get_precision()
-                    return optree.get_precision()
+    def instantiate_abstract_precision(self, optree, default_precision = None, memoization_map = None):
+        """ determine an abstract precision for each node """
+        memoization_map = {} if memoization_map is None else memoization_map
+
+        ## @return list of (child, default precision) to be processed
+        #          before <node>
+        def get_children(node, node_default_precision):
+            if node.get_precision() != None:
+                if isinstance(node, ML_LeafNode):
+                    return []
+                return [(op, node_default_precision) for op in list(node.inputs) + list(node.get_extra_inputs())]
+            elif isinstance(node, Constant) or isinstance(node, Variable):
+                return []
+            elif isinstance(node, TableLoad):
+                # table indexes are integers
+                return [(op, ML_Integer) for op in node.inputs[1:]]
+            elif isinstance(node, ConditionBlock) or isinstance(node, SwitchBlock):
+                return [(node.get_pre_statement(), node_default_precision)] + [(op, node_default_precision) for op in list(node.inputs) + list(node.get_extra_inputs())]
+            elif isinstance(node, Statement) or isinstance(node, Loop):
+                return [(op, node_default_precision) for op in node.inputs]
+            elif isinstance(node, ReferenceAssign):
+                # the assigned value is processed once the variable
+                # precision is known
+                return [(node.inputs[0], node_default_precision)]
+            else:
+                return [(op, node_default_precision) for op in list(node.inputs) + list(node.get_extra_inputs())]
+
+        ## determine the precision of <node> once its children are processed
+        def instantiate_node(node, node_default_precision):
+            if node.get_precision() != None:
+                memoization_map[node] = node.get_precision()
+            elif isinstance(node, Constant):
+                if isinstance(node.get_value(), FP_SpecialValue):
+                    node.set_precision(node.get_value().get_precision())
                 else:
-                    if default_precision:
-                      new_precision = default_precision
+                    if node_default_precision:
+                      new_precision = node_default_precision
                     else:
-                      new_precision = ML_Integer if isinstance(optree.get_value(), int) else ML_Float
-                    optree.set_precision(new_precision)
-                    memoization_map[optree] = new_precision
-                    return new_precision
-
-            elif isinstance(optree, Variable):
-                if optree.get_var_type() in [Variable.Input, Variable.Local]:
-                    Log.report(Log.Error, "%s Variable %s has no defined precision" % (optree.get_var_type(), optree.get_tag()))
+                      new_precision = ML_Integer if isinstance(node.get_value(), int) else ML_Float
+                    node.set_precision(new_precision)
+                memoization_map[node] = node.get_precision()
+            elif isinstance(node, Variable):
+                if node.get_var_type() in [Variable.Input, Variable.Local]:
+                    Log.report(Log.Error, "%s Variable %s has no defined precision" % (node.get_var_type(), node.get_tag()))
                 else:
-                    Log.report(Log.Error, "Variable %s error: only Input Variables are supported in instantiate_abstract_precision" % optree.get_tag())
-
-            elif isinstance(optree, TableLoad):
-                # TableLoad operations
-                for inp in optree.inputs[1:]:
-                    self.instantiate_abstract_precision(inp, ML_Integer, memoization_map = memoization_map)
-                format_rule = abstract_typing_rule[optree.__class__]
-                abstract_format = format_rule(optree, *optree.inputs)
-                optree.set_precision(abstract_format)
-                memoization_map[optree] = abstract_format
-                return abstract_format
-
-            elif isinstance(optree, ConditionBlock):
-                # pre statement
-                self.instantiate_abstract_precision(optree.get_pre_statement(), default_precision, memoization_map = memoization_map)
-                # condition and branches
-                for inp in optree.inputs:
-                    self.instantiate_abstract_precision(inp, default_precision, memoization_map = memoization_map)
-                for inp in optree.get_extra_inputs():
-                    self.instantiate_abstract_precision(inp, default_precision, memoization_map = memoization_map)
-                memoization_map[optree] = None
-                return None
-
-            elif isinstance(optree, SwitchBlock):
-                # pre statement
-                self.instantiate_abstract_precision(optree.get_pre_statement(), default_precision, memoization_map = memoization_map)
-
-                case_map = optree.get_case_map()
-                for inp in optree.inputs:
-                    self.instantiate_abstract_precision(inp, default_precision, memoization_map = memoization_map)
-                for inp in optree.get_extra_inputs():
-                    self.instantiate_abstract_precision(inp, default_precision, memoization_map = memoization_map)
-                memoization_map[optree] = None
-                return None
-
-            elif isinstance(optree, Statement):
-                for inp in optree.inputs:
-                    self.instantiate_abstract_precision(inp, default_precision, memoization_map = memoization_map)
-
-                memoization_map[optree] = None
-                return None
-
-            elif isinstance(optree, Loop):
-                for inp in optree.inputs:
-                    self.instantiate_abstract_precision(inp, default_precision, memoization_map = memoization_map)
-
-                memoization_map[optree] = None
-                return None
-
-            elif isinstance(optree, ReferenceAssign):
-                var = optree.inputs[0]
-                value = optree.inputs[1]
-                var_type = self.instantiate_abstract_precision(var, default_precision, memoization_map = memoization_map)
-                value_type = self.instantiate_abstract_precision(value, var_type, memoization_map = memoization_map)
-                return None
-                        
+                    Log.report(Log.Error, "Variable %s error: only Input Variables are supported in instantiate_abstract_precision" % node.get_tag())
+            elif isinstance(node, ConditionBlock) or isinstance(node, SwitchBlock) or isinstance(node, Statement) or isinstance(node, Loop):
+                memoization_map[node] = None
+            elif isinstance(node, ReferenceAssign):
+                # not memoized
+                pass
             else:
-                # all other operations
-                for inp in optree.inputs:
-                    self.instantiate_abstract_precision(inp, default_precision, memoization_map = memoization_map)
-                for inp in optree.get_extra_inputs():
-                    self.instantiate_abstract_precision(inp, default_precision, memoization_map = memoization_map)
-
-                format_rule = abstract_typing_rule[optree.__class__]
-                abstract_format = format_rule(optree, *optree.inputs)
-                optree.set_precision(abstract_format)
-
-                memoization_map[optree] = abstract_format
-                return abstract_format
+                format_rule = abstract_typing_rule[node.__class__]
+                abstract_format = format_rule(node, *node.inputs)
+                node.set_precision(abstract_format)
+                memoization_map[node] = abstract_format
+
+        # iterative depth-first traversal, a node is instantiated after
+        # its children (which may inherit a default precision from it)
+        # stack entries: (node, default precision, state)
+        node_stack = [(optree, default_precision, "pre")]
+        while node_stack:
+            node, node_default_precision, state = node_stack.pop()
+            if state == "pre":
+                if node in memoization_map:
+                    continue
+                node_stack.append((node, node_default_precision, "post"))
+                for child, child_default_precision in reversed(get_children(node, node_default_precision)):
+                    node_stack.append((child, child_default_precision, "pre"))
+            elif state == "post" and isinstance(node, ReferenceAssign) and node.get_precision() is None:
+                var_type = memoization_map.get(node.inputs[0], None)
+                node_stack.append((node, node_default_precision, "done"))
+                node_stack.append((node.inputs[1], var_type, "pre"))
+            else:
+                instantiate_node(node, node_default_precision)
+        return memoization_map.get(optree, None)
 
 
     def simplify_fp_context(optree):
@@ -594,37 +756,23 @@ class OptimizationEngine(object):
         
 
 
-    def instantiate_precision(self, optree, default_precision = None, memoization_map = {}):
+    def instantiate_precision(self, optree, default_precision = None, memoization_map = None):
         """ instantiate final precisions and insert required conversions
             if the operation is not supported """
-        result_precision = optree.get_precision()
-
-
-        if optree in memoization_map:
-            return memoization_map[optree]
-
-
-        if not isinstance(optree, ML_LeafNode):
-
-            for inp in optree.inputs: 
-                self.instantiate_precision(inp, default_precision, memoization_map = memoization_map)
-
+        def instantiate_node_precision(node):
             # instanciating if abstract precision
-            if isinstance(result_precision, ML_AbstractFormat): 
-                format_rule = practical_typing_rule[optree.__class__]
-                result_precision = format_rule(self, optree, default_precision)
+            if not isinstance(node, ML_LeafNode) and isinstance(node.get_precision(), ML_AbstractFormat): 
+                format_rule = practical_typing_rule[node.__class__]
+                result_precision = format_rule(self, node, default_precision)
+                node.set_precision(result_precision)
 
-                optree.set_precision(result_precision)
+            if node.__class__ in post_typing_process_rules:
+                post_rule = post_typing_process_rules[node.__class__]
+                post_rule(self, node)
 
-        for inp in optree.get_extra_inputs(): 
-            self.instantiate_precision(inp, default_precision, memoization_map = memoization_map)
+            return node.get_precision()
 
-        if optree.__class__ in post_typing_process_rules:
-            post_rule = post_typing_process_rules[optree.__class__]
-            post_rule(self, optree)
-        
-        memoization_map[optree] = optree.get_precision()
-        return optree.get_precision()
+        return postorder_apply(optree, get_node_children, instantiate_node_precision, memoization_map)
 
 
     def cb_parent_tagging(self, optree, parent_block = None):
@@ -638,8 +786,12 @@ class OptimizationEngine(object):
                 self.cb_parent_tagging(op, parent_block = parent_block)
 
 
-    def subexpression_sharing(self, optree, sharing_map = {}, level_sharing_map = [{}], current_parent_list = []):
-        def search_level_map(optree):
+    def subexpression_sharing(self, optree, sharing_map = None, level_sharing_map = None, current_parent_list = None):
+        sharing_map = {} if sharing_map is None else sharing_map
+        level_sharing_map = [{}] if level_sharing_map is None else level_sharing_map
+        current_parent_list = [] if current_parent_list is None else current_parent_list
+
+        def search_level_map(optree, level_sharing_map):
             """ search if optree has been defined among the active node """
             for level in level_sharing_map:
                 if optree in level: return True
@@ -653,49 +805,170 @@ class OptimizationEngine(object):
                     return b
             return None
 
-        if isinstance(optree, ConditionBlock):
-            optree.set_parent_list(current_parent_list)
-            # condition
-            self.subexpression_sharing(optree.inputs[0], sharing_map, level_sharing_map, current_parent_list + [optree])
-            # branches
-            for op in optree.inputs[1:]:
-                self.subexpression_sharing(op, sharing_map, [{}] + level_sharing_map, current_parent_list + [optree])
-
-        elif isinstance(optree, SwitchBlock):
-            optree.set_parent_list(current_parent_list)
-
-            # switch value
-            self.subexpression_sharing(optree.inputs[0], sharing_map, level_sharing_map, current_parent_list + [optree])
-            # case_statement
-            case_map = optree.get_case_map()
-            for case in case_map:
-                op = case_map[case]
-                self.subexpression_sharing(op, sharing_map, [{}] + level_sharing_map, current_parent_list + [optree])
+        ## process one node and return the list of (child, (level_sharing_map, current_parent_list))
+        #  to be processed next
+        def share_node(optree, context):
+            level_sharing_map, current_parent_list = context
+            if isinstance(optree, ConditionBlock):
+                optree.set_parent_list(current_parent_list)
+                # condition
+                child_list = [(optree.inputs[0], (level_sharing_map, current_parent_list + [optree]))]
+                # branches
+                for op in optree.inputs[1:]:
+                    child_list.append((op, ([{}] + level_sharing_map, current_parent_list + [optree])))
+                return child_list
 
-        elif isinstance(optree, Statement):
-            if not optree.get_prevent_optimization(): 
-              for op in optree.inputs:
-                  self.subexpression_sharing(op, sharing_map, [{}] + level_sharing_map, current_parent_list)
+            elif isinstance(optree, SwitchBlock):
+                optree.set_parent_list(current_parent_list)
 
-        elif isinstance(optree, Loop):
-            pass
-            #for op in optree.inputs:
-            #    self.subexpression_sharing(op, sharing_map, [{}] + level_sharing_map, current_parent_list)
+                # switch value
+                child_list = [(optree.inputs[0], (level_sharing_map, current_parent_list + [optree]))]
+                # case_statement
+                case_map = optree.get_case_map()
+                for case in case_map:
+                    op = case_map[case]
+                    child_list.append((op, ([{}] + level_sharing_map, current_parent_list + [optree])))
+                return child_list
 
-        elif isinstance(optree, ML_LeafNode):
-            pass
-        else:
-            if optree in sharing_map:
-                if not search_level_map(optree): 
-                    # parallel branch sharing possibility
-                    ancestor = common_ancestor(sharing_map[optree], current_parent_list)            
-                    if ancestor != None:
-                        ancestor.add_to_pre_statement(optree)
+            elif isinstance(optree, Statement):
+                if not optree.get_prevent_optimization(): 
+                    return [(op, ([{}] + level_sharing_map, current_parent_list)) for op in optree.inputs]
+                return []
+
+            elif isinstance(optree, Loop):
+                return []
+
+            elif isinstance(optree, ML_LeafNode):
+                return []
             else:
-                sharing_map[optree] = current_parent_list
-                level_sharing_map[0][optree] = current_parent_list
-                for op in optree.inputs:
-                    self.subexpression_sharing(op, sharing_map, level_sharing_map, current_parent_list)
+                if optree in sharing_map:
+                    if not search_level_map(optree, level_sharing_map): 
+                        # parallel branch sharing possibility
+                        ancestor = common_ancestor(sharing_map[optree], current_parent_list)            
+                        if ancestor != None:
+                            ancestor.add_to_pre_statement(optree)
+                    return []
+                else:
+                    sharing_map[optree] = current_parent_list
+                    level_sharing_map[0][optree] = current_parent_list
+                    return [(op, (level_sharing_map, current_parent_list)) for op in optree.inputs]
+
+        preorder_walk(optree, share_node, (level_sharing_map, current_parent_list))
+
+
+    ## structural sharing: merge structurally equivalent pure nodes of
+    #  <optree> (same operation class, codegen key, precision, rounding
+    #  mode, silent, likely and exact attributes, interval and max_abs_error
+    #  annotations, and same canonical operands; constants of the same
+    #  instanciated format and value), e.g. operations built twice in
+    #  different parts of a scheme.
+    #  A node is only replaced by an equivalent node of its scope or of an
+    #  enclosing scope (ConditionBlock and SwitchBlock branches open new
+    #  scopes), loop bodies are not processed. Pure nodes only depend on
+    #  constants, tables and input variables which are never assigned.
+    #  Sharing between parallel branches is left to subexpression_sharing.
+    #  @return number of merged nodes
+    def structural_sharing(self, optree):
+        assigned_variables = set()
+        for node in topological_order(optree):
+            if isinstance(node, ReferenceAssign):
+                assigned_variables.update(op for op in topological_order(node.get_input(0)) if isinstance(op, Variable))
+
+        # node -> canonical node
+        canonical_map = {}
+        # canonical nodes which only depend on pure nodes
+        pure_nodes = set()
+        merge_count = 0
+
+        def get_key(node):
+            if node.get_debug() or node.get_prevent_optimization():
+                return None
+            if isinstance(node, Constant):
+                precision = node.get_precision()
+                # abstract formats (e.g. ML_Integer) have no constant encoding
+                if isinstance(precision, ML_AbstractFormat):
+                    return None
+                if isinstance(precision, ML_FP_Format) or isinstance(precision, ML_Fixed_Format) or isinstance(precision, ML_VectorFormat):
+                    return (Constant, precision, precision.get_cst(node.get_value(), language = C_Code))
+                return None
+            if not isinstance(node, ML_ArithmeticOperation) or isinstance(node, Dereference):
+                return None
+            if isinstance(node, TableLoad) and not isinstance(node.get_input(0), ML_Table):
+                return None
+            if not all(op in pure_nodes for op in node.inputs):
+                return None
+            likely = node.get_likely() if isinstance(node, BooleanOperation) else None
+            return (node.__class__, node.get_codegen_key(), node.get_precision(), node.get_rounding_mode(), node.get_silent(), likely, node.get_exact()) + tuple(id(op) for op in node.inputs)
+
+        ## interval and max_abs_error annotations (sollya objects, not
+        #  hashable) are compared when an operation matches a key
+        #  (the interval of a constant is given by its value)
+        def same_annotations(node, other):
+            if isinstance(node, Constant):
+                return True
+            for value, other_value in [(node.get_interval(), other.get_interval()), (node.get_max_abs_error(), other.get_max_abs_error())]:
+                if value is other_value:
+                    continue
+                if value is None or other_value is None or not value == other_value:
+                    return False
+            return True
+
+        ## @return list of (child, scope list) to be processed before <node>
+        def get_scoped_children(node, scope_list):
+            if isinstance(node, Loop) or (isinstance(node, Statement) and node.get_prevent_optimization()):
+                return []
+            elif isinstance(node, ConditionBlock) or isinstance(node, SwitchBlock):
+                branch_list = node.inputs[1:] if isinstance(node, ConditionBlock) else node.get_extra_inputs()
+                return [(node.get_pre_statement(), scope_list), (node.inputs[0], scope_list)] + [(branch, [{}] + scope_list) for branch in branch_list]
+            elif isinstance(node, ReferenceAssign):
+                # the assignment target is left unchanged
+                return [(op, scope_list) for op in node.inputs[1:]]
+            elif isinstance(node, ML_LeafNode):
+                return []
+            return [(op, scope_list) for op in node.inputs]
+
+        ## replace the operands of <node> (from index <start>) by their canonical node
+        def update_inputs(node, start):
+            input_list = list(node.inputs)
+            new_input_list = input_list[:start] + [canonical_map.get(op, op) for op in input_list[start:]]
+            if any(not new_op is op for new_op, op in zip(new_input_list, input_list)):
+                node.inputs = tuple(new_input_list) if isinstance(node.inputs, tuple) else new_input_list
+
+        # iterative depth-first traversal: each node is processed once, after
+        # its children, in the scope it is first reached from
+        visited = set()
+        node_stack = [(optree, [{}], False)]
+        while node_stack:
+            node, scope_list, children_done = node_stack.pop()
+            if not children_done:
+                if node in visited: continue
+                visited.add(node)
+                node_stack.append((node, scope_list, True))
+                for child, child_scope_list in reversed(get_scoped_children(node, scope_list)):
+                    if not child in visited:
+                        node_stack.append((child, child_scope_list, False))
+                continue
+
+            canonical_map[node] = node
+            if not isinstance(node, ML_LeafNode):
+                update_inputs(node, 1 if isinstance(node, ReferenceAssign) else 0)
+            if isinstance(node, ML_Table) or (isinstance(node, Variable) and node.get_var_type() is Variable.Input and not node in assigned_variables):
+                pure_nodes.add(node)
+                continue
+            key = get_key(node)
+            if key is None:
+                continue
+            for scope in scope_list:
+                if key in scope and same_annotations(node, scope[key]):
+                    canonical_map[node] = scope[key]
+                    merge_count += 1
+                    break
+            else:
+                scope_list[0][key] = node
+                pure_nodes.add(node)
+
+        Log.report(Log.Verbose, "structural sharing: %d node(s) merged" % merge_count)
+        return merge_count
 
 
     def extract_fast_path(self, optree):
@@ -786,130 +1059,263 @@ class OptimizationEngine(object):
             Log.report(Log.Error, "unsupported root for fast path factorization")
 
 
-    def fuse_multiply_add(self, optree, silence = False, memoization = {}):
+    def fuse_multiply_add(self, optree, silence = False, memoization = None):
         """ whenever possible fuse a multiply and add/sub into a FMA/FMS """
-        if (isinstance(optree, Addition) or isinstance(optree, Subtraction)) and not optree.get_unbreakable():
-            if len(optree.inputs) != 2:
+        memoization = {} if memoization is None else memoization
+        # fusion pattern selected for each node
+        pattern_map = {}
+
+        def is_fusable_multiplication(op):
+            return isinstance(op, Multiplication) and not op.get_prevent_optimization()
+
+        ## select the fusion pattern of <optree> and return the list
+        #  of nodes which must be processed before <optree>
+        def get_fma_children(optree):
+            pattern = None
+            if (isinstance(optree, Addition) or isinstance(optree, Subtraction)) and not optree.get_unbreakable() and len(optree.inputs) == 2:
+                op0, op1 = optree.inputs
+                if True in [(op.get_debug() != None and isinstance(op, Multiplication)) for op in optree.inputs]:
+                    # exclude node with debug operands
+                    pattern = None
+                elif self.get_dot_product_enabled() and is_fusable_multiplication(op0) and is_fusable_multiplication(op1):
+                    pattern = "dot_product"
+                    children = [op0.inputs[0], op0.inputs[1], op1.inputs[0], op1.inputs[1]]
+                elif is_fusable_multiplication(op0):
+                    pattern = "fma_lhs"
+                    children = [op0.inputs[0], op0.inputs[1], op1]
+                elif is_fusable_multiplication(op1):
+                    pattern = "fma_rhs"
+                    children = [op1.inputs[0], op1.inputs[1], op0]
+            pattern_map[optree] = pattern
+            if pattern is None:
                 # more than 2-operand addition are not supported yet
-                optree.inputs = tuple(self.fuse_multiply_add(op, silence = silence, memoization = memoization) for op in optree.inputs)
+                children = get_node_children(optree)
+            return children
+
+        def fuse_node(optree):
+            pattern = pattern_map.pop(optree)
+            if pattern is None:
+                if optree.get_extra_inputs() != []: 
+                    optree.set_extra_inputs([memoization[op] for op in optree.get_extra_inputs()])
+                if not isinstance(optree, ML_LeafNode):
+                    optree.inputs = tuple(memoization[op] for op in optree.inputs)
                 return optree
 
-            else:
-                if optree in memoization: 
-                    return memoization[optree]
-
-                elif optree.get_unbreakable():
-                    optree.inputs = tuple(self.fuse_multiply_add(op, silence = silence, memoization = memoization) for op in optree.inputs)
-                    memoization[optree] = optree
-                    return optree
+            elif pattern == "dot_product":
+                specifier = FusedMultiplyAdd.DotProductNegate if isinstance(optree, Subtraction) else FusedMultiplyAdd.DotProduct 
+                mult0 = memoization[optree.inputs[0].inputs[0]]
+                mult1 = memoization[optree.inputs[0].inputs[1]]
+                mult2 = memoization[optree.inputs[1].inputs[0]]
+                mult3 = memoization[optree.inputs[1].inputs[1]]
+                new_op = FusedMultiplyAdd(mult0, mult1, mult2, mult3, specifier = specifier)
+                # propagating exact attribute
+                exact = optree.inputs[0].get_exact() and optree.inputs[1].get_exact() and optree.get_exact()
+
+            elif pattern == "fma_lhs":
+                specifier = FusedMultiplyAdd.Subtract if isinstance(optree, Subtraction) else FusedMultiplyAdd.Standard 
+                mult0 = memoization[optree.inputs[0].inputs[0]]
+                mult1 = memoization[optree.inputs[0].inputs[1]]
+                addend = memoization[optree.inputs[1]]
+                new_op = FusedMultiplyAdd(mult0, mult1, addend, specifier = specifier)
+                # propagating exact attribute
+                exact = optree.inputs[0].get_exact() and optree.get_exact()
 
-                elif True in [(op.get_debug() != None and isinstance(op, Multiplication)) for op in optree.inputs]:
-                    # exclude node with debug operands
-                    optree.inputs = tuple(self.fuse_multiply_add(op, silence = silence, memoization = memoization) for op in optree.inputs)
-                    memoization[optree] = optree
-                    return optree
-
-                elif self.get_dot_product_enabled() and isinstance(optree.inputs[0], Multiplication) and isinstance(optree.inputs[1], Multiplication) and not optree.inputs[0].get_prevent_optimization() and not optree.inputs[1].get_prevent_optimization():
-                    specifier = FusedMultiplyAdd.DotProductNegate if isinstance(optree, Subtraction) else FusedMultiplyAdd.DotProduct 
-                    mult0 = self.fuse_multiply_add(optree.inputs[0].inputs[0], silence = silence, memoization = memoization)
-                    mult1 = self.fuse_multiply_add(optree.inputs[0].inputs[1], silence = silence, memoization = memoization)
-                    mult2 = self.fuse_multiply_add(optree.inputs[1].inputs[0], silence = silence, memoization = memoization)
-                    mult3 = self.fuse_multiply_add(optree.inputs[1].inputs[1], silence = silence, memoization = memoization)
-                    new_op = FusedMultiplyAdd(mult0, mult1, mult2, mult3, specifier = specifier)
-                    new_op.attributes = optree.attributes.get_light_copy()
-                    new_op.set_silent(silence)
-                    new_op.set_index(optree.get_index())
-                    # propagating exact attribute
-                    if optree.inputs[0].get_exact() and optree.inputs[1].get_exact() and optree.get_exact():
-                        new_op.set_exact(True)
-                    # modifying handle
-                    if self.change_handle: optree.get_handle().set_node(new_op)
-                    memoization[optree] = new_op
-                    return new_op
-
-                elif isinstance(optree.inputs[0], Multiplication) and not optree.inputs[0].get_prevent_optimization():
-                    specifier = FusedMultiplyAdd.Subtract if isinstance(optree, Subtraction) else FusedMultiplyAdd.Standard 
-                    mult0 = self.fuse_multiply_add(optree.inputs[0].inputs[0], silence = silence, memoization = memoization)
-                    mult1 = self.fuse_multiply_add(optree.inputs[0].inputs[1], silence = silence, memoization = memoization)
-                    addend = self.fuse_multiply_add(optree.inputs[1], silence = silence, memoization = memoization)
-
-                    new_op = FusedMultiplyAdd(mult0, mult1, addend, specifier = specifier)
-                    new_op.attributes = optree.attributes.get_light_copy()
-                    new_op.set_silent(silence)
-                    new_op.set_index(optree.get_index())
-
-                    # propagating exact attribute
-                    if optree.inputs[0].get_exact() and optree.get_exact():
-                        new_op.set_exact(True)
-
-                    # modifying handle
-                    if self.change_handle: optree.get_handle().set_node(new_op)
-
-                    memoization[optree] = new_op
-                    return new_op
-
-                elif isinstance(optree.inputs[1], Multiplication) and not optree.inputs[1].get_prevent_optimization():
-                    specifier = FusedMultiplyAdd.SubtractNegate if isinstance(optree, Subtraction) else FusedMultiplyAdd.Standard 
-                    mult0 = self.fuse_multiply_add(optree.inputs[1].inputs[0], silence = silence, memoization = memoization)
-                    mult1 = self.fuse_multiply_add(optree.inputs[1].inputs[1], silence = silence, memoization = memoization)
-                    addend = self.fuse_multiply_add(optree.inputs[0], silence = silence)
-                    new_op = FusedMultiplyAdd(mult0, mult1, addend, specifier = specifier)
-                    new_op.attributes = optree.attributes.get_light_copy()
-                    new_op.set_silent(silence)
-                    new_op.set_commutated(True)
-                    memoization[optree] = new_op
-
-                    new_op.set_index(optree.get_index())
-                    # propagating exact attribute
-                    if optree.inputs[1].get_exact() and optree.get_exact():
-                        new_op.set_exact(True)
-
-                    # modifying handle
-                    if self.change_handle: optree.get_handle().set_node(new_op)
-
-                    return new_op
-                else:
-                    optree.inputs = tuple(self.fuse_multiply_add(op, silence = silence, memoization = memoization) for op in optree.inputs)
-                    memoization[optree] = optree
-                    return optree
+            else:
+                specifier = FusedMultiplyAdd.SubtractNegate if isinstance(optree, Subtraction) else FusedMultiplyAdd.Standard 
+                mult0 = memoization[optree.inputs[1].inputs[0]]
+                mult1 = memoization[optree.inputs[1].inputs[1]]
+                addend = memoization[optree.inputs[0]]
+                new_op = FusedMultiplyAdd(mult0, mult1, addend, specifier = specifier)
+                new_op.set_commutated(True)
+                # propagating exact attribute
+                exact = optree.inputs[1].get_exact() and optree.get_exact()
+
+            new_op.copy_attributes(optree, light = True)
+            new_op.set_silent(silence)
+            new_op.set_index(optree.get_index())
+            if exact:
+                new_op.set_exact(True)
+            # modifying handle
+            if self.change_handle: optree.get_handle().set_node(new_op)
+            return new_op
+
+        return postorder_apply(optree, get_fma_children, fuse_node, memoization)
+
+    ## evaluate <optree> if all its operands are constants
+    #  floating-point operations are evaluated exactly by sollya and
+    #  rounded once to their format, integer operations follow C semantics
+    #  @return new Constant node, None if <optree> can not be folded
+    def fold_constant_operation(self, optree):
+        precision = optree.get_precision()
+        if isinstance(optree, Conversion):
+            op = optree.inputs[0]
+            op_precision = op.get_precision()
+            if isinstance(precision, ML_Std_FP_Format) and (isinstance(op_precision, ML_Std_FP_Format) or is_std_integer_format(op_precision)):
+                value = get_constant_value(op)
+                if value is None: return None
+                value = round_fp_constant_value(value, precision, optree.get_rounding_mode())
+            elif is_std_integer_format(precision) and is_std_integer_format(op_precision):
+                # float to integer conversions depend on the target
+                # implementation (truncation or rounding), they are not folded
+                value = get_integer_constant_value(op)
+                if value is None: return None
+                value = wrap_integer_value(value, precision)
+            else:
+                return None
+        elif isinstance(precision, ML_Std_FP_Format) and (optree.__class__ in fp_folding_map or (isinstance(optree, FusedMultiplyAdd) and optree.specifier in fma_folding_map)):
+            if False in [op.get_precision() == precision for op in optree.inputs]:
+                return None
+            value_list = [get_constant_value(op) for op in optree.inputs]
+            if None in value_list: return None
+            fold_function = fma_folding_map[optree.specifier] if isinstance(optree, FusedMultiplyAdd) else fp_folding_map[optree.__class__]
+            exact_value = fold_function(*tuple(SollyaObject(value) for value in value_list))
+            value = round_fp_constant_value(exact_value, precision, optree.get_rounding_mode())
+        elif is_std_integer_format(precision) and optree.__class__ in integer_folding_map:
+            is_shift = isinstance(optree, BitLogicLeftShift) or isinstance(optree, BitLogicRightShift)
+            # shift amounts may have a different format
+            typed_inputs = optree.inputs[:1] if is_shift else optree.inputs
+            if False in [op.get_precision() == precision for op in typed_inputs]:
+                return None
+            # constant values are taken as stored in their format
+            # (e.g. -2 as an ML_UInt64 is 2**64 - 2)
+            value_list = [get_integer_constant_value(op) for op in optree.inputs]
+            if None in value_list: return None
+            value_list = [wrap_integer_value(value, op.get_precision()) if is_std_integer_format(op.get_precision()) else value for value, op in zip(value_list, optree.inputs)]
+            if None in value_list: return None
+            if is_shift and not (0 <= value_list[1] < precision.get_bit_size()):
+                return None
+            # shifts of negative values are undefined (left) or
+            # implementation-defined (right)
+            if is_shift and value_list[0] < 0:
+                return None
+            if isinstance(optree, Division) or isinstance(optree, Modulo):
+                # division by zero and signed quotient overflow are undefined
+                if value_list[1] == 0 or wrap_integer_value(c_integer_division(*value_list), precision) is None:
+                    return None
+            value = wrap_integer_value(integer_folding_map[optree.__class__](*value_list), precision)
         else:
-            if optree.get_extra_inputs() != []: 
-                optree.set_extra_inputs([self.fuse_multiply_add(op, silence = silence, memoization = memoization) for op in optree.get_extra_inputs()])
-
+            return None
+        return None if value is None else Constant(value, precision = precision)
+
+    ## algebraic simplification of <optree> (peephole rules which do not
+    #  change the result of the operation, signed zeros included)
+    #  @return simplified node, None if no rule applies
+    def simplify_operation(self, optree):
+        precision = optree.get_precision()
+        is_fp = isinstance(precision, ML_FP_Format)
+        is_integer = isinstance(precision, ML_Fixed_Format)
+        if not (is_fp or is_integer):
+            return None
+        ## <op> if it can replace <optree>
+        def forward(op):
+            return op if op.get_precision() == precision else None
+
+        if isinstance(optree, Multiplication):
+            op0, op1 = optree.inputs
+            if is_constant_equal(op1, 1): return forward(op0)
+            if is_constant_equal(op0, 1): return forward(op1)
+            # x * 0 is not 0 for infinite, NaN or negative x
+            if is_integer and (is_constant_equal(op0, 0) or is_constant_equal(op1, 0)):
+                return Constant(0, precision = precision)
+        elif isinstance(optree, Division):
+            if is_constant_equal(optree.inputs[1], 1): return forward(optree.inputs[0])
+        elif isinstance(optree, Addition):
+            op0, op1 = optree.inputs
+            # x + 0.0 is 0.0 (not x) for x = -0.0, x + (-0.0) is always x
+            is_neutral = is_negative_zero if is_fp else lambda op: is_constant_equal(op, 0)
+            if is_neutral(op1): return forward(op0)
+            if is_neutral(op0): return forward(op1)
+        elif isinstance(optree, Subtraction):
+            op0, op1 = optree.inputs
+            if is_constant_equal(op1, 0) and not is_negative_zero(op1): return forward(op0)
+        elif isinstance(optree, Negation):
+            op = optree.inputs[0]
+            if isinstance(op, Negation) and not op.get_debug(): return forward(op.inputs[0])
+        elif isinstance(optree, BitLogicOr) or isinstance(optree, BitLogicXor):
+            op0, op1 = optree.inputs
+            if is_constant_equal(op1, 0): return forward(op0)
+            if is_constant_equal(op0, 0): return forward(op1)
+        elif isinstance(optree, BitLogicLeftShift) or isinstance(optree, BitLogicRightShift):
+            if is_constant_equal(optree.inputs[1], 0): return forward(optree.inputs[0])
+        elif isinstance(optree, TypeCast) or isinstance(optree, Conversion):
+            op = optree.inputs[0]
+            if op.get_precision() == precision: return op
+            if isinstance(optree, TypeCast) and isinstance(op, TypeCast) and not op.get_debug():
+                # bit-field reinterpretations compose
+                if op.inputs[0].get_precision() == precision: return op.inputs[0]
+                new_op = TypeCast(op.inputs[0], precision = precision)
+                new_op.copy_attributes(optree, light = True)
+                return new_op
+        elif isinstance(optree, FusedMultiplyAdd) and optree.specifier in [FusedMultiplyAdd.Standard, FusedMultiplyAdd.Subtract]:
+            # x * 1 is exact: fma(x, 1, z) = x + z
+            op0, op1, addend = optree.inputs
+            mult_op = op0 if is_constant_equal(op1, 1) else (op1 if is_constant_equal(op0, 1) else None)
+            if mult_op is None or mult_op.get_precision() != precision:
+                return None
+            new_op = (Addition if optree.specifier is FusedMultiplyAdd.Standard else Subtraction)(mult_op, addend, precision = precision)
+            new_op.copy_attributes(optree, light = True)
+            return new_op
+        return None
+
+    ## constant folding and algebraic simplification: operations on
+    #  constants are evaluated (see fold_constant_operation) and peephole
+    #  rules are applied (see simplify_operation); debug and
+    #  prevent_optimization nodes are left unchanged
+    #  The pass runs before fuse_fma and precision instantiation: only
+    #  operations whose format (and operand formats) are already
+    #  instanciated are folded, operations on abstract formats (ML_Integer,
+    #  ML_Float) are left to run time
+    #  @return optimized scheme
+    def constant_folding(self, optree, memoization_map = None):
+        memoization_map = {} if memoization_map is None else memoization_map
+        simplified_count = [0]
+
+        def fold_node(optree):
+            if optree.get_extra_inputs() != []:
+                optree.set_extra_inputs([memoization_map[op] for op in optree.get_extra_inputs()])
             if isinstance(optree, ML_LeafNode):
-                memoization[optree] = optree
                 return optree
-            else:
-                optree.inputs = tuple(self.fuse_multiply_add(op, silence = silence, memoization = memoization) for op in optree.inputs)
-                memoization[optree] = optree
+            input_list = [memoization_map[op] for op in optree.inputs]
+            if False in [new_op is op for new_op, op in zip(input_list, optree.inputs)]:
+                optree.inputs = tuple(input_list) if isinstance(optree.inputs, tuple) else input_list
+            if not isinstance(optree, ML_ArithmeticOperation) or optree.get_debug() or optree.get_prevent_optimization():
                 return optree
+            new_optree = optree
+            while isinstance(new_optree, ML_ArithmeticOperation):
+                # nodes built by a simplification are simplified again
+                simplified_optree = self.fold_constant_operation(new_optree)
+                if simplified_optree is None:
+                    simplified_optree = self.simplify_operation(new_optree)
+                if simplified_optree is None:
+                    break
+                new_optree = simplified_optree
+            if new_optree is optree:
+                return optree
+            simplified_count[0] += 1
+            # modifying handle
+            if self.change_handle: optree.get_handle().set_node(new_optree)
+            return new_optree
+
+        new_optree = postorder_apply(optree, get_node_children, fold_node, memoization_map)
+        Log.report(Log.Verbose, "constant folding: %d node(s) simplified" % simplified_count[0])
+        return new_optree
 
     def silence_fp_operations(self, optree, force = False):
-        if isinstance(optree, ML_LeafNode):
-            pass
-        else:
-            for op in optree.inputs:
-                self.silence_fp_operations(op, force = force)
-            for op in optree.get_extra_inputs():
-                self.silence_fp_operations(op, force = force)
+        def silence_node(optree):
             if isinstance(optree, Multiplication) or isinstance(optree, Addition) or isinstance(optree, FusedMultiplyAdd) or isinstance(optree, Subtraction):
                 if optree.get_silent() == None: optree.set_silent(True)
+        postorder_apply(optree, get_node_children, silence_node)
 
 
-    def register_nodes_by_tag(self, optree, node_map = {}):
+    def register_nodes_by_tag(self, optree, node_map = None):
         """ build a map tag->optree """
-        # registering node if tag is defined
-        if optree.get_tag() != None:
-            node_map[optree.get_tag()] = optree
-
-        # processing extra_inputs list
-        for op in optree.get_extra_inputs():
-            self.register_nodes_by_tag(op, node_map)
-
-        # processing inputs list for non ML_LeafNode optree
-        if not isinstance(optree, ML_LeafNode):
-            for op in optree.inputs:
-                self.register_nodes_by_tag(op, node_map)
+        node_map = {} if node_map is None else node_map
+        def register_node(optree):
+            # registering node if tag is defined
+            if optree.get_tag() != None:
+                node_map[optree.get_tag()] = optree
+        postorder_apply(optree, get_node_children, register_node)
+        return node_map
 
     def has_support_simplification(self, optree):
         if optree.__class__ in support_simplification:
@@ -940,18 +1346,26 @@ class OptimizationEngine(object):
       
 
 
-    def check_processor_support(self, optree, memoization_map = {}, debug = False):
+    def check_processor_support(self, optree, memoization_map = None, debug = False):
         """ check if all precision-instantiated operation are supported by the processor """
         if debug:
           print "checking processor support: ", self.processor.__class__ # Debug print
-        if  optree in memoization_map:
-            return True
-        if not isinstance(optree, ML_LeafNode):
-            for inp in optree.inputs:
-                self.check_processor_support(inp, memoization_map, debug = debug)
 
+        def get_support_children(optree):
+            if isinstance(optree, ML_LeafNode):
+                return []
+            children = list(optree.inputs)
             if isinstance(optree, ConditionBlock):
-                self.check_processor_support(optree.get_pre_statement(), memoization_map, debug = debug)
+                children.append(optree.get_pre_statement())
+            elif isinstance(optree, SwitchBlock):
+                # TODO: assert case is integer constant
+                children += optree.get_extra_inputs()
+            return children
+
+        def check_node_support(optree):
+            if isinstance(optree, ML_LeafNode):
+                pass
+            elif isinstance(optree, ConditionBlock):
                 pass
             elif isinstance(optree, Statement):
                 pass
@@ -962,11 +1376,7 @@ class OptimizationEngine(object):
             elif isinstance(optree, ReferenceAssign):
                 pass 
             elif isinstance(optree, SwitchBlock):
-                #self.check_processor_support(optree.get_pre_statement(), memoization_map)
-
-                for op in optree.get_extra_inputs():
-                  # TODO: assert case is integer constant
-                  self.check_processor_support(op, memoization_map, debug = debug)
+                pass
             elif not self.processor.is_supported_operation(optree, debug = debug):
                 # trying operand format escalation
                 init_optree = optree
@@ -999,7 +1409,6 @@ class OptimizationEngine(object):
                         Log.report(Log.Verbose, "into %s" % simplified_tree.get_str(depth = 2, display_precision = True))
                         optree.change_to(simplified_tree)
                         if self.processor.is_supported_operation(optree):
-                            memoization_map[optree] = True
                             return True
                         
                     print optree # Error print
@@ -1007,8 +1416,9 @@ class OptimizationEngine(object):
                     print self.processor.get_operation_keys(optree) # Error print
                     print optree.get_str(display_precision = True, display_id = True, memoization_map = {}) # Error print
                     Log.report(Log.Error, "unsupported operation\n")
-        # memoization
-        memoization_map[optree] = True
+            return True
+
+        postorder_apply(optree, get_support_children, check_node_support, memoization_map)
         return True
 
 
@@ -1017,27 +1427,149 @@ class OptimizationEngine(object):
         return optree
 
 
-    def exactify(self, optree, exact_format = ML_Exact, memoization_map = {}):
+    def exactify(self, optree, exact_format = ML_Exact, memoization_map = None):
         """ recursively process <optree> according to table exactify_rule 
             to translete each node into is exact counterpart (no rounding error)
             , generally by setting its precision to <exact_format> """
-        if optree in memoization_map:
-            return memoization_map[optree]
-        if not isinstance(optree, ML_LeafNode):
-            for inp in optree.inputs:
-                self.exactify(inp, exact_format, memoization_map)
-            for inp in optree.get_extra_inputs():
-                self.exactify(inp, exact_format, memoization_map)
-
-        if optree.__class__ in exactify_rule:
-            for cond in exactify_rule[optree.__class__][None]:
-                if cond(optree, exact_format):
-                    new_optree = exactify_rule[optree.__class__][None][cond](self, optree, exact_format)
-                    memoization_map[optree] = new_optree
-                    return new_optree   
-
-        memoization_map[optree] = optree
-        return optree
+        def exactify_node(optree):
+            if optree.__class__ in exactify_rule:
+                for cond in exactify_rule[optree.__class__][None]:
+                    if cond(optree, exact_format):
+                        return exactify_rule[optree.__class__][None][cond](self, optree, exact_format)
+            return optree
+
+        return postorder_apply(optree, get_node_children, exactify_node, memoization_map)
+
+
+    ## test if <optree> can be evaluated speculatively: value DAG
+    #  without side effect nor evaluation that may trap or be undefined
+    #  (table load, integer division, floating-point to integer
+    #  conversion, signed integer overflow)
+    def is_speculation_safe(self, optree, memoization_map = None):
+        memoization_map = {} if memoization_map is None else memoization_map
+        def is_node_safe(node):
+            if isinstance(node, Constant) or isinstance(node, Variable):
+                return True
+            elif isinstance(node, TableLoad):
+                return False
+            elif isinstance(node, Division) or isinstance(node, Modulo):
+                node_safe = isinstance(node.get_precision(), ML_FP_Format)
+            elif isinstance(node, Conversion) or isinstance(node, NearestInteger):
+                # floating-point to integer conversion of an out-of-range
+                # value is undefined
+                node_safe = is_fp_format(node.get_precision()) or not any(is_fp_format(op.get_precision()) for op in node.get_inputs())
+            elif node.__class__ in signed_overflow_operation_list:
+                # signed integer overflow is undefined
+                node_safe = not is_signed_integer_format(node.get_precision())
+            elif isinstance(node, ML_ArithmeticOperation):
+                node_safe = True
+            elif isinstance(node, SpecificOperation) and not isinstance(node, ExceptionOperation):
+                node_safe = node.get_specifier() in [SpecificOperation.DivisionSeed, SpecificOperation.InverseSquareRootSeed]
+            else:
+                return False
+            return node_safe and all(memoization_map[op] for op in node.get_inputs())
+        def get_inputs(node):
+            return [] if isinstance(node, ML_LeafNode) else list(node.get_inputs())
+        return postorder_apply(optree, get_inputs, is_node_safe, memoization_map)
+
+    ## value returned by the statement <optree> when it consists of a
+    #  speculation-safe Return (possibly preceded by speculation-safe
+    #  expressions), None otherwise
+    def get_speculative_return_value(self, optree, memoization_map):
+        if isinstance(optree, Return):
+            value = optree.get_input(0)
+            return value if self.is_speculation_safe(value, memoization_map) else None
+        elif isinstance(optree, Statement) and len(optree.get_inputs()) > 0:
+            for op in optree.get_inputs()[:-1]:
+                if not self.is_speculation_safe(op, memoization_map):
+                    return None
+            return self.get_speculative_return_value(optree.get_inputs()[-1], memoization_map)
+        return None
+
+    ## evaluation cost of the nodes of the DAGs <optree_list>, nodes
+    #  of <free_nodes> (already evaluated) excluded
+    def get_speculation_cost(self, optree_list, free_nodes):
+        visited = set(free_nodes)
+        cost = 0
+        node_stack = list(optree_list)
+        while node_stack:
+            node = node_stack.pop()
+            if node in visited: continue
+            visited.add(node)
+            if isinstance(node, ML_LeafNode): continue
+            cost += if_conversion_cost_table.get(node.__class__, 1)
+            node_stack.extend(node.get_inputs())
+        return cost
+
+    ## if-conversion cost model: compare the cost of evaluating both
+    #  branches followed by a Select with the expected cost of the branch
+    #  @param vector_size integer, vector implementation are always converted
+    #         (a remaining branch sends lanes to the scalar slow path)
+    def is_if_conversion_profitable(self, cond, if_value, else_value, vector_size = 1):
+        if vector_size > 1:
+            return True
+        cond_nodes = set(topological_order(cond))
+        if_cost = self.get_speculation_cost([if_value], cond_nodes)
+        else_cost = self.get_speculation_cost([else_value], cond_nodes)
+        select_cost = self.get_speculation_cost([if_value, else_value], cond_nodes) + 1
+        likely = cond.get_likely() if isinstance(cond, BooleanOperation) else None
+        if likely is True or likely is False:
+            rate = IF_CONVERSION_LIKELY_MISPREDICTION_RATE
+            likely_cost, unlikely_cost = (if_cost, else_cost) if likely else (else_cost, if_cost)
+            branch_cost = (1 - rate) * likely_cost + rate * unlikely_cost
+        else:
+            rate = IF_CONVERSION_UNKNOWN_MISPREDICTION_RATE
+            branch_cost = (if_cost + else_cost) / 2.0
+        branch_cost += rate * IF_CONVERSION_MISPREDICTION_COST
+        return select_cost <= branch_cost
+
+    ## build Return(Select(cond, if_value, else_value)) if the conversion
+    #  is possible and profitable, None otherwise
+    def if_convert_branches(self, cond, if_branch, else_branch, vector_size, memoization_map):
+        if_value = self.get_speculative_return_value(if_branch, memoization_map)
+        else_value = self.get_speculative_return_value(else_branch, memoization_map)
+        if if_value is None or else_value is None:
+            return None
+        if if_value.get_precision() != else_value.get_precision():
+            return None
+        if not self.is_if_conversion_profitable(cond, if_value, else_value, vector_size):
+            return None
+        return Return(Select(cond, if_value, else_value, precision = if_value.get_precision()), precision = if_value.get_precision())
+
+    ## convert side-effect free ConditionBlock/Return structures of the
+    #  scheme <optree> into Select DAGs (bottom-up), when the cost model
+    #  (is_if_conversion_profitable) allows it
+    #  @param vector_size integer vector size of the implementation <optree>
+    #         is (scalar scheme) generated for
+    #  @return new root of the scheme
+    def if_conversion(self, optree, vector_size = 1, memoization_map = None):
+        memoization_map = {} if memoization_map is None else memoization_map
+        if isinstance(optree, ConditionBlock):
+            pre_statement = optree.get_pre_statement()
+            self.if_conversion(pre_statement, vector_size, memoization_map)
+            new_inputs = [optree.get_input(0)] + [self.if_conversion(op, vector_size, memoization_map) for op in optree.get_inputs()[1:]]
+            optree.inputs = tuple(new_inputs)
+            if len(new_inputs) == 3 and len(pre_statement.get_inputs()) == 0:
+                converted = self.if_convert_branches(new_inputs[0], new_inputs[1], new_inputs[2], vector_size, memoization_map)
+                if converted != None:
+                    return converted
+            return optree
+        elif isinstance(optree, Statement):
+            new_inputs = [self.if_conversion(op, vector_size, memoization_map) for op in optree.get_inputs()]
+            # ConditionBlock without else branch followed by a returning
+            # statement list: the statement list is the else branch
+            index = len(new_inputs) - 2
+            while index >= 0:
+                op = new_inputs[index]
+                if isinstance(op, ConditionBlock) and len(op.get_inputs()) == 2 and len(op.get_pre_statement().get_inputs()) == 0:
+                    converted = self.if_convert_branches(op.get_input(0), op.get_input(1), Statement(*tuple(new_inputs[index + 1:])), vector_size, memoization_map)
+                    if converted != None:
+                        new_inputs = new_inputs[:index] + [converted]
+                index -= 1
+            optree.inputs = tuple(new_inputs)
+            return optree
+        else:
+            return optree
 
 
     def static_vectorization(self, optree):
@@ -1049,35 +1581,12 @@ class OptimizationEngine(object):
         # copying when required
         scheme = pre_scheme if not copy else pre_scheme.copy({})
 
-        if fuse_fma:
-            Log.report(Log.Info, "Fusing FMA")
-        scheme_post_fma = scheme if not fuse_fma else self.fuse_multiply_add(scheme, silence = silence_fp_operations)
-        
-        Log.report(Log.Info, "Infering types")
-        self.instantiate_abstract_precision(scheme_post_fma, None)
-        Log.report(Log.Info, "Instantiating precisions")
-        self.instantiate_precision(scheme_post_fma, default_precision)
-
-        if subexpression_sharing:
-            Log.report(Log.Info, "Sharing sub-expressions")
-            self.subexpression_sharing(scheme_post_fma)
-
-        if silence_fp_operations:
-            Log.report(Log.Info, "Silencing exceptions in internal fp operations")
-            self.silence_fp_operations(scheme_post_fma)
-
-        Log.report(Log.Info, "Checking processor support")
-        self.check_processor_support(scheme_post_fma, memoization_map = {})
+        # the custom pipeline (self.pass_list) only applies to the top-level
+        # function optimization, not to sub-schemes optimized here
+        pass_list = ["constant_folding"] + (["fuse_fma"] if fuse_fma else []) + ["instantiate_abstract_precision", "instantiate_precision"]
+        pass_list += ["structural_sharing", "subexpression_sharing"] if subexpression_sharing else []
+        pass_list += ["silence_fp_operations"] if silence_fp_operations else []
+        pass_list += ["check_processor_support"]
+        pass_list += ["factorize_fast_path"] if factorize_fast_path else []
 
-        if factorize_fast_path:
-            Log.report(Log.Info, "Factorizing fast path")
-            self.factorize_fast_path(scheme_post_fma)
-
-        return scheme_post_fma
-        
-
-
-            
-
-
-        
+        return self.execute_pass_list(scheme, pass_list, default_precision = default_precision, silence = silence_fp_operations)
@@ -11,10 +11,11 @@
 
 from sollya import Interval
 
-from ml_operations import ML_LeafNode, BitLogicAnd, BitLogicRightShift, TypeCast, Constant
+from ml_operations import ML_LeafNode, AbstractOperation, BitLogicAnd, BitLogicRightShift, TypeCast, Constant
 from attributes import Attributes, attr_init
 from ml_formats import ML_Int32, ML_Int64, ML_UInt32, ML_UInt64
 from ..code_generation.code_constant import *
+from ..utility.profiling import Profile
 
 def create_multi_dim_array(dimensions, init_data = None):
     """ create a multi dimension array """
@@ -44,20 +45,39 @@ class ML_Table(ML_LeafNode):
     """ Metalibm Table object """
     def __init__(self, **kwords): 
         self.attributes = Attributes(**kwords)
+        # node index (order of generation of the operands, see ordered_generation)
+        self.index = AbstractOperation.global_index; AbstractOperation.global_index += 1
         dimensions = attr_init(kwords, "dimensions", [])
         storage_precision = attr_init(kwords, "storage_precision", None)
         init_data = attr_init(kwords, "init_data", None)
+        ## empty tables are declared without initializer, their content
+        #  is filled at run time (e.g. loaded from a file)
+        self.empty = attr_init(kwords, "empty", False)
 
         self.table = create_multi_dim_array(dimensions, init_data = init_data)
         self.dimensions = dimensions
         self.storage_precision = storage_precision
 
+        Profile.add_counter("tables")
+        Profile.add_counter("table_entries", reduce(lambda acc, dim: acc * dim, dimensions, 1))
+
     def __setitem__(self, key, value):
         self.table[key] = value
 
     def __getitem__(self, key):
         return self.table[key]
 
+    def is_empty(self):
+        return self.empty
+
+    def copy(self, copy_map = None):
+        """ tables are not duplicated: copies of a scheme (e.g. the scalar
+            callback of a vector implementation) share its tables """
+        copy_map = {} if copy_map is None else copy_map
+        if not self in copy_map:
+            copy_map[self] = self
+        return copy_map[self]
+
     def get_storage_precision(self):
         return self.storage_precision
 
@@ -87,7 +107,7 @@ class ML_Table(ML_LeafNode):
     def get_content_init(self, language = C_Code):
         return get_table_content(self.table, self.dimensions, self.get_storage_precision(), language = language)
 
-    def get_str(self, depth = None, display_precision = False, tab_level = 0, memoization_map = {}, display_attribute = False, display_id = False):
+    def get_str(self, depth = None, display_precision = False, tab_level = 0, memoization_map = None, display_attribute = False, display_id = False):
         id_str     = ("[id=%x]" % id(self)) if display_id else ""
         attribute_str = "" if not display_attribute else self.attributes.get_str(tab_level = tab_level)
         precision_str = "" if not display_precision else "[%s]" % str(self.get_storage_precision())
@@ -15,6 +15,17 @@ from .ml_formats import *
 from .ml_operations import *
 
 
+## lanes failing the vector fast path are evaluated one by one by
+#  the scalar callback
+VECTOR_FALLBACK_SCALAR_LOOP = "scalar_loop"
+## special-case branches are evaluated in vector form and blended (Select)
+#  with the fast path result, only lanes reaching a non-vectorizable
+#  branch are evaluated by the scalar callback
+VECTOR_FALLBACK_BLEND = "blend"
+
+VECTOR_FALLBACK_LIST = [VECTOR_FALLBACK_SCALAR_LOOP, VECTOR_FALLBACK_BLEND]
+
+
 ## 
 class StaticVectorizer(object):
   ## initialize static vectorizer object
@@ -29,7 +40,8 @@ class StaticVectorizer(object):
   #  @param vector_size integer size of the vectors to be generated
   #  @param call_externalizer function to handle call_externalization process
   #  @param output_precision scalar precision to be used in scalar callback
-  #  @return paire ML_Operation, CodeFunction of vectorized scheme and scalar callback 
+  #  @return triple (vector arguments, vectorized scheme, vector mask of the
+  #          lanes valid for the vectorized scheme, None if every lane is)
   def vectorize_scheme(self, optree, arg_list, vector_size, call_externalizer, output_precision):
     def fallback_policy(cond, cond_block, if_branch, else_branch):
       return if_branch, [cond]
@@ -49,11 +61,20 @@ class StaticVectorizer(object):
     vec_arg_list = [arg_list_copy[arg_node] for arg_node in arg_list]
 
     vector_path = linearized_most_likely_path.copy(arg_list_copy)
-    vector_mask = and_merge_conditions(validity_list).copy(arg_list_copy)
 
     vectorization_map = {}
     vector_path = self.vector_replicate_scheme_in_place(vector_path, vector_size, vectorization_map)
-    vector_mask = self.vector_replicate_scheme_in_place(vector_mask, vector_size, vectorization_map)
+    if len(validity_list) == 0:
+      # branch-free scheme (e.g. after if-conversion)
+      vector_mask = None
+    else:
+      vector_mask = and_merge_conditions(validity_list).copy(arg_list_copy)
+      vector_mask = self.vector_replicate_scheme_in_place(vector_mask, vector_size, vectorization_map)
+
+    # copy and vectorization maps are kept for vectorize_blended_scheme
+    # (nodes shared with the most likely path are not duplicated)
+    self.copy_map = arg_list_copy
+    self.vectorization_map = vectorization_map
 
     return vec_arg_list, vector_path, vector_mask
 
@@ -72,12 +93,98 @@ class StaticVectorizer(object):
     #)
     #return vectorized_scheme, callback_function
 
+  ## vectorize <optree> with every vectorizable conditional branch merged
+  #  through Select operations, must be called after vectorize_scheme on the
+  #  same <optree>
+  #  @param optree ML_Operation object, root of the DAG to be vectorized
+  #  @param vector_size integer size of the vectors to be generated
+  #  @return pair (blended scheme, blend mask), the mask being true for lanes
+  #          correctly evaluated by the blended scheme (None if every lane is),
+  #          (None, None) if no Return reachable in vector form
+  def vectorize_blended_scheme(self, optree, vector_size):
+    blended_path, blend_mask = self.extract_blended_path(optree, (None, None))
+    if blended_path is None:
+      return None, None
+    blended_path = self.vector_replicate_scheme_in_place(blended_path.copy(self.copy_map), vector_size, self.vectorization_map)
+    if not blend_mask is None:
+      blend_mask = self.vector_replicate_scheme_in_place(blend_mask.copy(self.copy_map), vector_size, self.vectorization_map)
+    return blended_path, blend_mask
+
+  ## check that every node of the value DAG <optree> can be vectorized
+  def is_vectorizable_value(self, optree, memoization_map = None):
+    memoization_map = {} if memoization_map is None else memoization_map
+    if optree in memoization_map:
+      return memoization_map[optree]
+    result = self.is_vectorizable(optree)
+    if result and not isinstance(optree, ML_LeafNode):
+      result = all(self.is_vectorizable_value(op, memoization_map) for op in optree.get_inputs())
+    memoization_map[optree] = result
+    return result
+
+  ## merge the results of the two branches of a condition
+  #  @param cond ML_Operation condition
+  #  @param if_result (value, validity) pair when <cond> is true
+  #  @param else_result (value, validity) pair when <cond> is false
+  #  @return (value, validity) pair
+  def merge_blended_branches(self, cond, if_result, else_result, bool_precision = ML_Bool):
+    if_value, if_validity = if_result
+    else_value, else_validity = else_result
+    if not self.is_vectorizable_value(cond) or (if_value is None and else_value is None):
+      return None, None
+    not_cond = LogicalNot(cond, precision = bool_precision)
+    if if_value is None:
+      validity = not_cond if else_validity is None else LogicalAnd(not_cond, else_validity, precision = bool_precision)
+      return else_value, validity
+    elif else_value is None:
+      validity = cond if if_validity is None else LogicalAnd(cond, if_validity, precision = bool_precision)
+      return if_value, validity
+    value = Select(cond, if_value, else_value, precision = if_value.get_precision())
+    if if_validity is None and else_validity is None:
+      validity = None
+    elif if_validity is None:
+      validity = LogicalOr(cond, else_validity, precision = bool_precision)
+    elif else_validity is None:
+      validity = LogicalOr(not_cond, if_validity, precision = bool_precision)
+    else:
+      validity = LogicalOr(
+        LogicalAnd(cond, if_validity, precision = bool_precision),
+        LogicalAnd(not_cond, else_validity, precision = bool_precision),
+        precision = bool_precision
+      )
+    return value, validity
+
+  ## extract the blended value of the scheme <optree>
+  #  @param continuation (value, validity) pair of the scheme executed
+  #         after <optree> when it does not return
+  #  @return (value, validity) pair, value being None if no vectorizable
+  #          Return is reached, validity None if every lane is valid
+  def extract_blended_path(self, optree, continuation):
+    if isinstance(optree, Return):
+      value = optree.get_input(0)
+      return (value, None) if self.is_vectorizable_value(value) else (None, None)
+    elif isinstance(optree, Statement):
+      result = continuation
+      for sub_stat in reversed(optree.get_inputs()):
+        result = self.extract_blended_path(sub_stat, result)
+      return result
+    elif isinstance(optree, ConditionBlock):
+      if_result = self.extract_blended_path(optree.get_input(1), continuation)
+      else_result = self.extract_blended_path(optree.get_input(2), continuation) if len(optree.get_inputs()) >= 3 else continuation
+      result = self.merge_blended_branches(optree.get_input(0), if_result, else_result)
+      return self.extract_blended_path(optree.get_pre_statement(), result)
+    else:
+      # other statements (assignments, loops ...) may have side effects
+      # which the blended path would drop: the lanes reaching them are
+      # not vectorizable
+      return None, None
+
   def vectorize_format(self, scalar_format, vector_size):
     return {
       ML_Binary32: {
         2: ML_Float2,
         4: ML_Float4,
-        8: ML_Float8
+        8: ML_Float8,
+        16: ML_Float16
       },
       ML_Binary64: {
         2: ML_Double2,
@@ -87,17 +194,20 @@ class StaticVectorizer(object):
       ML_UInt32: {
         2: ML_UInt2,
         4: ML_UInt4,
-        8: ML_UInt8
+        8: ML_UInt8,
+        16: ML_VUInt16
       },
       ML_Int32: {
         2: ML_Int2,
         4: ML_Int4,
-        8: ML_Int8
+        8: ML_Int8,
+        16: ML_VInt16
       },
       ML_Bool: {
         2: ML_Bool2,
         4: ML_Bool4,
-        8: ML_Bool8
+        8: ML_Bool8,
+        16: ML_Bool16
       },
     }[scalar_format][vector_size]
 
@@ -126,6 +236,13 @@ class StaticVectorizer(object):
           optree.set_value([optree.get_value() for i in xrange(vector_size)])
         elif isinstance(optree, Variable):
           pass
+        elif isinstance(optree, TableLoad):
+          # the row index is vectorized, constant column indices are kept
+          # scalar (vector table loads accept scalar column indices)
+          self.vector_replicate_scheme_in_place(optree.get_input(1), vector_size, memoization_map)
+          for index in optree.get_inputs()[2:]:
+            if not isinstance(index, Constant):
+              self.vector_replicate_scheme_in_place(index, vector_size, memoization_map)
         elif not isinstance(optree, ML_LeafNode):
           for optree_input in optree.get_inputs():
             self.vector_replicate_scheme_in_place(optree_input, vector_size, memoization_map)
@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+
+###############################################################################
+# This file is part of Kalray's Metalibm tool
+# Copyright (2016)
+# All rights reserved
+# created:          Oct 18th, 2016
+# last-modified:    Oct 18th, 2016
+#
+# author(s): Nicolas Brunie (nicolas.brunie@kalray.eu)
+###############################################################################
+
+# Multi-target generation with runtime CPU-feature dispatch
+#
+# The function is generated once per target into <output>_<target>.c
+# (as <function_name>_<target>), each variant being compiled with the
+# options of its target. A dispatcher source (<output>.c) defines
+# <function_name> and selects at run time the last variant (targets are
+# listed by increasing preference) whose CPU features are supported by the
+# host, the first variant being the unconditional fallback:
+#
+#   static <function_name>_impl_t <function_name>_resolver(void)
+#   {
+#     __builtin_cpu_init();
+#     if (__builtin_cpu_supports("avx2") && ...) return <function_name>_x86_avx2;
+#     return <function_name>_none;
+#   }
+#
+# The resolver is either used as a GNU ifunc resolver (selection at load
+# time) or called on the first call of the function (selection stored in a
+# function pointer, for toolchains without ifunc support).
+
+import os
+
+from ..utility.log_report import Log
+
+
+## <function_name> is a GNU indirect function (resolved by the dynamic loader)
+DISPATCH_IFUNC = "ifunc"
+## <function_name> calls the variant through a function pointer initialized
+#  on the first call
+DISPATCH_CPU_SUPPORTS = "cpu_supports"
+
+DISPATCH_LIST = [DISPATCH_IFUNC, DISPATCH_CPU_SUPPORTS]
+
+
+## @return name of the <target_name> variant of <function_name>
+def get_variant_function_name(function_name, target_name):
+  return "%s_%s" % (function_name, target_name)
+
+## @return name of the file the <target_name> variant is generated in
+def get_variant_output_file(output_file, target_name):
+  base, ext = os.path.splitext(output_file)
+  return "%s_%s%s" % (base, target_name, ext)
+
+
+## generate the dispatcher source
+#  @param function_name string name of the dispatched function
+#  @param variant_list list of (processor, CodeFunction) pairs, by increasing
+#         preference, the first variant being the fallback
+#  @param dispatch dispatch method (DISPATCH_IFUNC or DISPATCH_CPU_SUPPORTS)
+#  @param header_list list of headers required by the function formats
+#  @return string C source
+def generate_dispatcher(function_name, variant_list, dispatch = DISPATCH_IFUNC, header_list = None):
+  if not dispatch in DISPATCH_LIST:
+    Log.report(Log.Error, "unknown dispatch method: %s" % dispatch)
+  header_list = [] if header_list is None else header_list
+  _, reference_function = variant_list[0]
+  output_name = reference_function.get_output_format().get_name()
+  arg_list = reference_function.get_arg_list()
+  arg_format_list = ", ".join(arg.get_precision().get_name() for arg in arg_list)
+  arg_decl_list = ", ".join("%s %s" % (arg.get_precision().get_name(), arg.get_tag()) for arg in arg_list)
+  pointer_type = "%s_impl_t" % function_name
+  resolver_name = "%s_resolver" % function_name
+
+  code = "/* runtime CPU-feature dispatch of %s */\n" % function_name
+  code += "".join("#include <%s>\n" % header for header in header_list)
+  code += "\n"
+  code += "".join("%s\n" % code_function.get_declaration() for _, code_function in variant_list)
+  code += "\ntypedef %s (*%s)(%s);\n\n" % (output_name, pointer_type, arg_format_list)
+
+  code += "static %s %s(void)\n{\n" % (pointer_type, resolver_name)
+  code += "  __builtin_cpu_init();\n"
+  for processor, code_function in reversed(variant_list[1:]):
+    feature_list = processor.get_cpu_features()
+    if feature_list == []:
+      Log.report(Log.Warning, "variant %s has no CPU feature requirement, variants listed before it are never selected" % code_function.get_name())
+      condition = "1"
+    else:
+      condition = " && ".join("__builtin_cpu_supports(\"%s\")" % feature for feature in feature_list)
+    code += "  if (%s) return %s;\n" % (condition, code_function.get_name())
+  code += "  return %s;\n}\n\n" % reference_function.get_name()
+
+  if dispatch == DISPATCH_IFUNC:
+    code += "%s %s(%s) __attribute__((ifunc(\"%s\")));\n" % (output_name, function_name, arg_decl_list, resolver_name)
+  else:
+    impl_name = "%s_impl" % function_name
+    code += "static %s %s = 0;\n\n" % (pointer_type, impl_name)
+    code += "%s %s(%s)\n{\n" % (output_name, function_name, arg_decl_list)
+    code += "  if (!%s) %s = %s();\n" % (impl_name, impl_name, resolver_name)
+    code += "  return %s(%s);\n}\n" % (impl_name, ", ".join(arg.get_tag() for arg in arg_list))
+  return code
@@ -0,0 +1,194 @@
+# -*- coding: utf-8 -*-
+
+###############################################################################
+# This file is part of Kalray's Metalibm tool
+# Copyright (2016)
+# All rights reserved
+# created:          Oct 18th, 2016
+# last-modified:    Oct 18th, 2016
+#
+# author(s): Nicolas Brunie (nicolas.brunie@kalray.eu)
+###############################################################################
+
+import time
+import json
+
+from ..utility.log_report import Log
+from .ml_operations import ML_LeafNode
+
+
+## count the number of distinct nodes in the DAG rooted at <optree>
+#  (extra inputs included)
+def get_node_count(optree):
+    visited = set()
+    node_stack = [optree]
+    while node_stack:
+        node = node_stack.pop()
+        if node is None or node in visited: continue
+        visited.add(node)
+        if not isinstance(node, ML_LeafNode):
+            node_stack.extend(node.get_inputs())
+        node_stack.extend(node.get_extra_inputs())
+    return len(visited)
+
+
+## Optimization pass description
+class OptimizationPass(object):
+    ## @param name string identifier of the pass (used in pipeline description)
+    #  @param process_function function (opt_engine, optree, pass_options) ->
+    #         new root optree (or None if the root is unchanged)
+    #  @param description string message displayed when the pass is executed
+    def __init__(self, name, process_function, description = None):
+        self.name = name
+        self.process_function = process_function
+        self.description = name if description is None else description
+
+    def get_name(self):
+        return self.name
+
+    def get_description(self):
+        return self.description
+
+    ## execute pass on <optree>
+    #  @return new root of the optimized DAG
+    def execute(self, opt_engine, optree, pass_options):
+        result = self.process_function(opt_engine, optree, pass_options)
+        return optree if result is None else result
+
+
+class PassRegister(object):
+    pass_map = {}
+
+    @staticmethod
+    def get_pass_by_name(pass_name):
+        if not pass_name in PassRegister.pass_map:
+            Log.report(Log.Error, "unknown optimization pass: %s" % pass_name)
+        return PassRegister.pass_map[pass_name]
+
+    @staticmethod
+    def get_pass_name_list():
+        return PassRegister.pass_map.keys()
+
+    @staticmethod
+    def register_new_pass(opt_pass):
+        PassRegister.pass_map[opt_pass.get_name()] = opt_pass
+
+
+## Per-run optimization context: owns the memoization tables of the 
+#  optimization passes, tables are released once the pipeline has been
+#  executed so that no node reference outlives the optimization of a scheme
+class PassContext(object):
+    def __init__(self):
+        self.memoization_tables = {}
+
+    ## return the memoization table associated with <table_name>
+    #  (created empty on first request)
+    def get_memoization_map(self, table_name):
+        if not table_name in self.memoization_tables:
+            self.memoization_tables[table_name] = {}
+        return self.memoization_tables[table_name]
+
+    def release(self):
+        self.memoization_tables.clear()
+
+
+## Execute a list of registered optimization passes, measuring
+#  execution time (and optionally node count evolution) of each pass
+class PassManager(object):
+    ## @param opt_engine OptimizationEngine object passes are applied with
+    #  @param pass_list list of pass names (executed in order)
+    #  @param node_count boolean flag, enable node count measurement
+    #         (each measurement is a full traversal of the DAG)
+    def __init__(self, opt_engine, pass_list, node_count = False):
+        self.opt_engine = opt_engine
+        self.pass_list = pass_list
+        self.node_count = node_count
+        ## list of per pass statistic dict
+        self.statistics = []
+
+    ## execute the pipeline on <optree>
+    #  @param pass_options dict of options transmitted to every pass
+    #         (e.g. default_precision, silence)
+    #  @return root of the optimized DAG
+    def execute(self, optree, verbose = True, **pass_options):
+        pass_context = PassContext()
+        pass_options["context"] = pass_context
+        for pass_name in self.pass_list:
+            opt_pass = PassRegister.get_pass_by_name(pass_name)
+            if verbose:
+                Log.report(Log.Info, opt_pass.get_description())
+            pass_stat = {"pass": pass_name}
+            if self.node_count:
+                pass_stat["pre_node_count"] = get_node_count(optree)
+            start_time = time.time()
+            optree = opt_pass.execute(self.opt_engine, optree, pass_options)
+            pass_stat["time"] = time.time() - start_time
+            if self.node_count:
+                pass_stat["post_node_count"] = get_node_count(optree)
+                Log.report(Log.Verbose, "pass %s: %.3fs, %d -> %d nodes" % (pass_name, pass_stat["time"], pass_stat["pre_node_count"], pass_stat["post_node_count"]))
+            else:
+                Log.report(Log.Verbose, "pass %s: %.3fs" % (pass_name, pass_stat["time"]))
+            self.statistics.append(pass_stat)
+        pass_context.release()
+        return optree
+
+    def get_statistics(self):
+        return self.statistics
+
+
+## dump pass statistics list <statistics> to <trace_filename> (JSON format)
+def dump_pass_trace(statistics, trace_filename):
+    trace_stream = open(trace_filename, "w")
+    json.dump(statistics, trace_stream, indent = 2)
+    trace_stream.close()
+
+
+## standard optimization passes
+#  (options["context"] is the PassContext of the current pipeline execution)
+def pass_fuse_fma(opt_engine, optree, options):
+    memoization = options["context"].get_memoization_map("fuse_fma")
+    return opt_engine.fuse_multiply_add(optree, silence = options.get("silence", False), memoization = memoization)
+
+def pass_instantiate_abstract_precision(opt_engine, optree, options):
+    memoization_map = options["context"].get_memoization_map("instantiate_abstract_precision")
+    opt_engine.instantiate_abstract_precision(optree, None, memoization_map = memoization_map)
+
+def pass_instantiate_precision(opt_engine, optree, options):
+    memoization_map = options["context"].get_memoization_map("instantiate_precision")
+    opt_engine.instantiate_precision(optree, options.get("default_precision", None), memoization_map = memoization_map)
+
+def pass_constant_folding(opt_engine, optree, options):
+    memoization_map = options["context"].get_memoization_map("constant_folding")
+    return opt_engine.constant_folding(optree, memoization_map = memoization_map)
+
+def pass_subexpression_sharing(opt_engine, optree, options):
+    sharing_map = options["context"].get_memoization_map("subexpression_sharing")
+    opt_engine.subexpression_sharing(optree, sharing_map = sharing_map)
+
+def pass_structural_sharing(opt_engine, optree, options):
+    opt_engine.structural_sharing(optree)
+
+def pass_silence_fp_operations(opt_engine, optree, options):
+    opt_engine.silence_fp_operations(optree)
+
+def pass_check_processor_support(opt_engine, optree, options):
+    memoization_map = options["context"].get_memoization_map("check_processor_support")
+    opt_engine.check_processor_support(optree, memoization_map = memoization_map)
+
+def pass_factorize_fast_path(opt_engine, optree, options):
+    opt_engine.factorize_fast_path(optree)
+
+def pass_if_conversion(opt_engine, optree, options):
+    memoization_map = options["context"].get_memoization_map("if_conversion")
+    return opt_engine.if_conversion(optree, vector_size = options.get("vector_size", 1), memoization_map = memoization_map)
+
+PassRegister.register_new_pass(OptimizationPass("fuse_fma", pass_fuse_fma, "Fusing FMA"))
+PassRegister.register_new_pass(OptimizationPass("instantiate_abstract_precision", pass_instantiate_abstract_precision, "Infering types"))
+PassRegister.register_new_pass(OptimizationPass("instantiate_precision", pass_instantiate_precision, "Instantiating precisions"))
+PassRegister.register_new_pass(OptimizationPass("constant_folding", pass_constant_folding, "Folding constants and simplifying operations"))
+PassRegister.register_new_pass(OptimizationPass("structural_sharing", pass_structural_sharing, "Merging structurally equivalent sub-expressions"))
+PassRegister.register_new_pass(OptimizationPass("subexpression_sharing", pass_subexpression_sharing, "Sharing sub-expressions"))
+PassRegister.register_new_pass(OptimizationPass("silence_fp_operations", pass_silence_fp_operations, "Silencing exceptions in internal fp operations"))
+PassRegister.register_new_pass(OptimizationPass("check_processor_support", pass_check_processor_support, "Checking processor support"))
+PassRegister.register_new_pass(OptimizationPass("factorize_fast_path", pass_factorize_fast_path, "Factorizing fast path"))
+PassRegister.register_new_pass(OptimizationPass("if_conversion", pass_if_conversion, "Converting branches into selections"))
@@ -0,0 +1,173 @@
+# -*- coding: utf-8 -*-
+
+###############################################################################
+# This file is part of Kalray's Metalibm tool
+# Copyright (2016)
+# All rights reserved
+# created:          Oct 18th, 2016
+# last-modified:    Oct 18th, 2016
+#
+# author(s): Nicolas Brunie (nicolas.brunie@kalray.eu)
+###############################################################################
+
+# Cost-model-driven selection of polynomial evaluation schemes
+#
+# Every candidate scheme of POLYNOMIAL_SCHEME_MAP is generated, its critical
+# path latency and reciprocal throughput are estimated from the operation
+# costs of the target (see GenericProcessor.get_operation_cost),
+# multiply-add pairs counting as a single FMA when the target supports it. Candidates are then considered by
+# increasing cost and the first one whose evaluation error (e.g. computed
+# by Gappa) does not exceed <error_tolerance> times the error of the
+# reference (Horner) scheme is selected.
+
+from ..utility.log_report import Log
+from ..code_generation.code_constant import C_Code
+from .ml_operations import (
+    Variable, Addition, Subtraction, Multiplication, Negation, FusedMultiplyAdd,
+    ML_LeafNode
+)
+from .polynomials import PolynomialSchemeEvaluator
+
+
+## candidate evaluation schemes, builders are called as
+#  builder(polynomial_object, variable, unified_precision, power_map)
+POLYNOMIAL_SCHEME_MAP = {
+    "horner": PolynomialSchemeEvaluator.generate_horner_scheme,
+    "estrin": PolynomialSchemeEvaluator.generate_estrin_scheme,
+    "horner2": PolynomialSchemeEvaluator.generate_second_order_horner_scheme,
+    "paterson_stockmeyer": PolynomialSchemeEvaluator.generate_paterson_stockmeyer_scheme,
+    "split2": lambda *args: PolynomialSchemeEvaluator.generate_split_scheme(*args, split_factor = 2),
+    "split4": lambda *args: PolynomialSchemeEvaluator.generate_split_scheme(*args, split_factor = 4),
+}
+
+## the evaluation error of the other candidates is compared to the error
+#  of this scheme
+REFERENCE_POLYNOMIAL_SCHEME = "horner"
+
+## select the candidate with the lowest latency (reciprocal throughput
+#  breaking ties)
+POLYNOMIAL_METRIC_LATENCY = "latency"
+## select the candidate with the lowest reciprocal throughput (latency
+#  breaking ties), e.g. for vector implementations
+POLYNOMIAL_METRIC_THROUGHPUT = "throughput"
+
+
+class PolynomialSchemeCostModel(object):
+    """ latency / throughput estimation of polynomial evaluation schemes """
+    def __init__(self, processor, precision, fuse_fma = True, language = C_Code):
+        self.processor = processor
+        self.precision = precision
+        self.language = language
+        self.cost_cache = {}
+        self.fma_enabled = fuse_fma and self.is_fma_supported()
+
+    ## @return a dummy <op_class> node on <arity> variables of <self.precision>
+    def build_dummy_node(self, op_class, arity, **kwords):
+        dummy_inputs = tuple(Variable("dummy_%d" % i, precision = self.precision) for i in xrange(arity))
+        return op_class(*dummy_inputs, precision = self.precision, **kwords)
+
+    def is_fma_supported(self):
+        dummy_fma = self.build_dummy_node(FusedMultiplyAdd, 3, specifier = FusedMultiplyAdd.Standard)
+        return self.processor.is_supported_operation(dummy_fma, language = self.language)
+
+    ## @return (latency, reciprocal throughput) of operation class <op_class>
+    def get_operation_cost(self, op_class):
+        if not op_class in self.cost_cache:
+            arity = {Negation: 1, FusedMultiplyAdd: 3}.get(op_class, 2)
+            specifier = {FusedMultiplyAdd: {"specifier": FusedMultiplyAdd.Standard}}.get(op_class, {})
+            dummy_node = self.build_dummy_node(op_class, arity, **specifier)
+            self.cost_cache[op_class] = self.processor.get_operation_cost(dummy_node, language = self.language)
+        return self.cost_cache[op_class]
+
+    ## @return the multiplication operand of <optree> fused with it into a
+    #          FMA, None if <optree> is not fused
+    def get_fused_multiplication(self, optree):
+        if not self.fma_enabled or not (isinstance(optree, Addition) or isinstance(optree, Subtraction)):
+            return None
+        for op in optree.get_inputs():
+            if isinstance(op, Multiplication):
+                return op
+        return None
+
+    ## estimate the cost of scheme <optree>
+    #  @return pair (critical path latency, reciprocal throughput)
+    def evaluate(self, optree):
+        latency_map = {}
+        counted_nodes = set()
+        throughput = [0]
+
+        def get_latency(node):
+            if node in latency_map:
+                return latency_map[node]
+            if isinstance(node, ML_LeafNode):
+                latency = 0
+            else:
+                fused_mult = self.get_fused_multiplication(node)
+                if fused_mult is None:
+                    op_latency, op_throughput = self.get_operation_cost(node.__class__)
+                    input_list = node.get_inputs()
+                else:
+                    op_latency, op_throughput = self.get_operation_cost(FusedMultiplyAdd)
+                    input_list = list(fused_mult.get_inputs()) + [op for op in node.get_inputs() if not op is fused_mult]
+                latency = op_latency + max([get_latency(op) for op in input_list] + [0])
+                if not node in counted_nodes:
+                    counted_nodes.add(node)
+                    throughput[0] += op_throughput
+            latency_map[node] = latency
+            return latency
+
+        return get_latency(optree), throughput[0]
+
+
+class PolynomialSchemeSelector(object):
+    """ polynomial evaluation scheme selection """
+    def __init__(self, processor, fuse_fma = True, metric = POLYNOMIAL_METRIC_LATENCY, error_tolerance = 2):
+        self.processor = processor
+        self.fuse_fma = fuse_fma
+        self.metric = metric
+        self.error_tolerance = error_tolerance
+
+    def get_sort_key(self, cost):
+        latency, throughput = cost
+        return (latency, throughput) if self.metric == POLYNOMIAL_METRIC_LATENCY else (throughput, latency)
+
+    ## select and build the evaluation scheme of <polynomial_object>
+    #  @param polynomial_object Polynomial object to be evaluated
+    #  @param variable ML_Operation polynomial variable
+    #  @param unified_precision ML_Format of the polynomial operations
+    #  @param error_function function(scheme) -> bound on the absolute
+    #         evaluation error of scheme, None to disable evaluation error check
+    #  @param candidate_list list of candidate names (POLYNOMIAL_SCHEME_MAP keys),
+    #         None for every candidate
+    #  @return ML_Operation, selected evaluation scheme
+    def select(self, polynomial_object, variable, unified_precision, error_function = None, candidate_list = None, power_map = None):
+        candidate_list = sorted(POLYNOMIAL_SCHEME_MAP.keys()) if candidate_list is None else candidate_list
+        cost_model = PolynomialSchemeCostModel(self.processor, unified_precision, fuse_fma = self.fuse_fma)
+        candidate_map = {}
+        for scheme_name in candidate_list:
+            scheme = POLYNOMIAL_SCHEME_MAP[scheme_name](polynomial_object, variable, unified_precision, {})
+            cost = cost_model.evaluate(scheme)
+            Log.report(Log.Verbose, "polynomial scheme %s: latency=%s, reciprocal throughput=%s" % (scheme_name, cost[0], cost[1]))
+            candidate_map[scheme_name] = scheme, cost
+
+        # the reference scheme is preferred among candidates of equal cost
+        ordered_candidates = sorted(candidate_list, key = lambda name: self.get_sort_key(candidate_map[name][1]) + (name != REFERENCE_POLYNOMIAL_SCHEME,))
+        selected_name = ordered_candidates[0]
+        if error_function != None and REFERENCE_POLYNOMIAL_SCHEME in candidate_map:
+            reference_error = error_function(candidate_map[REFERENCE_POLYNOMIAL_SCHEME][0])
+            for scheme_name in ordered_candidates:
+                if scheme_name == REFERENCE_POLYNOMIAL_SCHEME:
+                    selected_name = scheme_name
+                    break
+                scheme_error = error_function(candidate_map[scheme_name][0])
+                Log.report(Log.Verbose, "polynomial scheme %s: evaluation error=%s (reference %s)" % (scheme_name, scheme_error, reference_error))
+                if scheme_error <= self.error_tolerance * reference_error:
+                    selected_name = scheme_name
+                    break
+
+        selected_scheme, selected_cost = candidate_map[selected_name]
+        Log.report(Log.Info, "selected polynomial scheme: %s (latency=%s, reciprocal throughput=%s)" % (selected_name, selected_cost[0], selected_cost[1]))
+        if power_map != None:
+            # the selected scheme is rebuilt to share the caller powers
+            selected_scheme = POLYNOMIAL_SCHEME_MAP[selected_name](polynomial_object, variable, unified_precision, power_map)
+        return selected_scheme
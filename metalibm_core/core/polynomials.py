@@ -11,13 +11,87 @@
 ###############################################################################
 
 import sollya
+import math
 
 from sollya import S2, SollyaObject, coeff
 
 from ..utility.log_report import Log
+from ..utility.cache_utils import DiskCache
+from ..utility.profiling import Profile
 from .ml_operations import Constant, Variable, Multiplication, Addition, Subtraction
 from .ml_formats import ML_Format, ML_FP_Format, ML_Fixed_Format
 
+## on-disk cache of fpminimax (and supnorm) results
+approx_cache = DiskCache("fpminimax")
+
+def sollya_number_to_cache_str(value):
+    """ exact (display-mode independant) string encoding of a sollya dyadic number """
+    return "%s*2^(%s)" % (sollya.mantissa(value), sollya.exponent(value))
+
+def sollya_object_to_cache_str(value):
+    """ exact (display-mode independant) string encoding of a sollya object
+        (expression, interval, list, ...), non sollya values are encoded by str """
+    if isinstance(value, list) or isinstance(value, tuple):
+        return "[%s]" % ",".join(sollya_object_to_cache_str(v) for v in value)
+    elif not isinstance(value, SollyaObject):
+        return str(value)
+    display_mode = sollya.settings.display
+    sollya.settings.display = sollya.hexadecimal
+    try:
+        return str(value)
+    finally:
+        sollya.settings.display = display_mode
+
+def get_approximation_cache_key(function, poly_degree, precision_list, approx_interval, modifiers, extra = ""):
+    """ build the content key of a polynomial approximation request,
+        the sollya working precision is part of the key """
+    return "|".join([
+        sollya_object_to_cache_str(function), sollya_object_to_cache_str(poly_degree),
+        sollya_object_to_cache_str(list(precision_list)),
+        sollya_object_to_cache_str(approx_interval), sollya_object_to_cache_str(list(modifiers)),
+        sollya_object_to_cache_str(extra),
+        "prec=%s" % sollya_object_to_cache_str(sollya.settings.prec),
+    ])
+
+def cached_fpminimax(function, poly_degree, precision_list, approx_interval, *modifiers):
+    """ sollya.fpminimax call whose result is memoized in approx_cache """
+    cache_key = get_approximation_cache_key(function, poly_degree, precision_list, approx_interval, modifiers)
+    cache_value = approx_cache.get(cache_key)
+    # empty entries (e.g. truncated writes) are treated as misses
+    if cache_value:
+        sollya_poly = 0
+        for index, coeff_str in enumerate(cache_value.split(";")):
+            sollya_poly += sollya.parse(coeff_str) * sollya.x**index
+        Profile.add_counter("sollya_cache_hits")
+        return sollya_poly
+    profile_token = Profile.start_phase("sollya_approximation")
+    sollya_poly = sollya.fpminimax(function, poly_degree, precision_list, approx_interval, *modifiers)
+    Profile.end_phase("sollya_approximation", profile_token)
+    Profile.add_counter("sollya_calls")
+    poly_degree_value = sollya.degree(sollya_poly)
+    # fpminimax failures (error object, negative degree) are not cached
+    if poly_degree_value < 0:
+        return sollya_poly
+    coeff_str_list = [sollya_number_to_cache_str(coeff(sollya_poly, index)) for index in xrange(poly_degree_value + 1)]
+    approx_cache.put(cache_key, ";".join(coeff_str_list))
+    return sollya_poly
+
+def cached_supnorm(sollya_poly, function, approx_interval, fpnorm_modifiers, tightness):
+    """ sollya.supnorm call whose result is memoized in approx_cache """
+    cache_key = get_approximation_cache_key(function, "supnorm", [sollya_poly], approx_interval, [fpnorm_modifiers], tightness)
+    cache_value = approx_cache.get(cache_key)
+    if cache_value != None:
+        inf_str, sup_str = cache_value.split(";")
+        Profile.add_counter("sollya_cache_hits")
+        return sollya.Interval(sollya.parse(inf_str), sollya.parse(sup_str))
+    profile_token = Profile.start_phase("sollya_approximation")
+    approx_error = sollya.supnorm(sollya_poly, function, approx_interval, fpnorm_modifiers, tightness)
+    Profile.end_phase("sollya_approximation", profile_token)
+    Profile.add_counter("sollya_calls")
+    approx_cache.put(cache_key, "%s;%s" % (sollya_number_to_cache_str(sollya.inf(approx_error)), sollya_number_to_cache_str(sollya.sup(approx_error))))
+    return approx_error
+
+
 class Polynomial(object):
     """ Mathematical polynomial object class """
 
@@ -125,7 +199,7 @@ class Polynomial(object):
             precision_list.append(c.get_bit_size())
           else:
             precision_list.append(c)
-        sollya_poly = sollya.fpminimax(function, poly_degree, precision_list, approx_interval, *modifiers)
+        sollya_poly = cached_fpminimax(function, poly_degree, precision_list, approx_interval, *modifiers)
         return Polynomial(sollya_poly)
 
 
@@ -146,22 +220,23 @@ class Polynomial(object):
     def build_from_approximation_with_error(function, poly_degree, coeff_formats, approx_interval, *modifiers, **kwords): 
         """ construct a polynomial object from a function approximation using sollya's fpminimax """
         tightness = kwords["tightness"] if "tightness" in kwords else S2**-24
-        error_function = kwords["error_function"] if "error_function" in kwords else lambda p, f, ai, mod, t: sollya.supnorm(p, f, ai, mod, t)
+        error_function = kwords["error_function"] if "error_function" in kwords else cached_supnorm
         precision_list = []
         for c in coeff_formats:
             if isinstance(c, ML_FP_Format):
                 precision_list.append(c.get_sollya_object())
             else:
                 precision_list.append(c)
-        sollya_poly = sollya.fpminimax(function, poly_degree, precision_list, approx_interval, *modifiers)
+        sollya_poly = cached_fpminimax(function, poly_degree, precision_list, approx_interval, *modifiers)
         fpnorm_modifiers = sollya.absolute if sollya.absolute in modifiers else sollya.relative
         #approx_error = sollya.supnorm(sollya_poly, function, approx_interval, fpnorm_modifiers, tightness)
         approx_error = error_function(sollya_poly, function, approx_interval, fpnorm_modifiers, tightness)
         return Polynomial(sollya_poly), approx_error
 
-def generate_power(variable, power, power_map = {}, precision = None):
+def generate_power(variable, power, power_map = None, precision = None):
     """ generate variable^power, using power_map for memoization 
         if precision is defined, every created operation is assigned that format """
+    power_map = {} if power_map is None else power_map
     if power in power_map:
         return power_map[power]
     else:
@@ -246,6 +321,102 @@ class PolynomialSchemeEvaluator(object):
 
         return current_scheme
 
+    @staticmethod
+    def generate_second_order_horner_scheme(polynomial_object, variable, unified_precision = None, power_map_ = None, constant_precision = None):
+        """ generate a second-order Horner evaluation scheme: even and odd 
+            coefficients are evaluated by two independant Horner schemes on
+            variable^2, p(x) = p_even(x^2) + x * p_odd(x^2) """
+        power_map = power_map_ if power_map_ != None else {}
+        coeff_list = polynomial_object.get_ordered_coeff_list()
+        even_poly = Polynomial(dict((index / 2, coeff) for index, coeff in coeff_list if index % 2 == 0))
+        odd_poly = Polynomial(dict((index / 2, coeff) for index, coeff in coeff_list if index % 2 == 1))
+        if odd_poly.get_coeff_num() == 0 or even_poly.get_coeff_num() == 0:
+            # single parity: second-order Horner degenerates into Horner
+            return PolynomialSchemeEvaluator.generate_horner_scheme(polynomial_object, variable, unified_precision, power_map, constant_precision)
+        square = generate_power(variable, 2, power_map, precision = unified_precision)
+        # powers of variable^2 are shared with power_map (square^k = variable^2k)
+        square_power_map = dict((index / 2, power_map[index]) for index in power_map if index % 2 == 0)
+        even_node = PolynomialSchemeEvaluator.generate_horner_scheme(even_poly, square, unified_precision, square_power_map, constant_precision)
+        odd_node = PolynomialSchemeEvaluator.generate_horner_scheme(odd_poly, square, unified_precision, square_power_map, constant_precision)
+        for index in square_power_map:
+            power_map[2 * index] = square_power_map[index]
+        return Addition(even_node, Multiplication(variable, odd_node, precision = unified_precision), precision = unified_precision)
+
+    @staticmethod
+    def generate_paterson_stockmeyer_scheme(polynomial_object, variable, unified_precision = None, power_map_ = None, constant_precision = None, block_size = None):
+        """ generate a Paterson-Stockmeyer evaluation scheme: coefficients are
+            grouped in blocks of <block_size> (default ceil(sqrt(degree+1)))
+            evaluated as linear combinations of the shared powers variable^i
+            (i < block_size), blocks are combined by a Horner scheme on
+            variable^block_size """
+        power_map = power_map_ if power_map_ != None else {}
+        cst_precision = unified_precision if constant_precision == None else constant_precision
+        coeff_list = polynomial_object.get_ordered_coeff_list()
+        if len(coeff_list) == 0:
+            return Constant(0)
+        degree = int(coeff_list[-1][0])
+        block_size = int(math.ceil(math.sqrt(degree + 1))) if block_size is None else block_size
+        if block_size < 2 or degree < block_size:
+            return PolynomialSchemeEvaluator.generate_horner_scheme(polynomial_object, variable, unified_precision, power_map, constant_precision)
+
+        block_list = [None] * (degree / block_size + 1)
+        for index, coeff in coeff_list:
+            block_index, power_index = index / block_size, index % block_size
+            coeff_node = Constant(coeff, precision = cst_precision, tag = "coeff_%d" % index)
+            if power_index == 0:
+                term = coeff_node
+            else:
+                term = Multiplication(generate_power(variable, power_index, power_map, precision = unified_precision), coeff_node, precision = unified_precision, tag = "pm_%d" % index)
+            block = block_list[block_index]
+            block_list[block_index] = term if block is None else Addition(block, term, precision = unified_precision, tag = "pa_%d" % index)
+
+        block_power = generate_power(variable, block_size, power_map, precision = unified_precision)
+        current_scheme = block_list[-1]
+        for block in block_list[-2::-1]:
+            mult_op = Multiplication(block_power, current_scheme, precision = unified_precision)
+            current_scheme = mult_op if block is None else Addition(block, mult_op, precision = unified_precision)
+        return current_scheme
+
+    @staticmethod
+    def generate_split_scheme(polynomial_object, variable, unified_precision = None, power_map_ = None, constant_precision = None, split_factor = 2):
+        """ generate a split Estrin/Horner evaluation scheme: the polynomial is
+            split into <split_factor> chunks of consecutive coefficients
+            evaluated by independant Horner schemes, chunks being combined by
+            an Estrin scheme on variable^chunk_size """
+        power_map = power_map_ if power_map_ != None else {}
+        coeff_list = polynomial_object.get_ordered_coeff_list()
+        if len(coeff_list) == 0:
+            return Constant(0)
+        degree = int(coeff_list[-1][0])
+        chunk_size = (degree + split_factor) / split_factor
+        if split_factor < 2 or chunk_size < 2:
+            return PolynomialSchemeEvaluator.generate_horner_scheme(polynomial_object, variable, unified_precision, power_map, constant_precision)
+
+        node_list = []
+        for chunk_index in xrange(split_factor):
+            start_index = chunk_index * chunk_size
+            chunk_poly = polynomial_object.sub_poly(start_index = start_index, stop_index = start_index + chunk_size - 1, offset = start_index)
+            if chunk_poly.get_coeff_num() == 0:
+                node_list.append(None)
+            else:
+                node_list.append(PolynomialSchemeEvaluator.generate_horner_scheme(chunk_poly, variable, unified_precision, power_map, constant_precision))
+
+        # Estrin combination: at each level, consecutive nodes are paired
+        # as lo + variable^offset * hi
+        offset = chunk_size
+        while len(node_list) > 1:
+            offset_power = generate_power(variable, offset, power_map, precision = unified_precision)
+            next_list = []
+            for lo_node, hi_node in zip(node_list[0::2], node_list[1::2] + [None]):
+                if hi_node is None:
+                    next_list.append(lo_node)
+                else:
+                    mult_op = Multiplication(offset_power, hi_node, precision = unified_precision)
+                    next_list.append(mult_op if lo_node is None else Addition(lo_node, mult_op, precision = unified_precision))
+            node_list = next_list
+            offset *= 2
+        return node_list[0]
+
     @staticmethod
     def generate_estrin_scheme(polynomial_object, variable, unified_precision, power_map_ = None):
         """ generate a Estrin evaluation scheme """
@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+
+###############################################################################
+# This file is part of Kalray's Metalibm tool
+# Copyright (2016)
+# All rights reserved
+# created:          Oct 18th, 2016
+# last-modified:    Oct 18th, 2016
+#
+# author(s): Nicolas Brunie (nicolas.brunie@kalray.eu)
+###############################################################################
+
+# x86_64 vector function ABI (libmvec compatible) wrappers
+#
+#   <scalar> <function_name>(<scalar> x);
+#   __m256 _ZGVdN8v_<function_name>(__m256 vx);
+#
+# The wrapper converts the native vector registers to metalibm vector
+# formats (through their <vec> member, see support_lib/ml_vector_format.h)
+# and calls the vector implementation. The generated header declares the
+# scalar function with "omp declare simd" / __attribute__((simd)) so that
+# auto-vectorizing compilers call the wrapper from vectorized loops.
+#
+# Only the unmasked ('N') variant of the ISA matching the register width
+# of the implementation is generated (SSE: 'b', AVX2: 'd', AVX-512: 'e').
+
+import os
+
+from .ml_operations import Statement, Return, FunctionObject
+from .ml_formats import ML_FormatConstructor, ML_Binary32, ML_Binary64
+from ..code_generation.code_function import CodeFunction
+from ..code_generation.generator_utility import TemplateOperator
+from ..utility.log_report import Log
+
+
+## x86 native vector formats used by the ABI
+ML_ABI_m128  = ML_FormatConstructor(128, "__m128", None, lambda v: None)
+ML_ABI_m128d = ML_FormatConstructor(128, "__m128d", None, lambda v: None)
+ML_ABI_m256  = ML_FormatConstructor(256, "__m256", None, lambda v: None)
+ML_ABI_m256d = ML_FormatConstructor(256, "__m256d", None, lambda v: None)
+ML_ABI_m512  = ML_FormatConstructor(512, "__m512", None, lambda v: None)
+ML_ABI_m512d = ML_FormatConstructor(512, "__m512d", None, lambda v: None)
+
+## ISA description for each vector register width (in bits):
+#  mangling letter, native formats (per element format), function attribute
+#  enabling the ISA, preprocessor condition selecting the ISA on the
+#  caller side (the variant chosen by compilers depends on the caller ISA)
+#  and whether GCC's simd attribute can declare the variant: the attribute
+#  has no simdlen and declares every ISA variant, GCC only calls the 'b'
+#  and 'd' variants from SSE and AVX2 code but also calls the 'd' variant
+#  (e.g. in loop epilogues) from AVX-512 code
+VECTOR_ABI_ISA_MAP = {
+  128: ("b", {ML_Binary32: ML_ABI_m128, ML_Binary64: ML_ABI_m128d}, None, "!defined(__AVX__)", True),
+  256: ("d", {ML_Binary32: ML_ABI_m256, ML_Binary64: ML_ABI_m256d}, "target(\"avx2\")", "defined(__AVX2__) && !defined(__AVX512F__)", True),
+  512: ("e", {ML_Binary32: ML_ABI_m512, ML_Binary64: ML_ABI_m512d}, "target(\"avx512f\")", "defined(__AVX512F__)", False),
+}
+
+ABI_HEADER_LIST = ["immintrin.h", "support_lib/ml_vector_format.h"]
+
+
+## @return name of the vector implementation when the vector ABI is enabled
+#          (<function_name> is then the scalar entry point)
+def get_vector_abi_implementation_name(function_name, vector_size):
+  return "%s_vec%d" % (function_name, vector_size)
+
+## @return ISA description (see VECTOR_ABI_ISA_MAP) of a vector implementation
+#          on <vector_size> elements of <precision>, None if the ABI does not
+#          define any variant for it
+def get_vector_abi_isa(precision, vector_size):
+  if not precision in [ML_Binary32, ML_Binary64]:
+    return None
+  return VECTOR_ABI_ISA_MAP.get(precision.get_bit_size() * vector_size, None)
+
+## libmvec mangled name
+#  @param isa string ISA letter
+#  @param arity integer number of (vector) arguments
+def vector_abi_mangling(function_name, isa, vector_size, arity = 1):
+  return "_ZGV%sN%d%s_%s" % (isa, vector_size, "v" * arity, function_name)
+
+
+## build the x86_64 vector ABI wrapper of a vector implementation
+#  @param function_name string name of the scalar function
+#  @param vector_function FunctionObject of the vector implementation
+#  @param precision scalar ML_Format of the implementation
+#  @param vector_format ML_Format of vector_function arguments and result
+#  @param arity integer number of arguments
+#  @return CodeFunction object
+def generate_vector_abi_wrapper(function_name, vector_function, precision, vector_format, vector_size, arity = 1):
+  isa_desc = get_vector_abi_isa(precision, vector_size)
+  if isa_desc is None:
+    Log.report(Log.Error, "no x86_64 vector ABI variant for %d x %s" % (vector_size, precision))
+  isa, abi_format_map, target_attribute, _, _ = isa_desc
+  abi_format = abi_format_map[precision]
+
+  from_abi = FunctionObject("from_abi", [abi_format], vector_format, TemplateOperator("((%s) {.vec = %%s})" % vector_format.get_name(), arity = 1, require_header = ABI_HEADER_LIST))
+  to_abi = FunctionObject("to_abi", [vector_format], abi_format, TemplateOperator("%s.vec", arity = 1, require_header = ABI_HEADER_LIST))
+
+  wrapper = CodeFunction(
+    vector_abi_mangling(function_name, isa, vector_size, arity),
+    output_format = abi_format,
+    attributes = [] if target_attribute is None else [target_attribute]
+  )
+  arg_list = [wrapper.add_input_variable("vx%d" % i, abi_format) for i in xrange(arity)]
+  wrapper.set_scheme(Statement(Return(to_abi(vector_function(*tuple(from_abi(arg) for arg in arg_list))))))
+  return wrapper
+
+## build the header declaring the scalar function and its vector variant
+#  the function is declared const: compilers do not call vector variants of
+#  functions which may access memory
+#  @return string header content
+def generate_vector_abi_header(header_name, function_name, precision, vector_size, arity = 1):
+  isa_desc = get_vector_abi_isa(precision, vector_size)
+  if isa_desc is None:
+    Log.report(Log.Error, "no x86_64 vector ABI variant for %d x %s" % (vector_size, precision))
+  _, _, _, isa_condition, simd_attribute = isa_desc
+  guard = "__%s__" % "".join(c if c.isalnum() else "_" for c in os.path.basename(header_name).upper())
+  prototype = "%s %s(%s)" % (precision.get_name(), function_name, ", ".join([precision.get_name()] * arity))
+  simd_pragma = [
+    "#pragma omp declare simd simdlen(%d) notinbranch" % vector_size,
+    "%s __attribute__((__const__));" % prototype,
+  ]
+  if simd_attribute:
+    simd_declaration = ["#if defined(_OPENMP) || defined(__clang__)"] + simd_pragma + [
+      "#elif defined(__GNUC__)",
+      "__attribute__((__simd__(\"notinbranch\"), __const__)) %s;" % prototype,
+      "#endif",
+    ]
+  else:
+    # only honored with -fopenmp or -fopenmp-simd
+    simd_declaration = simd_pragma
+  return "\n".join([
+    "#ifndef %s" % guard,
+    "#define %s" % guard,
+    "",
+    "#if defined(__x86_64__) && %s" % isa_condition,
+  ] + simd_declaration + [
+    "#endif",
+    "",
+    "%s __attribute__((__const__));" % prototype,
+    "",
+    "#endif /* %s */" % guard,
+    "",
+  ])
@@ -0,0 +1,97 @@
+/*******************************************************************************
+* This file is part of Kalray's Metalibm tool
+* Copyright (2016)
+* All rights reserved
+* created:          Oct 18th, 2016
+* last-modified:    Oct 18th, 2016
+*
+* author(s): Nicolas Brunie (nicolas.brunie@kalray.eu)
+*******************************************************************************/
+#include <stdio.h>
+#include <stdint.h>
+#include <time.h>
+
+#ifndef __ML_BENCH_H__
+#define __ML_BENCH_H__
+
+/** time stamp source: time stamp counter on x86 (unless ML_BENCH_CLOCK_GETTIME
+ *  is defined), clock_gettime(CLOCK_MONOTONIC) otherwise */
+#if (defined(__x86_64__) || defined(__i386__)) && !defined(ML_BENCH_CLOCK_GETTIME)
+#include <x86intrin.h>
+#define ML_BENCH_UNIT "cycles"
+static inline uint64_t ml_bench_timestamp(void) {
+    return __rdtsc();
+}
+#else
+#define ML_BENCH_UNIT "ns"
+static inline uint64_t ml_bench_timestamp(void) {
+    struct timespec ts;
+    clock_gettime(CLOCK_MONOTONIC, &ts);
+    return (uint64_t) ts.tv_sec * 1000000000ull + (uint64_t) ts.tv_nsec;
+}
+#endif
+
+/** register constraint for floating-point values (dependency chains) */
+#if defined(__GNUC__) && (defined(__x86_64__) || defined(__i386__))
+#define ML_BENCH_FP_CONSTRAINT "x"
+#elif defined(__GNUC__) && defined(__aarch64__)
+#define ML_BENCH_FP_CONSTRAINT "w"
+#elif defined(__GNUC__)
+#define ML_BENCH_FP_CONSTRAINT "g"
+#endif
+
+/** return <v> with a (zero-cost) data dependency on <x>,
+ *  used to build latency measurement chains */
+static inline float ml_bench_chainf(float v, float x) {
+#ifdef ML_BENCH_FP_CONSTRAINT
+    __asm__ ("" : "+" ML_BENCH_FP_CONSTRAINT (v) : ML_BENCH_FP_CONSTRAINT (x));
+#else
+    (void) x;
+#endif
+    return v;
+}
+
+static inline double ml_bench_chain(double v, double x) {
+#ifdef ML_BENCH_FP_CONSTRAINT
+    __asm__ ("" : "+" ML_BENCH_FP_CONSTRAINT (v) : ML_BENCH_FP_CONSTRAINT (x));
+#else
+    (void) x;
+#endif
+    return v;
+}
+
+/** result sinks, prevent benchmarked computations from being optimized out */
+static volatile double ml_bench_sink;
+
+static inline void ml_bench_consume_value(double v) {
+    ml_bench_sink = v;
+}
+
+static inline void ml_bench_consume_array(const void* data) {
+#ifdef __GNUC__
+    __asm__ volatile ("" : : "r" (data) : "memory");
+#else
+    ml_bench_sink = (double) ((const unsigned char*) data)[0];
+#endif
+}
+
+/** JSON report */
+static int ml_bench_result_count = 0;
+
+static inline void ml_bench_begin(const char* function_name) {
+    printf("{\n  \"function\": \"%s\",\n  \"unit\": \"%s\",\n  \"results\": [", function_name, ML_BENCH_UNIT);
+}
+
+static inline void ml_bench_report(const char* variant, const char* mode, uint64_t elapsed, uint64_t call_count, uint64_t element_count) {
+    printf("%s\n    {\"variant\": \"%s\", \"mode\": \"%s\", \"total\": %llu, \"calls\": %llu, \"elements\": %llu, \"per_call\": %.3f, \"per_element\": %.3f}",
+           ml_bench_result_count ? "," : "", variant, mode,
+           (unsigned long long) elapsed, (unsigned long long) call_count, (unsigned long long) element_count,
+           elapsed / (double) call_count, elapsed / (double) element_count);
+    ml_bench_result_count++;
+}
+
+static inline void ml_bench_end(void) {
+    printf("\n  ]\n}\n");
+}
+
+#endif /* __ML_BENCH_H__ */
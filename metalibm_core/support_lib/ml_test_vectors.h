@@ -0,0 +1,62 @@
+/*******************************************************************************
+* This file is part of Kalray's Metalibm tool
+* Copyright (2016)
+* All rights reserved
+* created:          Oct 18th, 2016
+* last-modified:    Oct 18th, 2016
+*
+* author(s): Nicolas Brunie (nicolas.brunie@kalray.eu)
+*******************************************************************************/
+#include <stdio.h>
+#include <stdlib.h>
+#include <stdint.h>
+#include <string.h>
+
+#ifndef __ML_TEST_VECTORS_H__
+#define __ML_TEST_VECTORS_H__
+
+/** swap the bytes of <count> elements of <elt_size> bytes stored at <data> */
+static inline void ml_swap_test_vector_bytes(void* data, size_t elt_size, size_t count) {
+    unsigned char* bytes = (unsigned char*) data;
+    size_t i, j;
+    for (i = 0; i < count; ++i) {
+        unsigned char* elt = bytes + i * elt_size;
+        for (j = 0; j < elt_size / 2; ++j) {
+            unsigned char tmp = elt[j];
+            elt[j] = elt[elt_size - 1 - j];
+            elt[elt_size - 1 - j] = tmp;
+        }
+    }
+}
+
+/** read <count> elements of <elt_size> bytes from <stream> into <data>,
+ *  elements are stored in little-endian order in the file */
+static inline int ml_read_test_vector(FILE* stream, void* data, size_t elt_size, size_t count) {
+    const uint16_t endianness_probe = 1;
+    if (fread(data, elt_size, count, stream) != count) return 1;
+    if (*((const unsigned char*) &endianness_probe) != 1) {
+        /* big-endian host */
+        ml_swap_test_vector_bytes(data, elt_size, count);
+    }
+    return 0;
+}
+
+/** load auto-test vectors from the binary file <filename>:
+ *  <input_count> inputs followed by <output_count> expected values,
+ *  every element being <elt_size> bytes wide.
+ *  Exits the program if the file can not be read */
+static inline void ml_load_test_vectors(const char* filename, size_t elt_size, void* input_table, size_t input_count, void* output_table, size_t output_count) {
+    FILE* stream = fopen(filename, "rb");
+    if (!stream) {
+        printf("error: unable to open test vector file %s\n", filename);
+        exit(1);
+    }
+    if (ml_read_test_vector(stream, input_table, elt_size, input_count) || ml_read_test_vector(stream, output_table, elt_size, output_count)) {
+        printf("error: test vector file %s is truncated\n", filename);
+        fclose(stream);
+        exit(1);
+    }
+    fclose(stream);
+}
+
+#endif /* __ML_TEST_VECTORS_H__ */
@@ -12,44 +12,100 @@
 #ifndef __ML_VECTOR_FORMAT_H__
 #define __ML_VECTOR_FORMAT_H__
 
-#define DEC_ML_FORMAT(FORMAT_NAME, FIELD_FORMAT, SIZE) \
-typedef struct {\
+/** vector extension types: when compiling with GCC or Clang, every format
+ *  ml_<name>_t is associated with a vector extension type ml_<name>_vec_t
+ *  (__attribute__((vector_size))) accessible through the member <vec>
+ *  of the format (used by the vector_ext target) */
+#if defined(__GNUC__) && !defined(ML_NO_VECTOR_EXTENSION)
+#define ML_VECTOR_EXTENSION
+#endif
+
+#ifdef ML_VECTOR_EXTENSION
+#define DEC_ML_VECTOR_EXTENSION(VEC_NAME, FIELD_FORMAT, SIZE) \
+typedef FIELD_FORMAT VEC_NAME __attribute__((vector_size(SIZE * sizeof(FIELD_FORMAT)), aligned(sizeof(FIELD_FORMAT))));
+#define ML_VECTOR_EXTENSION_MEMBER(VEC_NAME) VEC_NAME vec;
+#else
+#define DEC_ML_VECTOR_EXTENSION(VEC_NAME, FIELD_FORMAT, SIZE)
+#define ML_VECTOR_EXTENSION_MEMBER(VEC_NAME)
+#endif
+
+/** formats with native vector members: the element array <_>, the
+ *  vector extension member <vec> and an optional native member.
+ *  Every member is aligned as the format elements so that the size and
+ *  alignment of the formats do not depend on the available members */
+#define DEC_ML_NATIVE_FORMAT(FORMAT_NAME, VEC_NAME, FIELD_FORMAT, SIZE, NATIVE_MEMBER) \
+DEC_ML_VECTOR_EXTENSION(VEC_NAME, FIELD_FORMAT, SIZE)\
+typedef union {\
   FIELD_FORMAT _[SIZE];\
+  ML_VECTOR_EXTENSION_MEMBER(VEC_NAME)\
+  NATIVE_MEMBER\
 } FORMAT_NAME;
 
+#define DEC_ML_FORMAT(FORMAT_NAME, VEC_NAME, FIELD_FORMAT, SIZE) \
+DEC_ML_NATIVE_FORMAT(FORMAT_NAME, VEC_NAME, FIELD_FORMAT, SIZE, )
+
+/** when compiling with AVX (resp. AVX-512F) support, 256-bit
+ *  (resp. 512-bit) formats have a member <v> of the type expected by
+ *  the intrinsics of the x86 vector targets */
+#if defined(__AVX__) || defined(__AVX512F__)
+#include <immintrin.h>
+#endif
+
+#ifdef __AVX__
+typedef float ml_m256_u __attribute__((vector_size(32), aligned(4)));
+typedef double ml_m256d_u __attribute__((vector_size(32), aligned(8)));
+typedef long long ml_m256i_u __attribute__((vector_size(32), aligned(4)));
+#define DEC_ML_FORMAT_256(FORMAT_NAME, VEC_NAME, FIELD_FORMAT, SIZE, NATIVE_FORMAT) DEC_ML_NATIVE_FORMAT(FORMAT_NAME, VEC_NAME, FIELD_FORMAT, SIZE, NATIVE_FORMAT v;)
+#else
+#define DEC_ML_FORMAT_256(FORMAT_NAME, VEC_NAME, FIELD_FORMAT, SIZE, NATIVE_FORMAT) DEC_ML_FORMAT(FORMAT_NAME, VEC_NAME, FIELD_FORMAT, SIZE)
+#endif
+
+#ifdef __AVX512F__
+typedef float ml_m512_u __attribute__((vector_size(64), aligned(4)));
+typedef double ml_m512d_u __attribute__((vector_size(64), aligned(8)));
+typedef long long ml_m512i_u __attribute__((vector_size(64), aligned(4)));
+#define DEC_ML_FORMAT_512(FORMAT_NAME, VEC_NAME, FIELD_FORMAT, SIZE, NATIVE_FORMAT) DEC_ML_NATIVE_FORMAT(FORMAT_NAME, VEC_NAME, FIELD_FORMAT, SIZE, NATIVE_FORMAT v;)
+#else
+#define DEC_ML_FORMAT_512(FORMAT_NAME, VEC_NAME, FIELD_FORMAT, SIZE, NATIVE_FORMAT) DEC_ML_FORMAT(FORMAT_NAME, VEC_NAME, FIELD_FORMAT, SIZE)
+#endif
+
 // single precision vector format
-DEC_ML_FORMAT(ml_float2_t, float, 2)
-DEC_ML_FORMAT(ml_float4_t, float, 4)
-DEC_ML_FORMAT(ml_float8_t, float, 8)
+DEC_ML_FORMAT(ml_float2_t, ml_float2_vec_t, float, 2)
+DEC_ML_FORMAT(ml_float4_t, ml_float4_vec_t, float, 4)
+DEC_ML_FORMAT_256(ml_float8_t, ml_float8_vec_t, float, 8, ml_m256_u)
+DEC_ML_FORMAT_512(ml_float16_t, ml_float16_vec_t, float, 16, ml_m512_u)
 
 // double precision vector format
-DEC_ML_FORMAT(ml_double2_t, double, 2)
-DEC_ML_FORMAT(ml_double4_t, double, 4)
-DEC_ML_FORMAT(ml_double8_t, double, 8)
+DEC_ML_FORMAT(ml_double2_t, ml_double2_vec_t, double, 2)
+DEC_ML_FORMAT_256(ml_double4_t, ml_double4_vec_t, double, 4, ml_m256d_u)
+DEC_ML_FORMAT_512(ml_double8_t, ml_double8_vec_t, double, 8, ml_m512d_u)
 
 // 32-b integer vector format
-DEC_ML_FORMAT(ml_int2_t, int32_t, 2)
-DEC_ML_FORMAT(ml_int4_t, int32_t, 4)
-DEC_ML_FORMAT(ml_int8_t, int32_t, 8)
+DEC_ML_FORMAT(ml_int2_t, ml_int2_vec_t, int32_t, 2)
+DEC_ML_FORMAT(ml_int4_t, ml_int4_vec_t, int32_t, 4)
+DEC_ML_FORMAT_256(ml_int8_t, ml_int8_vec_t, int32_t, 8, ml_m256i_u)
+DEC_ML_FORMAT_512(ml_int16_t, ml_int16_vec_t, int32_t, 16, ml_m512i_u)
 
 // 32-b unsigned integer vector format
-DEC_ML_FORMAT(ml_uint2_t, uint32_t, 2)
-DEC_ML_FORMAT(ml_uint4_t, uint32_t, 4)
-DEC_ML_FORMAT(ml_uint8_t, uint32_t, 8)
+DEC_ML_FORMAT(ml_uint2_t, ml_uint2_vec_t, uint32_t, 2)
+DEC_ML_FORMAT(ml_uint4_t, ml_uint4_vec_t, uint32_t, 4)
+DEC_ML_FORMAT_256(ml_uint8_t, ml_uint8_vec_t, uint32_t, 8, ml_m256i_u)
+DEC_ML_FORMAT_512(ml_uint16_t, ml_uint16_vec_t, uint32_t, 16, ml_m512i_u)
 
-// 32-b integer vector format
-DEC_ML_FORMAT(ml_long2_t, int64_t, 2)
-DEC_ML_FORMAT(ml_long4_t, int64_t, 4)
-DEC_ML_FORMAT(ml_long8_t, int64_t, 8)
+// 64-b integer vector format
+DEC_ML_FORMAT(ml_long2_t, ml_long2_vec_t, int64_t, 2)
+DEC_ML_FORMAT_256(ml_long4_t, ml_long4_vec_t, int64_t, 4, ml_m256i_u)
+DEC_ML_FORMAT_512(ml_long8_t, ml_long8_vec_t, int64_t, 8, ml_m512i_u)
 
-// 32-b unsigned integer vector format
-DEC_ML_FORMAT(ml_ulong2_t, uint64_t, 2)
-DEC_ML_FORMAT(ml_ulong4_t, uint64_t, 4)
-DEC_ML_FORMAT(ml_ulong8_t, uint64_t, 8)
+// 64-b unsigned integer vector format
+DEC_ML_FORMAT(ml_ulong2_t, ml_ulong2_vec_t, uint64_t, 2)
+DEC_ML_FORMAT_256(ml_ulong4_t, ml_ulong4_vec_t, uint64_t, 4, ml_m256i_u)
+DEC_ML_FORMAT_512(ml_ulong8_t, ml_ulong8_vec_t, uint64_t, 8, ml_m512i_u)
 
 // boolean vector formats
-DEC_ML_FORMAT(ml_bool2_t, int, 2)
-DEC_ML_FORMAT(ml_bool4_t, int, 4)
-DEC_ML_FORMAT(ml_bool8_t, int, 8)
+DEC_ML_FORMAT(ml_bool2_t, ml_bool2_vec_t, int, 2)
+DEC_ML_FORMAT(ml_bool4_t, ml_bool4_vec_t, int, 4)
+DEC_ML_FORMAT_256(ml_bool8_t, ml_bool8_vec_t, int, 8, ml_m256i_u)
+DEC_ML_FORMAT_512(ml_bool16_t, ml_bool16_vec_t, int, 16, ml_m512i_u)
 
 #endif /** ifdef __ML_VECTOR_FORMAT_H__ */
@@ -42,6 +42,7 @@ static inline void FUNC_NAME(VECTOR_FORMAT *r, VECTOR_FORMAT vop) {\
 DEF_ML_VECTOR_PRIMITIVES_OP2(ml_vaddf2, ml_float2_t, float, 2, +)
 DEF_ML_VECTOR_PRIMITIVES_OP2(ml_vaddf4, ml_float4_t, float, 4, +)
 DEF_ML_VECTOR_PRIMITIVES_OP2(ml_vaddf8, ml_float8_t, float, 8, +)
+DEF_ML_VECTOR_PRIMITIVES_OP2(ml_vaddf16, ml_float16_t, float, 16, +)
 
 DEF_ML_VECTOR_PRIMITIVES_OP2(ml_vaddd2, ml_double2_t, double, 2, +)
 DEF_ML_VECTOR_PRIMITIVES_OP2(ml_vaddd4, ml_double4_t, double, 4, +)
@@ -50,15 +51,18 @@ DEF_ML_VECTOR_PRIMITIVES_OP2(ml_vaddd8, ml_double8_t, double, 8, +)
 DEF_ML_VECTOR_PRIMITIVES_OP2(ml_vaddi2, ml_int2_t, int32_t, 2, +)
 DEF_ML_VECTOR_PRIMITIVES_OP2(ml_vaddi4, ml_int4_t, int32_t, 4, +)
 DEF_ML_VECTOR_PRIMITIVES_OP2(ml_vaddi8, ml_int8_t, int32_t, 8, +)
+DEF_ML_VECTOR_PRIMITIVES_OP2(ml_vaddi16, ml_int16_t, int32_t, 16, +)
 
 DEF_ML_VECTOR_PRIMITIVES_OP2(ml_vaddu2, ml_uint2_t, uint32_t, 2, +)
 DEF_ML_VECTOR_PRIMITIVES_OP2(ml_vaddu4, ml_uint4_t, uint32_t, 4, +)
 DEF_ML_VECTOR_PRIMITIVES_OP2(ml_vaddu8, ml_uint8_t, uint32_t, 8, +)
+DEF_ML_VECTOR_PRIMITIVES_OP2(ml_vaddu16, ml_uint16_t, uint32_t, 16, +)
 
 /** Vector Subtraction */
 DEF_ML_VECTOR_PRIMITIVES_OP2(ml_vsubf2, ml_float2_t, float, 2, -)
 DEF_ML_VECTOR_PRIMITIVES_OP2(ml_vsubf4, ml_float4_t, float, 4, -)
 DEF_ML_VECTOR_PRIMITIVES_OP2(ml_vsubf8, ml_float8_t, float, 8, -)
+DEF_ML_VECTOR_PRIMITIVES_OP2(ml_vsubf16, ml_float16_t, float, 16, -)
 
 DEF_ML_VECTOR_PRIMITIVES_OP2(ml_vsubd2, ml_double2_t, double, 2, -)
 DEF_ML_VECTOR_PRIMITIVES_OP2(ml_vsubd4, ml_double4_t, double, 4, -)
@@ -67,15 +71,18 @@ DEF_ML_VECTOR_PRIMITIVES_OP2(ml_vsubd8, ml_double8_t, double, 8, -)
 DEF_ML_VECTOR_PRIMITIVES_OP2(ml_vsubi2, ml_int2_t, int32_t, 2, -)
 DEF_ML_VECTOR_PRIMITIVES_OP2(ml_vsubi4, ml_int4_t, int32_t, 4, -)
 DEF_ML_VECTOR_PRIMITIVES_OP2(ml_vsubi8, ml_int8_t, int32_t, 8, -)
+DEF_ML_VECTOR_PRIMITIVES_OP2(ml_vsubi16, ml_int16_t, int32_t, 16, -)
 
 DEF_ML_VECTOR_PRIMITIVES_OP2(ml_vsubu2, ml_uint2_t, uint32_t, 2, -)
 DEF_ML_VECTOR_PRIMITIVES_OP2(ml_vsubu4, ml_uint4_t, uint32_t, 4, -)
 DEF_ML_VECTOR_PRIMITIVES_OP2(ml_vsubu8, ml_uint8_t, uint32_t, 8, -)
+DEF_ML_VECTOR_PRIMITIVES_OP2(ml_vsubu16, ml_uint16_t, uint32_t, 16, -)
 
 /** Vector Multiplication */
 DEF_ML_VECTOR_PRIMITIVES_OP2(ml_vmulf2, ml_float2_t, float, 2, *)
 DEF_ML_VECTOR_PRIMITIVES_OP2(ml_vmulf4, ml_float4_t, float, 4, *)
 DEF_ML_VECTOR_PRIMITIVES_OP2(ml_vmulf8, ml_float8_t, float, 8, *)
+DEF_ML_VECTOR_PRIMITIVES_OP2(ml_vmulf16, ml_float16_t, float, 16, *)
 
 DEF_ML_VECTOR_PRIMITIVES_OP2(ml_vmuld2, ml_double2_t, double, 2, *)
 DEF_ML_VECTOR_PRIMITIVES_OP2(ml_vmuld4, ml_double4_t, double, 4, *)
@@ -84,15 +91,18 @@ DEF_ML_VECTOR_PRIMITIVES_OP2(ml_vmuld8, ml_double8_t, double, 8, *)
 DEF_ML_VECTOR_PRIMITIVES_OP2(ml_vmuli2, ml_int2_t, int32_t, 2, *)
 DEF_ML_VECTOR_PRIMITIVES_OP2(ml_vmuli4, ml_int4_t, int32_t, 4, *)
 DEF_ML_VECTOR_PRIMITIVES_OP2(ml_vmuli8, ml_int8_t, int32_t, 8, *)
+DEF_ML_VECTOR_PRIMITIVES_OP2(ml_vmuli16, ml_int16_t, int32_t, 16, *)
 
 DEF_ML_VECTOR_PRIMITIVES_OP2(ml_vmulu2, ml_uint2_t, uint32_t, 2, *)
 DEF_ML_VECTOR_PRIMITIVES_OP2(ml_vmulu4, ml_uint4_t, uint32_t, 4, *)
 DEF_ML_VECTOR_PRIMITIVES_OP2(ml_vmulu8, ml_uint8_t, uint32_t, 8, *)
+DEF_ML_VECTOR_PRIMITIVES_OP2(ml_vmulu16, ml_uint16_t, uint32_t, 16, *)
 
 /** Vector Division */
 DEF_ML_VECTOR_PRIMITIVES_OP2(ml_vdivf2, ml_float2_t, float, 2, /)
 DEF_ML_VECTOR_PRIMITIVES_OP2(ml_vdivf4, ml_float4_t, float, 4, /)
 DEF_ML_VECTOR_PRIMITIVES_OP2(ml_vdivf8, ml_float8_t, float, 8, /)
+DEF_ML_VECTOR_PRIMITIVES_OP2(ml_vdivf16, ml_float16_t, float, 16, /)
 
 DEF_ML_VECTOR_PRIMITIVES_OP2(ml_vdivd2, ml_double2_t, double, 2, /)
 DEF_ML_VECTOR_PRIMITIVES_OP2(ml_vdivd4, ml_double4_t, double, 4, /)
@@ -101,24 +111,29 @@ DEF_ML_VECTOR_PRIMITIVES_OP2(ml_vdivd8, ml_double8_t, double, 8, /)
 DEF_ML_VECTOR_PRIMITIVES_OP2(ml_vdivi2, ml_int2_t, int32_t, 2, /)
 DEF_ML_VECTOR_PRIMITIVES_OP2(ml_vdivi4, ml_int4_t, int32_t, 4, /)
 DEF_ML_VECTOR_PRIMITIVES_OP2(ml_vdivi8, ml_int8_t, int32_t, 8, /)
+DEF_ML_VECTOR_PRIMITIVES_OP2(ml_vdivi16, ml_int16_t, int32_t, 16, /)
 
 DEF_ML_VECTOR_PRIMITIVES_OP2(ml_vdivu2, ml_uint2_t, uint32_t, 2, /)
 DEF_ML_VECTOR_PRIMITIVES_OP2(ml_vdivu4, ml_uint4_t, uint32_t, 4, /)
 DEF_ML_VECTOR_PRIMITIVES_OP2(ml_vdivu8, ml_uint8_t, uint32_t, 8, /)
+DEF_ML_VECTOR_PRIMITIVES_OP2(ml_vdivu16, ml_uint16_t, uint32_t, 16, /)
 
 /** Vector Modulo */
 DEF_ML_VECTOR_PRIMITIVES_OP2(ml_vmodi2, ml_int2_t, int32_t, 2, %)
 DEF_ML_VECTOR_PRIMITIVES_OP2(ml_vmodi4, ml_int4_t, int32_t, 4, %)
 DEF_ML_VECTOR_PRIMITIVES_OP2(ml_vmodi8, ml_int8_t, int32_t, 8, %)
+DEF_ML_VECTOR_PRIMITIVES_OP2(ml_vmodi16, ml_int16_t, int32_t, 16, %)
 
 DEF_ML_VECTOR_PRIMITIVES_OP2(ml_vmodu2, ml_uint2_t, uint32_t, 2, %)
 DEF_ML_VECTOR_PRIMITIVES_OP2(ml_vmodu4, ml_uint4_t, uint32_t, 4, %)
 DEF_ML_VECTOR_PRIMITIVES_OP2(ml_vmodu8, ml_uint8_t, uint32_t, 8, %)
+DEF_ML_VECTOR_PRIMITIVES_OP2(ml_vmodu16, ml_uint16_t, uint32_t, 16, %)
 
 /** Vector Fused Multiply and Add */
 DEF_ML_VECTOR_PRIMITIVES_OP3(ml_vfmaf2, ml_float2_t, float, 2, *, +)
 DEF_ML_VECTOR_PRIMITIVES_OP3(ml_vfmaf4, ml_float4_t, float, 4, *, +)
 DEF_ML_VECTOR_PRIMITIVES_OP3(ml_vfmaf8, ml_float8_t, float, 8, *, +)
+DEF_ML_VECTOR_PRIMITIVES_OP3(ml_vfmaf16, ml_float16_t, float, 16, *, +)
 
 DEF_ML_VECTOR_PRIMITIVES_OP3(ml_vfmad2, ml_double2_t, double, 2, *, +)
 DEF_ML_VECTOR_PRIMITIVES_OP3(ml_vfmad4, ml_double4_t, double, 4, *, +)
@@ -127,16 +142,19 @@ DEF_ML_VECTOR_PRIMITIVES_OP3(ml_vfmad8, ml_double8_t, double, 8, *, +)
 DEF_ML_VECTOR_PRIMITIVES_OP3(ml_vfmai2, ml_int2_t, int32_t, 2, *, +)
 DEF_ML_VECTOR_PRIMITIVES_OP3(ml_vfmai4, ml_int4_t, int32_t, 4, *, +)
 DEF_ML_VECTOR_PRIMITIVES_OP3(ml_vfmai8, ml_int8_t, int32_t, 8, *, +)
+DEF_ML_VECTOR_PRIMITIVES_OP3(ml_vfmai16, ml_int16_t, int32_t, 16, *, +)
 
 DEF_ML_VECTOR_PRIMITIVES_OP3(ml_vfmau2, ml_uint2_t, uint32_t, 2, *, +)
 DEF_ML_VECTOR_PRIMITIVES_OP3(ml_vfmau4, ml_uint4_t, uint32_t, 4, *, +)
 DEF_ML_VECTOR_PRIMITIVES_OP3(ml_vfmau8, ml_uint8_t, uint32_t, 8, *, +)
+DEF_ML_VECTOR_PRIMITIVES_OP3(ml_vfmau16, ml_uint16_t, uint32_t, 16, *, +)
 
 
 /** Vector Negate */
 DEF_ML_VECTOR_PRIMITIVES_OP1(ml_vnegf2, ml_float2_t, float, 2, -)
 DEF_ML_VECTOR_PRIMITIVES_OP1(ml_vnegf4, ml_float4_t, float, 4, -)
 DEF_ML_VECTOR_PRIMITIVES_OP1(ml_vnegf8, ml_float8_t, float, 8, -)
+DEF_ML_VECTOR_PRIMITIVES_OP1(ml_vnegf16, ml_float16_t, float, 16, -)
 
 DEF_ML_VECTOR_PRIMITIVES_OP1(ml_vnegd2, ml_double2_t, double, 2, -)
 DEF_ML_VECTOR_PRIMITIVES_OP1(ml_vnegd4, ml_double4_t, double, 4, -)
@@ -145,65 +163,85 @@ DEF_ML_VECTOR_PRIMITIVES_OP1(ml_vnegd8, ml_double8_t, double, 8, -)
 DEF_ML_VECTOR_PRIMITIVES_OP1(ml_vnegi2, ml_int2_t, int32_t, 2, -)
 DEF_ML_VECTOR_PRIMITIVES_OP1(ml_vnegi4, ml_int4_t, int32_t, 4, -)
 DEF_ML_VECTOR_PRIMITIVES_OP1(ml_vnegi8, ml_int8_t, int32_t, 8, -)
+DEF_ML_VECTOR_PRIMITIVES_OP1(ml_vnegi16, ml_int16_t, int32_t, 16, -)
 
 DEF_ML_VECTOR_PRIMITIVES_OP1(ml_vnegu2, ml_uint2_t, uint32_t, 2, -)
 DEF_ML_VECTOR_PRIMITIVES_OP1(ml_vnegu4, ml_uint4_t, uint32_t, 4, -)
 DEF_ML_VECTOR_PRIMITIVES_OP1(ml_vnegu8, ml_uint8_t, uint32_t, 8, -)
+DEF_ML_VECTOR_PRIMITIVES_OP1(ml_vnegu16, ml_uint16_t, uint32_t, 16, -)
 
 
 /** Vector logical negation */
 DEF_ML_VECTOR_PRIMITIVES_OP1(ml_vnoti2, ml_int2_t, int32_t, 2, !)
 DEF_ML_VECTOR_PRIMITIVES_OP1(ml_vnoti4, ml_int4_t, int32_t, 4, !)
 DEF_ML_VECTOR_PRIMITIVES_OP1(ml_vnoti8, ml_int8_t, int32_t, 8, !)
+DEF_ML_VECTOR_PRIMITIVES_OP1(ml_vnoti16, ml_int16_t, int32_t, 16, !)
 
 DEF_ML_VECTOR_PRIMITIVES_OP1(ml_vnotu2, ml_uint2_t, uint32_t, 2, !)
 DEF_ML_VECTOR_PRIMITIVES_OP1(ml_vnotu4, ml_uint4_t, uint32_t, 4, !)
 DEF_ML_VECTOR_PRIMITIVES_OP1(ml_vnotu8, ml_uint8_t, uint32_t, 8, !)
+DEF_ML_VECTOR_PRIMITIVES_OP1(ml_vnotu16, ml_uint16_t, uint32_t, 16, !)
 
 DEF_ML_VECTOR_PRIMITIVES_OP1(ml_vnotb2, ml_bool2_t, uint32_t, 2, !)
 DEF_ML_VECTOR_PRIMITIVES_OP1(ml_vnotb4, ml_bool4_t, uint32_t, 4, !)
 DEF_ML_VECTOR_PRIMITIVES_OP1(ml_vnotb8, ml_bool8_t, uint32_t, 8, !)
+DEF_ML_VECTOR_PRIMITIVES_OP1(ml_vnotb16, ml_bool16_t, uint32_t, 16, !)
 
 
 /** Vector logical and */
 DEF_ML_VECTOR_PRIMITIVES_OP2(ml_vandi2, ml_int2_t, int32_t, 2, &&)
 DEF_ML_VECTOR_PRIMITIVES_OP2(ml_vandi4, ml_int4_t, int32_t, 4, &&)
 DEF_ML_VECTOR_PRIMITIVES_OP2(ml_vandi8, ml_int8_t, int32_t, 8, &&)
+DEF_ML_VECTOR_PRIMITIVES_OP2(ml_vandi16, ml_int16_t, int32_t, 16, &&)
 
 DEF_ML_VECTOR_PRIMITIVES_OP2(ml_vandu2, ml_uint2_t, int32_t, 2, &&)
 DEF_ML_VECTOR_PRIMITIVES_OP2(ml_vandu4, ml_uint4_t, int32_t, 4, &&)
 DEF_ML_VECTOR_PRIMITIVES_OP2(ml_vandu8, ml_uint8_t, int32_t, 8, &&)
+DEF_ML_VECTOR_PRIMITIVES_OP2(ml_vandu16, ml_uint16_t, int32_t, 16, &&)
 
 DEF_ML_VECTOR_PRIMITIVES_OP2(ml_vandb2, ml_bool2_t, int32_t, 2, &&)
 DEF_ML_VECTOR_PRIMITIVES_OP2(ml_vandb4, ml_bool4_t, int32_t, 4, &&)
 DEF_ML_VECTOR_PRIMITIVES_OP2(ml_vandb8, ml_bool8_t, int32_t, 8, &&)
+DEF_ML_VECTOR_PRIMITIVES_OP2(ml_vandb16, ml_bool16_t, int32_t, 16, &&)
+
+/** Vector logical or */
+DEF_ML_VECTOR_PRIMITIVES_OP2(ml_vorb2, ml_bool2_t, int32_t, 2, ||)
+DEF_ML_VECTOR_PRIMITIVES_OP2(ml_vorb4, ml_bool4_t, int32_t, 4, ||)
+DEF_ML_VECTOR_PRIMITIVES_OP2(ml_vorb8, ml_bool8_t, int32_t, 8, ||)
+DEF_ML_VECTOR_PRIMITIVES_OP2(ml_vorb16, ml_bool16_t, int32_t, 16, ||)
 
 /** Vector bitwise and */
 DEF_ML_VECTOR_PRIMITIVES_OP2(ml_vbwandi2, ml_int2_t, int32_t, 2, &)
 DEF_ML_VECTOR_PRIMITIVES_OP2(ml_vbwandi4, ml_int4_t, int32_t, 4, &)
 DEF_ML_VECTOR_PRIMITIVES_OP2(ml_vbwandi8, ml_int8_t, int32_t, 8, &)
+DEF_ML_VECTOR_PRIMITIVES_OP2(ml_vbwandi16, ml_int16_t, int32_t, 16, &)
 
 DEF_ML_VECTOR_PRIMITIVES_OP2(ml_vbwandu2, ml_uint2_t, int32_t, 2, &)
 DEF_ML_VECTOR_PRIMITIVES_OP2(ml_vbwandu4, ml_uint4_t, int32_t, 4, &)
 DEF_ML_VECTOR_PRIMITIVES_OP2(ml_vbwandu8, ml_uint8_t, int32_t, 8, &)
+DEF_ML_VECTOR_PRIMITIVES_OP2(ml_vbwandu16, ml_uint16_t, int32_t, 16, &)
 
 /** Vector bitwise or */
 DEF_ML_VECTOR_PRIMITIVES_OP2(ml_vbwori2, ml_int2_t, int32_t, 2, |)
 DEF_ML_VECTOR_PRIMITIVES_OP2(ml_vbwori4, ml_int4_t, int32_t, 4, |)
 DEF_ML_VECTOR_PRIMITIVES_OP2(ml_vbwori8, ml_int8_t, int32_t, 8, |)
+DEF_ML_VECTOR_PRIMITIVES_OP2(ml_vbwori16, ml_int16_t, int32_t, 16, |)
 
 DEF_ML_VECTOR_PRIMITIVES_OP2(ml_vbworu2, ml_uint2_t, int32_t, 2,|)
 DEF_ML_VECTOR_PRIMITIVES_OP2(ml_vbworu4, ml_uint4_t, int32_t, 4,|)
 DEF_ML_VECTOR_PRIMITIVES_OP2(ml_vbworu8, ml_uint8_t, int32_t, 8,|)
+DEF_ML_VECTOR_PRIMITIVES_OP2(ml_vbworu16, ml_uint16_t, int32_t, 16,|)
 
 /** Vector bitwise not */
 DEF_ML_VECTOR_PRIMITIVES_OP1(ml_vbwnoti2, ml_int2_t, int32_t, 2, ~)
 DEF_ML_VECTOR_PRIMITIVES_OP1(ml_vbwnoti4, ml_int4_t, int32_t, 4, ~)
 DEF_ML_VECTOR_PRIMITIVES_OP1(ml_vbwnoti8, ml_int8_t, int32_t, 8, ~)
+DEF_ML_VECTOR_PRIMITIVES_OP1(ml_vbwnoti16, ml_int16_t, int32_t, 16, ~)
 
 DEF_ML_VECTOR_PRIMITIVES_OP1(ml_vbwnotu2, ml_uint2_t, int32_t, 2,~)
 DEF_ML_VECTOR_PRIMITIVES_OP1(ml_vbwnotu4, ml_uint4_t, int32_t, 4,~)
 DEF_ML_VECTOR_PRIMITIVES_OP1(ml_vbwnotu8, ml_uint8_t, int32_t, 8,~)
+DEF_ML_VECTOR_PRIMITIVES_OP1(ml_vbwnotu16, ml_uint16_t, int32_t, 16,~)
 
 /** Comparison operations */
 #define DEF_ML_VECTOR_COMPARATOR_OP2(FUNC_NAME, RESULT_FORMAT, VECTOR_FORMAT, VECTOR_SIZE, COMP_OP) \
@@ -301,6 +339,28 @@ DEF_ML_VECTOR_COMPARATOR_OP2(ml_comp_le_u8, ml_bool8_t, ml_uint8_t, 8, <=)
 DEF_ML_VECTOR_COMPARATOR_OP2(ml_comp_eq_u8, ml_bool8_t, ml_uint8_t, 8, ==)
 DEF_ML_VECTOR_COMPARATOR_OP2(ml_comp_ne_u8, ml_bool8_t, ml_uint8_t, 8, !=)
 
+/** 16-element vector comparison */
+DEF_ML_VECTOR_COMPARATOR_OP2(ml_comp_gt_f16, ml_bool16_t, ml_float16_t, 16, >)
+DEF_ML_VECTOR_COMPARATOR_OP2(ml_comp_ge_f16, ml_bool16_t, ml_float16_t, 16, >=)
+DEF_ML_VECTOR_COMPARATOR_OP2(ml_comp_lt_f16, ml_bool16_t, ml_float16_t, 16, <)
+DEF_ML_VECTOR_COMPARATOR_OP2(ml_comp_le_f16, ml_bool16_t, ml_float16_t, 16, <=)
+DEF_ML_VECTOR_COMPARATOR_OP2(ml_comp_eq_f16, ml_bool16_t, ml_float16_t, 16, ==)
+DEF_ML_VECTOR_COMPARATOR_OP2(ml_comp_ne_f16, ml_bool16_t, ml_float16_t, 16, !=)
+
+DEF_ML_VECTOR_COMPARATOR_OP2(ml_comp_gt_i16, ml_bool16_t, ml_int16_t, 16, >)
+DEF_ML_VECTOR_COMPARATOR_OP2(ml_comp_ge_i16, ml_bool16_t, ml_int16_t, 16, >=)
+DEF_ML_VECTOR_COMPARATOR_OP2(ml_comp_lt_i16, ml_bool16_t, ml_int16_t, 16, <)
+DEF_ML_VECTOR_COMPARATOR_OP2(ml_comp_le_i16, ml_bool16_t, ml_int16_t, 16, <=)
+DEF_ML_VECTOR_COMPARATOR_OP2(ml_comp_eq_i16, ml_bool16_t, ml_int16_t, 16, ==)
+DEF_ML_VECTOR_COMPARATOR_OP2(ml_comp_ne_i16, ml_bool16_t, ml_int16_t, 16, !=)
+
+DEF_ML_VECTOR_COMPARATOR_OP2(ml_comp_gt_u16, ml_bool16_t, ml_uint16_t, 16, >)
+DEF_ML_VECTOR_COMPARATOR_OP2(ml_comp_ge_u16, ml_bool16_t, ml_uint16_t, 16, >=)
+DEF_ML_VECTOR_COMPARATOR_OP2(ml_comp_lt_u16, ml_bool16_t, ml_uint16_t, 16, <)
+DEF_ML_VECTOR_COMPARATOR_OP2(ml_comp_le_u16, ml_bool16_t, ml_uint16_t, 16, <=)
+DEF_ML_VECTOR_COMPARATOR_OP2(ml_comp_eq_u16, ml_bool16_t, ml_uint16_t, 16, ==)
+DEF_ML_VECTOR_COMPARATOR_OP2(ml_comp_ne_u16, ml_bool16_t, ml_uint16_t, 16, !=)
+
 
 /** Specific tests */
 #define DEF_ML_VECTOR_TEST_FUNC_OP1(FUNC_NAME, RESULT_FORMAT, VECTOR_FORMAT, VECTOR_SIZE, SCALAR_TEST_FUNC) \
@@ -314,6 +374,7 @@ static inline void FUNC_NAME(RESULT_FORMAT *r, VECTOR_FORMAT vop) {\
 DEF_ML_VECTOR_TEST_FUNC_OP1(ml_vtestf2_is_nan_or_inf, ml_bool2_t, ml_float2_t, 2, ml_is_nan_or_inff)
 DEF_ML_VECTOR_TEST_FUNC_OP1(ml_vtestf4_is_nan_or_inf, ml_bool4_t, ml_float4_t, 4, ml_is_nan_or_inff)
 DEF_ML_VECTOR_TEST_FUNC_OP1(ml_vtestf8_is_nan_or_inf, ml_bool8_t, ml_float8_t, 8, ml_is_nan_or_inff)
+DEF_ML_VECTOR_TEST_FUNC_OP1(ml_vtestf16_is_nan_or_inf, ml_bool16_t, ml_float16_t, 16, ml_is_nan_or_inff)
 
 DEF_ML_VECTOR_TEST_FUNC_OP1(ml_vtestd2_is_nan_or_inf, ml_bool2_t, ml_double2_t, 2, ml_is_nan_or_inf)
 DEF_ML_VECTOR_TEST_FUNC_OP1(ml_vtestd4_is_nan_or_inf, ml_bool4_t, ml_double4_t, 4, ml_is_nan_or_inf)
@@ -322,11 +383,21 @@ DEF_ML_VECTOR_TEST_FUNC_OP1(ml_vtestd8_is_nan_or_inf, ml_bool8_t, ml_double8_t,
 DEF_ML_VECTOR_TEST_FUNC_OP1(ml_vtestf2_is_nan, ml_bool2_t, ml_float2_t, 2, ml_is_nanf)
 DEF_ML_VECTOR_TEST_FUNC_OP1(ml_vtestf4_is_nan, ml_bool4_t, ml_float4_t, 4, ml_is_nanf)
 DEF_ML_VECTOR_TEST_FUNC_OP1(ml_vtestf8_is_nan, ml_bool8_t, ml_float8_t, 8, ml_is_nanf)
+DEF_ML_VECTOR_TEST_FUNC_OP1(ml_vtestf16_is_nan, ml_bool16_t, ml_float16_t, 16, ml_is_nanf)
 
 DEF_ML_VECTOR_TEST_FUNC_OP1(ml_vtestd2_is_nan, ml_bool2_t, ml_double2_t, 2, ml_is_nan)
 DEF_ML_VECTOR_TEST_FUNC_OP1(ml_vtestd4_is_nan, ml_bool4_t, ml_double4_t, 4, ml_is_nan)
 DEF_ML_VECTOR_TEST_FUNC_OP1(ml_vtestd8_is_nan, ml_bool8_t, ml_double8_t, 8, ml_is_nan)
 
+DEF_ML_VECTOR_TEST_FUNC_OP1(ml_vtestf2_is_inf, ml_bool2_t, ml_float2_t, 2, ml_is_inff)
+DEF_ML_VECTOR_TEST_FUNC_OP1(ml_vtestf4_is_inf, ml_bool4_t, ml_float4_t, 4, ml_is_inff)
+DEF_ML_VECTOR_TEST_FUNC_OP1(ml_vtestf8_is_inf, ml_bool8_t, ml_float8_t, 8, ml_is_inff)
+DEF_ML_VECTOR_TEST_FUNC_OP1(ml_vtestf16_is_inf, ml_bool16_t, ml_float16_t, 16, ml_is_inff)
+
+DEF_ML_VECTOR_TEST_FUNC_OP1(ml_vtestd2_is_inf, ml_bool2_t, ml_double2_t, 2, ml_is_inf)
+DEF_ML_VECTOR_TEST_FUNC_OP1(ml_vtestd4_is_inf, ml_bool4_t, ml_double4_t, 4, ml_is_inf)
+DEF_ML_VECTOR_TEST_FUNC_OP1(ml_vtestd8_is_inf, ml_bool8_t, ml_double8_t, 8, ml_is_inf)
+
 static inline int ml_is_vmask2_zero(ml_bool2_t vop) {
   return (vop._[0] == 0) && (vop._[1] == 0);
 }
@@ -346,6 +417,13 @@ static inline int ml_is_vmask8_zero(ml_bool8_t vop) {
          (vop._[6] == 0) && 
          (vop._[7] == 0);
 }
+static inline int ml_is_vmask16_zero(ml_bool16_t vop) {
+  unsigned i;
+  for (i = 0; i < 16; ++i) {
+    if (vop._[i] != 0) return 0;
+  };
+  return 1;
+}
 
 static inline int ml_is_vmask2_any_zero(ml_bool2_t vop) {
   return (vop._[0] == 0) || (vop._[1] == 0);
@@ -366,6 +444,13 @@ static inline int ml_is_vmask8_any_zero(ml_bool8_t vop) {
          (vop._[6] == 0) || 
          (vop._[7] == 0);
 }
+static inline int ml_is_vmask16_any_zero(ml_bool16_t vop) {
+  unsigned i;
+  for (i = 0; i < 16; ++i) {
+    if (vop._[i] == 0) return 1;
+  };
+  return 0;
+}
 
 static inline int ml_is_vmask2_not_any_zero(ml_bool2_t vop) {
   return (vop._[0] != 0) && (vop._[1] != 0);
@@ -386,6 +471,13 @@ static inline int ml_is_vmask8_not_any_zero(ml_bool8_t vop) {
          (vop._[6] != 0) && 
          (vop._[7] != 0);
 }
+static inline int ml_is_vmask16_not_any_zero(ml_bool16_t vop) {
+  unsigned i;
+  for (i = 0; i < 16; ++i) {
+    if (vop._[i] == 0) return 0;
+  };
+  return 1;
+}
 
 static inline int ml_is_vmask2_not_all_zero(ml_bool2_t vop) {
   return (vop._[0] != 0) || (vop._[1] != 0);
@@ -406,6 +498,44 @@ static inline int ml_is_vmask8_not_all_zero(ml_bool8_t vop) {
          (vop._[6] != 0) || 
          (vop._[7] != 0);
 }
+static inline int ml_is_vmask16_not_all_zero(ml_bool16_t vop) {
+  unsigned i;
+  for (i = 0; i < 16; ++i) {
+    if (vop._[i] != 0) return 1;
+  };
+  return 0;
+}
+
+/** bit-field of the zero lanes of a mask (bit k set if lane k is zero),
+ *  used to iterate over the lanes requiring a slow path */
+#define DEF_ML_VMASK_ZERO_LANES(FUNC_NAME, VECTOR_FORMAT, VECTOR_SIZE) \
+static inline uint32_t FUNC_NAME(VECTOR_FORMAT vop) {\
+  uint32_t lanes = 0;\
+  unsigned i;\
+  for (i = 0; i < VECTOR_SIZE; ++i) {\
+    lanes |= (uint32_t) (vop._[i] == 0) << i;\
+  };\
+  return lanes;\
+}
+
+DEF_ML_VMASK_ZERO_LANES(ml_vmask2_zero_lanes, ml_bool2_t, 2)
+DEF_ML_VMASK_ZERO_LANES(ml_vmask4_zero_lanes, ml_bool4_t, 4)
+DEF_ML_VMASK_ZERO_LANES(ml_vmask8_zero_lanes, ml_bool8_t, 8)
+DEF_ML_VMASK_ZERO_LANES(ml_vmask16_zero_lanes, ml_bool16_t, 16)
+
+/** index of the lowest lane set in the (non-zero) lane bit-field <lanes> */
+static inline int32_t ml_lowest_lane(uint32_t lanes) {
+#ifdef __GNUC__
+  return __builtin_ctz(lanes);
+#else
+  int32_t index = 0;
+  while (!(lanes & 1)) {
+    lanes >>= 1;
+    index++;
+  };
+  return index;
+#endif
+}
 
 
 /** Single Argument function with non-uniform formats */
@@ -465,10 +595,12 @@ static inline void ml_vrintf8(ml_float8_t *r, ml_float8_t vop) {
 DEF_ML_VECTOR_NONUN_FUNC_OP1(ml_vnearbyintf2, ml_int2_t, ml_float2_t, 2, nearbyintf)
 DEF_ML_VECTOR_NONUN_FUNC_OP1(ml_vnearbyintf4, ml_int4_t, ml_float4_t, 4, nearbyintf)
 DEF_ML_VECTOR_NONUN_FUNC_OP1(ml_vnearbyintf8, ml_int8_t, ml_float8_t, 8, nearbyintf)
+DEF_ML_VECTOR_NONUN_FUNC_OP1(ml_vnearbyintf16, ml_int16_t, ml_float16_t, 16, nearbyintf)
 
 DEF_ML_VECTOR_NONUN_FUNC_OP1(ml_vrintf2, ml_float2_t, ml_float2_t, 2, rintf)
 DEF_ML_VECTOR_NONUN_FUNC_OP1(ml_vrintf4, ml_float4_t, ml_float4_t, 4, rintf)
 DEF_ML_VECTOR_NONUN_FUNC_OP1(ml_vrintf8, ml_float8_t, ml_float8_t, 8, rintf)
+DEF_ML_VECTOR_NONUN_FUNC_OP1(ml_vrintf16, ml_float16_t, ml_float16_t, 16, rintf)
 #endif
 
 DEF_ML_VECTOR_NONUN_FUNC_OP1(ml_vrintd2, ml_double2_t, ml_double2_t, 2, rint)
@@ -479,11 +611,53 @@ DEF_ML_VECTOR_NONUN_FUNC_OP1(ml_vrintd8, ml_double8_t, ml_double8_t, 8, rint)
 DEF_ML_VECTOR_NONUN_FUNC_OP1(ml_vexp_insertion_f2, ml_float2_t, ml_int2_t, 2, ml_exp_insertion_fp32)
 DEF_ML_VECTOR_NONUN_FUNC_OP1(ml_vexp_insertion_f4, ml_float4_t, ml_int4_t, 4, ml_exp_insertion_fp32)
 DEF_ML_VECTOR_NONUN_FUNC_OP1(ml_vexp_insertion_f8, ml_float8_t, ml_int8_t, 8, ml_exp_insertion_fp32)
+DEF_ML_VECTOR_NONUN_FUNC_OP1(ml_vexp_insertion_f16, ml_float16_t, ml_int16_t, 16, ml_exp_insertion_fp32)
 
 /** Exponent extraction */
 DEF_ML_VECTOR_NONUN_FUNC_OP1(ml_vexp_extraction_f2, ml_int2_t, ml_float2_t, 2, ml_exp_extraction_dirty_fp32)
 DEF_ML_VECTOR_NONUN_FUNC_OP1(ml_vexp_extraction_f4, ml_int4_t, ml_float4_t, 4, ml_exp_extraction_dirty_fp32)
 DEF_ML_VECTOR_NONUN_FUNC_OP1(ml_vexp_extraction_f8, ml_int8_t, ml_float8_t, 8, ml_exp_extraction_dirty_fp32)
+DEF_ML_VECTOR_NONUN_FUNC_OP1(ml_vexp_extraction_f16, ml_int16_t, ml_float16_t, 16, ml_exp_extraction_dirty_fp32)
+
+/** Absolute value */
+DEF_ML_VECTOR_NONUN_FUNC_OP1(ml_vabsf2, ml_float2_t, ml_float2_t, 2, fabsf)
+DEF_ML_VECTOR_NONUN_FUNC_OP1(ml_vabsf4, ml_float4_t, ml_float4_t, 4, fabsf)
+DEF_ML_VECTOR_NONUN_FUNC_OP1(ml_vabsf8, ml_float8_t, ml_float8_t, 8, fabsf)
+DEF_ML_VECTOR_NONUN_FUNC_OP1(ml_vabsf16, ml_float16_t, ml_float16_t, 16, fabsf)
+
+DEF_ML_VECTOR_NONUN_FUNC_OP1(ml_vabsd2, ml_double2_t, ml_double2_t, 2, fabs)
+DEF_ML_VECTOR_NONUN_FUNC_OP1(ml_vabsd4, ml_double4_t, ml_double4_t, 4, fabs)
+DEF_ML_VECTOR_NONUN_FUNC_OP1(ml_vabsd8, ml_double8_t, ml_double8_t, 8, fabs)
+
+/** Rounding down */
+DEF_ML_VECTOR_NONUN_FUNC_OP1(ml_vfloorf2, ml_float2_t, ml_float2_t, 2, floorf)
+DEF_ML_VECTOR_NONUN_FUNC_OP1(ml_vfloorf4, ml_float4_t, ml_float4_t, 4, floorf)
+DEF_ML_VECTOR_NONUN_FUNC_OP1(ml_vfloorf8, ml_float8_t, ml_float8_t, 8, floorf)
+DEF_ML_VECTOR_NONUN_FUNC_OP1(ml_vfloorf16, ml_float16_t, ml_float16_t, 16, floorf)
+
+DEF_ML_VECTOR_NONUN_FUNC_OP1(ml_vfloord2, ml_double2_t, ml_double2_t, 2, floor)
+DEF_ML_VECTOR_NONUN_FUNC_OP1(ml_vfloord4, ml_double4_t, ml_double4_t, 4, floor)
+DEF_ML_VECTOR_NONUN_FUNC_OP1(ml_vfloord8, ml_double8_t, ml_double8_t, 8, floor)
+
+/** Rounding up */
+DEF_ML_VECTOR_NONUN_FUNC_OP1(ml_vceilf2, ml_float2_t, ml_float2_t, 2, ceilf)
+DEF_ML_VECTOR_NONUN_FUNC_OP1(ml_vceilf4, ml_float4_t, ml_float4_t, 4, ceilf)
+DEF_ML_VECTOR_NONUN_FUNC_OP1(ml_vceilf8, ml_float8_t, ml_float8_t, 8, ceilf)
+DEF_ML_VECTOR_NONUN_FUNC_OP1(ml_vceilf16, ml_float16_t, ml_float16_t, 16, ceilf)
+
+DEF_ML_VECTOR_NONUN_FUNC_OP1(ml_vceild2, ml_double2_t, ml_double2_t, 2, ceil)
+DEF_ML_VECTOR_NONUN_FUNC_OP1(ml_vceild4, ml_double4_t, ml_double4_t, 4, ceil)
+DEF_ML_VECTOR_NONUN_FUNC_OP1(ml_vceild8, ml_double8_t, ml_double8_t, 8, ceil)
+
+/** Rounding toward zero */
+DEF_ML_VECTOR_NONUN_FUNC_OP1(ml_vtruncf2, ml_float2_t, ml_float2_t, 2, truncf)
+DEF_ML_VECTOR_NONUN_FUNC_OP1(ml_vtruncf4, ml_float4_t, ml_float4_t, 4, truncf)
+DEF_ML_VECTOR_NONUN_FUNC_OP1(ml_vtruncf8, ml_float8_t, ml_float8_t, 8, truncf)
+DEF_ML_VECTOR_NONUN_FUNC_OP1(ml_vtruncf16, ml_float16_t, ml_float16_t, 16, truncf)
+
+DEF_ML_VECTOR_NONUN_FUNC_OP1(ml_vtruncd2, ml_double2_t, ml_double2_t, 2, trunc)
+DEF_ML_VECTOR_NONUN_FUNC_OP1(ml_vtruncd4, ml_double4_t, ml_double4_t, 4, trunc)
+DEF_ML_VECTOR_NONUN_FUNC_OP1(ml_vtruncd8, ml_double8_t, ml_double8_t, 8, trunc)
 
 
 /** Vector element-wise selection */
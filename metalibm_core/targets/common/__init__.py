@@ -1,2 +1,3 @@
 from fixed_point_backend import FixedPointBackend
 from vector_backend      import VectorBackend 
+from vector_extension_backend import VectorExtensionBackend
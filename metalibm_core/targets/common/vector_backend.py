@@ -33,7 +33,8 @@ vector_type = {
   ML_Binary32: {
     2: ML_Float2,
     4: ML_Float4,
-    8: ML_Float8
+    8: ML_Float8,
+    16: ML_Float16
   },
   ML_Binary64: {
     2: ML_Double2,
@@ -43,17 +44,20 @@ vector_type = {
   ML_Int32: {
     2: ML_Int2,
     4: ML_Int4,
-    8: ML_Int8
+    8: ML_Int8,
+    16: ML_VInt16
   },
   ML_UInt32: {
     2: ML_UInt2,
     4: ML_UInt4,
-    8: ML_UInt8
+    8: ML_UInt8,
+    16: ML_VUInt16
   },
   ML_Bool: {
     2: ML_Bool2,
     4: ML_Bool4,
-    8: ML_Bool8
+    8: ML_Bool8,
+    16: ML_Bool16
   },
 }
 scalar_type_letter = {
@@ -63,6 +67,63 @@ scalar_type_letter = {
   ML_Int32:    "i",
 }
 
+
+## index vector formats of vector table loads producing <vector_format>
+#  values
+def get_table_index_formats(vector_format):
+  vector_size = vector_format.get_vector_size()
+  return [vector_type[ML_Int32][vector_size], vector_type[ML_UInt32][vector_size]]
+
+## interface condition of vector table loads producing <vector_format>
+#  values: the table elements are <vector_format>'s elements, the row
+#  index is an index vector and the column indices are either index
+#  vectors or scalar integers (constant column indices are not
+#  vectorized, see StaticVectorizer)
+def type_vector_table_load_match(vector_format):
+  index_formats = get_table_index_formats(vector_format)
+  def is_column_format(index_format):
+    if index_format in index_formats:
+      return True
+    return not index_format.is_vector_format() and (index_format is ML_Integer or is_std_integer_format(index_format))
+  def interface_match(result_format, table_format, *index_format_list, **kwords):
+    return result_format == vector_format and table_format == vector_format.get_scalar_format() \
+      and len(index_format_list) >= 1 and index_format_list[0] in index_formats \
+      and all(is_column_format(index_format) for index_format in index_format_list[1:])
+  return interface_match
+
+## per-lane implementation of the vector table load <optree>: the result
+#  is built from the scalar loads of every lane
+def generate_vector_table_load(optree):
+  vector_format = optree.get_precision()
+  index_list = optree.get_inputs()[1:]
+  lane_list = []
+  arg_map = {}
+  for lane in xrange(vector_format.get_vector_size()):
+    # table argument followed by the indices
+    arg_map[len(arg_map)] = FO_Arg(0)
+    access = "%s"
+    for index_id, index in enumerate(index_list):
+      access += ("[%%s._[%d]]" % lane) if index.get_precision().is_vector_format() else "[%s]"
+      arg_map[len(arg_map)] = FO_Arg(index_id + 1)
+    lane_list.append(access)
+  template = "((%s) {._ = {%s}})" % (vector_format.get_name(), ", ".join(lane_list))
+  return TemplateOperator(template, arg_map = arg_map, arity = len(optree.get_inputs()), output_precision = vector_format, require_header = ["support_lib/ml_vector_format.h"])
+
+## per-lane implementations of the unary operation <func_prefix>
+#  (support library functions <func_prefix><letter><size>) for every
+#  vector format whose scalar format is in <scalar_type_list>
+#  @param result_type scalar format of the results (None for the
+#         operand scalar format)
+def generate_per_lane_unary_table(func_prefix, scalar_type_list, result_type = None, func_suffix = ""):
+  table = {}
+  for scalar_type in scalar_type_list:
+    for vector_size in vector_type[scalar_type]:
+      op_format = vector_type[scalar_type][vector_size]
+      result_format = op_format if result_type is None else vector_type[result_type][vector_size]
+      func_name = "%s%s%d%s" % (func_prefix, scalar_type_letter[scalar_type], vector_size, func_suffix)
+      table[type_strict_match(result_format, op_format)] = ML_VectorLib_Function(func_name, arg_map = {0: FO_ResultRef(0), 1: FO_Arg(0)}, arity = 1, output_precision = result_format)
+  return table
+
 vector_opencl_code_generation_table = {
 
   Addition: {
@@ -77,7 +138,7 @@ vector_opencl_code_generation_table = {
                   vector_type[scalar_type][vector_size],
                   vector_type[scalar_type][vector_size]
                 ), SymbolOperator("+", arity = 2)
-              ) for vector_size in [2, 4, 8]
+              ) for vector_size in vector_type[scalar_type]
             ] for scalar_type in [ML_Binary32, ML_Binary64, ML_Int32, ML_UInt32]
           ], [])
         )
@@ -95,7 +156,7 @@ vector_opencl_code_generation_table = {
                   vector_type[scalar_type][vector_size],
                   vector_type[scalar_type][vector_size]
                 ), SymbolOperator("-", arity = 2)
-              ) for vector_size in [2, 4, 8]
+              ) for vector_size in vector_type[scalar_type]
             ] for scalar_type in [ML_Binary32, ML_Binary64, ML_Int32, ML_UInt32]
           ], [])
         )
@@ -113,7 +174,7 @@ vector_opencl_code_generation_table = {
                   vector_type[scalar_type][vector_size],
                   vector_type[scalar_type][vector_size]
                 ), SymbolOperator("&", arity = 2)
-              ) for vector_size in [2, 4, 8]
+              ) for vector_size in vector_type[scalar_type]
             ] for scalar_type in [ML_Binary32, ML_Binary64, ML_Int32, ML_UInt32]
           ], [])
         )
@@ -131,7 +192,7 @@ vector_opencl_code_generation_table = {
                   vector_type[scalar_type][vector_size],
                   vector_type[scalar_type][vector_size]
                 ), SymbolOperator("|", arity = 2)
-              ) for vector_size in [2, 4, 8]
+              ) for vector_size in vector_type[scalar_type]
             ] for scalar_type in [ML_Binary32, ML_Binary64, ML_Int32, ML_UInt32]
           ], [])
         )
@@ -149,7 +210,7 @@ vector_opencl_code_generation_table = {
                   vector_type[scalar_type][vector_size],
                   vector_type[scalar_type][vector_size]
                 ), SymbolOperator("/", arity = 2)
-              ) for vector_size in [2, 4, 8]
+              ) for vector_size in vector_type[scalar_type]
             ] for scalar_type in [ML_Binary32, ML_Binary64, ML_Int32, ML_UInt32]
           ], [])
         )
@@ -167,7 +228,7 @@ vector_opencl_code_generation_table = {
                   vector_type[scalar_type][vector_size],
                   vector_type[scalar_type][vector_size]
                 ), SymbolOperator("%", arity = 2)
-              ) for vector_size in [2, 4, 8]
+              ) for vector_size in vector_type[scalar_type]
             ] for scalar_type in [ML_Binary32, ML_Binary64, ML_Int32, ML_UInt32]
           ], [])
         )
@@ -186,7 +247,7 @@ vector_opencl_code_generation_table = {
                   vector_type[scalar_type][vector_size],
                   vector_type[scalar_type][vector_size]
                 ), TemplateOperator("%s ? %s : %s", arity = 3)
-              ) for vector_size in [2, 4, 8]
+              ) for vector_size in vector_type[scalar_type]
             ] for scalar_type in [ML_Binary32, ML_Binary64, ML_Int32, ML_UInt32]
           ], [])
         )
@@ -204,7 +265,7 @@ vector_opencl_code_generation_table = {
                   vector_type[scalar_type][vector_size],
                   vector_type[scalar_type][vector_size]
                 ), SymbolOperator("*", arity = 2)
-              ) for vector_size in [2, 4, 8]
+              ) for vector_size in vector_type[scalar_type]
             ] for scalar_type in [ML_Binary32, ML_Binary64, ML_Int32, ML_UInt32]
           ], [])
         )
@@ -221,7 +282,7 @@ vector_opencl_code_generation_table = {
                   vector_type[scalar_type][vector_size],
                   vector_type[scalar_type][vector_size]
                 ), SymbolOperator("-", arity = 1)
-              ) for vector_size in [2, 4, 8]
+              ) for vector_size in vector_type[scalar_type]
             ] for scalar_type in [ML_Binary32, ML_Binary64, ML_Int32, ML_UInt32]
           ], [])
         )
@@ -240,7 +301,7 @@ vector_opencl_code_generation_table = {
                   vector_type[scalar_type][vector_size],
                   vector_type[scalar_type][vector_size]
                 ), OpenCL_Builtin("fma", arity = 3),
-              ) for vector_size in [2, 4, 8]
+              ) for vector_size in vector_type[scalar_type]
             ] for scalar_type in [ML_Binary32, ML_Binary64, ML_Int32, ML_UInt32]
           ], [])
         )
@@ -357,8 +418,8 @@ vector_opencl_code_generation_table = {
                       )
                       , 
                       SymbolOperator(comp_specifier.symbol, arity = 2),
-                    )  for scalar_type in [ML_Binary32, ML_Binary64, ML_Int32, ML_UInt32]
-                  ] for vector_size in [2, 4, 8]
+                    )  for scalar_type in [ML_Binary32, ML_Binary64, ML_Int32, ML_UInt32] if vector_size in vector_type[scalar_type]
+                  ] for vector_size in [2, 4, 8, 16]
                 ], []
               )
             )
@@ -434,12 +495,22 @@ vector_opencl_code_generation_table = {
 }
 
 vector_c_code_generation_table = {
+  TableLoad: {
+    None: {
+      lambda _: True: dict(
+        (type_vector_table_load_match(vector_type[scalar_type][vector_size]), DynamicOperator(generate_vector_table_load))
+          for scalar_type in [ML_Binary32, ML_Binary64, ML_Int32, ML_UInt32]
+          for vector_size in vector_type[scalar_type]
+      ),
+    },
+  },
   BitLogicAnd: {
     None: {
        lambda _: True: {
         type_strict_match(ML_Int2, ML_Int2, ML_Int2): ML_VectorLib_Function("ml_vbwandi2", arg_map = {0: FO_ResultRef(0), 1: FO_Arg(0), 2: FO_Arg(1)}, arity = 2),
         type_strict_match(ML_Int4, ML_Int4, ML_Int4): ML_VectorLib_Function("ml_vbwandi4", arg_map = {0: FO_ResultRef(0), 1: FO_Arg(0), 2: FO_Arg(1)}, arity = 2, output_precision = ML_Int4),
         type_strict_match(ML_Int8, ML_Int8, ML_Int8): ML_VectorLib_Function("ml_vbwandi8", arg_map = {0: FO_ResultRef(0), 1: FO_Arg(0), 2: FO_Arg(1)}, arity = 2, output_precision = ML_Int8),
+        type_strict_match(ML_VInt16, ML_VInt16, ML_VInt16): ML_VectorLib_Function("ml_vbwandi16", arg_map = {0: FO_ResultRef(0), 1: FO_Arg(0), 2: FO_Arg(1)}, arity = 2, output_precision = ML_VInt16),
         },
       },
   },
@@ -449,6 +520,18 @@ vector_c_code_generation_table = {
         type_strict_match(ML_Int2, ML_Bool2, ML_Int2, ML_Int2): ML_VectorLib_Function("ML_VSELECT", arg_map = {0: FO_ResultRef(0), 1: FO_Arg(0), 2: FO_Arg(1), 3: FO_Arg(2), 4: "2"}, arity = 3),
         type_strict_match(ML_Int4, ML_Bool4, ML_Int4, ML_Int4): ML_VectorLib_Function("ML_VSELECT", arg_map = {0: FO_ResultRef(0), 1: FO_Arg(0), 2: FO_Arg(1), 3: FO_Arg(2), 4: "4"}, arity = 3, output_precision = ML_Int4),
         type_strict_match(ML_Int8, ML_Bool8, ML_Int8, ML_Int8): ML_VectorLib_Function("ML_VSELECT", arg_map = {0: FO_ResultRef(0), 1: FO_Arg(0), 2: FO_Arg(1), 3: FO_Arg(2), 4: "8"}, arity = 3, output_precision = ML_Int8),
+        type_strict_match(ML_VInt16, ML_Bool16, ML_VInt16, ML_VInt16): ML_VectorLib_Function("ML_VSELECT", arg_map = {0: FO_ResultRef(0), 1: FO_Arg(0), 2: FO_Arg(1), 3: FO_Arg(2), 4: "16"}, arity = 3, output_precision = ML_VInt16),
+        type_strict_match(ML_UInt2, ML_Bool2, ML_UInt2, ML_UInt2): ML_VectorLib_Function("ML_VSELECT", arg_map = {0: FO_ResultRef(0), 1: FO_Arg(0), 2: FO_Arg(1), 3: FO_Arg(2), 4: "2"}, arity = 3, output_precision = ML_UInt2),
+        type_strict_match(ML_UInt4, ML_Bool4, ML_UInt4, ML_UInt4): ML_VectorLib_Function("ML_VSELECT", arg_map = {0: FO_ResultRef(0), 1: FO_Arg(0), 2: FO_Arg(1), 3: FO_Arg(2), 4: "4"}, arity = 3, output_precision = ML_UInt4),
+        type_strict_match(ML_UInt8, ML_Bool8, ML_UInt8, ML_UInt8): ML_VectorLib_Function("ML_VSELECT", arg_map = {0: FO_ResultRef(0), 1: FO_Arg(0), 2: FO_Arg(1), 3: FO_Arg(2), 4: "8"}, arity = 3, output_precision = ML_UInt8),
+        type_strict_match(ML_VUInt16, ML_Bool16, ML_VUInt16, ML_VUInt16): ML_VectorLib_Function("ML_VSELECT", arg_map = {0: FO_ResultRef(0), 1: FO_Arg(0), 2: FO_Arg(1), 3: FO_Arg(2), 4: "16"}, arity = 3, output_precision = ML_VUInt16),
+        type_strict_match(ML_Float2, ML_Bool2, ML_Float2, ML_Float2): ML_VectorLib_Function("ML_VSELECT", arg_map = {0: FO_ResultRef(0), 1: FO_Arg(0), 2: FO_Arg(1), 3: FO_Arg(2), 4: "2"}, arity = 3, output_precision = ML_Float2),
+        type_strict_match(ML_Float4, ML_Bool4, ML_Float4, ML_Float4): ML_VectorLib_Function("ML_VSELECT", arg_map = {0: FO_ResultRef(0), 1: FO_Arg(0), 2: FO_Arg(1), 3: FO_Arg(2), 4: "4"}, arity = 3, output_precision = ML_Float4),
+        type_strict_match(ML_Float8, ML_Bool8, ML_Float8, ML_Float8): ML_VectorLib_Function("ML_VSELECT", arg_map = {0: FO_ResultRef(0), 1: FO_Arg(0), 2: FO_Arg(1), 3: FO_Arg(2), 4: "8"}, arity = 3, output_precision = ML_Float8),
+        type_strict_match(ML_Float16, ML_Bool16, ML_Float16, ML_Float16): ML_VectorLib_Function("ML_VSELECT", arg_map = {0: FO_ResultRef(0), 1: FO_Arg(0), 2: FO_Arg(1), 3: FO_Arg(2), 4: "16"}, arity = 3, output_precision = ML_Float16),
+        type_strict_match(ML_Double2, ML_Bool2, ML_Double2, ML_Double2): ML_VectorLib_Function("ML_VSELECT", arg_map = {0: FO_ResultRef(0), 1: FO_Arg(0), 2: FO_Arg(1), 3: FO_Arg(2), 4: "2"}, arity = 3, output_precision = ML_Double2),
+        type_strict_match(ML_Double4, ML_Bool4, ML_Double4, ML_Double4): ML_VectorLib_Function("ML_VSELECT", arg_map = {0: FO_ResultRef(0), 1: FO_Arg(0), 2: FO_Arg(1), 3: FO_Arg(2), 4: "4"}, arity = 3, output_precision = ML_Double4),
+        type_strict_match(ML_Double8, ML_Bool8, ML_Double8, ML_Double8): ML_VectorLib_Function("ML_VSELECT", arg_map = {0: FO_ResultRef(0), 1: FO_Arg(0), 2: FO_Arg(1), 3: FO_Arg(2), 4: "8"}, arity = 3, output_precision = ML_Double8),
       },
     },
   },
@@ -458,6 +541,7 @@ vector_c_code_generation_table = {
         type_strict_match(ML_Int2, ML_Int2, ML_Int2): ML_VectorLib_Function("ml_vmodi2", arg_map = {0: FO_ResultRef(0), 1: FO_Arg(0), 2: FO_Arg(1)}, arity = 2),
         type_strict_match(ML_Int4, ML_Int4, ML_Int4): ML_VectorLib_Function("ml_vmodi4", arg_map = {0: FO_ResultRef(0), 1: FO_Arg(0), 2: FO_Arg(1)}, arity = 2, output_precision = ML_Int4),
         type_strict_match(ML_Int8, ML_Int8, ML_Int8): ML_VectorLib_Function("ml_vmodi8", arg_map = {0: FO_ResultRef(0), 1: FO_Arg(0), 2: FO_Arg(1)}, arity = 2, output_precision = ML_Int8),
+        type_strict_match(ML_VInt16, ML_VInt16, ML_VInt16): ML_VectorLib_Function("ml_vmodi16", arg_map = {0: FO_ResultRef(0), 1: FO_Arg(0), 2: FO_Arg(1)}, arity = 2, output_precision = ML_VInt16),
       },
     },
   },
@@ -467,6 +551,7 @@ vector_c_code_generation_table = {
         type_strict_match(ML_Int2, ML_Int2, ML_Int2): ML_VectorLib_Function("ml_vdivi2", arg_map = {0: FO_ResultRef(0), 1: FO_Arg(0), 2: FO_Arg(1)}, arity = 2),
         type_strict_match(ML_Int4, ML_Int4, ML_Int4): ML_VectorLib_Function("ml_vdivi4", arg_map = {0: FO_ResultRef(0), 1: FO_Arg(0), 2: FO_Arg(1)}, arity = 2, output_precision = ML_Int4),
         type_strict_match(ML_Int8, ML_Int8, ML_Int8): ML_VectorLib_Function("ml_vdivi8", arg_map = {0: FO_ResultRef(0), 1: FO_Arg(0), 2: FO_Arg(1)}, arity = 2, output_precision = ML_Int8),
+        type_strict_match(ML_VInt16, ML_VInt16, ML_VInt16): ML_VectorLib_Function("ml_vdivi16", arg_map = {0: FO_ResultRef(0), 1: FO_Arg(0), 2: FO_Arg(1)}, arity = 2, output_precision = ML_VInt16),
       },
     },
   },
@@ -476,10 +561,12 @@ vector_c_code_generation_table = {
         type_strict_match(ML_Int2, ML_Int2, ML_Int2): ML_VectorLib_Function("ml_vaddi2", arg_map = {0: FO_ResultRef(0), 1: FO_Arg(0), 2: FO_Arg(1)}, arity = 2),
         type_strict_match(ML_Int4, ML_Int4, ML_Int4): ML_VectorLib_Function("ml_vaddi4", arg_map = {0: FO_ResultRef(0), 1: FO_Arg(0), 2: FO_Arg(1)}, arity = 2, output_precision = ML_Int4),
         type_strict_match(ML_Int8, ML_Int8, ML_Int8): ML_VectorLib_Function("ml_vaddi8", arg_map = {0: FO_ResultRef(0), 1: FO_Arg(0), 2: FO_Arg(1)}, arity = 2, output_precision = ML_Int8),
+        type_strict_match(ML_VInt16, ML_VInt16, ML_VInt16): ML_VectorLib_Function("ml_vaddi16", arg_map = {0: FO_ResultRef(0), 1: FO_Arg(0), 2: FO_Arg(1)}, arity = 2, output_precision = ML_VInt16),
 
         type_strict_match(ML_Float2, ML_Float2, ML_Float2): ML_VectorLib_Function("ml_vaddf2", arg_map = {0: FO_ResultRef(0), 1: FO_Arg(0), 2: FO_Arg(1)}, arity = 2, output_precision = ML_Float2),
         type_strict_match(ML_Float4, ML_Float4, ML_Float4): ML_VectorLib_Function("ml_vaddf4", arg_map = {0: FO_ResultRef(0), 1: FO_Arg(0), 2: FO_Arg(1)}, arity = 2, output_precision = ML_Float4),
         type_strict_match(ML_Float8, ML_Float8, ML_Float8): ML_VectorLib_Function("ml_vaddf8", arg_map = {0: FO_ResultRef(0), 1: FO_Arg(0), 2: FO_Arg(1)}, arity = 2, output_precision = ML_Float8),
+        type_strict_match(ML_Float16, ML_Float16, ML_Float16): ML_VectorLib_Function("ml_vaddf16", arg_map = {0: FO_ResultRef(0), 1: FO_Arg(0), 2: FO_Arg(1)}, arity = 2, output_precision = ML_Float16),
       },
     },
   },
@@ -489,6 +576,7 @@ vector_c_code_generation_table = {
         type_strict_match(ML_Float2, ML_Float2, ML_Float2): ML_VectorLib_Function("ml_vsubf2", arg_map = {0: FO_ResultRef(0), 1: FO_Arg(0), 2: FO_Arg(1)}, arity = 2, output_precision = ML_Float2),
         type_strict_match(ML_Float4, ML_Float4, ML_Float4): ML_VectorLib_Function("ml_vsubf4", arg_map = {0: FO_ResultRef(0), 1: FO_Arg(0), 2: FO_Arg(1)}, arity = 2, output_precision = ML_Float4),
         type_strict_match(ML_Float8, ML_Float8, ML_Float8): ML_VectorLib_Function("ml_vsubf8", arg_map = {0: FO_ResultRef(0), 1: FO_Arg(0), 2: FO_Arg(1)}, arity = 2, output_precision = ML_Float8),
+        type_strict_match(ML_Float16, ML_Float16, ML_Float16): ML_VectorLib_Function("ml_vsubf16", arg_map = {0: FO_ResultRef(0), 1: FO_Arg(0), 2: FO_Arg(1)}, arity = 2, output_precision = ML_Float16),
       },
     },
   },
@@ -511,6 +599,7 @@ vector_c_code_generation_table = {
         type_strict_match(ML_Float2, ML_Float2, ML_Float2): ML_VectorLib_Function("ml_vmulf2", arg_map = {0: FO_ResultRef(0), 1: FO_Arg(0), 2: FO_Arg(1)}, arity = 2, output_precision = ML_Float2),
         type_strict_match(ML_Float4, ML_Float4, ML_Float4): ML_VectorLib_Function("ml_vmulf4", arg_map = {0: FO_ResultRef(0), 1: FO_Arg(0), 2: FO_Arg(1)}, arity = 2, output_precision = ML_Float4),
         type_strict_match(ML_Float8, ML_Float8, ML_Float8): ML_VectorLib_Function("ml_vmulf8", arg_map = {0: FO_ResultRef(0), 1: FO_Arg(0), 2: FO_Arg(1)}, arity = 2, output_precision = ML_Float8),
+        type_strict_match(ML_Float16, ML_Float16, ML_Float16): ML_VectorLib_Function("ml_vmulf16", arg_map = {0: FO_ResultRef(0), 1: FO_Arg(0), 2: FO_Arg(1)}, arity = 2, output_precision = ML_Float16),
       },
     },
   },
@@ -520,6 +609,7 @@ vector_c_code_generation_table = {
         type_strict_match(ML_Float2, ML_Float2, ML_Float2, ML_Float2): ML_VectorLib_Function("ml_vfmaf2", arg_map = {0: FO_ResultRef(0), 1: FO_Arg(0), 2: FO_Arg(1), 3: FO_Arg(2)}, arity = 2, output_precision = ML_Float2),
         type_strict_match(ML_Float4, ML_Float4, ML_Float4, ML_Float4): ML_VectorLib_Function("ml_vfmaf4", arg_map = {0: FO_ResultRef(0), 1: FO_Arg(0), 2: FO_Arg(1), 3: FO_Arg(2)}, arity = 2, output_precision = ML_Float4),
         type_strict_match(ML_Float8, ML_Float8, ML_Float8, ML_Float8): ML_VectorLib_Function("ml_vfmaf8", arg_map = {0: FO_ResultRef(0), 1: FO_Arg(0), 2: FO_Arg(1), 3: FO_Arg(2)}, arity = 2, output_precision = ML_Float8),
+        type_strict_match(ML_Float16, ML_Float16, ML_Float16, ML_Float16): ML_VectorLib_Function("ml_vfmaf16", arg_map = {0: FO_ResultRef(0), 1: FO_Arg(0), 2: FO_Arg(1), 3: FO_Arg(2)}, arity = 2, output_precision = ML_Float16),
       },
     },
   },
@@ -529,6 +619,7 @@ vector_c_code_generation_table = {
         type_strict_match(ML_Float2, ML_Int2): ML_VectorLib_Function("ml_vexp_insertion_f2", arg_map = {0: FO_ResultRef(0), 1: FO_Arg(0)}, arity = 1, output_precision = ML_Float2),
         type_strict_match(ML_Float4, ML_Int4): ML_VectorLib_Function("ml_vexp_insertion_f4", arg_map = {0: FO_ResultRef(0), 1: FO_Arg(0)}, arity = 1, output_precision = ML_Float4),
         type_strict_match(ML_Float8, ML_Int8): ML_VectorLib_Function("ml_vexp_insertion_f8", arg_map = {0: FO_ResultRef(0), 1: FO_Arg(0)}, arity = 1, output_precision = ML_Float8),
+        type_strict_match(ML_Float16, ML_VInt16): ML_VectorLib_Function("ml_vexp_insertion_f16", arg_map = {0: FO_ResultRef(0), 1: FO_Arg(0)}, arity = 1, output_precision = ML_Float16),
       }
     },
   },
@@ -538,6 +629,7 @@ vector_c_code_generation_table = {
         type_strict_match(ML_Int2, ML_Float2): ML_VectorLib_Function("ml_vexp_extraction_f2", arg_map = {0: FO_ResultRef(0), 1: FO_Arg(0)}, arity = 1, output_precision = ML_Int2),
         type_strict_match(ML_Int4, ML_Float4): ML_VectorLib_Function("ml_vexp_extraction_f4", arg_map = {0: FO_ResultRef(0), 1: FO_Arg(0)}, arity = 1, output_precision = ML_Int4),
         type_strict_match(ML_Int8, ML_Float8): ML_VectorLib_Function("ml_vexp_extraction_f8", arg_map = {0: FO_ResultRef(0), 1: FO_Arg(0)}, arity = 1, output_precision = ML_Int8),
+        type_strict_match(ML_VInt16, ML_Float16): ML_VectorLib_Function("ml_vexp_extraction_f16", arg_map = {0: FO_ResultRef(0), 1: FO_Arg(0)}, arity = 1, output_precision = ML_VInt16),
       }
     },
   },
@@ -547,13 +639,35 @@ vector_c_code_generation_table = {
         type_strict_match(ML_Int2, ML_Float2): ML_VectorLib_Function("ml_vnearbyintf2", arg_map = {0: FO_ResultRef(0), 1: FO_Arg(0)}, arity = 1, output_precision = ML_Int2),
         type_strict_match(ML_Int4, ML_Float4): ML_VectorLib_Function("ml_vnearbyintf4", arg_map = {0: FO_ResultRef(0), 1: FO_Arg(0)}, arity = 1, output_precision = ML_Int4),
         type_strict_match(ML_Int8, ML_Float8): ML_VectorLib_Function("ml_vnearbyintf8", arg_map = {0: FO_ResultRef(0), 1: FO_Arg(0)}, arity = 1, output_precision = ML_Int8),
+        type_strict_match(ML_VInt16, ML_Float16): ML_VectorLib_Function("ml_vnearbyintf16", arg_map = {0: FO_ResultRef(0), 1: FO_Arg(0)}, arity = 1, output_precision = ML_VInt16),
 
         type_strict_match(ML_Float2, ML_Float2): ML_VectorLib_Function("ml_vrintf2", arg_map = {0: FO_ResultRef(0), 1: FO_Arg(0)}, arity = 1, output_precision = ML_Float2),
         type_strict_match(ML_Float4, ML_Float4): ML_VectorLib_Function("ml_vrintf4", arg_map = {0: FO_ResultRef(0), 1: FO_Arg(0)}, arity = 1, output_precision = ML_Float4),
         type_strict_match(ML_Float8, ML_Float8): ML_VectorLib_Function("ml_vrintf8", arg_map = {0: FO_ResultRef(0), 1: FO_Arg(0)}, arity = 1, output_precision = ML_Float8),
+        type_strict_match(ML_Float16, ML_Float16): ML_VectorLib_Function("ml_vrintf16", arg_map = {0: FO_ResultRef(0), 1: FO_Arg(0)}, arity = 1, output_precision = ML_Float16),
       }
     }
   },
+  Abs: {
+    None: {
+      lambda _: True: generate_per_lane_unary_table("ml_vabs", [ML_Binary32, ML_Binary64]),
+    }
+  },
+  Floor: {
+    None: {
+      lambda _: True: generate_per_lane_unary_table("ml_vfloor", [ML_Binary32, ML_Binary64]),
+    }
+  },
+  Ceil: {
+    None: {
+      lambda _: True: generate_per_lane_unary_table("ml_vceil", [ML_Binary32, ML_Binary64]),
+    }
+  },
+  Trunc: {
+    None: {
+      lambda _: True: generate_per_lane_unary_table("ml_vtrunc", [ML_Binary32, ML_Binary64]),
+    }
+  },
   Negation: {
     None: {
       lambda _: True: 
@@ -565,7 +679,7 @@ vector_c_code_generation_table = {
                 type_strict_match(vector_type[scalar_type][vector_size], vector_type[scalar_type][vector_size])
               , 
                 ML_VectorLib_Function("ml_vneg%s%d" % (scalar_type_letter[scalar_type], vector_size), arg_map = {0: FO_ResultRef(0), 1: FO_Arg(0)}, arity = 1, output_precision = vector_type[scalar_type][vector_size])
-              ) for vector_size in [2, 4, 8]
+              ) for vector_size in vector_type[scalar_type]
             ] for scalar_type in [ML_Binary32, ML_Binary64, ML_Int32, ML_UInt32]
           ]
           , []
@@ -617,6 +731,7 @@ vector_c_code_generation_table = {
         type_strict_match(ML_Bool2, ML_Bool2): ML_VectorLib_Function("ml_vnotb2", arg_map = {0: FO_ResultRef(0), 1: FO_Arg(0)}, arity = 1, output_precision = ML_Int2),
         type_strict_match(ML_Bool4, ML_Bool4): ML_VectorLib_Function("ml_vnotb4", arg_map = {0: FO_ResultRef(0), 1: FO_Arg(0)}, arity = 1, output_precision = ML_Int2),
         type_strict_match(ML_Bool8, ML_Bool8): ML_VectorLib_Function("ml_vnotb8", arg_map = {0: FO_ResultRef(0), 1: FO_Arg(0)}, arity = 1, output_precision = ML_Int2),
+        type_strict_match(ML_Bool16, ML_Bool16): ML_VectorLib_Function("ml_vnotb16", arg_map = {0: FO_ResultRef(0), 1: FO_Arg(0)}, arity = 1, output_precision = ML_Int2),
       },
     },
   },
@@ -626,6 +741,17 @@ vector_c_code_generation_table = {
         type_strict_match(ML_Bool2, ML_Bool2, ML_Bool2): ML_VectorLib_Function("ml_vandb2", arg_map = {0: FO_ResultRef(0), 1: FO_Arg(0), 2: FO_Arg(1)}, arity = 2, output_precision = ML_Int2),
         type_strict_match(ML_Bool4, ML_Bool4, ML_Bool4): ML_VectorLib_Function("ml_vandb4", arg_map = {0: FO_ResultRef(0), 1: FO_Arg(0), 2: FO_Arg(1)}, arity = 2, output_precision = ML_Int2),
         type_strict_match(ML_Bool8, ML_Bool8, ML_Bool8): ML_VectorLib_Function("ml_vandb8", arg_map = {0: FO_ResultRef(0), 1: FO_Arg(0), 2: FO_Arg(1)}, arity = 2, output_precision = ML_Int2),
+        type_strict_match(ML_Bool16, ML_Bool16, ML_Bool16): ML_VectorLib_Function("ml_vandb16", arg_map = {0: FO_ResultRef(0), 1: FO_Arg(0), 2: FO_Arg(1)}, arity = 2, output_precision = ML_Int2),
+      },
+    },
+  },
+  LogicalOr: {
+    None: {
+      lambda _: True: {
+        type_strict_match(ML_Bool2, ML_Bool2, ML_Bool2): ML_VectorLib_Function("ml_vorb2", arg_map = {0: FO_ResultRef(0), 1: FO_Arg(0), 2: FO_Arg(1)}, arity = 2, output_precision = ML_Bool2),
+        type_strict_match(ML_Bool4, ML_Bool4, ML_Bool4): ML_VectorLib_Function("ml_vorb4", arg_map = {0: FO_ResultRef(0), 1: FO_Arg(0), 2: FO_Arg(1)}, arity = 2, output_precision = ML_Bool4),
+        type_strict_match(ML_Bool8, ML_Bool8, ML_Bool8): ML_VectorLib_Function("ml_vorb8", arg_map = {0: FO_ResultRef(0), 1: FO_Arg(0), 2: FO_Arg(1)}, arity = 2, output_precision = ML_Bool8),
+        type_strict_match(ML_Bool16, ML_Bool16, ML_Bool16): ML_VectorLib_Function("ml_vorb16", arg_map = {0: FO_ResultRef(0), 1: FO_Arg(0), 2: FO_Arg(1)}, arity = 2, output_precision = ML_Bool16),
       },
     },
   },
@@ -654,8 +780,8 @@ vector_c_code_generation_table = {
                       )
                       , 
                       ML_VectorLib_Function("ml_comp_%s_%s%d" % (comp_specifier.opcode, scalar_type_letter[scalar_type], vector_size), arg_map = {0: FO_ResultRef(0), 1: FO_Arg(0), 2: FO_Arg(1)}, arity = 2, output_precision = vector_type[ML_Bool][vector_size])
-                    )  for scalar_type in [ML_Binary32, ML_Binary64, ML_Int32, ML_UInt32]
-                  ] for vector_size in [2, 4, 8]
+                    )  for scalar_type in [ML_Binary32, ML_Binary64, ML_Int32, ML_UInt32] if vector_size in vector_type[scalar_type]
+                  ] for vector_size in [2, 4, 8, 16]
                 ], []
               )
             )
@@ -669,6 +795,7 @@ vector_c_code_generation_table = {
         type_strict_match_list([ML_Bool, ML_Int32], [ML_Bool2]): ML_VectorLib_Function("ml_is_vmask2_zero", arity = 1, output_precision = ML_Int32), 
         type_strict_match_list([ML_Bool, ML_Int32], [ML_Bool4]): ML_VectorLib_Function("ml_is_vmask4_zero", arity = 1, output_precision = ML_Int32), 
         type_strict_match_list([ML_Bool, ML_Int32], [ML_Bool8]): ML_VectorLib_Function("ml_is_vmask8_zero", arity = 1, output_precision = ML_Int32), 
+        type_strict_match_list([ML_Bool, ML_Int32], [ML_Bool16]): ML_VectorLib_Function("ml_is_vmask16_zero", arity = 1, output_precision = ML_Int32), 
       },
     },
     Test.IsMaskAnyZero: {
@@ -676,6 +803,7 @@ vector_c_code_generation_table = {
         type_strict_match_list([ML_Bool, ML_Int32], [ML_Bool2]): ML_VectorLib_Function("ml_is_vmask2_any_zero", arity = 1, output_precision = ML_Int32), 
         type_strict_match_list([ML_Bool, ML_Int32], [ML_Bool4]): ML_VectorLib_Function("ml_is_vmask4_any_zero", arity = 1, output_precision = ML_Int32), 
         type_strict_match_list([ML_Bool, ML_Int32], [ML_Bool8]): ML_VectorLib_Function("ml_is_vmask8_any_zero", arity = 1, output_precision = ML_Int32), 
+        type_strict_match_list([ML_Bool, ML_Int32], [ML_Bool16]): ML_VectorLib_Function("ml_is_vmask16_any_zero", arity = 1, output_precision = ML_Int32), 
       },
     },
     Test.IsMaskNotAnyZero: {
@@ -683,6 +811,7 @@ vector_c_code_generation_table = {
         type_strict_match_list([ML_Bool, ML_Int32], [ML_Bool2]): ML_VectorLib_Function("ml_is_vmask2_not_any_zero", arity = 1, output_precision = ML_Int32), 
         type_strict_match_list([ML_Bool, ML_Int32], [ML_Bool4]): ML_VectorLib_Function("ml_is_vmask4_not_any_zero", arity = 1, output_precision = ML_Int32), 
         type_strict_match_list([ML_Bool, ML_Int32], [ML_Bool8]): ML_VectorLib_Function("ml_is_vmask8_not_any_zero", arity = 1, output_precision = ML_Int32), 
+        type_strict_match_list([ML_Bool, ML_Int32], [ML_Bool16]): ML_VectorLib_Function("ml_is_vmask16_not_any_zero", arity = 1, output_precision = ML_Int32), 
       },
     },
     Test.IsMaskNotAllZero: {
@@ -690,6 +819,7 @@ vector_c_code_generation_table = {
         type_strict_match_list([ML_Bool, ML_Int32], [ML_Bool2]): ML_VectorLib_Function("ml_is_vmask2_not_all_zero", arity = 1, output_precision = ML_Int32), 
         type_strict_match_list([ML_Bool, ML_Int32], [ML_Bool4]): ML_VectorLib_Function("ml_is_vmask4_not_all_zero", arity = 1, output_precision = ML_Int32), 
         type_strict_match_list([ML_Bool, ML_Int32], [ML_Bool8]): ML_VectorLib_Function("ml_is_vmask8_not_all_zero", arity = 1, output_precision = ML_Int32), 
+        type_strict_match_list([ML_Bool, ML_Int32], [ML_Bool16]): ML_VectorLib_Function("ml_is_vmask16_not_all_zero", arity = 1, output_precision = ML_Int32), 
       },
     },
     Test.IsInfOrNaN: {
@@ -697,8 +827,12 @@ vector_c_code_generation_table = {
         type_strict_match(ML_Bool2, ML_Float2): ML_VectorLib_Function("ml_vtestf2_is_nan_or_inf", arg_map = {0: FO_ResultRef(0), 1: FO_Arg(0)}, arity = 1, output_precision = ML_Int2),
         type_strict_match(ML_Bool4, ML_Float4): ML_VectorLib_Function("ml_vtestf4_is_nan_or_inf", arg_map = {0: FO_ResultRef(0), 1: FO_Arg(0)}, arity = 1, output_precision = ML_Int4),
         type_strict_match(ML_Bool8, ML_Float8): ML_VectorLib_Function("ml_vtestf8_is_nan_or_inf", arg_map = {0: FO_ResultRef(0), 1: FO_Arg(0)}, arity = 1, output_precision = ML_Int8),
+        type_strict_match(ML_Bool16, ML_Float16): ML_VectorLib_Function("ml_vtestf16_is_nan_or_inf", arg_map = {0: FO_ResultRef(0), 1: FO_Arg(0)}, arity = 1, output_precision = ML_VInt16),
       },
-    }
+    },
+    Test.IsInfty: {
+      lambda _: True: generate_per_lane_unary_table("ml_vtest", [ML_Binary32, ML_Binary64], result_type = ML_Bool, func_suffix = "_is_inf"),
+    },
   },
 }
 
@@ -0,0 +1,253 @@
+# -*- coding: utf-8 -*-
+
+###############################################################################
+# This file is part of Kalray's Metalibm tool
+# Copyright (2016)
+# All rights reserved
+# created:          Oct 18th, 2016
+# last-modified:    Oct 18th, 2016
+#
+# description: implement a vector backend based on GCC/Clang vector extensions
+# author(s): Nicolas Brunie (nicolas.brunie@kalray.eu)
+###############################################################################
+
+# Vector operations are implemented by C operators (and __builtin_convertvector
+# for conversions) applied to the vector extension member <vec> of the vector
+# formats (see ML_VECTOR_EXTENSION in support_lib/ml_vector_format.h): the
+# compiler selects the SIMD instructions of the ISA it targets.
+# Lane permutations are not implemented (the IR has no permutation
+# operation).
+# Operations without vector extension implementation (mask tests,
+# rounding ...) fall back to the per-lane implementations of VectorBackend,
+# which exist for every vector size of vext_size_list.
+#
+# Boolean vectors produced by these implementations have all-ones lanes
+# for true values (C vector comparison results), boolean vectors are
+# consumed as "lane != 0".
+# __builtin_convertvector requires GCC >= 9 or Clang.
+
+from metalibm_core.utility.log_report import *
+from metalibm_core.code_generation.generator_utility import *
+from metalibm_core.core.ml_formats import *
+from metalibm_core.core.ml_operations import *
+
+from metalibm_core.core.target import TargetRegister
+
+from metalibm_core.targets.common.vector_backend import VectorBackend, vector_type
+
+
+## name of the vector extension type associated with <vector_format>
+#  (ml_float4_t -> ml_float4_vec_t)
+def get_vector_extension_name(vector_format):
+  return vector_format.get_name()[:-2] + "_vec_t"
+
+## name of the signed integer vector extension type whose lanes have the
+#  width of <vector_format>'s lanes
+def get_lane_mask_name(vector_format):
+  lane_type = "long" if vector_format.get_scalar_format().get_bit_size() == 64 else "int"
+  return "ml_%s%d_vec_t" % (lane_type, vector_format.get_vector_size())
+
+## build an operator evaluating the vector extension expression <template>
+#  (every "%s" of <template> being replaced by the <vec> member of an
+#  argument) and returning its result as a <vector_format> value
+#  @param arg_map optional FunctionOperator argument map (argument order
+#         in <template>)
+def vext_operator(vector_format, template, arity, arg_map = None):
+  vext_template = template.replace("%s", "%s.vec")
+  return TemplateOperator("((%s) {.vec = %s})" % (vector_format.get_name(), vext_template), arg_map = arg_map, arity = arity, output_precision = vector_format, require_header = ["support_lib/ml_vector_format.h"])
+
+
+## vector sizes supported for each scalar format
+vext_size_list = {
+  ML_Binary32: [2, 4, 8, 16],
+  ML_Binary64: [2, 4, 8],
+  ML_Int32:    [2, 4, 8, 16],
+  ML_UInt32:   [2, 4, 8, 16],
+}
+
+def vext_format_list(scalar_format_list):
+  return [vector_type[scalar_format][vector_size] for scalar_format in scalar_format_list for vector_size in vext_size_list[scalar_format]]
+
+## boolean vector format associated with <vector_format>
+def vext_bool_format(vector_format):
+  return vector_type[ML_Bool][vector_format.get_vector_size()]
+
+## same-size vector format with <scalar_format> elements (None if
+#  it does not exist)
+def vext_lane_format(vector_format, scalar_format):
+  return vector_type[scalar_format].get(vector_format.get_vector_size(), None)
+
+## lanes mask of a boolean vector (all-ones lanes for non-zero lanes),
+#  with lanes as wide as <vector_format>'s lanes
+def vext_mask(vector_format, bool_template):
+  mask = "(%s != 0)" % bool_template
+  if vector_format.get_scalar_format().get_bit_size() == 64:
+    return "__builtin_convertvector(%s, %s)" % (mask, get_lane_mask_name(vector_format))
+  return mask
+
+float_formats = vext_format_list([ML_Binary32, ML_Binary64])
+integer_formats = vext_format_list([ML_Int32, ML_UInt32])
+arith_formats = float_formats + integer_formats
+bool_formats = [vector_type[ML_Bool][vector_size] for vector_size in vext_size_list[ML_Int32]]
+
+
+def vext_binary_op(c_operator, format_list):
+  return {
+    lambda optree: True: dict(
+      (type_strict_match(vformat, vformat, vformat), vext_operator(vformat, "%%s %s %%s" % c_operator, 2)) for vformat in format_list
+    ),
+  }
+
+def vext_unary_op(c_operator, format_list):
+  return {
+    lambda optree: True: dict(
+      (type_strict_match(vformat, vformat), vext_operator(vformat, "%s%%s" % c_operator, 1)) for vformat in format_list
+    ),
+  }
+
+def vext_comparison(c_operator):
+  return {
+    lambda optree: True: dict(
+      (type_strict_match(vext_bool_format(vformat), vformat, vformat),
+       # 64-bit lanes comparison results are narrowed to the (32-bit) boolean lanes
+       vext_operator(vext_bool_format(vformat), "__builtin_convertvector(%%s %s %%s, %s)" % (c_operator, get_vector_extension_name(vext_bool_format(vformat))) if vformat.get_scalar_format().get_bit_size() == 64 else "%%s %s %%s" % c_operator, 2)
+      ) for vformat in arith_formats
+    ),
+  }
+
+## select(cond, if_true, if_false) as bitwise blend of lanes
+def vext_select(vformat):
+  mask_name = get_lane_mask_name(vformat)
+  mask = vext_mask(vformat, "%s")
+  template = "(%s) ((((%s) %%s) & %s) | (((%s) %%s) & ~%s))" % (get_vector_extension_name(vformat), mask_name, mask, mask_name, mask)
+  # template argument order: if_true, cond, if_false, cond
+  return vext_operator(vformat, template, 3, arg_map = {0: FO_Arg(1), 1: FO_Arg(0), 2: FO_Arg(2), 3: FO_Arg(0)})
+
+def vext_convert(dst_format):
+  return vext_operator(dst_format, "__builtin_convertvector(%%s, %s)" % get_vector_extension_name(dst_format), 1)
+
+def vext_bitcast(dst_format):
+  return vext_operator(dst_format, "(%s) %%s" % get_vector_extension_name(dst_format), 1)
+
+
+vector_extension_c_code_generation_table = {
+  Addition: {None: vext_binary_op("+", arith_formats)},
+  Subtraction: {None: vext_binary_op("-", arith_formats)},
+  Multiplication: {None: vext_binary_op("*", arith_formats)},
+  Division: {None: vext_binary_op("/", arith_formats)},
+  # ("%" is escaped for TemplateOperator formatting)
+  Modulo: {None: vext_binary_op("%%", integer_formats)},
+  Negation: {None: vext_unary_op("-", arith_formats)},
+  FusedMultiplyAdd: {
+    # same (contractible) expression as the per-lane implementation
+    FusedMultiplyAdd.Standard: {
+      lambda optree: True: dict(
+        (type_strict_match(vformat, vformat, vformat, vformat), vext_operator(vformat, "%s * %s + %s", 3)) for vformat in float_formats
+      ),
+    },
+  },
+  BitLogicAnd: {None: vext_binary_op("&", integer_formats)},
+  BitLogicOr: {None: vext_binary_op("|", integer_formats)},
+  BitLogicXor: {None: vext_binary_op("^", integer_formats)},
+  BitLogicNegate: {None: vext_unary_op("~", integer_formats)},
+  BitLogicLeftShift: {None: vext_binary_op("<<", integer_formats)},
+  BitLogicRightShift: {None: vext_binary_op(">>", integer_formats)},
+  Comparison: {
+    Comparison.Equal: vext_comparison("=="),
+    Comparison.NotEqual: vext_comparison("!="),
+    Comparison.Greater: vext_comparison(">"),
+    Comparison.GreaterOrEqual: vext_comparison(">="),
+    Comparison.Less: vext_comparison("<"),
+    Comparison.LessOrEqual: vext_comparison("<="),
+  },
+  Select: {
+    None: {
+      lambda optree: True: dict(
+        (type_strict_match(vformat, vext_bool_format(vformat), vformat, vformat), vext_select(vformat)) for vformat in arith_formats
+      ),
+    },
+  },
+  LogicalNot: {
+    None: {
+      lambda optree: True: dict(
+        (type_strict_match(bformat, bformat), vext_operator(bformat, "%s == 0", 1)) for bformat in bool_formats
+      ),
+    },
+  },
+  LogicalAnd: {
+    None: {
+      lambda optree: True: dict(
+        (type_strict_match(bformat, bformat, bformat), vext_operator(bformat, "(%s != 0) & (%s != 0)", 2)) for bformat in bool_formats
+      ),
+    },
+  },
+  LogicalOr: {
+    None: {
+      lambda optree: True: dict(
+        (type_strict_match(bformat, bformat, bformat), vext_operator(bformat, "(%s != 0) | (%s != 0)", 2)) for bformat in bool_formats
+      ),
+    },
+  },
+  Conversion: {
+    None: {
+      lambda optree: True: dict(
+        # value conversions between same-size vectors (C conversion semantic)
+        (type_strict_match(dst_format, src_format), vext_convert(dst_format))
+          for src_format in arith_formats
+          for dst_scalar in [ML_Binary32, ML_Binary64, ML_Int32, ML_UInt32]
+          for dst_format in [vext_lane_format(src_format, dst_scalar)]
+          if dst_format != None and dst_format != src_format
+      ),
+    },
+  },
+  TypeCast: {
+    None: {
+      lambda optree: True: dict(
+        # bit casts between 32-bit lane vectors
+        (type_strict_match(dst_format, src_format), vext_bitcast(dst_format))
+          for src_format in vext_format_list([ML_Binary32, ML_Int32, ML_UInt32])
+          for dst_scalar in [ML_Binary32, ML_Int32, ML_UInt32]
+          for dst_format in [vext_lane_format(src_format, dst_scalar)]
+          if dst_format != src_format
+      ),
+    },
+  },
+  ExponentInsertion: {
+    ExponentInsertion.Default: {
+      lambda optree: True: dict(
+        (type_strict_match(vformat, vext_lane_format(vformat, ML_Int32)), vext_operator(vformat, "(%s) ((%%s + 127) << 23)" % get_vector_extension_name(vformat), 1)) for vformat in vext_format_list([ML_Binary32])
+      ),
+    },
+  },
+  ExponentExtraction: {
+    None: {
+      lambda optree: True: dict(
+        (type_strict_match(vext_lane_format(vformat, ML_Int32), vformat), vext_operator(vext_lane_format(vformat, ML_Int32), "((((%s) %%s) >> 23) & 0xff) - 127" % get_lane_mask_name(vformat), 1)) for vformat in vext_format_list([ML_Binary32])
+      ),
+    },
+  },
+  Test: {
+    Test.IsInfOrNaN: {
+      lambda optree: True: dict(
+        (type_strict_match(vext_bool_format(vformat), vformat), vext_operator(vext_bool_format(vformat), "(((%s) %%s) & 0x7f800000) == 0x7f800000" % get_lane_mask_name(vformat), 1)) for vformat in vext_format_list([ML_Binary32])
+      ),
+    },
+    Test.IsNaN: {
+      lambda optree: True: dict(
+        (type_strict_match(vext_bool_format(vformat), vformat), vext_operator(vext_bool_format(vformat), "%s != %s", 1, arg_map = {0: FO_Arg(0), 1: FO_Arg(0)})) for vformat in vext_format_list([ML_Binary32])
+      ),
+    },
+  },
+}
+
+
+class VectorExtensionBackend(VectorBackend):
+  target_name = "vector_ext"
+  TargetRegister.register_new_target(target_name, lambda _: VectorExtensionBackend)
+
+  code_generation_table = {
+    C_Code: vector_extension_c_code_generation_table,
+  }
+
+  def __init__(self, *args):
+    VectorBackend.__init__(self, *args)
@@ -1,2 +1,3 @@
 
 from x86_processor import *
+from x86_avx_processor import *
@@ -0,0 +1,711 @@
+# -*- coding: utf-8 -*-
+
+###############################################################################
+# This file is part of Kalray's Metalibm tool
+# Copyright (2016)
+# All rights reserved
+# created:          Oct 18th, 2016
+# last-modified:    Oct 18th, 2016
+#
+# description: x86 AVX2 and AVX-512 vector targets
+# author(s): Nicolas Brunie (nicolas.brunie@kalray.eu)
+###############################################################################
+
+# Vector operations are implemented by _mm256_* / _mm512_* intrinsics
+# operating on the native member <v> of the vector formats: when compiling
+# with AVX (resp. AVX-512F) support, support_lib/ml_vector_format.h declares
+# the 256-bit (resp. 512-bit) formats as unions of an element array and of
+# a native vector (see DEC_ML_NATIVE_FORMAT). The format layout is unchanged
+# so that operations not listed here fall back to the per-lane
+# implementations of the generic vector backend.
+#
+# Boolean vectors produced by these implementations have all-ones lanes
+# for true values, boolean vectors are consumed as "lane != 0" (as the
+# generic vector backend does).
+
+from abc import ABCMeta, abstractmethod
+
+from ...utility.log_report import *
+from ...code_generation.generator_utility import *
+from ...code_generation.complex_generator import DynamicOperator
+from ...core.ml_formats import *
+from ...core.ml_operations import *
+from ...core.target import TargetRegister
+from ..common.vector_backend import VectorBackend, type_vector_table_load_match
+from .x86_processor import X86_FMA_Processor
+
+
+## headers required by native vector operators (intrinsics and unions
+#  declaration of the vector formats)
+x86_vector_header_list = ["immintrin.h", "support_lib/ml_vector_format.h"]
+
+## build an operator evaluating the native vector expression <template>
+#  (every "%s" of <template> being replaced by the native vector of an
+#  argument) and returning its result as a <vector_format> value
+#  @param arg_map optional FunctionOperator argument map (argument order
+#         in <template>)
+def x86_vector_operator(vector_format, template, arity, arg_map = None):
+    native_template = template.replace("%s", "%s.v")
+    return TemplateOperator("((%s) {.v = %s})" % (vector_format.get_name(), native_template), arg_map = arg_map, arity = arity, output_precision = vector_format, require_header = x86_vector_header_list)
+
+## build an operator evaluating the scalar expression <template> of
+#  native vector arguments
+def x86_vector_test_operator(template, arity, output_precision = ML_Int32, arg_map = None):
+    native_template = template.replace("%s", "%s.v")
+    return TemplateOperator(native_template, arg_map = arg_map, arity = arity, output_precision = output_precision, require_header = x86_vector_header_list)
+
+
+## description of an x86 vector extension: vector formats and intrinsic
+#  expression templates (for 32-bit lanes)
+#  Extensions must implement every abstract template method, an
+#  incomplete extension can not be instanciated
+class X86_VectorISA(object):
+    __metaclass__ = ABCMeta
+
+    def __init__(self, vector_size, float_format, double_format, int_format, uint_format, bool_format, prefix, si_suffix):
+        self.vector_size = vector_size
+        self.float_format = float_format
+        self.double_format = double_format
+        self.int_format = int_format
+        self.uint_format = uint_format
+        self.bool_format = bool_format
+        ## intrinsic prefix (e.g. _mm256_)
+        self.prefix = prefix
+        ## suffix of the integer register type (e.g. si256)
+        self.si_suffix = si_suffix
+
+    def intr(self, name):
+        return self.prefix + name
+
+    ## float vector reinterpreted as an integer vector
+    def cast_f2i(self, expr):
+        return "%scastps_%s(%s)" % (self.prefix, self.si_suffix, expr)
+    ## integer vector reinterpreted as a float vector
+    def cast_i2f(self, expr):
+        return "%scast%s_ps(%s)" % (self.prefix, self.si_suffix, expr)
+
+    def set1_epi32(self, value):
+        return "%sset1_epi32(%s)" % (self.prefix, value)
+
+    ## float comparison of <lhs> and <rhs> with predicate <predicate>,
+    #  result as a boolean vector expression
+    @abstractmethod
+    def float_compare(self, lhs, rhs, predicate):
+        pass
+    ## signed integer comparison template
+    #  @return pair (template, argument map)
+    @abstractmethod
+    def int_compare(self, specifier):
+        pass
+
+    def unordered(self):
+        return self.float_compare("%s", "%s", "_CMP_UNORD_Q")
+
+    ## lane selection template (see select_arg_map), <scalar_letter> being
+    #  "f" for float vectors and "i" for integer vectors
+    @abstractmethod
+    def select(self, scalar_letter):
+        pass
+
+    ## boolean vector templates
+    @abstractmethod
+    def logical_not(self):
+        pass
+    @abstractmethod
+    def logical_and(self):
+        pass
+    @abstractmethod
+    def logical_or(self):
+        pass
+    ## lane-wise equality of integer vectors <lhs> and <rhs>, as a boolean
+    #  vector expression
+    @abstractmethod
+    def lane_equal(self, lhs, rhs):
+        pass
+    ## test template: some lane of the mask is zero (all lanes are
+    #  non-zero if <negate>)
+    @abstractmethod
+    def mask_any_zero(self, negate):
+        pass
+
+    ## float rounding template (current rounding mode)
+    @abstractmethod
+    def round_float(self):
+        pass
+
+    ## argument maps of templates using their argument(s) several times
+    #  (None when every argument is used once, in order)
+    logical_not_arg_map = None
+    logical_op_arg_map = None
+    mask_test_arg_map = {0: FO_Arg(0), 1: FO_Arg(0)}
+    mask_any_zero_arg_map = None
+
+    ## vector formats whose table loads are implemented natively
+    @abstractmethod
+    def get_table_load_formats(self):
+        pass
+    ## intrinsic prefix of the operations on the index vectors of
+    #  <vector_format> table loads
+    def index_prefix(self, vector_format):
+        return self.prefix
+    ## gather of the elements <base>[<index>] (<scale>: element byte size)
+    @abstractmethod
+    def gather(self, suffix, base, index, scale):
+        pass
+    ## lookup of the <index> lanes in the <table_size> elements from <base>
+    #  (table_size <= X86_PERMUTE_TABLE_MAX_SIZE)
+    @abstractmethod
+    def permute_table(self, suffix, base, index, table_size):
+        pass
+
+
+class X86_AVX2_ISA(X86_VectorISA):
+    def __init__(self):
+        X86_VectorISA.__init__(self, 8, ML_Float8, ML_Double4, ML_Int8, ML_UInt8, ML_Bool8, "_mm256_", "si256")
+
+    def float_compare(self, lhs, rhs, predicate):
+        return self.cast_f2i("_mm256_cmp_ps(%s, %s, %s)" % (lhs, rhs, predicate))
+
+    def int_compare(self, specifier):
+        # only equality and greater-than are available: other comparisons
+        # are obtained by swapping operands and/or complementing the result
+        swap_map = {0: FO_Arg(1), 1: FO_Arg(0)}
+        complement = "_mm256_xor_si256(%s, _mm256_set1_epi32(-1))"
+        return {
+            Comparison.Equal:           ("_mm256_cmpeq_epi32(%s, %s)", None),
+            Comparison.NotEqual:        (complement % "_mm256_cmpeq_epi32(%s, %s)", None),
+            Comparison.Greater:         ("_mm256_cmpgt_epi32(%s, %s)", None),
+            Comparison.GreaterOrEqual:  (complement % "_mm256_cmpgt_epi32(%s, %s)", swap_map),
+            Comparison.Less:            ("_mm256_cmpgt_epi32(%s, %s)", swap_map),
+            Comparison.LessOrEqual:     (complement % "_mm256_cmpgt_epi32(%s, %s)", None),
+        }[specifier]
+
+    ## all-ones lanes where <expr> is zero
+    def zero_lanes(self, expr):
+        return "_mm256_cmpeq_epi32(%s, _mm256_setzero_si256())" % expr
+
+    def select(self, scalar_letter):
+        # <if_false> is selected in the lanes where the condition is zero
+        if scalar_letter == "f":
+            return "_mm256_blendv_ps(%s, %s, _mm256_castsi256_ps(" + self.zero_lanes("%s") + "))"
+        else:
+            return "_mm256_blendv_epi8(%s, %s, " + self.zero_lanes("%s") + ")"
+    ## argument order of select templates: if_true, if_false, condition
+    select_arg_map = {0: FO_Arg(1), 1: FO_Arg(2), 2: FO_Arg(0)}
+
+    def logical_not(self):
+        return self.zero_lanes("%s")
+    def logical_and(self):
+        return self.zero_lanes("_mm256_or_si256(%s, %s)" % (self.zero_lanes("%s"), self.zero_lanes("%s")))
+    def logical_or(self):
+        return self.zero_lanes("_mm256_and_si256(%s, %s)" % (self.zero_lanes("%s"), self.zero_lanes("%s")))
+
+    def lane_equal(self, lhs, rhs):
+        return "_mm256_cmpeq_epi32(%s, %s)" % (lhs, rhs)
+
+    mask_test_map = {
+        Test.IsMaskAllZero:    "_mm256_testz_si256(%s, %s)",
+        Test.IsMaskNotAllZero: "(!_mm256_testz_si256(%s, %s))",
+    }
+    def mask_any_zero(self, negate):
+        return "(_mm256_movemask_ps(_mm256_castsi256_ps(_mm256_cmpeq_epi32(%%s, _mm256_setzero_si256()))) %s 0)" % ("==" if negate else "!=")
+
+    int_and = "_mm256_and_si256"
+    int_or = "_mm256_or_si256"
+    int_xor = "_mm256_xor_si256"
+
+    def round_float(self):
+        return "_mm256_round_ps(%s, _MM_FROUND_CUR_DIRECTION)"
+
+    ## formats of the gathered (or permuted) table loads: the 4 x 64-bit
+    #  format has no native 4 x 32-bit index vector
+    def get_table_load_formats(self):
+        return [self.float_format, self.int_format, self.uint_format]
+
+    def gather(self, suffix, base, index, scale):
+        return "_mm256_i32gather_%s(%s, %s, %d)" % (suffix, base, index, scale)
+
+    ## <count> first elements from <base> (the others being zero)
+    def load_table(self, suffix, base, count):
+        if count == 8:
+            return "_mm256_loadu_ps(%s)" % base if suffix == "ps" else "_mm256_loadu_si256((const __m256i*) (%s))" % base
+        mask = "_mm256_cmpgt_epi32(_mm256_set1_epi32(%d), _mm256_setr_epi32(0, 1, 2, 3, 4, 5, 6, 7))" % count
+        return "_mm256_maskload_%s(%s, %s)" % (suffix, base, mask)
+
+    ## lookup of <index> lanes in the (at most 16) elements from <base>
+    def permute_table(self, suffix, base, index, table_size):
+        permute = "_mm256_permutevar8x32_%s(%%s, %s)" % (suffix, index)
+        low_part = permute % self.load_table(suffix, base, min(table_size, 8))
+        if table_size <= 8:
+            return low_part
+        high_part = permute % self.load_table(suffix, "%s + 8" % base, table_size - 8)
+        high_lanes = "_mm256_cmpgt_epi32(%s, _mm256_set1_epi32(7))" % index
+        if suffix == "ps":
+            return "_mm256_blendv_ps(%s, %s, _mm256_castsi256_ps(%s))" % (low_part, high_part, high_lanes)
+        return "_mm256_blendv_epi8(%s, %s, %s)" % (low_part, high_part, high_lanes)
+
+
+class X86_AVX512_ISA(X86_VectorISA):
+    def __init__(self):
+        X86_VectorISA.__init__(self, 16, ML_Float16, ML_Double8, ML_VInt16, ML_VUInt16, ML_Bool16, "_mm512_", "si512")
+
+    def bool_from_mask(self, expr):
+        return "_mm512_maskz_mov_epi32(%s, _mm512_set1_epi32(-1))" % expr
+
+    def float_compare(self, lhs, rhs, predicate):
+        return self.bool_from_mask("_mm512_cmp_ps_mask(%s, %s, %s)" % (lhs, rhs, predicate))
+
+    def int_compare(self, specifier):
+        predicate = {
+            Comparison.Equal:           "_MM_CMPINT_EQ",
+            Comparison.NotEqual:        "_MM_CMPINT_NE",
+            Comparison.Greater:         "_MM_CMPINT_NLE",
+            Comparison.GreaterOrEqual:  "_MM_CMPINT_NLT",
+            Comparison.Less:            "_MM_CMPINT_LT",
+            Comparison.LessOrEqual:     "_MM_CMPINT_LE",
+        }[specifier]
+        return self.bool_from_mask("_mm512_cmp_epi32_mask(%%s, %%s, %s)" % predicate), None
+
+    def select(self, scalar_letter):
+        # <if_true> is selected in the lanes where the condition is not zero
+        return "_mm512_mask_blend_%s(_mm512_test_epi32_mask(%%s, %%s), %%s, %%s)" % ("ps" if scalar_letter == "f" else "epi32")
+    ## argument order of select templates: condition (twice), if_false, if_true
+    select_arg_map = {0: FO_Arg(0), 1: FO_Arg(0), 2: FO_Arg(2), 3: FO_Arg(1)}
+
+    logical_not_arg_map = {0: FO_Arg(0), 1: FO_Arg(0)}
+    logical_op_arg_map = {0: FO_Arg(0), 1: FO_Arg(0), 2: FO_Arg(1), 3: FO_Arg(1)}
+
+    def logical_not(self):
+        return self.bool_from_mask("_mm512_testn_epi32_mask(%s, %s)")
+    def logical_and(self):
+        return self.bool_from_mask("(_mm512_test_epi32_mask(%s, %s) & _mm512_test_epi32_mask(%s, %s))")
+    def logical_or(self):
+        return self.bool_from_mask("(_mm512_test_epi32_mask(%s, %s) | _mm512_test_epi32_mask(%s, %s))")
+
+    def lane_equal(self, lhs, rhs):
+        return self.bool_from_mask("_mm512_cmpeq_epi32_mask(%s, %s)" % (lhs, rhs))
+
+    mask_test_map = {
+        Test.IsMaskAllZero:    "(_mm512_test_epi32_mask(%s, %s) == 0)",
+        Test.IsMaskNotAllZero: "(_mm512_test_epi32_mask(%s, %s) != 0)",
+    }
+    mask_any_zero_arg_map = {0: FO_Arg(0), 1: FO_Arg(0)}
+
+    def mask_any_zero(self, negate):
+        return "(_mm512_test_epi32_mask(%%s, %%s) %s 0xffff)" % ("==" if negate else "!=")
+
+    int_and = "_mm512_and_epi32"
+    int_or = "_mm512_or_epi32"
+    int_xor = "_mm512_xor_epi32"
+
+    def round_float(self):
+        return "_mm512_roundscale_ps(%s, _MM_FROUND_CUR_DIRECTION)"
+
+    ## 8 x 64-bit loads are indexed by 8 x 32-bit (256-bit) index vectors
+    def get_table_load_formats(self):
+        return [self.float_format, self.int_format, self.uint_format, self.double_format]
+
+    def index_prefix(self, vector_format):
+        return "_mm256_" if vector_format is self.double_format else self.prefix
+
+    def gather(self, suffix, base, index, scale):
+        return "_mm512_i32gather_%s(%s, %s, %d)" % (suffix, index, base, scale)
+
+    def load_table(self, suffix, base, count):
+        if count == 16:
+            return "_mm512_loadu_%s(%s)" % ("ps" if suffix == "ps" else "si512", base)
+        return "_mm512_maskz_loadu_%s((__mmask16) 0x%x, %s)" % (suffix, (1 << count) - 1, base)
+
+    def permute_table(self, suffix, base, index, table_size):
+        return "_mm512_permutexvar_%s(%s, %s)" % (suffix, index, self.load_table(suffix, base, table_size))
+
+
+## comparison predicates of float comparisons (C semantic: ordered
+#  comparisons, != is true for unordered operands)
+x86_float_compare_predicate = {
+    Comparison.Equal:           "_CMP_EQ_OQ",
+    Comparison.NotEqual:        "_CMP_NEQ_UQ",
+    Comparison.Greater:         "_CMP_GT_OQ",
+    Comparison.GreaterOrEqual:  "_CMP_GE_OQ",
+    Comparison.Less:            "_CMP_LT_OQ",
+    Comparison.LessOrEqual:     "_CMP_LE_OQ",
+}
+
+x86_comparison_specifier_list = [Comparison.Equal, Comparison.NotEqual, Comparison.Greater, Comparison.GreaterOrEqual, Comparison.Less, Comparison.LessOrEqual]
+
+
+## largest tables (number of elements) whose vector loads are implemented
+#  by permutations of the table loaded in registers rather than by
+#  gathers (gathers are slow on many micro-architectures)
+X86_PERMUTE_TABLE_MAX_SIZE = 16
+
+## C element type, intrinsic suffix and byte size of table elements
+x86_table_element_map = {
+    ML_Binary32: ("float", "ps", 4),
+    ML_Binary64: ("double", "pd", 8),
+    ML_Int32:    ("int", "epi32", 4),
+    ML_UInt32:   ("int", "epi32", 4),
+}
+
+## convert <template>, whose arguments are denoted by @<index>@ markers
+#  (arguments may be used several times, in any order), into a
+#  TemplateOperator template and argument map
+def x86_marked_template(template):
+    piece_list = template.split("@")
+    arg_map = {}
+    for piece_id in xrange(1, len(piece_list), 2):
+        arg_map[len(arg_map)] = FO_Arg(int(piece_list[piece_id]))
+        piece_list[piece_id] = "%s"
+    return "".join(piece_list), arg_map
+
+## build the operator implementing the vector table load <optree> with
+#  the vector extension <isa>. The table is addressed as a one-dimensional
+#  array: constant column indices are folded into the element offset,
+#  the other indices into a linear index vector (or into the base address
+#  for scalar non-constant indices). Loads from tables of at most
+#  X86_PERMUTE_TABLE_MAX_SIZE 32-bit elements are register permutations,
+#  the others are gathers.
+def x86_vector_table_load(isa, optree):
+    vector_format = optree.get_precision()
+    element_type, suffix, scale = x86_table_element_map[vector_format.get_scalar_format()]
+    prefix = isa.index_prefix(vector_format)
+    dimensions = optree.get_input(0).dimensions
+    stride_list = [reduce(lambda acc, dim: acc * dim, dimensions[dim_id + 1:], 1) for dim_id in xrange(len(dimensions))]
+    table_size = stride_list[0] * dimensions[0]
+
+    base = "((const %s*) @0@)" % element_type
+    offset = 0
+    index = None
+    permutable = table_size <= X86_PERMUTE_TABLE_MAX_SIZE and scale == 4
+    for index_id, index_op in enumerate(optree.get_inputs()[1:]):
+        stride = stride_list[index_id]
+        if index_op.get_precision().is_vector_format():
+            term = "@%d@.v" % (index_id + 1)
+            if stride != 1:
+                term = "%smullo_epi32(%s, %sset1_epi32(%d))" % (prefix, term, prefix, stride)
+            index = term if index is None else "%sadd_epi32(%s, %s)" % (prefix, index, term)
+        elif isinstance(index_op, Constant):
+            offset += int(index_op.get_value()) * stride
+        else:
+            base = "(%s + (@%d@) * %d)" % (base, index_id + 1, stride)
+            permutable = False
+
+    if permutable:
+        if offset != 0:
+            index = "%sadd_epi32(%s, %sset1_epi32(%d))" % (prefix, index, prefix, offset)
+        result = isa.permute_table(suffix, base, index, table_size)
+    else:
+        if offset != 0:
+            base = "(%s + %d)" % (base, offset)
+        result = isa.gather(suffix, base, index, scale)
+
+    template, arg_map = x86_marked_template("((%s) {.v = %s})" % (vector_format.get_name(), result))
+    return TemplateOperator(template, arg_map = arg_map, arity = len(optree.get_inputs()), output_precision = vector_format, require_header = x86_vector_header_list)
+
+
+## generate the C code generation table of the x86 vector extension <isa>
+def generate_x86_vector_table(isa):
+    F = isa.float_format
+    D = isa.double_format
+    I = isa.int_format
+    U = isa.uint_format
+    B = isa.bool_format
+    intr = isa.intr
+
+    def op2(vector_format, intr_name):
+        return x86_vector_operator(vector_format, "%s(%%s, %%s)" % intr_name, 2)
+
+    float_arith = lambda name: {
+        type_strict_match(F, F, F): op2(F, intr(name + "_ps")),
+        type_strict_match(D, D, D): op2(D, intr(name + "_pd")),
+    }
+    int_arith = lambda name: {
+        type_strict_match(I, I, I): op2(I, intr(name)),
+        type_strict_match(U, U, U): op2(U, intr(name)),
+    }
+    def merge(*table_list):
+        result = {}
+        for table in table_list:
+            result.update(table)
+        return result
+
+    def fma_case(name):
+        return {
+            lambda optree: True: {
+                type_strict_match(F, F, F, F): x86_vector_operator(F, "%s(%%s, %%s, %%s)" % intr(name + "_ps"), 3),
+                type_strict_match(D, D, D, D): x86_vector_operator(D, "%s(%%s, %%s, %%s)" % intr(name + "_pd"), 3),
+            },
+        }
+
+    def int_compare_operator(specifier):
+        template, arg_map = isa.int_compare(specifier)
+        return x86_vector_operator(B, template, 2, arg_map = arg_map)
+
+    sign_mask = isa.set1_epi32("0x80000000")
+    exp_mask = isa.set1_epi32("0x7f800000")
+
+    table = {
+        TableLoad: {
+            None: {
+                lambda optree: True: dict(
+                    (type_vector_table_load_match(vector_format), DynamicOperator(lambda optree: x86_vector_table_load(isa, optree)))
+                    for vector_format in isa.get_table_load_formats()
+                ),
+            },
+        },
+        Addition: {
+            None: {
+                lambda optree: True: merge(float_arith("add"), int_arith("add_epi32")),
+            },
+        },
+        Subtraction: {
+            None: {
+                lambda optree: True: merge(float_arith("sub"), int_arith("sub_epi32")),
+            },
+        },
+        Multiplication: {
+            None: {
+                lambda optree: True: merge(float_arith("mul"), int_arith("mullo_epi32")),
+            },
+        },
+        Division: {
+            None: {
+                lambda optree: True: float_arith("div"),
+            },
+        },
+        FusedMultiplyAdd: {
+            FusedMultiplyAdd.Standard: fma_case("fmadd"),
+            FusedMultiplyAdd.Subtract: fma_case("fmsub"),
+            FusedMultiplyAdd.SubtractNegate: fma_case("fnmadd"),
+            FusedMultiplyAdd.Negate: fma_case("fnmsub"),
+        },
+        Negation: {
+            None: {
+                lambda optree: True: {
+                    # sign bit flip (0 - x is not -x for x = +0)
+                    type_strict_match(F, F): x86_vector_operator(F, isa.cast_i2f("%s(%s, %s)" % (isa.int_xor, isa.cast_f2i("%s"), sign_mask)), 1),
+                    type_strict_match(I, I): x86_vector_operator(I, "%s(%s(), %%s)" % (intr("sub_epi32"), intr("setzero_" + isa.si_suffix)), 1),
+                },
+            },
+        },
+        BitLogicAnd: {
+            None: {
+                lambda optree: True: {
+                    type_strict_match(I, I, I): op2(I, isa.int_and),
+                    type_strict_match(U, U, U): op2(U, isa.int_and),
+                },
+            },
+        },
+        BitLogicOr: {
+            None: {
+                lambda optree: True: {
+                    type_strict_match(I, I, I): op2(I, isa.int_or),
+                    type_strict_match(U, U, U): op2(U, isa.int_or),
+                },
+            },
+        },
+        BitLogicXor: {
+            None: {
+                lambda optree: True: {
+                    type_strict_match(I, I, I): op2(I, isa.int_xor),
+                    type_strict_match(U, U, U): op2(U, isa.int_xor),
+                },
+            },
+        },
+        BitLogicLeftShift: {
+            None: {
+                lambda optree: True: {
+                    type_strict_match(I, I, I): op2(I, intr("sllv_epi32")),
+                    type_strict_match(U, U, U): op2(U, intr("sllv_epi32")),
+                },
+            },
+        },
+        BitLogicRightShift: {
+            None: {
+                lambda optree: True: {
+                    # arithmetic shift for signed elements (as C >>)
+                    type_strict_match(I, I, I): op2(I, intr("srav_epi32")),
+                    type_strict_match(U, U, U): op2(U, intr("srlv_epi32")),
+                },
+            },
+        },
+        Select: {
+            None: {
+                lambda optree: True: {
+                    type_strict_match(F, B, F, F): x86_vector_operator(F, isa.select("f"), 3, arg_map = isa.select_arg_map),
+                    type_strict_match(I, B, I, I): x86_vector_operator(I, isa.select("i"), 3, arg_map = isa.select_arg_map),
+                    type_strict_match(U, B, U, U): x86_vector_operator(U, isa.select("i"), 3, arg_map = isa.select_arg_map),
+                },
+            },
+        },
+        Comparison: dict(
+            (specifier, {
+                lambda optree: True: {
+                    type_strict_match(B, F, F): x86_vector_operator(B, isa.float_compare("%s", "%s", x86_float_compare_predicate[specifier]), 2),
+                    type_strict_match(B, I, I): int_compare_operator(specifier),
+                },
+            }) for specifier in x86_comparison_specifier_list
+        ),
+        LogicalNot: {
+            None: {
+                lambda optree: True: {
+                    type_strict_match(B, B): x86_vector_operator(B, isa.logical_not(), 1, arg_map = isa.logical_not_arg_map),
+                },
+            },
+        },
+        LogicalAnd: {
+            None: {
+                lambda optree: True: {
+                    type_strict_match(B, B, B): x86_vector_operator(B, isa.logical_and(), 2, arg_map = isa.logical_op_arg_map),
+                },
+            },
+        },
+        LogicalOr: {
+            None: {
+                lambda optree: True: {
+                    type_strict_match(B, B, B): x86_vector_operator(B, isa.logical_or(), 2, arg_map = isa.logical_op_arg_map),
+                },
+            },
+        },
+        NearestInteger: {
+            None: {
+                lambda optree: True: {
+                    # current rounding mode (as nearbyintf/rintf)
+                    type_strict_match(I, F): x86_vector_operator(I, "%s(%%s)" % intr("cvtps_epi32"), 1),
+                    type_strict_match(F, F): x86_vector_operator(F, isa.round_float(), 1),
+                },
+            },
+        },
+        Conversion: {
+            None: {
+                lambda optree: True: {
+                    type_strict_match(F, I): x86_vector_operator(F, "%s(%%s)" % intr("cvtepi32_ps"), 1),
+                    # truncation (as C conversion)
+                    type_strict_match(I, F): x86_vector_operator(I, "%s(%%s)" % intr("cvttps_epi32"), 1),
+                },
+            },
+        },
+        TypeCast: {
+            None: {
+                lambda optree: True: {
+                    type_strict_match(F, I): x86_vector_operator(F, isa.cast_i2f("%s"), 1),
+                    type_strict_match(F, U): x86_vector_operator(F, isa.cast_i2f("%s"), 1),
+                    type_strict_match(I, F): x86_vector_operator(I, isa.cast_f2i("%s"), 1),
+                    type_strict_match(U, F): x86_vector_operator(U, isa.cast_f2i("%s"), 1),
+                },
+            },
+        },
+        ExponentInsertion: {
+            ExponentInsertion.Default: {
+                lambda optree: True: {
+                    type_strict_match(F, I): x86_vector_operator(F, isa.cast_i2f("%s(%s(%%s, %s), 23)" % (intr("slli_epi32"), intr("add_epi32"), isa.set1_epi32("127"))), 1),
+                },
+            },
+        },
+        ExponentExtraction: {
+            None: {
+                lambda optree: True: {
+                    type_strict_match(I, F): x86_vector_operator(I, "%s(%s(%s(%s, 23), %s), %s)" % (intr("sub_epi32"), isa.int_and, intr("srli_epi32"), isa.cast_f2i("%s"), isa.set1_epi32("0xff"), isa.set1_epi32("127")), 1),
+                },
+            },
+        },
+        Test: {
+            Test.IsInfOrNaN: {
+                lambda optree: True: {
+                    type_strict_match(B, F): x86_vector_operator(B, isa.lane_equal("%s(%s, %s)" % (isa.int_and, isa.cast_f2i("%s"), exp_mask), exp_mask), 1),
+                },
+            },
+            Test.IsNaN: {
+                lambda optree: True: {
+                    type_strict_match(B, F): x86_vector_operator(B, isa.unordered(), 1, arg_map = {0: FO_Arg(0), 1: FO_Arg(0)}),
+                },
+            },
+            Test.IsMaskAllZero: {
+                lambda optree: True: {
+                    type_strict_match_list([ML_Bool, ML_Int32], [B]): x86_vector_test_operator(isa.mask_test_map[Test.IsMaskAllZero], 1, arg_map = isa.mask_test_arg_map),
+                },
+            },
+            Test.IsMaskNotAllZero: {
+                lambda optree: True: {
+                    type_strict_match_list([ML_Bool, ML_Int32], [B]): x86_vector_test_operator(isa.mask_test_map[Test.IsMaskNotAllZero], 1, arg_map = isa.mask_test_arg_map),
+                },
+            },
+            Test.IsMaskAnyZero: {
+                lambda optree: True: {
+                    type_strict_match_list([ML_Bool, ML_Int32], [B]): x86_vector_test_operator(isa.mask_any_zero(False), 1, arg_map = isa.mask_any_zero_arg_map),
+                },
+            },
+            Test.IsMaskNotAnyZero: {
+                lambda optree: True: {
+                    type_strict_match_list([ML_Bool, ML_Int32], [B]): x86_vector_test_operator(isa.mask_any_zero(True), 1, arg_map = isa.mask_any_zero_arg_map),
+                },
+            },
+        },
+    }
+    return table
+
+
+avx2_c_code_generation_table = generate_x86_vector_table(X86_AVX2_ISA())
+avx512_c_code_generation_table = generate_x86_vector_table(X86_AVX512_ISA())
+
+
+## AVX2 target: 8 x 32-bit (and 4 x 64-bit) vector operations, vector
+#  operations not supported natively are implemented by the generic
+#  vector backend and scalar operations by the x86 FMA target
+class X86_AVX2_Processor(X86_FMA_Processor, VectorBackend):
+    target_name = "x86_avx2"
+    TargetRegister.register_new_target(target_name, lambda _: X86_AVX2_Processor)
+
+    code_generation_table = {
+        C_Code: avx2_c_code_generation_table,
+    }
+
+    ## Skylake class cores, vector table loads are costed as gathers
+    #  (loads from small tables lowered to register permutes are cheaper)
+    operation_cost_table = {
+        Addition: (4, 0.5),
+        Subtraction: (4, 0.5),
+        Multiplication: (4, 0.5),
+        FusedMultiplyAdd: (4, 0.5),
+        (Division, ML_Binary32): (11, 3),
+        (Division, ML_Binary64): (14, 4),
+        (Division, ML_Float8): (11, 5),
+        (Division, ML_Double4): (14, 8),
+        (TableLoad, ML_Float8): (22, 5),
+        (TableLoad, ML_Double4): (20, 4),
+    }
+
+    def __init__(self, *args):
+        VectorBackend.__init__(self, *args)
+
+    def get_compilation_options(self):
+        return ["-mavx2", "-mfma"]
+
+    def get_cpu_features(self):
+        return ["avx2", "fma"]
+
+## AVX-512 target: 16 x 32-bit (and 8 x 64-bit) vector operations
+class X86_AVX512_Processor(X86_AVX2_Processor):
+    target_name = "x86_avx512"
+    TargetRegister.register_new_target(target_name, lambda _: X86_AVX512_Processor)
+
+    code_generation_table = {
+        C_Code: avx512_c_code_generation_table,
+    }
+
+    ## Skylake-SP class cores
+    operation_cost_table = {
+        (Division, ML_Float16): (18, 10),
+        (Division, ML_Double8): (23, 16),
+        (TableLoad, ML_Float16): (24, 8),
+        (TableLoad, ML_Double8): (22, 5),
+    }
+
+    def __init__(self, *args):
+        X86_AVX2_Processor.__init__(self, *args)
+
+    def get_compilation_options(self):
+        return ["-mavx2", "-mfma", "-mavx512f"]
+
+    def get_cpu_features(self):
+        return ["avx2", "fma", "avx512f"]
@@ -84,9 +84,24 @@ class X86_SSE_Processor(GenericProcessor):
         C_Code: sse_c_code_generation_table,
     }
 
+    ## scalar SSE costs (Nehalem class cores)
+    operation_cost_table = {
+        Addition: (3, 1),
+        Subtraction: (3, 1),
+        Multiplication: (5, 1),
+        (Division, ML_Binary32): (14, 14),
+        (Division, ML_Binary64): (22, 22),
+    }
+
     def __init__(self):
         GenericProcessor.__init__(self)
 
+    def get_compilation_options(self):
+        return ["-msse"]
+
+    def get_cpu_features(self):
+        return ["sse"]
+
 class X86_SSE2_Processor(X86_SSE_Processor):
     target_name = "x86_sse2"
     TargetRegister.register_new_target(target_name, lambda _: X86_SSE2_Processor)
@@ -98,6 +113,12 @@ class X86_SSE2_Processor(X86_SSE_Processor):
     def __init__(self):
         X86_SSE_Processor.__init__(self)
 
+    def get_compilation_options(self):
+        return ["-msse2"]
+
+    def get_cpu_features(self):
+        return ["sse2"]
+
 class X86_SSE41_Processor(X86_SSE2_Processor):
     target_name = "x86_sse41"
     TargetRegister.register_new_target(target_name, lambda _: X86_SSE41_Processor)
@@ -106,9 +127,20 @@ class X86_SSE41_Processor(X86_SSE2_Processor):
         C_Code: sse41_c_code_generation_table,
     }
 
+    ## roundss / roundsd
+    operation_cost_table = {
+        NearestInteger: (6, 1),
+    }
+
     def __init__(self):
         X86_SSE2_Processor.__init__(self)
 
+    def get_compilation_options(self):
+        return ["-msse4.1"]
+
+    def get_cpu_features(self):
+        return ["sse4.1"]
+
 class X86_FMA_Processor(X86_SSE41_Processor):
     target_name = "x86_fma"
     TargetRegister.register_new_target(target_name, lambda _: X86_FMA_Processor)
@@ -144,9 +176,23 @@ class X86_FMA_Processor(X86_SSE41_Processor):
         },
     }
 
+    ## Haswell class cores
+    operation_cost_table = {
+        Multiplication: (5, 0.5),
+        FusedMultiplyAdd: (5, 0.5),
+        (Division, ML_Binary32): (13, 7),
+        (Division, ML_Binary64): (20, 14),
+    }
+
     def __init__(self):
         X86_SSE41_Processor.__init__(self)
 
+    def get_compilation_options(self):
+        return ["-msse4.1", "-mfma"]
+
+    def get_cpu_features(self):
+        return ["sse4.1", "fma"]
+
 
 # debug message
 print "initializing INTEL targets"
@@ -0,0 +1,172 @@
+# -*- coding: utf-8 -*-
+
+###############################################################################
+# This file is part of Kalray's Metalibm tool
+# Copyright (2016)
+# All rights reserved
+# created:          Oct 18th, 2016
+# last-modified:    Oct 18th, 2016
+#
+# author(s): Nicolas Brunie (nicolas.brunie@kalray.eu)
+###############################################################################
+
+# Batch generation driver: generates many function variants described
+# by a manifest, dispatching variants over a pool of worker processes.
+#
+# The manifest is a JSON list of variant descriptions:
+#   [
+#     {
+#       "function": "metalibm_functions.ml_exp:ML_Exponential",
+#       "name": "expf_v4",
+#       "args": {"precision": "binary32", "vector-size": "4", "target": "vector"}
+#     },
+#     ...
+#   ]
+# "args" is either a dict (option name without leading "--" -> value,
+# true for flag options) or a raw list of command line arguments as
+# accepted by ML_NewArgTemplate.
+#
+# usage: python -m metalibm_core.utility.batch_generation manifest.json [--jobs N] [--report report.json]
+
+import sys
+import os
+import time
+import json
+import argparse
+import importlib
+import traceback
+import multiprocessing
+
+from .log_report import Log
+
+
+## convert the "args" field of a manifest entry to a command line argument list
+#  @param arg_overrides dict or list of arguments
+#  @return list of strings
+def build_arg_list(arg_overrides):
+  if isinstance(arg_overrides, list):
+    return [str(arg) for arg in arg_overrides]
+  arg_list = []
+  for option_name in sorted(arg_overrides):
+    value = arg_overrides[option_name]
+    if value is False or value is None:
+      continue
+    arg_list.append("--%s" % option_name)
+    if value is not True:
+      arg_list.append(str(value))
+  return arg_list
+
+## load the function class from a "module:class" descriptor
+def load_function_class(function_desc):
+  module_name, class_name = function_desc.split(":")
+  module = importlib.import_module(module_name)
+  return getattr(module, class_name)
+
+## normalize manifest entries (name and output defaults)
+#  @param manifest list of variant dict
+#  @param output_dir directory where generated sources are written
+#  @return list of variant dict
+def normalize_manifest(manifest, output_dir = "."):
+  variant_list = []
+  for index, entry in enumerate(manifest):
+    module_name, class_name = entry["function"].split(":")
+    name = entry.get("name", "%s_%d" % (module_name.split(".")[-1], index))
+    variant_list.append({
+      "index": index,
+      "name": name,
+      "function": entry["function"],
+      "arg_list": build_arg_list(entry.get("args", {})),
+      "default_output_file": os.path.join(output_dir, "%s.c" % name),
+    })
+  return variant_list
+
+## worker process initialization: importing the generation
+#  framework (and thus sollya) once per worker
+#  @param sequential_gappa force sequential gappa evaluations, pool
+#         workers are daemonic processes which can not have children
+def worker_init(sequential_gappa = True):
+  from . import ml_template
+  from .gappa_utils import set_gappa_process_num
+  # errors must be reported as exceptions rather than process exit
+  Log.exit_on_error = False
+  if sequential_gappa:
+    set_gappa_process_num(1)
+
+## generate a single variant
+#  @param variant normalized variant dict
+#  @return result dict (name, status, time, output_file, error)
+def generate_variant(variant):
+  from .ml_template import ML_NewArgTemplate
+  result = {
+    "name": variant["name"],
+    "function": variant["function"],
+    "arg_list": variant["arg_list"],
+    "status": "failure",
+    "output_file": None,
+    "error": None,
+  }
+  start_time = time.time()
+  try:
+    function_class = load_function_class(variant["function"])
+    arg_template = ML_NewArgTemplate(default_function_name = variant["name"], default_output_file = variant["default_output_file"])
+    args = arg_template.arg_extraction(exit_on_info = False, arg_list = variant["arg_list"])
+    Log.exit_on_error = False
+    ml_function = function_class(args)
+    ml_function.gen_implementation()
+    result["output_file"] = ml_function.output_file
+    result["status"] = "success"
+  except BaseException as e:
+    result["error"] = "%s: %s\n%s" % (e.__class__.__name__, e, traceback.format_exc())
+  result["time"] = time.time() - start_time
+  return result
+
+## generate every variant of <manifest> on a pool of <process_num> processes
+#  @return list of result dict (in manifest order)
+def batch_generate(manifest, process_num = None, output_dir = "."):
+  variant_list = normalize_manifest(manifest, output_dir)
+  if process_num == 1:
+    worker_init(sequential_gappa = False)
+    return [generate_variant(variant) for variant in variant_list]
+  pool = multiprocessing.Pool(process_num, initializer = worker_init)
+  result_list = pool.map(generate_variant, variant_list, chunksize = 1)
+  pool.close()
+  pool.join()
+  return result_list
+
+
+if __name__ == "__main__":
+  parser = argparse.ArgumentParser("Metalibm batch generation")
+  parser.add_argument("manifest", action = "store", help = "JSON manifest of the variants to generate")
+  parser.add_argument("--jobs", dest = "process_num", action = "store", type = int, default = None, help = "number of worker processes (default: cpu count)")
+  parser.add_argument("--output-dir", dest = "output_dir", action = "store", default = ".", help = "directory for generated sources")
+  parser.add_argument("--report", dest = "report_file", action = "store", default = None, help = "dump per-variant results to a JSON file")
+  batch_args = parser.parse_args(sys.argv[1:])
+
+  manifest = json.load(open(batch_args.manifest, "r"))
+  if not os.path.isdir(batch_args.output_dir):
+    os.makedirs(batch_args.output_dir)
+
+  start_time = time.time()
+  result_list = batch_generate(manifest, batch_args.process_num, batch_args.output_dir)
+  total_time = time.time() - start_time
+
+  success = True
+  for result in result_list:
+    if result["status"] == "success":
+      print "%s SUCCESS [%.2fs] %s" % (result["name"], result["time"], result["output_file"])
+    else:
+      success = False
+      print "%s \033[31;1m FAILED \033[0;m [%.2fs]" % (result["name"], result["time"])
+      print result["error"]
+  print "%d variant(s) generated in %.2fs" % (len(result_list), total_time)
+
+  if batch_args.report_file:
+    report_stream = open(batch_args.report_file, "w")
+    json.dump({"total_time": total_time, "variants": result_list}, report_stream, indent = 2)
+    report_stream.close()
+
+  if success:
+    print "OVERALL SUCCESS"
+  else:
+    print "OVERALL FAILURE"
+    sys.exit(1)
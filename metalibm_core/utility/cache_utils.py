@@ -0,0 +1,197 @@
+# -*- coding: utf-8 -*-
+
+###############################################################################
+# This file is part of Kalray's Metalibm tool
+# Copyright (2016)
+# All rights reserved
+# created:          Oct 18th, 2016
+# last-modified:    Oct 18th, 2016
+#
+# author(s): Nicolas Brunie (nicolas.brunie@kalray.eu)
+###############################################################################
+
+import os
+import sys
+import hashlib
+import tempfile
+
+from .log_report import Log
+
+## version of the on-disk cache format, part of every cache key
+#  so that a format change invalidates previous entries
+CACHE_FORMAT_VERSION = 1
+
+## default root directory for Metalibm on-disk caches
+#  (can be overloaded by the ML_CACHE_DIR environment variable)
+DEFAULT_CACHE_ROOT = os.path.join(os.path.expanduser("~"), ".cache", "metalibm")
+
+## default maximal size (in bytes) of a single cache
+#  (can be overloaded by the ML_CACHE_MAX_SIZE environment variable)
+DEFAULT_CACHE_MAX_SIZE = 64 * 2**20
+
+## eviction shrinks the cache content to this fraction of its maximal
+#  size, so that the cache directory is not scanned on every insertion
+CACHE_EVICTION_RATIO = 0.75
+
+
+def get_cache_root():
+    """ return the root directory of Metalibm's on-disk caches """
+    return os.environ.get("ML_CACHE_DIR", DEFAULT_CACHE_ROOT)
+
+def is_cache_disabled():
+    """ on-disk caches are disabled if ML_DISABLE_CACHE is set to a non-empty value """
+    return os.environ.get("ML_DISABLE_CACHE", "") not in ["", "0"]
+
+
+## Content-addressed on-disk cache
+#  each entry is a file whose name is the sha1 digest of the entry key,
+#  the cache size is bounded and least recently used entries are evicted
+#  first (entry access time is tracked through the file modification time)
+class DiskCache(object):
+    ## @param name name of the cache (sub-directory of the cache root)
+    #  @param max_size maximal size in bytes of the cache content
+    #  @param cache_root root directory (default get_cache_root())
+    def __init__(self, name, max_size = None, cache_root = None):
+        self.name = name
+        self.cache_root = get_cache_root() if cache_root is None else cache_root
+        self.cache_dir = os.path.join(self.cache_root, name)
+        if max_size is None:
+            max_size = int(os.environ.get("ML_CACHE_MAX_SIZE", DEFAULT_CACHE_MAX_SIZE))
+        self.max_size = max_size
+        # estimated size of the cache content, None until the cache
+        # directory has been scanned (see evict)
+        self.current_size = None
+        # statistics
+        self.hit_count = 0
+        self.miss_count = 0
+
+    def is_enabled(self):
+        return not is_cache_disabled()
+
+    ## build the content address associated with <key>
+    def get_digest(self, key):
+        return hashlib.sha1("v%d:%s" % (CACHE_FORMAT_VERSION, key)).hexdigest()
+
+    def get_entry_path(self, key):
+        return os.path.join(self.cache_dir, self.get_digest(key))
+
+    ## lookup <key> in the cache
+    #  @return the stored value string, or None if <key> is not cached
+    def get(self, key):
+        if not self.is_enabled():
+            return None
+        entry_path = self.get_entry_path(key)
+        try:
+            entry_stream = open(entry_path, "r")
+            value = entry_stream.read()
+            entry_stream.close()
+        except IOError:
+            self.miss_count += 1
+            return None
+        # refreshing entry for LRU eviction
+        try:
+            os.utime(entry_path, None)
+        except OSError:
+            pass
+        self.hit_count += 1
+        Log.report(Log.Verbose, "%s cache hit: %s" % (self.name, self.get_digest(key)))
+        return value
+
+    ## store <value> (string) as the cache entry associated with <key>
+    def put(self, key, value):
+        if not self.is_enabled():
+            return
+        # an entry larger than the cache limit would be evicted right
+        # away (together with every other entry)
+        if len(value) > self.max_size:
+            Log.report(Log.Info, "%s cache entry not stored: %d bytes exceeds cache size limit (%d bytes)" % (self.name, len(value), self.max_size))
+            return
+        try:
+            if not os.path.isdir(self.cache_dir):
+                os.makedirs(self.cache_dir)
+            # writing to a temporary file, then renaming it so that
+            # concurrent generation processes never read partial entries
+            tmp_fd, tmp_path = tempfile.mkstemp(dir = self.cache_dir, prefix = ".tmp_")
+            tmp_stream = os.fdopen(tmp_fd, "w")
+            tmp_stream.write(value)
+            tmp_stream.close()
+            entry_path = self.get_entry_path(key)
+            previous_size = os.stat(entry_path).st_size if os.path.exists(entry_path) else 0
+            os.rename(tmp_path, entry_path)
+        except (IOError, OSError) as e:
+            Log.report(Log.Warning, "unable to write %s cache entry: %s" % (self.name, e))
+            return
+        # the cache directory is only scanned when the estimated size
+        # exceeds the limit (entries written by concurrent processes are
+        # accounted for during the scan)
+        if self.current_size != None:
+            self.current_size += len(value) - previous_size
+        if self.current_size is None or self.current_size > self.max_size:
+            self.evict()
+
+    ## if the cache content exceeds self.max_size bytes, remove least
+    #  recently used entries until it fits in CACHE_EVICTION_RATIO *
+    #  self.max_size bytes (and update the cache size estimation)
+    def evict(self):
+        entry_list = []
+        total_size = 0
+        for entry_name in os.listdir(self.cache_dir):
+            if entry_name.startswith(".tmp_"): continue
+            entry_path = os.path.join(self.cache_dir, entry_name)
+            try:
+                entry_stat = os.stat(entry_path)
+            except OSError:
+                continue
+            entry_list.append((entry_stat.st_mtime, entry_stat.st_size, entry_path))
+            total_size += entry_stat.st_size
+        self.current_size = total_size
+        if total_size <= self.max_size:
+            return
+        entry_list.sort(key = lambda e: e[0])
+        for mtime, size, entry_path in entry_list:
+            if total_size <= CACHE_EVICTION_RATIO * self.max_size: break
+            try:
+                os.remove(entry_path)
+            except OSError:
+                pass
+            total_size -= size
+        self.current_size = total_size
+
+    ## invalidate the cache entry associated with <key>
+    def invalidate(self, key):
+        try:
+            os.remove(self.get_entry_path(key))
+        except OSError:
+            pass
+
+    ## invalidate every entry of the cache
+    def clear(self):
+        if not os.path.isdir(self.cache_dir):
+            return
+        for entry_name in os.listdir(self.cache_dir):
+            try:
+                os.remove(os.path.join(self.cache_dir, entry_name))
+            except OSError:
+                pass
+        self.current_size = 0
+        Log.report(Log.Info, "%s cache cleared" % self.name)
+
+
+## clear every Metalibm on-disk cache
+def clear_all_caches():
+    cache_root = get_cache_root()
+    if not os.path.isdir(cache_root):
+        return
+    for cache_name in os.listdir(cache_root):
+        if os.path.isdir(os.path.join(cache_root, cache_name)):
+            DiskCache(cache_name).clear()
+
+
+if __name__ == "__main__":
+    # python -m metalibm_core.utility.cache_utils [cache_name ...]
+    # clears the listed caches (or every cache if none is listed)
+    if len(sys.argv) > 1:
+        for cache_name in sys.argv[1:]:
+            DiskCache(cache_name).clear()
+    else:
+        clear_all_caches()
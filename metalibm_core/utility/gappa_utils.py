@@ -5,17 +5,25 @@
 # Copyright (2013)
 # All rights reserved
 # created:          Apr  7th, 2014
-# last-modified:    Apr  7th, 2014
+# last-modified:    Oct 18th, 2016
 #
 # author(s): Nicolas Brunie (nicolas.brunie@kalray.eu)
 ###############################################################################
 
 import commands
 import re
+import os
 import subprocess
+import atexit
+import tempfile
+import multiprocessing
 
 import sollya
 
+from .log_report import Log
+from .cache_utils import DiskCache
+from .profiling import Profile
+
 def parse_gappa_interval(interval_value):
     # search for middle ","
     end_index = len(interval_value)
@@ -28,12 +36,40 @@ def parse_gappa_interval(interval_value):
     return sollya.Interval(sollya.parse(v0), sollya.parse(v1))
 
 
-def execute_gappa_script_extract(gappa_code, gappa_filename = "gappa_tmp.g"):
-    result = {}
-    gappa_stream = open(gappa_filename, "w")
+## on-disk cache of gappa outputs, indexed by gappa script text
+gappa_cache = DiskCache("gappa")
+
+## execute gappa on <gappa_code> and return its raw output
+#  the script is written to a unique temporary file so that concurrent
+#  evaluations (or generators) never clobber each other's script
+def get_gappa_output(gappa_code):
+    gappa_fd, gappa_tmp_filename = tempfile.mkstemp(prefix = "ml_gappa_", suffix = ".g")
+    gappa_stream = os.fdopen(gappa_fd, "w")
     gappa_stream.write(gappa_code)
     gappa_stream.close()
-    gappa_result = commands.getoutput("gappa %s" % gappa_filename)
+    gappa_result = commands.getoutput("gappa %s" % gappa_tmp_filename)
+    os.remove(gappa_tmp_filename)
+    return gappa_result
+
+## same as get_gappa_output with memoization in gappa_cache
+def get_cached_gappa_output(gappa_code):
+    gappa_result = gappa_cache.get(gappa_code)
+    if gappa_result != None:
+        Profile.add_counter("gappa_cache_hits")
+    else:
+        profile_token = Profile.start_phase("gappa_evaluation")
+        gappa_result = get_gappa_output(gappa_code)
+        Profile.end_phase("gappa_evaluation", profile_token)
+        Profile.add_counter("gappa_calls")
+        # only successful evaluations are memoized
+        if "Results" in gappa_result:
+            gappa_cache.put(gappa_code, gappa_result)
+    return gappa_result
+
+## extract the result intervals from gappa raw output
+#  @return dict var_name -> sollya Interval
+def parse_gappa_result(gappa_result):
+    result = {}
     start_result_index = gappa_result.index("Results")
     for result_line in gappa_result[start_result_index:].splitlines()[1:]:
         if not " in " in result_line: continue
@@ -42,6 +78,70 @@ def execute_gappa_script_extract(gappa_code, gappa_filename = "gappa_tmp.g"):
         interval_value = result_split[1].replace(" ", "")
         result[var] = parse_gappa_interval(interval_value)
     return result
+
+def dump_gappa_script(gappa_code, gappa_filename):
+    gappa_stream = open(gappa_filename, "w")
+    gappa_stream.write(gappa_code)
+    gappa_stream.close()
+
+## evaluate a gappa script and extract its results
+#  @param gappa_code string gappa script
+#  @param gappa_filename if not None, name of the file where the script is dumped
+#  @return dict var_name -> sollya Interval
+def execute_gappa_script_extract(gappa_code, gappa_filename = None):
+    if gappa_filename != None:
+        dump_gappa_script(gappa_code, gappa_filename)
+    return parse_gappa_result(get_cached_gappa_output(gappa_code))
+
+## default number of processes used to evaluate independent gappa scripts
+#  (None: cpu count, 1: sequential evaluation)
+gappa_process_num = None
+## pool of gappa worker processes, shared by every evaluation
+gappa_pool = None
+
+## set the default number of gappa worker processes
+def set_gappa_process_num(process_num):
+    global gappa_process_num
+    gappa_process_num = process_num
+
+## @return the pool of gappa worker processes (created on first request)
+def get_gappa_pool():
+    global gappa_pool
+    if gappa_pool is None:
+        gappa_pool = multiprocessing.Pool(gappa_process_num)
+        atexit.register(gappa_pool.terminate)
+    return gappa_pool
+
+## evaluate the gappa scripts of <gappa_code_list> (without memoization),
+#  concurrently unless gappa_process_num is 1 or the current process is a
+#  daemonic pool worker (which can not have children). Evaluation falls
+#  back to a sequential loop if the pool can not be created or fails.
+#  @return list of gappa raw outputs
+def get_gappa_output_list(gappa_code_list):
+    if len(gappa_code_list) > 1 and gappa_process_num != 1 and not multiprocessing.current_process().daemon:
+        try:
+            return get_gappa_pool().map(get_gappa_output, gappa_code_list)
+        except Exception as e:
+            Log.report(Log.Warning, "concurrent gappa evaluation failed (%s), falling back to sequential evaluation" % e)
+    return [get_gappa_output(gappa_code) for gappa_code in gappa_code_list]
+
+## evaluate a list of independent gappa scripts, uncached scripts
+#  are evaluated concurrently (see get_gappa_output_list)
+#  @param gappa_code_list list of gappa script strings
+#  @return list of dict var_name -> sollya Interval (one per script)
+def execute_gappa_script_list_extract(gappa_code_list):
+    gappa_result_list = [gappa_cache.get(gappa_code) for gappa_code in gappa_code_list]
+    missing_index_list = [i for i, r in enumerate(gappa_result_list) if r is None]
+    Profile.add_counter("gappa_cache_hits", len(gappa_code_list) - len(missing_index_list))
+    Profile.add_counter("gappa_calls", len(missing_index_list))
+    profile_token = Profile.start_phase("gappa_evaluation")
+    missing_result_list = get_gappa_output_list([gappa_code_list[i] for i in missing_index_list])
+    Profile.end_phase("gappa_evaluation", profile_token)
+    for index, gappa_result in zip(missing_index_list, missing_result_list):
+        if "Results" in gappa_result:
+            gappa_cache.put(gappa_code_list[index], gappa_result)
+        gappa_result_list[index] = gappa_result
+    return [parse_gappa_result(gappa_result) for gappa_result in gappa_result_list]
     
 
 def is_gappa_installed():
@@ -19,6 +19,7 @@ from .arg_utils import extract_option_value, test_flag_option
 from .log_report import Log
 
 from ..core.ml_formats import *
+from ..core.polynomial_scheme_selector import POLYNOMIAL_SCHEME_MAP
 
 from ..code_generation.generic_processor import GenericProcessor
 from ..core.target import TargetRegister
@@ -110,6 +111,8 @@ class ML_NewArgTemplate(object):
     self.parser.add_argument("--debug", dest = "debug", action = "store_const", const = True, default = ArgDefault(False), help = "enable debug display in generated code")
     self.parser.add_argument("--target", dest = "target_name", action = "store", default = "none", help = "select generation target")
     self.parser.add_argument("--disable-fma", dest = "fuse_fma", action = "store_const", const = False, default = ArgDefault(True), help = "disable FMA-like operation fusion")
+    self.parser.add_argument("--disable-if-conversion", dest = "if_conversion", action = "store_const", const = False, default = ArgDefault(True), help = "disable the conversion of side-effect free branches into selections")
+    self.parser.add_argument("--poly-scheme", dest = "polynomial_scheme", action = "store", choices = ["auto"] + sorted(POLYNOMIAL_SCHEME_MAP.keys()), default = ArgDefault("auto"), help = "polynomial evaluation scheme (auto: selection by latency/throughput cost model and evaluation error)")
     self.parser.add_argument("--output", action = "store", dest = "output_file", default = ArgDefault(self.default_output_file), help = "set output file")
     self.parser.add_argument("--fname", dest = "function_name", default = ArgDefault(self.default_function_name), help = "set function name")
     self.parser.add_argument("--precision", dest = "precision_name", default = ArgDefault("binary32"), help = "select main precision")
@@ -120,6 +123,10 @@ class ML_NewArgTemplate(object):
     self.parser.add_argument ("--display-after-gen", dest = "display_after_gen", action = "store_const", const = True, default = ArgDefault(False), help = "display MDL IR after implementation generation")
     self.parser.add_argument("--input-interval", dest = "input_interval_str", default = ArgDefault("Interval(0,1)"), help = "select input range")
     self.parser.add_argument("--vector-size", dest = "vector_size" , default = ArgDefault("1"), help = "define size of vector (1: scalar implemenation)")
+    self.parser.add_argument("--vector-fallback", dest = "vector_fallback", action = "store", choices = ["scalar_loop", "blend"], default = ArgDefault("scalar_loop"), help = "evaluation of the lanes failing the vector fast path: scalar callback on each lane or vector special-case branches blended with the fast path")
+    self.parser.add_argument("--vector-abi", dest = "vector_abi", action = "store_const", const = True, default = ArgDefault(False), help = "export the vector implementation under its x86_64 vector function ABI name (libmvec compatible) and generate a header declaring the scalar function with its simd variant")
+    self.parser.add_argument("--multi-target", dest = "multi_target", action = "store", type = lambda s: s.split(","), default = ArgDefault(None), help = "comma separated list of targets (by increasing preference, the first one being the fallback) the function is generated for, with a runtime CPU-feature dispatcher")
+    self.parser.add_argument("--dispatch", dest = "dispatch", action = "store", choices = ["ifunc", "cpu_supports"], default = ArgDefault("ifunc"), help = "multi-target dispatch: GNU ifunc resolver or function pointer selected by __builtin_cpu_supports on first call")
     self.parser.add_argument("--language", dest = "language_name", default = ArgDefault("c"), help = "select language for generated source code") 
 
     self.parser.add_argument("--auto-test", dest = "auto_test", action = "store", nargs = '?', const=10, type=int, default = ArgDefault(False), help = "enable the generation of a self-testing numerical/functionnal bench")
@@ -130,13 +137,28 @@ class ML_NewArgTemplate(object):
     self.parser.add_argument("--target-info", dest = "target_info_flag", action = "store_const", const = True, default = ArgDefault(False), help = "display list of supported targets")
 
     self.parser.add_argument("--exception-error", dest = "exception_on_error", action = "store_const", const = True, default = ArgDefault(False), help = "convert Fatal error to python Exception rather than straight sys exit")
+    self.parser.add_argument("--pass-list", dest = "pass_list", action = "store", type = lambda s: s.split(","), default = ArgDefault(None), help = "comma separated list of optimization passes overloading the default pipeline of the main function optimization")
+    self.parser.add_argument("--pass-trace", dest = "pass_trace", action = "store", default = ArgDefault(None), help = "dump per-pass execution time and node count to a JSON file")
+    self.parser.add_argument("--profile", dest = "profile", action = "store", nargs = '?', const = True, default = ArgDefault(None), help = "dump a generation-time profiling report (JSON) to the given file (default <function_name>.profile.json)")
+    self.parser.add_argument("--cost-report", dest = "cost_report", action = "store", nargs = '?', const = True, default = ArgDefault(None), help = "dump a static operation mix / critical path report of the optimized schemes (JSON) to the given file (default <function_name>.cost.json)")
     self.parser.add_argument("--auto-test-std", dest = "auto_test_std", action = "store_const", const = True, default = ArgDefault(False), help = "enabling function test on standard test case list")
+    self.parser.add_argument("--auto-test-seed", dest = "auto_test_seed", action = "store", type = int, default = ArgDefault(None), help = "seed of the auto-test random input generator (reproducible test vectors)")
+    self.parser.add_argument("--auto-test-jobs", dest = "auto_test_jobs", action = "store", type = int, default = ArgDefault(None), help = "number of processes evaluating auto-test reference values (default: cpu count)")
+    self.parser.add_argument("--auto-test-vector-file", dest = "auto_test_vector_file", action = "store", nargs = '?', const = True, default = ArgDefault(None), help = "store auto-test vectors in a binary file loaded at run time rather than in the generated source (default <output>.test_vectors.bin)")
+    self.parser.add_argument("--array-kernel", dest = "array_kernel", action = "store_const", const = True, default = ArgDefault(False), help = "generate the array-mapping kernel <function_name>_array(in, out, n)")
+    self.parser.add_argument("--array-unroll", dest = "array_unroll", action = "store", type = int, default = ArgDefault(1), help = "unroll factor of the array kernel main loop")
+    self.parser.add_argument("--array-tail", dest = "array_tail", action = "store", choices = ["scalar", "masked"], default = ArgDefault("scalar"), help = "array kernel tail processing: scalar implementation or masked vector implementation")
+    self.parser.add_argument("--auto-bench", dest = "auto_bench", action = "store", nargs = '?', const = 1024, type = int, default = ArgDefault(False), help = "enable the generation of a throughput/latency benchmark (number of inputs)")
+    self.parser.add_argument("--auto-bench-execute", dest = "auto_bench_execute", action = "store", nargs = '?', const = 1024, type = int, default = ArgDefault(False), help = "generate, compile and execute the benchmark (results dumped in <function_name>.bench.json)")
+    self.parser.add_argument("--bench-repeat", dest = "bench_repeat", action = "store", type = int, default = ArgDefault(100), help = "number of passes over the benchmark inputs per measure")
+    self.parser.add_argument("--bench-libm", dest = "bench_libm", action = "store", default = ArgDefault(None), help = "libm function the implementation is compared to (none to disable)")
 
 
   ## parse command line arguments
   #  @p exit_on_info trigger early exit when info options is encountered
-  def arg_extraction(self, exit_on_info = True):
-    self.args = self.parser.parse_args(sys.argv[1:])
+  #  @p arg_list list of argument strings to parse (default is sys.argv[1:])
+  def arg_extraction(self, exit_on_info = True, arg_list = None):
+    self.args = self.parser.parse_args(sys.argv[1:] if arg_list is None else arg_list)
     if self.args.exception_on_error:
       Log.exit_on_error = False
     if self.args.verbose_enable is True:
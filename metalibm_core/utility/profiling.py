@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+
+###############################################################################
+# This file is part of Kalray's Metalibm tool
+# Copyright (2016)
+# All rights reserved
+# created:          Oct 18th, 2016
+# last-modified:    Oct 18th, 2016
+#
+# author(s): Nicolas Brunie (nicolas.brunie@kalray.eu)
+###############################################################################
+
+import time
+import json
+
+
+## Generation-time profiler: accumulates time spent in named phases
+#  and event counters; disabled by default (every method is then a no-op)
+class Profile(object):
+    enabled = False
+    ## phase name -> [cumulated time, call count]
+    phase_map = {}
+    ## counter name -> value
+    counter_map = {}
+    ## extra report sections (name -> json-serializable value)
+    section_map = {}
+
+    @staticmethod
+    def enable():
+        Profile.enabled = True
+
+    @staticmethod
+    def disable():
+        Profile.enabled = False
+
+    @staticmethod
+    def reset():
+        Profile.phase_map = {}
+        Profile.counter_map = {}
+        Profile.section_map = {}
+
+    ## start timing a phase
+    #  @return token to be given to end_phase
+    @staticmethod
+    def start_phase(phase_name):
+        if not Profile.enabled: return None
+        return time.time()
+
+    ## stop timing a phase started by start_phase
+    @staticmethod
+    def end_phase(phase_name, start_token):
+        if not Profile.enabled or start_token is None: return
+        elapsed_time = time.time() - start_token
+        if not phase_name in Profile.phase_map:
+            Profile.phase_map[phase_name] = [0.0, 0]
+        Profile.phase_map[phase_name][0] += elapsed_time
+        Profile.phase_map[phase_name][1] += 1
+
+    @staticmethod
+    def add_counter(counter_name, value = 1):
+        if not Profile.enabled: return
+        Profile.counter_map[counter_name] = Profile.counter_map.get(counter_name, 0) + value
+
+    @staticmethod
+    def set_section(section_name, value):
+        if not Profile.enabled: return
+        Profile.section_map[section_name] = value
+
+    ## build the profiling report (dict)
+    @staticmethod
+    def get_report(**header):
+        report = dict(header)
+        report["phases"] = dict((name, {"time": v[0], "calls": v[1]}) for name, v in Profile.phase_map.items())
+        report["counters"] = dict(Profile.counter_map)
+        report.update(Profile.section_map)
+        return report
+
+    ## dump profiling report in JSON format to <report_filename>
+    @staticmethod
+    def dump(report_filename, **header):
+        report_stream = open(report_filename, "w")
+        json.dump(Profile.get_report(**header), report_stream, indent = 2, sort_keys = True)
+        report_stream.close()
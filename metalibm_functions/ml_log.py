@@ -162,7 +162,8 @@ class ML_Log(ML_Function("ml_log")):
 
         print "generating polynomial evaluation scheme"
         #_poly = PolynomialSchemeEvaluator.generate_horner_scheme(poly_object, _red_vx, unified_precision = self.precision)
-        _poly = PolynomialSchemeEvaluator.generate_estrin_scheme(poly_object, _red_vx, unified_precision = self.precision)
+        #_poly = PolynomialSchemeEvaluator.generate_estrin_scheme(poly_object, _red_vx, unified_precision = self.precision)
+        _poly = self.generate_polynomial_scheme(poly_object, _red_vx, self.precision, variable_interval = approx_interval)
 
         _poly.set_attributes(tag = "poly", debug = debug_lftolx)
         print global_poly_object.get_sollya_object()
@@ -164,9 +164,6 @@ class ML_SinCos(ML_Function("ml_cos")):
 
     error_function = lambda p, f, ai, mod, t: dirtyinfnorm(f - p, ai)
 
-    #polynomial_scheme_builder = PolynomialSchemeEvaluator.generate_estrin_scheme
-    polynomial_scheme_builder = PolynomialSchemeEvaluator.generate_horner_scheme
-
     table_index_size = frac_pi_index+1
     cos_table_hi = ML_Table(dimensions = [2**table_index_size, 1], storage_precision = self.precision, tag = self.uniquify_name("cos_table_hi"))
     cos_table_lo = ML_Table(dimensions = [2**table_index_size, 1], storage_precision = self.precision, tag = self.uniquify_name("cos_table_lo"))
@@ -218,8 +215,8 @@ class ML_SinCos(ML_Function("ml_cos")):
     print poly_object_sin.get_sollya_object()
     print "poly_error: ", poly_error_cos, poly_error_sin
 
-    poly_cos = polynomial_scheme_builder(poly_object_cos.sub_poly(start_index = 4, offset = 1), red_vx, unified_precision = self.precision)
-    poly_sin = polynomial_scheme_builder(poly_object_sin.sub_poly(start_index = 2), red_vx, unified_precision = self.precision)
+    poly_cos = self.generate_polynomial_scheme(poly_object_cos.sub_poly(start_index = 4, offset = 1), red_vx, self.precision, variable_interval = approx_interval)
+    poly_sin = self.generate_polynomial_scheme(poly_object_sin.sub_poly(start_index = 2), red_vx, self.precision, variable_interval = approx_interval)
     poly_cos.set_attributes(tag = "poly_cos", debug = debug_precision)
     poly_sin.set_attributes(tag = "poly_sin", debug = debug_precision)
 
@@ -275,23 +272,9 @@ class ML_SinCos(ML_Function("ml_cos")):
     cos_eval_3.set_attributes(tag = "cos_eval_3", precision = self.precision, debug = debug_precision)
 
     # computing evaluation error for cos_eval_d
-    cos_eval_d_eerror = []
-    for i in xrange(0, 2**(frac_pi_index-1)-3):
-      copy_map = {
-        #tabulated_cos_hi : Constant(cos_table_hi[i][0], tag = "tabulated_cos_hi", precision = ML_Binary64), 
-        #tabulated_sin    : Constant(sin_table[i][0], tag = "tabulated_sin", precision = ML_Binary64),
-        tabulated_cos_hi : Variable("tabulated_cos_hi", interval = Interval(cos_table_hi[i][0]), precision = ML_Binary64), 
-        tabulated_cos_lo : Variable("tabulated_cos_lo", interval = Interval(cos_table_lo[i][0]), precision = ML_Binary64), 
-        tabulated_sin    : Variable("tabulated_sin", interval = Interval(sin_table[i][0]), precision = ML_Binary64),
-        red_vx           : Variable("red_vx", precision = ML_Binary64, interval = approx_interval),
-      }
-
-      cos_eval_d_eerror_local = sup(abs(self.get_eval_error(cos_eval_d, variable_copy_map = copy_map, relative_error = True)))
-      cos_eval_d_eerror.append(cos_eval_d_eerror_local)
-      if cos_eval_d_eerror_local > S2**-52:
-        print "cos_eval_d_eerror_local: ", i, cos_eval_d_eerror_local
-
-    for i in xrange(2**(frac_pi_index-1)-3, 2**(frac_pi_index-1)-1):
+    # (the gappa scripts of every table entry are evaluated concurrently)
+    eval_error_request_list = []
+    for i in xrange(0, 2**(frac_pi_index-1)-1):
       copy_map = {
         #tabulated_cos_hi : Constant(cos_table_hi[i][0], tag = "tabulated_cos_hi", precision = ML_Binary64), 
         #tabulated_sin    : Constant(sin_table[i][0], tag = "tabulated_sin", precision = ML_Binary64),
@@ -300,16 +283,19 @@ class ML_SinCos(ML_Function("ml_cos")):
         tabulated_sin    : Variable("tabulated_sin", interval = Interval(sin_table[i][0]), precision = ML_Binary64),
         red_vx           : Variable("red_vx", precision = ML_Binary64, interval = approx_interval),
       }
+      if i < 2**(frac_pi_index-1)-3:
+        eval_error_request_list.append(("cos_eval_d_eerror_local", i, cos_eval_d, copy_map))
+      else:
+        eval_error_request_list.append(("cos_eval_d_eerror_local_2", i, cos_eval_2, copy_map))
+        eval_error_request_list.append(("cos_eval_d_eerror_local_3", i, cos_eval_3, copy_map))
 
-      cos_eval_d_eerror_local = sup(abs(self.get_eval_error(cos_eval_2, variable_copy_map = copy_map, relative_error = True)))
-      cos_eval_d_eerror.append(cos_eval_d_eerror_local)
-      if cos_eval_d_eerror_local > S2**-52:
-        print "cos_eval_d_eerror_local_2: ", i, cos_eval_d_eerror_local
-
-      cos_eval_d_eerror_local = sup(abs(self.get_eval_error(cos_eval_3, variable_copy_map = copy_map, relative_error = True)))
+    eval_error_list = self.get_eval_error_list([(scheme, copy_map) for _, _, scheme, copy_map in eval_error_request_list], relative_error = True)
+    cos_eval_d_eerror = []
+    for (label, i, _, _), eval_error in zip(eval_error_request_list, eval_error_list):
+      cos_eval_d_eerror_local = sup(abs(eval_error))
       cos_eval_d_eerror.append(cos_eval_d_eerror_local)
       if cos_eval_d_eerror_local > S2**-52:
-        print "cos_eval_d_eerror_local_3: ", i, cos_eval_d_eerror_local
+        print "%s: " % label, i, cos_eval_d_eerror_local
 
     print "max error: ", max(cos_eval_d_eerror)
 
@@ -394,9 +380,11 @@ class ML_SinCos(ML_Function("ml_cos")):
     lar_tabulated_sin    = TableLoad(sin_table,    lar_tab_index, 0, tag = "lar_tab_sin", debug = debug_precision) 
 
     lar_approx_interval = Interval(-1, 1)
+    # lar_vx lies in lar_approx_interval, lar_red_vx is scaled by ph_inv_frac_pi
+    lar_red_interval = Interval(inf(lar_approx_interval) * ph_inv_frac_pi, sup(lar_approx_interval) * ph_inv_frac_pi)
 
-    lar_poly_cos = polynomial_scheme_builder(poly_object_cos.sub_poly(start_index = 4, offset = 1), lar_red_vx, unified_precision = self.precision)
-    lar_poly_sin = polynomial_scheme_builder(poly_object_sin.sub_poly(start_index = 2), lar_red_vx, unified_precision = self.precision)
+    lar_poly_cos = self.generate_polynomial_scheme(poly_object_cos.sub_poly(start_index = 4, offset = 1), lar_red_vx, self.precision, variable_interval = lar_red_interval)
+    lar_poly_sin = self.generate_polynomial_scheme(poly_object_sin.sub_poly(start_index = 2), lar_red_vx, self.precision, variable_interval = lar_red_interval)
     lar_poly_cos.set_attributes(tag = "lar_poly_cos", debug = debug_precision)
     lar_poly_sin.set_attributes(tag = "lar_poly_sin", debug = debug_precision)
 
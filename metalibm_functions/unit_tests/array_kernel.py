@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+
+###############################################################################
+# This file is part of Kalray's Metalibm tool
+# Copyright (2016)
+# All rights reserved
+# created:          Oct 18th, 2016
+# last-modified:    Oct 18th, 2016
+#
+# author(s): Nicolas Brunie (nicolas.brunie@kalray.eu)
+# description: unit test for array-mapping kernel generation
+###############################################################################
+
+import sys
+
+from sollya import S2
+
+from metalibm_core.core.ml_function import ML_Function, ML_FunctionBasis
+
+from metalibm_core.core.ml_operations import *
+from metalibm_core.core.ml_formats import *
+from metalibm_core.core.array_kernel import generate_array_kernel, ARRAY_TAIL_SCALAR, ARRAY_TAIL_MASKED
+
+from metalibm_core.code_generation.generic_processor import GenericProcessor
+
+from metalibm_core.utility.ml_template import *
+from metalibm_core.utility.log_report import Log
+
+
+class ML_UT_ArrayKernel(ML_Function("ml_ut_array_kernel")):
+  def __init__(self,
+                 arg_template,
+                 precision = ML_Binary32,
+                 abs_accuracy = S2**-24,
+                 libm_compliant = True,
+                 debug_flag = False,
+                 fuse_fma = True,
+                 fast_path_extract = True,
+                 target = GenericProcessor(),
+                 array_unroll = 2,
+                 output_file = "ut_array_kernel.c",
+                 function_name = "ut_array_kernel"):
+    # extracting precision argument from command line
+    precision = ArgDefault.select_value([arg_template.precision, precision])
+    io_precisions = [precision] * 2
+
+    # initializing base class
+    ML_FunctionBasis.__init__(self,
+      base_name = "ut_array_kernel",
+      function_name = function_name,
+      output_file = output_file,
+
+      io_precisions = io_precisions,
+      abs_accuracy = None,
+      libm_compliant = libm_compliant,
+
+      processor = target,
+      fuse_fma = fuse_fma,
+      fast_path_extract = fast_path_extract,
+
+      arg_template = arg_template,
+
+      debug_flag = debug_flag
+    )
+
+    self.precision = precision
+    # the array kernel is always generated by this test
+    self.array_kernel = True
+    self.array_unroll = ArgDefault.select_value([arg_template.array_unroll, array_unroll])
+
+  def generate_scheme(self):
+    vx = self.implementation.add_input_variable("x", self.precision)
+    scheme = Statement(Return(vx * vx + vx))
+    return scheme
+
+  ## check the loop structure of the kernels built for every tail policy
+  def generate_array_kernel(self, code_function_list):
+    scalar_function, vector_function = self.get_implementation_function_objects(code_function_list)
+    vector_size = self.get_vector_size()
+    for tail_policy in [ARRAY_TAIL_SCALAR, ARRAY_TAIL_MASKED]:
+      kernel = generate_array_kernel(
+        "%s_array_check" % self.function_name, self.precision, scalar_function, vector_function,
+        vector_size = vector_size, unroll_factor = self.array_unroll, tail_policy = tail_policy
+      )
+      statement_list = kernel.get_scheme().get_inputs()
+      loop_count = len([op for op in statement_list if isinstance(op, Loop)])
+      unrolled_loop_count = 1 if self.array_unroll > 1 else 0
+      if vector_size == 1:
+        # main loop (optionally unrolled), whatever the tail policy
+        expected_loop_count = 1 + unrolled_loop_count
+      else:
+        # alignment peel, main vector loop (optionally unrolled) and
+        # scalar tail loop or masked tail block
+        expected_loop_count = 2 + unrolled_loop_count + (1 if tail_policy == ARRAY_TAIL_SCALAR else 0)
+        if tail_policy == ARRAY_TAIL_MASKED and not isinstance(statement_list[-1], ConditionBlock):
+          Log.report(Log.Error, "masked tail of the array kernel must be a conditional vector call")
+      if loop_count != expected_loop_count:
+        Log.report(Log.Error, "array kernel (tail %s) has %d loop(s), expected %d" % (tail_policy, loop_count, expected_loop_count))
+    return ML_FunctionBasis.generate_array_kernel(self, code_function_list)
+
+if __name__ == "__main__":
+  # auto-test
+  arg_template = ML_NewArgTemplate("new_ut_array_kernel")
+  args = arg_template.arg_extraction()
+
+  ml_ut_array_kernel = ML_UT_ArrayKernel(args)
+  ml_ut_array_kernel.gen_implementation()
@@ -0,0 +1,167 @@
+# -*- coding: utf-8 -*-
+
+###############################################################################
+# This file is part of Kalray's Metalibm tool
+# Copyright (2016)
+# All rights reserved
+# created:          Oct 18th, 2016
+# last-modified:    Oct 18th, 2016
+#
+# author(s): Nicolas Brunie (nicolas.brunie@kalray.eu)
+# description: unit test for constant folding and algebraic simplification
+###############################################################################
+
+import sys
+
+from sollya import S2
+
+from metalibm_core.core.ml_function import ML_Function, ML_FunctionBasis
+
+from metalibm_core.core.ml_operations import *
+from metalibm_core.core.ml_formats import *
+
+from metalibm_core.code_generation.generic_processor import GenericProcessor
+
+from metalibm_core.utility.ml_template import *
+from metalibm_core.utility.log_report import Log
+
+
+class ML_UT_ConstantFolding(ML_Function("ml_ut_constant_folding")):
+  def __init__(self,
+                 arg_template,
+                 precision = ML_Binary32,
+                 abs_accuracy = S2**-24,
+                 libm_compliant = True,
+                 debug_flag = False,
+                 fuse_fma = True,
+                 fast_path_extract = True,
+                 target = GenericProcessor(),
+                 output_file = "ut_constant_folding.c",
+                 function_name = "ut_constant_folding"):
+    # extracting precision argument from command line
+    precision = ArgDefault.select_value([arg_template.precision, precision])
+    io_precisions = [precision] * 2
+
+    # initializing base class
+    ML_FunctionBasis.__init__(self,
+      base_name = "ut_constant_folding",
+      function_name = function_name,
+      output_file = output_file,
+
+      io_precisions = io_precisions,
+      abs_accuracy = None,
+      libm_compliant = libm_compliant,
+
+      processor = target,
+      fuse_fma = fuse_fma,
+      fast_path_extract = fast_path_extract,
+
+      arg_template = arg_template,
+
+      debug_flag = debug_flag
+    )
+
+    self.precision = precision
+
+  ## fold <op_class>(<lhs>, <rhs>) with constant operands of format <precision>
+  #  @return pair (operation, folded constant or None)
+  def fold(self, op_class, lhs, rhs, precision):
+    optree = op_class(Constant(lhs, precision = precision), Constant(rhs, precision = precision), precision = precision)
+    return optree, self.opt_engine.fold_constant_operation(optree)
+
+  ## check the folded values of (op_class, lhs, rhs, precision, expected)
+  #  operations, expected being None if the operation must not be folded
+  def check_folding(self, expected_list):
+    for op_class, lhs, rhs, precision, expected in expected_list:
+      optree, folded = self.fold(op_class, lhs, rhs, precision)
+      value = None if folded is None else folded.get_value()
+      if value != expected:
+        Log.report(Log.Error, "wrong folding (expected %s, got %s) for %s" % (expected, value, optree.get_str(display_precision = True)))
+
+  ## check the folding of integer operations on constants
+  def check_integer_folding(self):
+    self.check_folding([
+      # unsigned operands are taken modulo 2**n
+      (BitLogicRightShift, -2, 1, ML_UInt64, 2**63 - 1),
+      (BitLogicRightShift, -1, 28, ML_UInt32, 0xf),
+      (BitLogicLeftShift, 0x80000001, 1, ML_UInt32, 2),
+      (Division, -1, 2, ML_UInt32, 2**31 - 1),
+      (Modulo, -1, 10, ML_UInt32, 5),
+      (Division, 7, 0, ML_UInt32, None),
+      # signed operations follow C semantics
+      (BitLogicLeftShift, 3, 2, ML_Int32, 12),
+      (BitLogicRightShift, 12, 2, ML_Int32, 3),
+      (BitLogicLeftShift, 1, 31, ML_Int32, None),
+      (BitLogicLeftShift, -1, 1, ML_Int32, None),
+      (BitLogicRightShift, -8, 1, ML_Int32, None),
+      (BitLogicRightShift, 1, 32, ML_Int32, None),
+      (Division, -7, 2, ML_Int32, -3),
+      (Division, 7, -2, ML_Int32, -3),
+      (Modulo, -7, 2, ML_Int32, -1),
+      (Modulo, 7, -2, ML_Int32, 1),
+      (Division, 7, 0, ML_Int32, None),
+      (Modulo, 7, 0, ML_Int32, None),
+      (Division, -2**31, -1, ML_Int32, None),
+      (Modulo, -2**31, -1, ML_Int32, None),
+      # out of range signed constants are not folded
+      (Addition, 2**31, 0, ML_Int32, None),
+    ])
+
+  ## check the folding of floating-point operations on constants
+  def check_fp_folding(self):
+    self.check_folding([
+      # the exact result is rounded (to nearest) to the node format
+      (Multiplication, 1.0 + 2.0**-23, 1.0 + 2.0**-23, ML_Binary32, 1.0 + 2.0**-22),
+      (Multiplication, 1.0 + 2.0**-23, 1.0 + 2.0**-23, ML_Binary64, 1.0 + 2.0**-22 + 2.0**-46),
+      (Addition, 1.0, 2.0**-24, ML_Binary32, 1.0),
+      (Addition, 1.0, 2.0**-24, ML_Binary64, 1.0 + 2.0**-24),
+      # overflows and inexact subnormal results are left to run time
+      (Multiplication, 2.0**127, 4.0, ML_Binary32, None),
+      (Multiplication, 2.0**-126, 1.0 / 3, ML_Binary32, None),
+    ])
+
+  ## check the algebraic simplification of operations with a non-constant
+  #  operand
+  def check_simplification(self):
+    vx = Variable("x", precision = ML_Binary32, var_type = Variable.Input)
+    vz = Variable("z", precision = ML_Binary32, var_type = Variable.Input)
+    one = Constant(1, precision = ML_Binary32)
+    # (operation, expected result: node, (class, inputs) of the new node,
+    # or None if the operation must be kept)
+    expected_list = [
+      (Multiplication(vx, one, precision = ML_Binary32), vx),
+      (Multiplication(one, vx, precision = ML_Binary32), vx),
+      # x + (-0.0) is x, x + 0.0 is not (for x = -0.0)
+      (Addition(vx, Constant(-0.0, precision = ML_Binary32), precision = ML_Binary32), vx),
+      (Addition(vx, Constant(0.0, precision = ML_Binary32), precision = ML_Binary32), None),
+      (TypeCast(TypeCast(vx, precision = ML_Int32), precision = ML_Binary32), vx),
+      (TypeCast(TypeCast(vx, precision = ML_Int32), precision = ML_UInt32), (TypeCast, [vx])),
+      (FusedMultiplyAdd(vx, one, vz, specifier = FusedMultiplyAdd.Standard, precision = ML_Binary32), (Addition, [vx, vz])),
+      (FusedMultiplyAdd(one, vx, vz, specifier = FusedMultiplyAdd.Subtract, precision = ML_Binary32), (Subtraction, [vx, vz])),
+    ]
+    for optree, expected in expected_list:
+      simplified = self.opt_engine.simplify_operation(optree)
+      if isinstance(expected, tuple):
+        op_class, input_list = expected
+        valid = isinstance(simplified, op_class) and simplified.get_precision() == optree.get_precision() and list(simplified.inputs) == input_list
+      else:
+        valid = simplified is expected
+      if not valid:
+        Log.report(Log.Error, "wrong simplification (got %s) for %s" % ("no simplification" if simplified is None else simplified.get_str(display_precision = True), optree.get_str(display_precision = True)))
+
+  def generate_scheme(self):
+    vx = self.implementation.add_input_variable("x", self.precision)
+    self.check_integer_folding()
+    self.check_fp_folding()
+    self.check_simplification()
+
+    scheme = Statement(Return(vx))
+    return scheme
+
+if __name__ == "__main__":
+  # auto-test
+  arg_template = ML_NewArgTemplate("new_ut_constant_folding")
+  args = arg_template.arg_extraction()
+
+  ml_ut_constant_folding = ML_UT_ConstantFolding(args)
+  ml_ut_constant_folding.gen_implementation()
@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+
+###############################################################################
+# This file is part of Kalray's Metalibm tool
+# Copyright (2016)
+# All rights reserved
+# created:          Oct 18th, 2016
+# last-modified:    Oct 18th, 2016
+#
+# author(s): Nicolas Brunie (nicolas.brunie@kalray.eu)
+# description: unit test for copy-on-write sharing of node attributes
+###############################################################################
+
+import sys
+
+from sollya import S2, Interval
+
+from metalibm_core.core.ml_function import ML_Function, ML_FunctionBasis
+
+from metalibm_core.core.ml_operations import *
+from metalibm_core.core.ml_formats import *
+from metalibm_core.core.attributes import Handle
+
+from metalibm_core.code_generation.generic_processor import GenericProcessor
+
+from metalibm_core.utility.ml_template import *
+from metalibm_core.utility.log_report import Log
+
+
+class ML_UT_CopyOnWrite(ML_Function("ml_ut_copy_on_write")):
+  def __init__(self,
+                 arg_template,
+                 precision = ML_Binary32,
+                 abs_accuracy = S2**-24,
+                 libm_compliant = True,
+                 debug_flag = False,
+                 fuse_fma = True,
+                 fast_path_extract = True,
+                 target = GenericProcessor(),
+                 output_file = "ut_copy_on_write.c",
+                 function_name = "ut_copy_on_write"):
+    # extracting precision argument from command line
+    precision = ArgDefault.select_value([arg_template.precision, precision])
+    io_precisions = [precision] * 2
+
+    # initializing base class
+    ML_FunctionBasis.__init__(self,
+      base_name = "ut_copy_on_write",
+      function_name = function_name,
+      output_file = output_file,
+
+      io_precisions = io_precisions,
+      abs_accuracy = None,
+      libm_compliant = libm_compliant,
+
+      processor = target,
+      fuse_fma = fuse_fma,
+      fast_path_extract = fast_path_extract,
+
+      arg_template = arg_template,
+
+      debug_flag = debug_flag
+    )
+
+    self.precision = precision
+
+  ## check that <node>'s interval, tag and handle are still <interval>,
+  #  <tag> and <handle>
+  def check_unchanged(self, node, interval, tag, handle, context):
+    if not node.get_interval() is interval:
+      Log.report(Log.Error, "interval of %s node modified by %s" % (tag, context))
+    if node.get_tag() != tag:
+      Log.report(Log.Error, "tag of %s node modified by %s (%s)" % (tag, context, node.get_tag()))
+    if not node.get_handle() is handle or not handle.get_node() is node:
+      Log.report(Log.Error, "handle of %s node modified by %s" % (tag, context))
+
+  ## mutate copies of nodes (and the nodes themselves) whose attributes
+  #  records are shared
+  def check_copy_on_write(self, vx):
+    original_interval = Interval(0, 1)
+    original = Multiplication(vx, vx, precision = self.precision, interval = original_interval, tag = "original")
+    original_handle = original.get_handle()
+
+    # copy sharing the attributes record of the original node
+    node_copy = original.copy({vx: vx})
+    copy_handle = Handle(node_copy)
+    node_copy.set_interval(Interval(0, 2))
+    node_copy.set_tag("copy")
+    node_copy.set_handle(copy_handle)
+    self.check_unchanged(original, original_interval, "original", original_handle, "copy mutation")
+
+    # light copy, the original node is mutated
+    light_copy = original.copy({vx: vx})
+    light_copy.copy_attributes(original, light = True)
+    light_copy_handle = Handle(light_copy)
+    light_copy.set_handle(light_copy_handle)
+    light_copy.set_tag("light_copy")
+    original.set_interval(Interval(0, 4))
+    original.set_tag("mutated")
+    self.check_unchanged(light_copy, None, "light_copy", light_copy_handle, "original mutation")
+    self.check_unchanged(node_copy, node_copy.get_interval(), "copy", copy_handle, "original mutation")
+
+    # nodes built without attributes share the default record
+    lhs = Addition(vx, vx, precision = self.precision)
+    rhs = Addition(vx, vx, precision = self.precision)
+    lhs.set_tag("lhs")
+    if rhs.get_tag() != None:
+      Log.report(Log.Error, "tag of default node modified by another node (%s)" % rhs.get_tag())
+
+  def generate_scheme(self):
+    vx = self.implementation.add_input_variable("x", self.precision)
+    self.check_copy_on_write(vx)
+
+    scheme = Statement(Return(vx))
+    return scheme
+
+if __name__ == "__main__":
+  # auto-test
+  arg_template = ML_NewArgTemplate("new_ut_copy_on_write")
+  args = arg_template.arg_extraction()
+
+  ml_ut_copy_on_write = ML_UT_CopyOnWrite(args)
+  ml_ut_copy_on_write.gen_implementation()
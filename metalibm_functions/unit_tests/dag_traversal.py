@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+
+###############################################################################
+# This file is part of Kalray's Metalibm tool
+# Copyright (2016)
+# All rights reserved
+# created:          Oct 18th, 2016
+# last-modified:    Oct 18th, 2016
+#
+# author(s): Nicolas Brunie (nicolas.brunie@kalray.eu)
+# description: unit test for iterative DAG traversal and optimization of
+#              deep schemes
+###############################################################################
+
+import sys
+
+from sollya import S2
+
+from metalibm_core.core.ml_function import ML_Function, ML_FunctionBasis
+
+from metalibm_core.core.ml_operations import *
+from metalibm_core.core.ml_formats import *
+from metalibm_core.core.dag_traversal import postorder_apply, topological_order, get_node_children
+
+from metalibm_core.code_generation.generic_processor import GenericProcessor
+
+from metalibm_core.utility.ml_template import *
+from metalibm_core.utility.log_report import Log
+
+
+class ML_UT_DAGTraversal(ML_Function("ml_ut_dag_traversal")):
+  def __init__(self,
+                 arg_template,
+                 precision = ML_Binary32,
+                 abs_accuracy = S2**-24,
+                 libm_compliant = True,
+                 debug_flag = False,
+                 fuse_fma = True,
+                 fast_path_extract = True,
+                 target = GenericProcessor(),
+                 output_file = "ut_dag_traversal.c",
+                 function_name = "ut_dag_traversal"):
+    # extracting precision argument from command line
+    precision = ArgDefault.select_value([arg_template.precision, precision])
+    io_precisions = [precision] * 2
+
+    # initializing base class
+    ML_FunctionBasis.__init__(self,
+      base_name = "ut_dag_traversal",
+      function_name = function_name,
+      output_file = output_file,
+
+      io_precisions = io_precisions,
+      abs_accuracy = None,
+      libm_compliant = libm_compliant,
+
+      processor = target,
+      fuse_fma = fuse_fma,
+      fast_path_extract = fast_path_extract,
+
+      arg_template = arg_template,
+
+      debug_flag = debug_flag
+    )
+
+    self.precision = precision
+
+  ## check that shared nodes are processed once, after their children
+  def check_traversal_order(self, vx):
+    square = vx * vx
+    diamond = Addition(square * vx, square + vx, precision = self.precision)
+
+    node_list = topological_order(diamond)
+    if len(node_list) != len(set(node_list)) or len(node_list) != 5:
+      Log.report(Log.Error, "each node must be listed exactly once by topological_order")
+    for index, node in enumerate(node_list):
+      if any(node_list.index(op) > index for op in get_node_children(node)):
+        Log.report(Log.Error, "node listed before its operands by topological_order")
+
+    process_count = {}
+    def count_node(node):
+      process_count[node] = process_count.get(node, 0) + 1
+    postorder_apply(diamond, get_node_children, count_node)
+    if any(count != 1 for count in process_count.values()):
+      Log.report(Log.Error, "node processed several times by postorder_apply")
+
+  ## optimize a scheme deeper than python's recursion limit
+  def check_deep_scheme(self, vx):
+    deep_op = vx
+    for i in xrange(2 * sys.getrecursionlimit()):
+      deep_op = Addition(deep_op * vx, Constant(1, precision = self.precision), precision = self.precision)
+    deep_scheme = Statement(Return(deep_op))
+    try:
+      self.opt_engine.optimization_process(deep_scheme, self.precision)
+    except RuntimeError:
+      Log.report(Log.Error, "recursion limit exceeded while optimizing a deep scheme")
+
+  def generate_scheme(self):
+    vx = self.implementation.add_input_variable("x", self.precision)
+    self.check_traversal_order(vx)
+    self.check_deep_scheme(Variable("y", precision = self.precision, var_type = Variable.Input))
+
+    scheme = Statement(Return(vx * vx + vx))
+    return scheme
+
+if __name__ == "__main__":
+  # auto-test
+  arg_template = ML_NewArgTemplate("new_ut_dag_traversal")
+  args = arg_template.arg_extraction()
+
+  ml_ut_dag_traversal = ML_UT_DAGTraversal(args)
+  ml_ut_dag_traversal.gen_implementation()
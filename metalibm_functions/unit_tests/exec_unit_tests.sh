@@ -8,6 +8,16 @@ python2 $ML_SRC_DIR/metalibm_functions/unit_tests/opencl_code.py &&\
 python2 $ML_SRC_DIR/metalibm_functions/unit_tests/pointer_manipulation.py &&\
 python2 $ML_SRC_DIR/metalibm_functions/unit_tests/static_vectorization.py --target vector &&\
 python2 $ML_SRC_DIR/metalibm_functions/unit_tests/vector_code.py --target vector &&\
+python2 $ML_SRC_DIR/metalibm_functions/unit_tests/vector_blending.py --target vector &&\
 python2 $ML_SRC_DIR/metalibm_functions/unit_tests/call_externalization.py &&\
+python2 $ML_SRC_DIR/metalibm_functions/unit_tests/if_conversion.py &&\
+python2 $ML_SRC_DIR/metalibm_functions/unit_tests/structural_sharing.py &&\
+python2 $ML_SRC_DIR/metalibm_functions/unit_tests/copy_on_write.py &&\
+python2 $ML_SRC_DIR/metalibm_functions/unit_tests/constant_folding.py &&\
+python2 $ML_SRC_DIR/metalibm_functions/unit_tests/dag_traversal.py &&\
+python2 $ML_SRC_DIR/metalibm_functions/unit_tests/array_kernel.py &&\
+python2 $ML_SRC_DIR/metalibm_functions/unit_tests/array_kernel.py --target vector --vector-size 4 --array-tail masked &&\
+python2 $ML_SRC_DIR/metalibm_functions/unit_tests/table_gather.py --target vector --vector-size 8 &&\
+python2 $ML_SRC_DIR/metalibm_functions/unit_tests/table_gather.py --target x86_avx2 --vector-size 8 &&\
 python2 $ML_SRC_DIR/metalibm_functions/unit_tests/auto_test.py --auto-test
 # python2 $ML_SRC_DIR/metalibm_functions/unit_tests/payne_hanek.py --precision binary64 &&\
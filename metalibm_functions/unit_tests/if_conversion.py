@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+
+###############################################################################
+# This file is part of Kalray's Metalibm tool
+# Copyright (2016)
+# All rights reserved
+# created:          Oct 18th, 2016
+# last-modified:    Oct 18th, 2016
+#
+# author(s): Nicolas Brunie (nicolas.brunie@kalray.eu)
+# description: unit test for speculation safety and if-conversion
+###############################################################################
+
+import sys
+
+from sollya import S2
+
+from metalibm_core.core.ml_function import ML_Function, ML_FunctionBasis
+
+from metalibm_core.core.ml_operations import *
+from metalibm_core.core.ml_formats import *
+
+from metalibm_core.code_generation.generic_processor import GenericProcessor
+
+from metalibm_core.utility.ml_template import *
+from metalibm_core.utility.log_report import Log
+
+
+class ML_UT_IfConversion(ML_Function("ml_ut_if_conversion")):
+  def __init__(self,
+                 arg_template,
+                 precision = ML_Binary32,
+                 abs_accuracy = S2**-24,
+                 libm_compliant = True,
+                 debug_flag = False,
+                 fuse_fma = True,
+                 fast_path_extract = True,
+                 target = GenericProcessor(),
+                 output_file = "ut_if_conversion.c",
+                 function_name = "ut_if_conversion"):
+    # extracting precision argument from command line
+    precision = ArgDefault.select_value([arg_template.precision, precision])
+    io_precisions = [precision] * 2
+
+    # initializing base class
+    ML_FunctionBasis.__init__(self,
+      base_name = "ut_if_conversion",
+      function_name = function_name,
+      output_file = output_file,
+
+      io_precisions = io_precisions,
+      abs_accuracy = None,
+      libm_compliant = libm_compliant,
+
+      processor = target,
+      fuse_fma = fuse_fma,
+      fast_path_extract = fast_path_extract,
+
+      arg_template = arg_template,
+
+      debug_flag = debug_flag
+    )
+
+    self.precision = precision
+
+  ## check the speculation safety of single operations
+  def check_speculation_safety(self, vx):
+    vi = Variable("i", precision = ML_Int32)
+    vu = Variable("u", precision = ML_UInt32)
+    expected_list = [
+      (Multiplication(vx, vx, precision = self.precision), True),
+      (Conversion(vi, precision = self.precision), True),
+      (Addition(vu, vu, precision = ML_UInt32), True),
+      (BitLogicLeftShift(vu, vu, precision = ML_UInt32), True),
+      # out-of-range conversions are undefined
+      (Conversion(vx, precision = ML_Int32), False),
+      (NearestInteger(vx, precision = ML_Int32), False),
+      # signed overflows are undefined
+      (Addition(vi, vi, precision = ML_Int32), False),
+      (Subtraction(vi, vi, precision = ML_Int32), False),
+      (Multiplication(vi, vi, precision = ML_Int32), False),
+      (Negation(vi, precision = ML_Int32), False),
+      (BitLogicLeftShift(vi, vu, precision = ML_Int32), False),
+      # integer division may trap
+      (Division(vu, vu, precision = ML_UInt32), False),
+    ]
+    for optree, expected in expected_list:
+      if self.opt_engine.is_speculation_safe(optree) != expected:
+        Log.report(Log.Error, "wrong speculation safety (expected %s) for %s" % (expected, optree.get_str(display_precision = True)))
+
+  def generate_scheme(self):
+    vx = self.implementation.add_input_variable("x", self.precision)
+    self.check_speculation_safety(vx)
+
+    cond = Comparison(vx, Constant(0, precision = self.precision), specifier = Comparison.GreaterOrEqual, precision = ML_Bool)
+
+    # both branches are safe: converted into a selection
+    safe_block = ConditionBlock(cond, Return(vx * vx), Return(vx + vx))
+    if not isinstance(self.opt_engine.if_conversion(safe_block), Return):
+      Log.report(Log.Error, "speculation-safe branches have not been converted")
+
+    # else branch converts a float to an integer: kept as a branch
+    int_value = Conversion(vx, precision = ML_Int32)
+    unsafe_block = ConditionBlock(cond, Return(vx * vx), Return(Conversion(int_value, precision = self.precision)))
+    if not isinstance(self.opt_engine.if_conversion(unsafe_block), ConditionBlock):
+      Log.report(Log.Error, "branch with float to integer conversion has been converted")
+
+    scheme = Statement(
+      ConditionBlock(cond,
+        Return(vx * vx),
+        Return(Conversion(Conversion(vx, precision = ML_Int32), precision = self.precision))
+      )
+    )
+    return scheme
+
+if __name__ == "__main__":
+  # auto-test
+  arg_template = ML_NewArgTemplate("new_ut_if_conversion")
+  args = arg_template.arg_extraction()
+
+  ml_ut_if_conversion = ML_UT_IfConversion(args)
+  ml_ut_if_conversion.gen_implementation()
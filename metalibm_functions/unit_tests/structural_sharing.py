@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+
+###############################################################################
+# This file is part of Kalray's Metalibm tool
+# Copyright (2016)
+# All rights reserved
+# created:          Oct 18th, 2016
+# last-modified:    Oct 18th, 2016
+#
+# author(s): Nicolas Brunie (nicolas.brunie@kalray.eu)
+# description: unit test for structural sharing of equivalent sub-expressions
+###############################################################################
+
+import sys
+
+from sollya import S2, Interval
+
+from metalibm_core.core.ml_function import ML_Function, ML_FunctionBasis
+
+from metalibm_core.core.ml_operations import *
+from metalibm_core.core.ml_formats import *
+
+from metalibm_core.code_generation.generic_processor import GenericProcessor
+
+from metalibm_core.utility.ml_template import *
+from metalibm_core.utility.log_report import Log
+
+
+class ML_UT_StructuralSharing(ML_Function("ml_ut_structural_sharing")):
+  def __init__(self,
+                 arg_template,
+                 precision = ML_Binary32,
+                 abs_accuracy = S2**-24,
+                 libm_compliant = True,
+                 debug_flag = False,
+                 fuse_fma = True,
+                 fast_path_extract = True,
+                 target = GenericProcessor(),
+                 output_file = "ut_structural_sharing.c",
+                 function_name = "ut_structural_sharing"):
+    # extracting precision argument from command line
+    precision = ArgDefault.select_value([arg_template.precision, precision])
+    io_precisions = [precision] * 2
+
+    # initializing base class
+    ML_FunctionBasis.__init__(self,
+      base_name = "ut_structural_sharing",
+      function_name = function_name,
+      output_file = output_file,
+
+      io_precisions = io_precisions,
+      abs_accuracy = None,
+      libm_compliant = libm_compliant,
+
+      processor = target,
+      fuse_fma = fuse_fma,
+      fast_path_extract = fast_path_extract,
+
+      arg_template = arg_template,
+
+      debug_flag = debug_flag
+    )
+
+    self.precision = precision
+
+  ## check which of the (lhs, rhs) operand pairs are merged by
+  #  structural sharing
+  def check_sharing(self, expected_list):
+    sum_list = [Addition(lhs, rhs, precision = lhs.get_precision()) for lhs, rhs, _ in expected_list]
+    self.opt_engine.structural_sharing(Statement(*tuple(Return(op) for op in sum_list)))
+    for sum_op, (lhs, rhs, expected) in zip(sum_list, expected_list):
+      merged = sum_op.get_input(0) is sum_op.get_input(1)
+      if merged != expected:
+        Log.report(Log.Error, "wrong structural sharing (expected %s) for %s" % (expected, sum_op.get_str(display_precision = True)))
+
+  def generate_scheme(self):
+    vx = self.implementation.add_input_variable("x", self.precision)
+
+    def square(**kwords):
+      return Multiplication(vx, vx, precision = self.precision, **kwords)
+
+    self.check_sharing([
+      (square(), square(), True),
+      (Constant(3, precision = ML_Int32), Constant(3, precision = ML_Int32), True),
+      # abstract constants have no encoding and are not merged
+      (Constant(1, precision = ML_Integer), Constant(1, precision = ML_Integer), False),
+      # nodes with different annotations are not merged
+      (square(interval = Interval(0, 1)), square(interval = Interval(0, 2)), False),
+      (square(exact = True), square(), False),
+      (square(max_abs_error = S2**-10), square(), False),
+    ])
+
+    scheme = Statement(Return(square() + square()))
+    return scheme
+
+if __name__ == "__main__":
+  # auto-test
+  arg_template = ML_NewArgTemplate("new_ut_structural_sharing")
+  args = arg_template.arg_extraction()
+
+  ml_ut_structural_sharing = ML_UT_StructuralSharing(args)
+  ml_ut_structural_sharing.gen_implementation()
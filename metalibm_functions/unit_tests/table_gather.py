@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+
+###############################################################################
+# This file is part of Kalray's Metalibm tool
+# Copyright (2016)
+# All rights reserved
+# created:          Oct 18th, 2016
+# last-modified:    Oct 18th, 2016
+#
+# author(s): Nicolas Brunie (nicolas.brunie@kalray.eu)
+# description: unit test for vector table loads (gathers and permutes)
+###############################################################################
+
+import sys
+
+from sollya import S2
+
+from metalibm_core.core.ml_function import ML_Function, ML_FunctionBasis
+
+from metalibm_core.core.ml_operations import *
+from metalibm_core.core.ml_formats import *
+from metalibm_core.core.ml_table import ML_Table
+
+from metalibm_core.code_generation.code_constant import C_Code
+from metalibm_core.code_generation.complex_generator import DynamicOperator
+from metalibm_core.targets.common.vector_backend import VectorBackend, vector_type
+from metalibm_core.targets.intel.x86_avx_processor import X86_AVX2_Processor, X86_AVX512_Processor
+
+from metalibm_core.utility.ml_template import *
+from metalibm_core.utility.log_report import Log
+
+
+class ML_UT_TableGather(ML_Function("ml_ut_table_gather")):
+  def __init__(self,
+                 arg_template,
+                 precision = ML_Binary32,
+                 abs_accuracy = S2**-24,
+                 libm_compliant = True,
+                 debug_flag = False,
+                 fuse_fma = True,
+                 fast_path_extract = True,
+                 target = VectorBackend(),
+                 output_file = "ut_table_gather.c",
+                 function_name = "ut_table_gather"):
+    # extracting precision argument from command line
+    precision = ArgDefault.select_value([arg_template.precision, precision])
+    io_precisions = [precision] * 2
+
+    # initializing base class
+    ML_FunctionBasis.__init__(self,
+      base_name = "ut_table_gather",
+      function_name = function_name,
+      output_file = output_file,
+
+      io_precisions = io_precisions,
+      abs_accuracy = None,
+      libm_compliant = libm_compliant,
+
+      processor = target,
+      fuse_fma = fuse_fma,
+      fast_path_extract = fast_path_extract,
+
+      arg_template = arg_template,
+
+      debug_flag = debug_flag
+    )
+
+    self.precision = precision
+
+  ## @return C template of the implementation of the vector table load
+  #          <optree> selected by the target
+  def get_table_load_template(self, optree):
+    if not self.processor.is_supported_operation(optree):
+      Log.report(Log.Error, "unsupported vector table load: %s" % optree.get_str(display_precision = True))
+    implementation = self.processor.get_recursive_implementation(optree, language = C_Code)
+    if isinstance(implementation, DynamicOperator):
+      implementation = implementation.dynamic_function(optree)
+    return implementation.function_name
+
+  ## check the implementation of vector table loads: per-lane loads for
+  #  the generic vector backend, register permutes (small tables) or
+  #  gathers (large tables) for native x86 vector formats
+  def check_table_loads(self, vector_size):
+    native_size_list = [8, 16] if isinstance(self.processor, X86_AVX512_Processor) else ([8] if isinstance(self.processor, X86_AVX2_Processor) else [])
+    native = vector_size in native_size_list
+    vindex = Variable("vindex", precision = vector_type[ML_Int32][vector_size], var_type = Variable.Input)
+    # (table dimensions, element format, expected native lowering)
+    expected_list = [
+      ([8], ML_Binary32, "permute"),
+      ([64], ML_Binary32, "gather"),
+      ([32, 2], ML_Binary32, "gather"),
+      ([64], ML_Int32, "gather"),
+    ]
+    for dimensions, element_format, lowering in expected_list:
+      table = ML_Table(dimensions = dimensions, storage_precision = element_format, tag = "check_table")
+      index_list = [vindex] + [Constant(1, precision = ML_Int32)] * (len(dimensions) - 1)
+      table_load = TableLoad(table, *tuple(index_list), precision = vector_type[element_format][vector_size])
+      template = self.get_table_load_template(table_load)
+      if native and not lowering in template:
+        Log.report(Log.Error, "vector table load from %s table should be a %s: %s" % (dimensions, lowering, template))
+      if not native and "_mm" in template:
+        Log.report(Log.Error, "vector table load from %s table should be per-lane: %s" % (dimensions, template))
+
+  def generate_scheme(self):
+    # table loads are checked on the vector format of the implementation
+    # (8 lanes for scalar implementations)
+    if isinstance(self.processor, VectorBackend):
+      self.check_table_loads(self.get_vector_size() if self.get_vector_size() > 1 else 8)
+
+    vx = self.implementation.add_input_variable("x", self.precision)
+
+    small_table = ML_Table(dimensions = [8, 1], storage_precision = self.precision, tag = self.uniquify_name("small_table"))
+    large_table = ML_Table(dimensions = [64, 1], storage_precision = self.precision, tag = self.uniquify_name("large_table"))
+    for i in xrange(64):
+      large_table[i][0] = i
+      if i < 8:
+        small_table[i][0] = -i
+
+    index = NearestInteger(vx, precision = ML_Int32)
+    small_index = BitLogicAnd(index, Constant(7, precision = ML_Int32), precision = ML_Int32)
+    large_index = BitLogicAnd(index, Constant(63, precision = ML_Int32), precision = ML_Int32)
+    scheme = Statement(
+      Return(
+        TableLoad(small_table, small_index, 0, precision = self.precision) +
+        TableLoad(large_table, large_index, 0, precision = self.precision)
+      )
+    )
+    return scheme
+
+if __name__ == "__main__":
+  # auto-test
+  arg_template = ML_NewArgTemplate("new_ut_table_gather")
+  args = arg_template.arg_extraction()
+
+  ml_ut_table_gather = ML_UT_TableGather(args)
+  ml_ut_table_gather.gen_implementation()
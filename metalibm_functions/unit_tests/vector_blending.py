@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+
+###############################################################################
+# This file is part of Kalray's Metalibm tool
+# Copyright (2016)
+# All rights reserved
+# created:          Oct 18th, 2016
+# last-modified:    Oct 18th, 2016
+#
+# author(s): Nicolas Brunie (nicolas.brunie@kalray.eu)
+# description: unit test for the blended vector slow path
+###############################################################################
+
+
+import sys
+
+from sollya import S2, Interval
+
+from metalibm_core.core.ml_function import ML_Function, ML_FunctionBasis, VECTOR_FALLBACK_BLEND
+
+from metalibm_core.core.ml_operations import *
+
+from metalibm_core.core.ml_formats import *
+
+from metalibm_core.targets.common.vector_backend import VectorBackend
+from metalibm_core.core.ml_vectorizer import StaticVectorizer
+
+from metalibm_core.utility.ml_template import *
+from metalibm_core.utility.log_report import Log
+
+
+
+
+class ML_UT_VectorBlending(ML_Function("ml_ut_vector_blending")):
+  def __init__(self,
+                 arg_template,
+                 precision = ML_Binary32,
+                 abs_accuracy = S2**-24,
+                 libm_compliant = True,
+                 debug_flag = False,
+                 fuse_fma = True,
+                 fast_path_extract = True,
+                 target = VectorBackend(),
+                 vector_fallback = VECTOR_FALLBACK_BLEND,
+                 output_file = "ut_vector_blending.c",
+                 function_name = "ut_vector_blending"):
+    # precision argument extraction
+    precision = ArgDefault.select_value([arg_template.precision, precision])
+    io_precisions = [precision] * 2
+
+    # initializing base class
+    ML_FunctionBasis.__init__(self,
+      base_name = "ut_vector_blending",
+      function_name = function_name,
+      output_file = output_file,
+
+      io_precisions = io_precisions,
+      abs_accuracy = None,
+      libm_compliant = libm_compliant,
+
+      processor = target,
+      fuse_fma = fuse_fma,
+      fast_path_extract = fast_path_extract,
+      vector_fallback = vector_fallback,
+
+      debug_flag = debug_flag,
+      arg_template = arg_template
+    )
+
+    self.precision = precision
+
+
+  def generate_function_list(self):
+    vector_size = 4
+
+    vx = Variable("x", precision = self.precision)
+    vx.set_interval(Interval(-1, 1))
+    vy = Variable("y", precision = self.precision, var_type = Variable.Local)
+
+    cond0 = Test(vx, specifier = Test.IsInfOrNaN, likely = False)
+    cond1 = Comparison(vx, 0, specifier = Comparison.GreaterOrEqual, likely = True)
+
+    exp1 = vx + vx * vx + Constant(1, precision = self.precision)
+    exp2 = vx * vx * vx
+    # the negative branch assigns a variable before returning: it can not
+    # be blended and must be left to the scalar callback
+    scheme = Statement(
+      ConditionBlock(cond0,
+        Return(vx),
+        ConditionBlock(cond1,
+          Return(exp1),
+          Statement(
+            ReferenceAssign(vy, exp2),
+            Return(vy)
+          )
+        )
+      )
+    )
+
+    blended_value, blend_mask = StaticVectorizer(self.opt_engine).extract_blended_path(scheme, (None, None))
+    if blended_value is None:
+      Log.report(Log.Error, "special and fast path branches should have been blended")
+    if blend_mask is None:
+      Log.report(Log.Error, "branch with side effects has been blended")
+
+    return self.generate_vector_implementation(scheme, [vx], vector_size)
+
+if __name__ == "__main__":
+  # auto-test
+  arg_template = ML_NewArgTemplate(default_function_name = "new_ut_vector_blending", default_output_file = "new_ut_vector_blending.c" )
+  args = arg_template.arg_extraction()
+
+  ml_ut_vector_blending = ML_UT_VectorBlending(args)
+
+  display_after_gen = ArgDefault.select_value([args.display_after_gen])
+  display_after_opt = ArgDefault.select_value([args.display_after_opt])
+  ml_ut_vector_blending.gen_implementation(display_after_gen = display_after_gen, display_after_opt = display_after_opt)